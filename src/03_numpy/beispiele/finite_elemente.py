@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Bystronic Python Grundkurs - Kapitel 3
+Beispiel: Finite Elemente mit dünnbesetzten Matrizen (Fachwerk und Rahmen)
+
+Die Steifigkeitsmatrix eines Vorrichtungs-Netzes mit 100'000 Freiheitsgraden
+hätte dicht gespeichert 10¹⁰ Einträge (80 GB) - fast alle davon Null, denn
+jeder Knoten ist nur mit seinen Nachbarn verbunden. Deshalb:
+
+- Elementmatrizen aller Elemente auf einmal berechnen (einsum statt Schleife)
+- In eine scipy.sparse COO-Matrix streuen: doppelte Einträge werden beim
+  Umwandeln in CSR automatisch addiert (vektorisiertes Scatter-Add)
+- Direkt (SuperLU) oder iterativ (CG/BiCGSTAB mit Jacobi- bzw. ILU-Vorkond.)
+  lösen
+- Konditionszahl schätzen statt berechnen (Hager/Higham über die
+  LU-Faktoren, deterministisch)
+- Nur die tiefsten k Eigenmoden mit eigsh (Shift-Invert um 0)
+
+Einheiten: N, mm, t (Tonne) - damit ergeben sich Frequenzen in Hz.
+"""
+
+import time
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg as sla
+
+STAHL = {"E": 210_000.0, "rho": 7.85e-9}  # N/mm², t/mm³
+VERFAHREN = [("direct", None), ("cg", "jacobi"), ("cg", "ilu"), ("bicgstab", "ilu")]
+
+
+def _element_geometry(nodes: np.ndarray, elements: np.ndarray):
+    """Länge und Richtungskosinus aller Elemente"""
+    delta = nodes[elements[:, 1]] - nodes[elements[:, 0]]
+    length = np.linalg.norm(delta, axis=1)
+    if np.any(length == 0):
+        raise ValueError("Elemente mit Länge 0")
+    return length, delta / length[:, None]
+
+
+def _element_dofs(elements: np.ndarray, dofs_per_node: int) -> np.ndarray:
+    """Globale Freiheitsgrade je Element (Elemente × 2·dofs_per_node)"""
+    offsets = np.arange(dofs_per_node)
+    return (elements[:, :, None] * dofs_per_node + offsets).reshape(len(elements), -1)
+
+
+def assemble(element_matrices: np.ndarray, element_dofs: np.ndarray, n_dofs: int):
+    """
+    Elementmatrizen in die globale Matrix streuen
+
+    Parameters:
+    -----------
+    element_matrices : np.ndarray
+        Elementmatrizen (Elemente × m × m)
+    element_dofs : np.ndarray
+        Globale Freiheitsgrade je Element (Elemente × m)
+    n_dofs : int
+        Anzahl Freiheitsgrade
+
+    Returns:
+    --------
+    sparse.csr_matrix
+        Globale Matrix; Beiträge auf denselben Eintrag sind aufsummiert
+    """
+    m = element_dofs.shape[1]
+    rows = np.repeat(element_dofs, m, axis=1).ravel()
+    cols = np.tile(element_dofs, (1, m)).ravel()
+    matrix = sparse.coo_matrix(
+        (element_matrices.ravel(), (rows, cols)), shape=(n_dofs, n_dofs)
+    )
+    return matrix.tocsr()  # summiert doppelte Einträge
+
+
+def truss_stiffness(nodes, elements, E: float, A) -> sparse.csr_matrix:
+    """
+    Steifigkeitsmatrix eines Fachwerks (2D oder 3D, nur Normalkräfte)
+
+    Parameters:
+    -----------
+    nodes : array_like
+        Knotenkoordinaten (Knoten × 2 oder 3) in mm
+    elements : array_like
+        Knotenpaare je Stab (Stäbe × 2)
+    E : float
+        Elastizitätsmodul in N/mm²
+    A : float or array_like
+        Querschnittsfläche je Stab in mm²
+
+    Returns:
+    --------
+    sparse.csr_matrix
+        Steifigkeitsmatrix (Knoten·dim × Knoten·dim)
+    """
+    nodes = np.asarray(nodes, dtype=np.float64)
+    elements = np.asarray(elements, dtype=np.int64)
+    dim = nodes.shape[1]
+    length, direction = _element_geometry(nodes, elements)
+
+    # k_e = EA/L · [[ccᵀ, -ccᵀ], [-ccᵀ, ccᵀ]] für alle Stäbe gleichzeitig
+    outer = np.einsum("ei,ej->eij", direction, direction)
+    outer *= (E * np.broadcast_to(A, length.shape) / length)[:, None, None]
+    blocks = np.block([[outer, -outer], [-outer, outer]])
+    return assemble(blocks, _element_dofs(elements, dim), len(nodes) * dim)
+
+
+def frame_stiffness(nodes, elements, E: float, A, inertia) -> sparse.csr_matrix:
+    """
+    Steifigkeitsmatrix eines ebenen Rahmens (Euler-Bernoulli-Balken)
+
+    Parameters:
+    -----------
+    nodes : array_like
+        Knotenkoordinaten (Knoten × 2) in mm
+    elements : array_like
+        Knotenpaare je Balken (Balken × 2)
+    E : float
+        Elastizitätsmodul in N/mm²
+    A, inertia : float or array_like
+        Querschnittsfläche (mm²) und Flächenträgheitsmoment (mm⁴) je Balken
+
+    Returns:
+    --------
+    sparse.csr_matrix
+        Steifigkeitsmatrix mit 3 Freiheitsgraden je Knoten (ux, uy, φ)
+    """
+    nodes = np.asarray(nodes, dtype=np.float64)
+    elements = np.asarray(elements, dtype=np.int64)
+    L, direction = _element_geometry(nodes, elements)
+    c, s = direction.T
+    n = len(L)
+    EA = E * np.broadcast_to(A, L.shape) / L
+    EI = E * np.broadcast_to(inertia, L.shape)
+
+    # Lokale Balkenmatrix (Achse entlang des Elements)
+    local = np.zeros((n, 6, 6))
+    local[:, [0, 3], [0, 3]] = EA[:, None]
+    local[:, [0, 3], [3, 0]] = -EA[:, None]
+    bend = np.array(
+        [[12, 6, -12, 6], [6, 4, -6, 2], [-12, -6, 12, -6], [6, 2, -6, 4]], float
+    )
+    powers = np.array([[3, 2, 3, 2], [2, 1, 2, 1], [3, 2, 3, 2], [2, 1, 2, 1]])
+    idx = np.array([1, 2, 4, 5])
+    # Einträge skalieren mit EI/L³, EI/L², EI/L (je nach Verschiebung/Drehung)
+    local[:, idx[:, None], idx] = bend * EI[:, None, None] / L[:, None, None] ** powers
+
+    # Drehung ins globale System: K = Tᵀ·k·T
+    rotation = np.zeros((n, 6, 6))
+    for start in (0, 3):
+        rotation[:, start, start] = rotation[:, start + 1, start + 1] = c
+        rotation[:, start, start + 1] = s
+        rotation[:, start + 1, start] = -s
+        rotation[:, start + 2, start + 2] = 1.0
+    blocks = np.einsum("eji,ejk,ekl->eil", rotation, local, rotation)
+    return assemble(blocks, _element_dofs(elements, 3), len(nodes) * 3)
+
+
+def lumped_mass(nodes, elements, rho: float, A, dofs_per_node: int = None):
+    """
+    Konzentrierte Massenmatrix: halbe Stabmasse auf jeden Endknoten
+
+    Parameters:
+    -----------
+    nodes, elements : array_like
+        Netz wie bei truss_stiffness
+    rho : float
+        Dichte in t/mm³
+    A : float or array_like
+        Querschnittsfläche je Element in mm²
+    dofs_per_node : int, optional
+        Freiheitsgrade je Knoten (Standard: Dimension); Drehfreiheitsgrade
+        eines Rahmens erhalten keine Masse
+
+    Returns:
+    --------
+    sparse.dia_matrix
+        Diagonale Massenmatrix
+    """
+    nodes = np.asarray(nodes, dtype=np.float64)
+    elements = np.asarray(elements, dtype=np.int64)
+    dim = nodes.shape[1]
+    dofs_per_node = dofs_per_node or dim
+    length, _ = _element_geometry(nodes, elements)
+    half = 0.5 * rho * np.broadcast_to(A, length.shape) * length
+    node_mass = np.bincount(elements.ravel(), np.repeat(half, 2), len(nodes))
+    diagonal = np.zeros((len(nodes), dofs_per_node))
+    diagonal[:, :dim] = node_mass[:, None]
+    return sparse.diags(diagonal.ravel())
+
+
+def free_dofs(n_dofs: int, fixed) -> np.ndarray:
+    """Freiheitsgrade ohne Lagerung"""
+    mask = np.ones(n_dofs, dtype=bool)
+    mask[np.asarray(fixed, dtype=np.int64)] = False
+    return np.flatnonzero(mask)
+
+
+def _preconditioner(K: sparse.csr_matrix, kind: str):
+    if kind is None:
+        return None
+    if kind == "jacobi":
+        inverse_diagonal = 1.0 / K.diagonal()
+        return sla.LinearOperator(K.shape, matvec=lambda x: inverse_diagonal * x)
+    if kind == "ilu":
+        # Symmetrische Ordnung ohne Pivotsuche: Faktor bleibt nahe an Cholesky
+        ilu = sla.spilu(
+            K.tocsc(),
+            drop_tol=1e-4,
+            fill_factor=10,
+            permc_spec="MMD_AT_PLUS_A",
+            diag_pivot_thresh=0.0,
+            options={"SymmetricMode": True},
+        )
+        return sla.LinearOperator(K.shape, matvec=ilu.solve)
+    raise ValueError(f"Unbekannte Vorkonditionierung: {kind}")
+
+
+def solve(
+    K,
+    F,
+    fixed,
+    method: str = "direct",
+    preconditioner: str = None,
+    rtol: float = 1e-10,
+    maxiter: int = None,
+) -> tuple[np.ndarray, dict]:
+    """
+    Verschiebungen aus K·u = F mit Lagerbedingungen u[fixed] = 0
+
+    Parameters:
+    -----------
+    K : sparse matrix
+        Globale Steifigkeitsmatrix
+    F : array_like
+        Lastvektor
+    fixed : array_like
+        Gelagerte Freiheitsgrade
+    method : str
+        "direct" (SuperLU), "cg" (konjugierte Gradienten) oder "bicgstab"
+        (verträgt die unsymmetrische ILU-Vorkonditionierung besser)
+    preconditioner : str, optional
+        "jacobi" oder "ilu" für die iterativen Verfahren
+    rtol : float
+        Relative Toleranz des iterativen Lösers
+    maxiter : int, optional
+        Maximale Iterationen des iterativen Lösers
+
+    Returns:
+    --------
+    tuple
+        (Verschiebungen aller Freiheitsgrade, Info mit 'iterations' und
+        'residual')
+    """
+    K = sparse.csr_matrix(K)
+    F = np.asarray(F, dtype=np.float64)
+    free = free_dofs(K.shape[0], fixed)
+    K_ff = K[free][:, free]
+    F_f = F[free]
+
+    info = {"method": method, "iterations": 0}
+    if method == "direct":
+        u_f = sla.spsolve(K_ff.tocsc(), F_f)
+    elif method in ("cg", "bicgstab"):
+        iterations = []
+        u_f, status = getattr(sla, method)(
+            K_ff,
+            F_f,
+            rtol=rtol,
+            maxiter=maxiter,
+            M=_preconditioner(K_ff, preconditioner),
+            callback=iterations.append,
+        )
+        if status != 0:
+            raise RuntimeError(
+                f"{method} nicht konvergiert nach {len(iterations)} Iterationen"
+            )
+        info["iterations"] = len(iterations)
+    else:
+        raise ValueError(f"Unbekannte Methode: {method}")
+
+    u = np.zeros(K.shape[0])
+    u[free] = u_f
+    info["residual"] = float(np.linalg.norm(K_ff @ u_f - F_f) / np.linalg.norm(F_f))
+    return u, info
+
+
+def condition_estimate(K, max_iter: int = 5) -> float:
+    """
+    Geschätzte Konditionszahl ‖K‖₁·‖K⁻¹‖₁ ohne Inverse (wie MATLAB condest)
+
+    ‖K‖₁ ist die grösste Spaltensumme und direkt ablesbar; ‖K⁻¹‖₁ wird
+    mit dem Verfahren von Hager/Higham aus wenigen Lösungen über die
+    LU-Zerlegung geschätzt. Ohne Zufallsvektoren - gleiche Matrix, gleiche
+    Schätzung.
+    """
+    K = sparse.csc_matrix(K)
+    n = K.shape[0]
+    lu = sla.splu(K)
+
+    x = np.full(n, 1.0 / n)
+    estimate = 0.0
+    for _ in range(max_iter):
+        y = lu.solve(x)
+        if np.abs(y).sum() <= estimate:
+            break
+        estimate = np.abs(y).sum()
+        z = lu.solve(np.where(y >= 0, 1.0, -1.0), trans="T")
+        j = np.argmax(np.abs(z))
+        if np.abs(z[j]) <= z @ x:
+            break
+        x = np.zeros(n)
+        x[j] = 1.0
+
+    # Zusatzvektor mit wechselnden Vorzeichen fängt Fälle ab, die Hager verfehlt
+    b = (-1.0) ** np.arange(n) * (1 + np.arange(n) / max(n - 1, 1))
+    estimate = max(estimate, 2 * np.abs(lu.solve(b)).sum() / (3 * n))
+
+    norm = abs(K).sum(axis=0).max()
+    return float(norm * estimate)
+
+
+def lowest_modes(K, M, k: int = 6, fixed=()) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Tiefste Eigenfrequenzen und Eigenmoden von K·φ = ω²·M·φ
+
+    Parameters:
+    -----------
+    K, M : sparse matrix
+        Steifigkeits- und Massenmatrix
+    k : int
+        Anzahl Moden
+    fixed : array_like
+        Gelagerte Freiheitsgrade
+
+    Returns:
+    --------
+    tuple
+        (Frequenzen in Hz aufsteigend, Moden als Spalten über alle
+        Freiheitsgrade)
+    """
+    K, M = sparse.csr_matrix(K), sparse.csr_matrix(M)
+    free = free_dofs(K.shape[0], fixed)
+    # Shift-Invert um 0: liefert die kleinsten Eigenwerte, ohne alle zu rechnen
+    values, vectors = sla.eigsh(
+        K[free][:, free], k=k, M=M[free][:, free], sigma=0, which="LM"
+    )
+    order = np.argsort(values)
+    modes = np.zeros((K.shape[0], k))
+    modes[free] = vectors[:, order]
+    return np.sqrt(np.maximum(values[order], 0)) / (2 * np.pi), modes
+
+
+def create_fixture_mesh(nx: int, ny: int, spacing: float = 10.0):
+    """
+    Ebenes Fachwerk-Gitter mit Diagonalen (z.B. Vorrichtungsplatte)
+
+    Returns:
+    --------
+    tuple
+        (Knoten nx·ny × 2, Stäbe × 2)
+    """
+    ix, iy = np.meshgrid(np.arange(nx), np.arange(ny), indexing="ij")
+    nodes = np.column_stack([ix.ravel(), iy.ravel()]) * spacing
+    number = np.arange(nx * ny).reshape(nx, ny)
+    pairs = [
+        (number[:-1, :], number[1:, :]),  # horizontal
+        (number[:, :-1], number[:, 1:]),  # vertikal
+        (number[:-1, :-1], number[1:, 1:]),  # Diagonale /
+        (number[1:, :-1], number[:-1, 1:]),  # Diagonale \
+    ]
+    elements = np.vstack([np.column_stack([a.ravel(), b.ravel()]) for a, b in pairs])
+    return nodes, elements
+
+
+def main() -> None:
+    print("=" * 60)
+    print("BYSTRONIC - FINITE ELEMENTE MIT DÜNNBESETZTEN MATRIZEN")
+    print("=" * 60)
+
+    # Platte 224 × 224 Knoten = 100'352 Freiheitsgrade, links eingespannt
+    nx = ny = 224
+    nodes, elements = create_fixture_mesh(nx, ny)
+    area = 20.0  # mm²
+    n_dofs = nodes.size
+
+    print(f"\n1️⃣ Assemblierung: {len(nodes):,} Knoten, {len(elements):,} Stäbe")
+    print("-" * 50)
+    start = time.perf_counter()
+    K = truss_stiffness(nodes, elements, STAHL["E"], area)
+    M = lumped_mass(nodes, elements, STAHL["rho"], area)
+    print(f"   {n_dofs:,} Freiheitsgrade in {time.perf_counter() - start:.2f} s")
+    print(f"   Nicht-Null-Einträge: {K.nnz:,} ({K.nnz / n_dofs**2:.4%} der Matrix)")
+    print(
+        f"   Speicher: {K.data.nbytes / 1e6:.0f} MB statt {n_dofs**2 * 8 / 1e9:.0f} GB"
+    )
+
+    links = np.flatnonzero(nodes[:, 0] == 0)
+    fixed = np.concatenate([2 * links, 2 * links + 1])
+    F = np.zeros(n_dofs)
+    rechts = np.flatnonzero(nodes[:, 0] == nodes[:, 0].max())
+    F[2 * rechts + 1] = -1000.0 / len(rechts)  # 1 kN nach unten am rechten Rand
+
+    print("\n2️⃣ Lösen: direkt vs. iterativ")
+    print("-" * 50)
+    for method, preconditioner in VERFAHREN:
+        start = time.perf_counter()
+        u, info = solve(K, F, fixed, method, preconditioner)
+        dauer = time.perf_counter() - start
+        name = method if preconditioner is None else f"{method} + {preconditioner}"
+        print(
+            f"   {name:<16} {dauer:6.2f} s, {info['iterations']:>5} Iterationen, "
+            f"max. Durchbiegung {u[1::2].min():.3f} mm"
+        )
+
+    print("\n3️⃣ Konditionszahl (Schätzung) und tiefste Eigenfrequenzen")
+    print("-" * 50)
+    free = free_dofs(n_dofs, fixed)
+    start = time.perf_counter()
+    cond = condition_estimate(K[free][:, free])
+    print(f"   κ₁(K) ≈ {cond:.2e} ({time.perf_counter() - start:.2f} s)")
+    start = time.perf_counter()
+    frequenzen, _ = lowest_modes(K, M, k=4, fixed=fixed)
+    print(f"   Tiefste 4 Eigenfrequenzen ({time.perf_counter() - start:.2f} s):")
+    for i, f in enumerate(frequenzen, 1):
+        print(f"   Mode {i}: {f:8.2f} Hz")
+
+    print(f"\n{'=' * 60}")
+    print("✅ FE-Analyse mit 100'000 Freiheitsgraden abgeschlossen!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Bystronic Python Grundkurs - Kapitel 3
+Beispiel: Hauptkomponentenanalyse (PCA) für breite Kanal-Matrizen
+
+Die Lehrbuch-PCA baut die Kovarianzmatrix (d × d) und zerlegt sie mit
+np.linalg.eig: O(d³), auch wenn nur 5 Komponenten gebraucht werden, und
+alle Daten müssen im Speicher liegen. Hier drei Wege:
+
+- "full": exakte SVD der standardisierten Daten (stabiler als eig(cov))
+- "randomized": randomisierte, abgeschnittene SVD (Halko et al. 2011) -
+  nur Matrixprodukte mit d × (k + 10) Zufallsmatrizen
+- partial_fit: Schicht-Daten blockweise einlesen; gesammelt werden nur
+  Summen und die Gram-Matrix (d × d), zerlegt wird zum Schluss
+
+Zentrieren und Standardisieren passieren dabei "on the fly" - die
+standardisierte Kopie der Daten wird nie angelegt.
+"""
+
+import time
+
+import numpy as np
+
+# Ergebnisse, die partial_fit erst beim ersten Zugriff berechnet
+FIT_RESULTS = (
+    "mean_",
+    "scale_",
+    "components_",
+    "explained_variance_",
+    "explained_variance_ratio_",
+)
+
+
+def _flip_signs(components: np.ndarray) -> np.ndarray:
+    """Vorzeichen eindeutig machen: grösste Ladung jeder Komponente positiv"""
+    largest = np.argmax(np.abs(components), axis=1)
+    signs = np.sign(components[np.arange(len(components)), largest])
+    return components * signs[:, None]
+
+
+def randomized_range(apply, apply_t, n_cols, size, n_iter, rng) -> np.ndarray:
+    """
+    Orthonormale Basis Q für den dominanten Bildraum eines Operators A
+
+    Parameters:
+    -----------
+    apply, apply_t : callable
+        M -> A·M bzw. N -> Aᵀ·N
+    n_cols : int
+        Anzahl Spalten von A
+    size : int
+        Gewünschte Basisgrösse (Komponenten + Überabtastung)
+    n_iter : int
+        Potenz-Iterationen (schärfen das Spektrum bei Rauschen)
+    rng : np.random.Generator
+        Zufallsgenerator
+
+    Returns:
+    --------
+    np.ndarray
+        Q mit orthonormalen Spalten
+    """
+    q, _ = np.linalg.qr(apply(rng.standard_normal((n_cols, size))))
+    for _ in range(n_iter):
+        # Nach jedem Produkt orthonormieren, sonst verschwinden kleine Richtungen
+        q, _ = np.linalg.qr(apply_t(q))
+        q, _ = np.linalg.qr(apply(q))
+    return q
+
+
+class PCA:
+    """
+    Hauptkomponentenanalyse mit exaktem, randomisiertem und blockweisem Fit
+
+    Parameters:
+    -----------
+    n_components : int, optional
+        Anzahl Komponenten (Standard: alle)
+    standardize : bool
+        Kanäle auf Standardabweichung 1 skalieren (Korrelations-PCA)
+    method : str
+        "full", "randomized" oder "auto" (randomisiert bei breiten Daten
+        und wenigen Komponenten)
+    n_oversamples : int
+        Zusätzliche Zufallsrichtungen im randomisierten Verfahren
+    n_iter : int
+        Potenz-Iterationen im randomisierten Verfahren
+    random_state : int
+        Startwert des Zufallsgenerators
+    """
+
+    def __init__(
+        self,
+        n_components: int = None,
+        standardize: bool = True,
+        method: str = "auto",
+        n_oversamples: int = 10,
+        n_iter: int = 4,
+        random_state: int = 0,
+    ):
+        if method not in ("auto", "full", "randomized"):
+            raise ValueError(f"Unbekannte Methode: {method}")
+        self.n_components = n_components
+        self.standardize = standardize
+        self.method = method
+        self.n_oversamples = n_oversamples
+        self.n_iter = n_iter
+        self.rng = np.random.default_rng(random_state)
+        self.n_samples_seen_ = 0
+        self._gram = None
+        self._pending = False
+
+    def __getattr__(self, name):
+        # Nur für fehlende Attribute: ausstehende Zerlegung nach partial_fit
+        if name in FIT_RESULTS and self.__dict__.get("_pending"):
+            self._decompose()
+            return getattr(self, name)
+        raise AttributeError(f"'PCA' hat kein Attribut '{name}'")
+
+    def _use_randomized(self, n_samples: int, n_features: int, k: int) -> bool:
+        if self.method != "auto":
+            return self.method == "randomized"
+        smaller = min(n_samples, n_features)
+        return smaller > 500 and k < 0.8 * smaller
+
+    def _set_moments(self, mean: np.ndarray, variance: np.ndarray) -> None:
+        self.mean_ = mean
+        scale = np.sqrt(variance) if self.standardize else np.ones_like(mean)
+        scale[scale == 0] = 1.0  # konstante Kanäle nicht durch 0 teilen
+        self.scale_ = scale
+
+    def _set_components(self, components, variances, total) -> None:
+        self.components_ = _flip_signs(components)
+        self.explained_variance_ = variances
+        self.explained_variance_ratio_ = variances / total
+
+    def fit(self, data):
+        """
+        PCA auf Daten im Speicher (Punkte × Kanäle)
+
+        Returns:
+        --------
+        PCA
+            self
+        """
+        data = np.asarray(data, dtype=np.float64)
+        n, d = data.shape
+        k = min(self.n_components or min(n, d), n, d)
+        self._set_moments(data.mean(axis=0), data.var(axis=0, ddof=1))
+        self.n_samples_seen_ = n
+        self._gram = None
+        self._pending = False
+        # Gesamtvarianz aller Kanäle (Nenner der erklärten Varianz)
+        total = float(np.sum(data.var(axis=0, ddof=1) / self.scale_**2))
+
+        if not self._use_randomized(n, d, k):
+            scaled = (data - self.mean_) / self.scale_
+            _, singular, vt = np.linalg.svd(scaled, full_matrices=False)
+            self._set_components(vt[:k], singular[:k] ** 2 / (n - 1), total)
+            return self
+
+        # Standardisierte Matrix nur implizit: X_s·M = X·(M/σ) - 1·(μ/σ)ᵀM
+        shift = self.mean_ / self.scale_
+
+        def apply(m):
+            return data @ (m / self.scale_[:, None]) - shift @ m
+
+        def apply_t(m):
+            return (data.T @ m) / self.scale_[:, None] - np.outer(shift, m.sum(axis=0))
+
+        size = min(k + self.n_oversamples, n, d)
+        q = randomized_range(apply, apply_t, d, size, self.n_iter, self.rng)
+        # Kleine Matrix B = Qᵀ·X_s (size × d) exakt zerlegen
+        _, singular, vt = np.linalg.svd(apply_t(q).T, full_matrices=False)
+        self._set_components(vt[:k], singular[:k] ** 2 / (n - 1), total)
+        return self
+
+    def partial_fit(self, chunk):
+        """
+        Aktualisiert die PCA mit einem weiteren Block (Punkte × Kanäle)
+
+        Gespeichert werden nur Summen und die Gram-Matrix der Kanäle; der
+        erste Block dient als Verschiebung gegen Auslöschung bei grossen
+        Offsets. Zerlegt wird erst beim ersten Zugriff auf components_,
+        mean_ usw. (z.B. durch transform), nicht bei jedem Block.
+
+        Returns:
+        --------
+        PCA
+            self
+        """
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if self._gram is None:
+            self.n_samples_seen_ = 0
+            self._offset = chunk.mean(axis=0)
+            self._sum = np.zeros(chunk.shape[1])
+            self._gram = np.zeros((chunk.shape[1], chunk.shape[1]))
+        shifted = chunk - self._offset
+        self._sum += shifted.sum(axis=0)
+        self._gram += shifted.T @ shifted
+        self.n_samples_seen_ += len(chunk)
+
+        # Ergebnisse des letzten Blocks verwerfen, neu zerlegt wird bei Bedarf
+        for name in FIT_RESULTS:
+            self.__dict__.pop(name, None)
+        self._pending = self.n_samples_seen_ >= 2
+        return self
+
+    def _decompose(self) -> None:
+        """Eigenzerlegung der gesammelten Gram-Matrix (nach partial_fit)"""
+        self._pending = False
+        n, d = self.n_samples_seen_, len(self._offset)
+        centered_mean = self._sum / n
+        covariance = self._gram - n * np.outer(centered_mean, centered_mean)
+        covariance /= n - 1
+        self._set_moments(self._offset + centered_mean, np.diag(covariance).copy())
+        # Kovarianz -> Korrelation (bzw. unverändert ohne Standardisierung)
+        covariance /= np.outer(self.scale_, self.scale_)
+        total = float(np.trace(covariance))
+
+        k = min(self.n_components or d, d)
+        if self._use_randomized(n, d, k):
+            size = min(k + self.n_oversamples, d)
+            # Symmetrische Matrix: A·M und Aᵀ·M sind dasselbe Produkt
+            product = covariance.__matmul__
+            q = randomized_range(product, product, d, size, self.n_iter, self.rng)
+            values, vectors = np.linalg.eigh(q.T @ covariance @ q)
+            vectors = q @ vectors
+        else:
+            values, vectors = np.linalg.eigh(covariance)
+        order = np.argsort(values)[::-1][:k]
+        self._set_components(vectors[:, order].T, values[order], total)
+
+    def transform(self, data) -> np.ndarray:
+        """Projektion auf die Hauptkomponenten (Punkte × Komponenten)"""
+        data = np.asarray(data, dtype=np.float64)
+        loadings = self.components_ / self.scale_
+        return data @ loadings.T - self.mean_ @ loadings.T
+
+    def fit_transform(self, data) -> np.ndarray:
+        return self.fit(data).transform(data)
+
+    def inverse_transform(self, scores) -> np.ndarray:
+        """Rekonstruktion der Kanäle aus den Komponenten-Werten"""
+        return (np.asarray(scores) @ self.components_) * self.scale_ + self.mean_
+
+
+def create_shift_scope(n: int, n_channels: int, n_sources: int = 5, seed: int = 3):
+    """
+    Scope-Daten einer Schicht: wenige Quellen, auf viele Kanäle gemischt
+
+    Returns:
+    --------
+    np.ndarray
+        Daten (n × n_channels) mit unterschiedlichen Einheiten/Offsets
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / 1000
+    sources = np.column_stack(
+        [np.sin(2 * np.pi * f * t + p) for f, p in rng.uniform(0.1, 5, (n_sources, 2))]
+    )
+    mixing = rng.normal(0, 1, (n_sources, n_channels))
+    noise = rng.normal(0, 0.3, (n, n_channels))
+    gain = rng.uniform(0.5, 50, n_channels)
+    offset = rng.uniform(-100, 100, n_channels)
+    return (sources @ mixing + noise) * gain + offset
+
+
+def main() -> None:
+    print("=" * 60)
+    print("BYSTRONIC - PCA FÜR BREITE SCOPE-DATEN")
+    print("=" * 60)
+
+    daten = create_shift_scope(100_000, 600)
+
+    # 1. Exakt vs. randomisiert
+    print("\n1️⃣ 100'000 Punkte × 600 Kanäle, 5 Komponenten")
+    print("-" * 50)
+    ergebnisse = {}
+    for method in ("full", "randomized"):
+        start = time.perf_counter()
+        pca = PCA(5, method=method).fit(daten)
+        dauer = time.perf_counter() - start
+        ergebnisse[method] = pca
+        anteil = pca.explained_variance_ratio_.sum()
+        print(f"   {method:<11} {dauer:6.2f} s, erklärte Varianz: {anteil:.2%}")
+    abweichung = np.abs(
+        ergebnisse["full"].components_ - ergebnisse["randomized"].components_
+    ).max()
+    print(f"   Max. Abweichung der Ladungen: {abweichung:.2e}")
+
+    # 2. Blockweise über eine ganze Schicht
+    print("\n2️⃣ partial_fit in Blöcken zu 10'000 Punkten")
+    print("-" * 50)
+    inkrementell = PCA(5)
+    start = time.perf_counter()
+    for block in np.array_split(daten, 10):
+        inkrementell.partial_fit(block)
+    dauer = time.perf_counter() - start
+    abweichung = np.abs(inkrementell.components_ - ergebnisse["full"].components_).max()
+    print(f"   {inkrementell.n_samples_seen_:,} Punkte in {dauer:.2f} s")
+    print(f"   Max. Abweichung zur exakten PCA: {abweichung:.2e}")
+
+    # 3. Datenreduktion
+    print("\n3️⃣ Reduktion 600 -> 5 Kanäle")
+    print("-" * 50)
+    pca = ergebnisse["randomized"]
+    werte = pca.transform(daten)
+    rekonstruiert = pca.inverse_transform(werte)
+    fehler = np.sqrt(np.mean(((daten - rekonstruiert) / pca.scale_) ** 2))
+    print(f"   Speicher: {daten.nbytes / 1e6:.0f} MB -> {werte.nbytes / 1e6:.0f} MB")
+    print(f"   Rekonstruktionsfehler (in σ): {fehler:.3f}")
+
+    print(f"\n{'=' * 60}")
+    print("✅ Hauptkomponentenanalyse abgeschlossen!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Bystronic Python Grundkurs - Kapitel 3
+Beispiel: Mini-Batch-K-Means für Maschinenzustände
+
+Aus Stunden von Mehrkanal-Scope-Daten sollen Betriebszustände gefunden
+werden (Leerlauf, Schneiden, Anfahren, Störung ...). Klassisches K-Means
+berechnet in jeder Iteration alle Distanzen zu allen Zentren - bei
+Millionen Punkten zu langsam und zu speicherhungrig.
+
+Die Bausteine hier:
+- Distanzen blockweise mit ||x||² - 2·x·cᵀ + ||c||² (ein Matrixprodukt,
+  Speicher begrenzt auf block_size × k)
+- k-means++-Initialisierung: Zentren weit auseinander statt zufällig
+- Mini-Batch-Updates: jedes Zentrum wandert mit Lernrate 1/Anzahl zum
+  Mittel der Batch-Punkte (Sculley 2010)
+- partial_fit für gestreamte Blöcke, predict optional mit mehreren Prozessen
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def assign(data, centers, block_size: int = 65_536) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Nächstes Zentrum für jeden Punkt, blockweise berechnet
+
+    Parameters:
+    -----------
+    data : array_like
+        Punkte (n × Kanäle)
+    centers : array_like
+        Zentren (k × Kanäle)
+    block_size : int
+        Punkte pro Block; der Zwischenspeicher ist block_size × k
+
+    Returns:
+    --------
+    tuple
+        (Cluster-Nummer, quadrierte Distanz zum Zentrum) je Punkt
+    """
+    data = np.asarray(data, dtype=np.float64)
+    centers = np.asarray(centers, dtype=np.float64)
+    center_norms = np.einsum("ij,ij->i", centers, centers)
+
+    labels = np.empty(len(data), dtype=np.int64)
+    distances = np.empty(len(data))
+    for start in range(0, len(data), block_size):
+        block = data[start : start + block_size]
+        # ||x - c||² = ||x||² - 2·x·c + ||c||²; ||x||² ist für argmin unnötig
+        partial = center_norms - 2.0 * (block @ centers.T)
+        best = np.argmin(partial, axis=1)
+        labels[start : start + block_size] = best
+        nearest = partial[np.arange(len(block)), best]
+        nearest += np.einsum("ij,ij->i", block, block)
+        # Rundungsfehler können minimal negative Werte ergeben
+        distances[start : start + block_size] = np.maximum(nearest, 0.0)
+    return labels, distances
+
+
+def _assign_worker(args) -> tuple[np.ndarray, np.ndarray]:
+    """Wrapper auf Modulebene, damit der ProcessPoolExecutor ihn pickeln kann"""
+    return assign(*args)
+
+
+def kmeans_plus_plus(data, k: int, rng: np.random.Generator, n_trials: int = None):
+    """
+    Greedy k-means++: neue Zentren proportional zur quadrierten Distanz ziehen
+
+    Parameters:
+    -----------
+    data : array_like
+        Punkte (n × Kanäle)
+    k : int
+        Anzahl Zentren
+    rng : np.random.Generator
+        Zufallsgenerator
+    n_trials : int, optional
+        Kandidaten pro Schritt, der beste wird behalten (Standard: 2 + log k)
+
+    Returns:
+    --------
+    np.ndarray
+        Startzentren (k × Kanäle)
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if len(data) < k:
+        raise ValueError(f"{len(data)} Punkte reichen nicht für {k} Zentren")
+    n_trials = n_trials or 2 + int(np.log(k))
+
+    centers = np.empty((k, data.shape[1]))
+    centers[0] = data[rng.integers(len(data))]
+    # Quadrierte Distanz jedes Punkts zum nächsten bisherigen Zentrum
+    closest = assign(data, centers[:1])[1]
+
+    for i in range(1, k):
+        total = closest.sum()
+        if total == 0:  # alle Punkte liegen auf Zentren
+            candidates = rng.integers(len(data), size=n_trials)
+        else:
+            draws = rng.random(n_trials) * total
+            candidates = np.searchsorted(np.cumsum(closest), draws)
+            candidates = np.minimum(candidates, len(data) - 1)
+        # Kandidat wählen, der die Summe der Distanzen am stärksten senkt
+        options = [
+            np.minimum(closest, assign(data, data[c : c + 1])[1]) for c in candidates
+        ]
+        best = int(np.argmin([option.sum() for option in options]))
+        centers[i] = data[candidates[best]]
+        closest = options[best]
+    return centers
+
+
+class MiniBatchKMeans:
+    """
+    K-Means mit Mini-Batch-Updates für grosse oder gestreamte Datenmengen
+
+    Parameters:
+    -----------
+    n_clusters : int
+        Anzahl Cluster
+    batch_size : int
+        Punkte pro Mini-Batch
+    max_iter : int
+        Maximale Anzahl Durchläufe (Epochen) über die Daten in fit()
+    tol : float
+        Abbruch, wenn sich die Zentren in einer Epoche weniger bewegen
+    init_size : int, optional
+        Punkte für die k-means++-Initialisierung (Standard: 3 × batch_size)
+    random_state : int
+        Startwert des Zufallsgenerators
+    n_jobs : int
+        Prozesse für die Zuordnung in predict() und fit()
+    block_size : int
+        Punkte pro Distanzblock
+    """
+
+    def __init__(
+        self,
+        n_clusters: int,
+        batch_size: int = 4096,
+        max_iter: int = 20,
+        tol: float = 1e-4,
+        init_size: int = None,
+        random_state: int = 0,
+        n_jobs: int = 1,
+        block_size: int = 65_536,
+    ):
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self.tol = tol
+        self.init_size = init_size or 3 * batch_size
+        self.n_jobs = n_jobs
+        self.block_size = block_size
+        self.rng = np.random.default_rng(random_state)
+        self.cluster_centers_ = None
+        self.counts_ = None
+        self.n_iter_ = 0
+
+    def _initialize(self, data: np.ndarray) -> None:
+        size = min(len(data), max(self.init_size, self.n_clusters))
+        sample = data[self.rng.choice(len(data), size, replace=False)]
+        self.cluster_centers_ = kmeans_plus_plus(sample, self.n_clusters, self.rng)
+        self.counts_ = np.zeros(self.n_clusters)
+
+    def _update(self, batch: np.ndarray) -> float:
+        """Ein Mini-Batch-Schritt; gibt die quadrierte Verschiebung zurück"""
+        labels, _ = assign(batch, self.cluster_centers_, self.block_size)
+        batch_counts = np.bincount(labels, minlength=self.n_clusters)
+        batch_sums = np.column_stack(
+            [
+                np.bincount(labels, weights=channel, minlength=self.n_clusters)
+                for channel in batch.T
+            ]
+        )
+
+        hit = batch_counts > 0
+        new_counts = self.counts_ + batch_counts
+        # Laufender Mittelwert: Zentrum = (alt·n_alt + Summe_batch) / n_neu
+        old = self.cluster_centers_[hit]
+        updated = old * self.counts_[hit, None] + batch_sums[hit]
+        updated /= new_counts[hit, None]
+        self.cluster_centers_[hit] = updated
+        self.counts_ = new_counts
+        return float(np.sum((updated - old) ** 2))
+
+    def partial_fit(self, data):
+        """
+        Aktualisiert die Zentren mit einem Block (z.B. aus einem Stream)
+
+        Parameters:
+        -----------
+        data : array_like
+            Neue Punkte (n × Kanäle)
+
+        Returns:
+        --------
+        MiniBatchKMeans
+            self
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if self.cluster_centers_ is None:
+            self._initialize(data)
+        for start in range(0, len(data), self.batch_size):
+            self._update(data[start : start + self.batch_size])
+        self.n_iter_ += 1
+        return self
+
+    def fit(self, data):
+        """
+        Mehrere Epochen zufälliger Mini-Batches bis zur Konvergenz
+
+        Parameters:
+        -----------
+        data : array_like
+            Punkte (n × Kanäle)
+
+        Returns:
+        --------
+        MiniBatchKMeans
+            self, mit labels_ und inertia_ für die Trainingsdaten
+        """
+        data = np.asarray(data, dtype=np.float64)
+        self._initialize(data)
+        for epoch in range(1, self.max_iter + 1):
+            order = self.rng.permutation(len(data))
+            shift = 0.0
+            for start in range(0, len(data), self.batch_size):
+                shift += self._update(data[order[start : start + self.batch_size]])
+            self.n_iter_ = epoch
+            if shift < self.tol:
+                break
+        self.labels_, distances = self._assign(data)
+        self.inertia_ = float(distances.sum())
+        return self
+
+    def _assign(self, data: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if self.n_jobs <= 1 or len(data) < 2 * self.block_size:
+            return assign(data, self.cluster_centers_, self.block_size)
+
+        parts = np.array_split(data, self.n_jobs)
+        args = [(part, self.cluster_centers_, self.block_size) for part in parts]
+        # Kein fork(): BLAS-Threads laufen bereits, fork wäre nicht sicher
+        start_methods = multiprocessing.get_all_start_methods()
+        method = "forkserver" if "forkserver" in start_methods else "spawn"
+        with ProcessPoolExecutor(
+            self.n_jobs, mp_context=multiprocessing.get_context(method)
+        ) as executor:
+            results = list(executor.map(_assign_worker, args))
+        return (
+            np.concatenate([labels for labels, _ in results]),
+            np.concatenate([distances for _, distances in results]),
+        )
+
+    def predict(self, data) -> np.ndarray:
+        """Cluster-Nummer für neue Punkte"""
+        if self.cluster_centers_ is None:
+            raise ValueError("Modell ist noch nicht trainiert (fit/partial_fit)")
+        return self._assign(np.asarray(data, dtype=np.float64))[0]
+
+    def score(self, data) -> float:
+        """Summe der quadrierten Distanzen zum nächsten Zentrum (Inertia)"""
+        return float(self._assign(np.asarray(data, dtype=np.float64))[1].sum())
+
+
+def create_scope_states(n: int, seed: int = 7) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Scope-Daten (Strom, Vibration, Temperatur, Gasdruck) aus fünf Zuständen
+
+    Returns:
+    --------
+    tuple
+        (Daten n × 4, wahrer Zustand je Punkt)
+    """
+    rng = np.random.default_rng(seed)
+    # Leerlauf, Anfahren, Schneiden dünn, Schneiden dick, Störung
+    means = np.array(
+        [
+            [2.0, 0.1, 25.0, 0.0],
+            [8.0, 0.8, 30.0, 2.0],
+            [15.0, 0.4, 45.0, 12.0],
+            [22.0, 0.6, 55.0, 16.0],
+            [5.0, 2.5, 60.0, 4.0],
+        ]
+    )
+    spread = np.array([1.0, 0.1, 2.0, 0.8])
+    states = rng.choice(len(means), n, p=[0.3, 0.1, 0.3, 0.25, 0.05])
+    return means[states] + rng.normal(0, 1, (n, 4)) * spread, states
+
+
+def main() -> None:
+    print("=" * 60)
+    print("BYSTRONIC - MINI-BATCH-K-MEANS FÜR MASCHINENZUSTÄNDE")
+    print("=" * 60)
+
+    daten, zustand = create_scope_states(2_000_000)
+    # Kanäle vergleichbar machen (Ampere vs. °C vs. bar)
+    standardisiert = (daten - daten.mean(axis=0)) / daten.std(axis=0)
+
+    # 1. Mini-Batch-Training
+    print("\n1️⃣ 2 Mio. Punkte, 4 Kanäle, 5 Zustände")
+    print("-" * 50)
+    start = time.perf_counter()
+    modell = MiniBatchKMeans(5, batch_size=8192, random_state=1).fit(standardisiert)
+    dauer = time.perf_counter() - start
+    print(f"   Training: {dauer:.2f} s, {modell.n_iter_} Epochen")
+    print(f"   Inertia: {modell.inertia_:,.0f}")
+
+    # Reinheit: Anteil Punkte, deren Cluster mehrheitlich ihren Zustand enthält
+    tabelle = np.zeros((5, 5), dtype=np.int64)
+    np.add.at(tabelle, (modell.labels_, zustand), 1)
+    print(f"   Reinheit: {tabelle.max(axis=1).sum() / len(daten):.1%}")
+
+    # 2. Gestreamte Blöcke mit partial_fit
+    print("\n2️⃣ partial_fit über Blöcke zu 100'000 Punkten")
+    print("-" * 50)
+    stream = MiniBatchKMeans(5, batch_size=8192, random_state=1)
+    start = time.perf_counter()
+    for block in np.array_split(standardisiert, 20):
+        stream.partial_fit(block)
+    dauer = time.perf_counter() - start
+    print(f"   {stream.n_iter_} Blöcke in {dauer:.2f} s")
+    print(f"   Inertia: {stream.score(standardisiert):,.0f}")
+
+    # 3. Zuordnung: ein Prozess vs. mehrere. Lohnt sich nur mit freien
+    # CPU-Kernen und vielen Kanälen/Zentren, sonst überwiegt das Kopieren.
+    print("\n3️⃣ predict() mit 1 und 4 Prozessen")
+    print("-" * 50)
+    print(f"   CPU-Kerne: {os.cpu_count()}")
+    for n_jobs in (1, 4):
+        modell.n_jobs = n_jobs
+        start = time.perf_counter()
+        labels = modell.predict(standardisiert)
+        print(f"   {n_jobs} Prozess(e): {time.perf_counter() - start:.2f} s")
+    print(f"   Gleiche Zuordnung wie fit(): {np.array_equal(labels, modell.labels_)}")
+
+    print(f"\n{'=' * 60}")
+    print("✅ Maschinenzustände geclustert!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Bystronic Python Grundkurs - Kapitel 3
+Beispiel: Mahalanobis-Distanz für Millionen Messpunkte
+
+Die Mahalanobis-Distanz misst, wie ungewöhnlich ein Messpunkt mit mehreren
+Kanälen (Temperatur, Vibration, Strom, ...) gegenüber dem Normalbetrieb ist:
+
+    d(x) = sqrt((x - μ)ᵀ Σ⁻¹ (x - μ))
+
+Statt Σ mit np.linalg.inv zu invertieren und jeden Punkt einzeln zu
+berechnen:
+- Σ = L·Lᵀ einmal per Cholesky zerlegen (stabiler als die Inverse)
+- Daten mit W = L⁻ᵀ "weiss" machen: z = (x - μ)·W, dann d² = Σ z²
+- Punkte blockweise als Matrixprodukt bewerten (BLAS statt Python-Schleife)
+
+Ein robustes Modell (Minimum Covariance Determinant) ignoriert Ausreisser
+bereits beim Schätzen von μ und Σ. Das eingefrorene Modell kann
+gespeichert und auf laufende Telemetrie angewendet werden.
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy import linalg, stats
+
+
+class MahalanobisModel:
+    """
+    Eingefrorenes Referenzmodell (μ, Σ) für die Mahalanobis-Bewertung
+
+    Parameters:
+    -----------
+    mean : array_like
+        Mittelwert je Kanal
+    covariance : array_like
+        Kovarianzmatrix (symmetrisch, positiv definit)
+    """
+
+    def __init__(self, mean, covariance):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.covariance = np.asarray(covariance, dtype=np.float64)
+        try:
+            lower = linalg.cholesky(self.covariance, lower=True)
+        except linalg.LinAlgError as exc:
+            raise ValueError("Kovarianzmatrix ist nicht positiv definit") from exc
+        # W = L⁻ᵀ: Eine Dreiecksauflösung beim Erstellen, danach nur Matrixprodukte
+        identity = np.eye(len(self.mean))
+        self.whitening = linalg.solve_triangular(lower, identity, lower=True).T
+
+    @property
+    def n_channels(self) -> int:
+        return len(self.mean)
+
+    @classmethod
+    def fit(cls, data, robust: bool = False, support_fraction: float = 0.75):
+        """
+        Schätzt das Modell aus Referenzdaten
+
+        Parameters:
+        -----------
+        data : array_like
+            Messpunkte (Punkte × Kanäle)
+        robust : bool
+            Minimum Covariance Determinant statt klassischer Schätzung
+        support_fraction : float
+            Anteil der Punkte, die die robuste Schätzung trägt
+
+        Returns:
+        --------
+        MahalanobisModel
+            Eingefrorenes Modell
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 2 or len(data) <= data.shape[1]:
+            raise ValueError("Mehr Messpunkte als Kanäle nötig (Punkte × Kanäle)")
+        if not robust:
+            return cls(data.mean(axis=0), np.cov(data, rowvar=False))
+        return cls._fit_mcd(data, support_fraction)
+
+    @classmethod
+    def _fit_mcd(cls, data: np.ndarray, support_fraction: float, max_steps: int = 30):
+        """Minimum Covariance Determinant über Konzentrationsschritte (C-Steps)"""
+        n, p = data.shape
+        h = max(int(support_fraction * n), p + 1)
+
+        # Start: Punkte nahe dem Median (robust skaliert mit der MAD)
+        median = np.median(data, axis=0)
+        mad = np.median(np.abs(data - median), axis=0)
+        mad[mad == 0] = 1.0
+        start = np.sum(((data - median) / mad) ** 2, axis=1)
+        subset = np.argpartition(start, h - 1)[:h]
+
+        # C-Step: Modell aus den h Punkten, dann die h nächsten Punkte wählen.
+        # Die Determinante von Σ sinkt dabei monoton bis zur Konvergenz.
+        for _ in range(max_steps):
+            model = cls(data[subset].mean(axis=0), np.cov(data[subset], rowvar=False))
+            squared = model.score(data, squared=True)
+            new_subset = np.argpartition(squared, h - 1)[:h]
+            if np.array_equal(np.sort(new_subset), np.sort(subset)):
+                break
+            subset = new_subset
+
+        # Konsistenz: Σ des Kerns ist zu klein, am Median der χ²-Verteilung skalieren
+        covariance = model.covariance * np.median(squared) / stats.chi2.ppf(0.5, p)
+        model = cls(model.mean, covariance)
+
+        # Nachgewichtung: alle Punkte innerhalb des 97.5%-Quantils verwenden
+        inlier = model.score(data, squared=True) <= stats.chi2.ppf(0.975, p)
+        return cls(data[inlier].mean(axis=0), np.cov(data[inlier], rowvar=False))
+
+    def score(self, data, squared: bool = False, chunk_size: int = 1_000_000):
+        """
+        Mahalanobis-Distanz aller Punkte, blockweise vektorisiert
+
+        Parameters:
+        -----------
+        data : array_like
+            Messpunkte (Punkte × Kanäle) oder ein einzelner Punkt
+        squared : bool
+            d² statt d zurückgeben (χ²-verteilt bei normalverteilten Daten)
+        chunk_size : int
+            Punkte pro Block (begrenzt den Zwischenspeicher)
+
+        Returns:
+        --------
+        np.ndarray
+            Distanz je Punkt
+        """
+        data = np.asarray(data)
+        single = data.ndim == 1
+        data = np.atleast_2d(data)
+        if data.shape[1] != self.n_channels:
+            raise ValueError(
+                f"{data.shape[1]} Kanäle, das Modell erwartet {self.n_channels}"
+            )
+
+        result = np.empty(len(data))
+        for start in range(0, len(data), chunk_size):
+            block = data[start : start + chunk_size] - self.mean
+            z = block @ self.whitening
+            np.einsum("ij,ij->i", z, z, out=result[start : start + chunk_size])
+        if not squared:
+            np.sqrt(result, out=result)
+        return result[0] if single else result
+
+    def threshold(self, alpha: float = 0.01) -> float:
+        """Distanz, die normale Punkte nur mit Wahrscheinlichkeit alpha überschreiten"""
+        return float(np.sqrt(stats.chi2.ppf(1 - alpha, self.n_channels)))
+
+    def score_stream(self, chunks, alpha: float = 0.01):
+        """
+        Bewertet laufend eintreffende Telemetrie-Blöcke
+
+        Parameters:
+        -----------
+        chunks : iterable
+            Blöcke (Punkte × Kanäle), z.B. aus einem Datei- oder Netzwerk-Reader
+        alpha : float
+            Signifikanzniveau für die Ausreisser-Markierung
+
+        Yields:
+        -------
+        tuple
+            (Distanzen, Ausreisser-Maske) je Block
+        """
+        limit = self.threshold(alpha)
+        for chunk in chunks:
+            distances = self.score(chunk)
+            yield distances, distances > limit
+
+    def save(self, path) -> None:
+        """Speichert μ und Σ als .npz-Datei"""
+        np.savez(Path(path), mean=self.mean, covariance=self.covariance)
+
+    @classmethod
+    def load(cls, path):
+        """Lädt ein mit save() gespeichertes Modell"""
+        with np.load(Path(path)) as saved:
+            return cls(saved["mean"], saved["covariance"])
+
+
+def create_telemetry(n: int, n_channels: int = 8, outlier_fraction: float = 0.05):
+    """
+    Korrelierte Mehrkanal-Telemetrie mit einem Cluster von Fehlmessungen
+
+    Returns:
+    --------
+    tuple
+        (Daten, wahre Ausreisser-Maske)
+    """
+    rng = np.random.default_rng(42)
+    mixing = rng.normal(0, 1, (n_channels, n_channels))
+    data = rng.standard_normal((n, n_channels)) @ mixing + np.arange(n_channels) * 10
+    outliers = rng.random(n) < outlier_fraction
+    # Fehlmessungen mit gemeinsamer Verschiebung (z.B. defekter Sensor)
+    data[outliers] += rng.normal(0, 1, (outliers.sum(), n_channels)) + 3
+    return data, outliers
+
+
+def main() -> None:
+    print("=" * 60)
+    print("BYSTRONIC - MAHALANOBIS-DISTANZ FÜR TELEMETRIE")
+    print("=" * 60)
+
+    # 1. Referenzmodell aus dem Normalbetrieb
+    print("\n1️⃣ Referenzmodell (200'000 Punkte, 8 Kanäle, 5% Fehlmessungen)")
+    print("-" * 50)
+    referenz, wahr = create_telemetry(200_000)
+    for robust in (False, True):
+        start = time.perf_counter()
+        modell = MahalanobisModel.fit(referenz, robust=robust)
+        dauer = time.perf_counter() - start
+        erkannt = modell.score(referenz) > modell.threshold(0.001)
+        name = "Robust (MCD)" if robust else "Klassisch"
+        print(
+            f"   {name:<13} {dauer:5.2f} s, erkannt: {erkannt[wahr].mean():6.1%} "
+            f"der Ausreisser, Fehlalarme: {erkannt[~wahr].mean():.2%}"
+        )
+
+    # 2. Schleife mit np.linalg.inv vs. Cholesky-Bewertung
+    print("\n2️⃣ Schleife mit inv() vs. blockweise Bewertung")
+    print("-" * 50)
+    inv = np.linalg.inv(modell.covariance)
+    start = time.perf_counter()
+    diffs = referenz[:20_000] - modell.mean
+    schleife = np.array([np.sqrt(diff @ inv @ diff) for diff in diffs])
+    dauer_schleife = (time.perf_counter() - start) * len(referenz) / 20_000
+    start = time.perf_counter()
+    distanzen = modell.score(referenz)
+    dauer_block = time.perf_counter() - start
+    print(f"   Schleife (hochgerechnet): {dauer_schleife:6.2f} s")
+    print(f"   Cholesky, blockweise:     {dauer_block:6.3f} s")
+    print(f"   Max. Abweichung: {np.abs(distanzen[:20_000] - schleife).max():.2e}")
+
+    # 3. Streaming gegen das eingefrorene Modell
+    print("\n3️⃣ Streaming: 10 Mio. Punkte in Blöcken zu 500'000")
+    print("-" * 50)
+    stream, _ = create_telemetry(10_000_000)
+    start = time.perf_counter()
+    anzahl = 0
+    blocks = (stream[i : i + 500_000] for i in range(0, len(stream), 500_000))
+    for _, ausreisser in modell.score_stream(blocks, alpha=0.001):
+        anzahl += ausreisser.sum()
+    dauer = time.perf_counter() - start
+    print(f"   {len(stream):,} Punkte in {dauer:.2f} s, {anzahl:,} Ausreisser")
+
+    print(f"\n{'=' * 60}")
+    print("✅ Mahalanobis-Bewertung abgeschlossen!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Bystronic Python Grundkurs - Kapitel 3
+Beispiel: Rollende Statistiken für lange Sensor-Signale
+
+Gleitende Kennzahlen werden oft mit einer Schleife über alle Fenster
+berechnet (np.std(daten[i : i + fenster])) oder mit np.convolve. Beides
+kostet O(n · fenster) - bei Scope-Kanälen mit 1.8 Mio. Samples und
+Fenstern von mehreren tausend Punkten sind das Minuten.
+
+Dieses Modul berechnet dieselben Kennzahlen in O(n):
+- Mittelwert, Standardabweichung, z-Score: kumulative Summen mit
+  Fehlerkompensation (TwoSum), Fenstersumme = Differenz zweier Summen
+- Minimum, Maximum: Block-Präfix/Suffix-Scans (van Herk/Gil-Werman),
+  die vektorisierte Form der monotonen Deque
+- Median: zwei Heaps mit verzögertem Löschen, O(log Fenster) pro Sample;
+  kurze Fenster (< MEDIAN_HEAP_WINDOW) vektorisiert mit np.median über
+  sliding_window_view, dort ist O(n · Fenster) in C schneller als die
+  Python-Schleife
+
+Alle Funktionen
+- rechnen entlang der letzten Achse, d.h. ein 2-D-Array (Kanäle × Samples)
+  wird in einem Aufruf verarbeitet,
+- ignorieren NaN-Werte (min_periods legt fest, wie viele gültige Werte
+  ein Fenster braucht),
+- liefern mit window=None expandierende Kennzahlen (alle bisherigen Werte).
+
+Das Ergebnis hat dieselbe Länge wie die Eingabe; Wert i beschreibt das
+Fenster, das bei Sample i endet (wie pandas rolling()).
+"""
+
+import heapq
+import math
+import time
+import warnings
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Ab dieser Fensterlänge rechnet rolling_median mit Heaps statt vektorisiert
+MEDIAN_HEAP_WINDOW = 128
+
+
+def _prepare(x) -> tuple[np.ndarray, np.ndarray]:
+    """Eingabe als float64 und Maske der gültigen Werte"""
+    x = np.asarray(x, dtype=np.float64)
+    return x, ~np.isnan(x)
+
+
+def _min_periods(window: int | None, min_periods: int | None) -> int:
+    if window is not None and window < 1:
+        raise ValueError(f"Fenster muss mindestens 1 sein, nicht {window}")
+    if min_periods is None:
+        return window if window is not None else 1
+    return min_periods
+
+
+def _cumsum(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Kumulative Summe mit führender Null und Rundungsfehler-Korrektur
+
+    Der Rundungsfehler jeder Addition wird mit TwoSum exakt bestimmt und
+    separat aufsummiert; Summe = hi + lo ist damit fast so genau wie eine
+    exakte Summe.
+    """
+    zero = np.zeros(values.shape[:-1] + (1,))
+    hi = np.concatenate([zero, np.cumsum(values, axis=-1)], axis=-1)
+    previous = hi[..., :-1]
+    total = hi[..., 1:]
+    z = total - previous
+    error = (previous - (total - z)) + (values - z)
+    lo = np.concatenate([zero, np.cumsum(error, axis=-1)], axis=-1)
+    return hi, lo
+
+
+def _window_sum(values: np.ndarray, window: int | None) -> np.ndarray:
+    """Summe über das Fenster, das bei jedem Sample endet"""
+    hi, lo = _cumsum(values)
+    if window is None:
+        return hi[..., 1:] + lo[..., 1:]
+    # Fenster i endet bei Sample i: Summe bis i minus Summe vor dem Fensterstart
+    hi_end, lo_end = hi[..., 1:].copy(), lo[..., 1:].copy()
+    hi_end[..., window:] -= hi[..., 1:-window]
+    lo_end[..., window:] -= lo[..., 1:-window]
+    return hi_end + lo_end
+
+
+def _window_count(valid: np.ndarray, window: int | None) -> np.ndarray:
+    """Anzahl gültiger Werte pro Fenster (exakt über Integer-Summen)"""
+    counts = np.cumsum(valid, axis=-1, dtype=np.int64)
+    if window is not None:
+        counts[..., window:] -= counts[..., :-window].copy()
+    return counts
+
+
+def _moments(x, window: int | None) -> tuple:
+    """Anzahl, Summe und Quadratsumme pro Fenster (um den Mittelwert verschoben)"""
+    x, valid = _prepare(x)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # Kanäle nur mit NaN
+        shift = np.nan_to_num(np.nanmean(x, axis=-1, keepdims=True))
+    centered = np.where(valid, x - shift, 0.0)
+
+    count = _window_count(valid, window)
+    sum_x = _window_sum(centered, window)
+    sum_xx = _window_sum(centered * centered, window)
+    return count, sum_x, sum_xx, shift
+
+
+def rolling_mean(x, window: int | None = None, min_periods: int | None = None):
+    """
+    Gleitender (oder expandierender) Mittelwert in O(n)
+
+    Parameters:
+    -----------
+    x : array_like
+        Signal(e), Samples entlang der letzten Achse
+    window : int, optional
+        Fensterlänge in Samples; None = expandierend
+    min_periods : int, optional
+        Mindestanzahl gültiger Werte (Standard: window bzw. 1)
+
+    Returns:
+    --------
+    np.ndarray
+        Mittelwerte, NaN wo zu wenige gültige Werte vorliegen
+    """
+    min_periods = _min_periods(window, min_periods)
+    count, sum_x, _, shift = _moments(x, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sum_x / count + shift
+    return np.where(count >= max(min_periods, 1), mean, np.nan)
+
+
+def rolling_var(
+    x, window: int | None = None, ddof: int = 1, min_periods: int | None = None
+):
+    """
+    Gleitende (oder expandierende) Varianz in O(n)
+
+    Parameters:
+    -----------
+    x : array_like
+        Signal(e), Samples entlang der letzten Achse
+    window : int, optional
+        Fensterlänge in Samples; None = expandierend
+    ddof : int
+        Freiheitsgrad-Korrektur (1 = Stichprobe wie pandas, 0 wie np.std)
+    min_periods : int, optional
+        Mindestanzahl gültiger Werte (Standard: window bzw. 1)
+
+    Returns:
+    --------
+    np.ndarray
+        Varianzen, NaN wo zu wenige gültige Werte vorliegen
+    """
+    min_periods = _min_periods(window, min_periods)
+    count, sum_x, sum_xx, _ = _moments(x, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (sum_xx - sum_x * sum_x / count) / (count - ddof)
+    var = np.maximum(var, 0.0)
+    return np.where(count >= max(min_periods, ddof + 1), var, np.nan)
+
+
+def rolling_std(
+    x, window: int | None = None, ddof: int = 1, min_periods: int | None = None
+):
+    """Gleitende Standardabweichung (Parameter wie rolling_var)"""
+    return np.sqrt(rolling_var(x, window, ddof=ddof, min_periods=min_periods))
+
+
+def rolling_zscore(
+    x, window: int | None = None, ddof: int = 1, min_periods: int | None = None
+):
+    """
+    z-Score jedes Samples relativ zu seinem Fenster
+
+    Parameters:
+    -----------
+    x : array_like
+        Signal(e), Samples entlang der letzten Achse
+    window : int, optional
+        Fensterlänge in Samples (inklusive aktuellem Sample); None = expandierend
+    ddof : int
+        Freiheitsgrad-Korrektur der Standardabweichung
+    min_periods : int, optional
+        Mindestanzahl gültiger Werte
+
+    Returns:
+    --------
+    np.ndarray
+        (x - Mittelwert) / Standardabweichung; NaN bei konstantem Fenster
+    """
+    x = np.asarray(x, dtype=np.float64)
+    mean = rolling_mean(x, window, min_periods=min_periods)
+    std = rolling_std(x, window, ddof=ddof, min_periods=min_periods)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(std > 0, (x - mean) / std, np.nan)
+
+
+def _rolling_extreme(x, window, min_periods, ufunc, fill: float) -> np.ndarray:
+    """Minimum/Maximum über Block-Präfix- und Suffix-Scans (van Herk/Gil-Werman)"""
+    min_periods = _min_periods(window, min_periods)
+    x, valid = _prepare(x)
+    filled = np.where(valid, x, fill)
+    count = _window_count(valid, window)
+
+    if window is None:
+        result = ufunc.accumulate(filled, axis=-1)
+    else:
+        n = x.shape[-1]
+        padded_n = -(-n // window) * window
+        padded = np.full(x.shape[:-1] + (padded_n,), fill)
+        padded[..., :n] = filled
+        blocks = padded.reshape(x.shape[:-1] + (padded_n // window, window))
+        # prefix[i]: Extremwert vom Blockanfang bis i, suffix[i]: von i bis Blockende
+        prefix = ufunc.accumulate(blocks, axis=-1).reshape(padded.shape)
+        suffix = ufunc.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1]
+        suffix = suffix.reshape(padded.shape)
+
+        # Ein Fenster überdeckt höchstens zwei Blöcke: Suffix des ersten,
+        # Präfix des zweiten. Die ersten window-1 Fenster liegen im ersten Block.
+        result = prefix[..., :n].copy()
+        if window <= n:
+            result[..., window - 1 :] = ufunc(
+                suffix[..., : n - window + 1], prefix[..., window - 1 : n]
+            )
+    return np.where(count >= max(min_periods, 1), result, np.nan)
+
+
+def rolling_min(x, window: int | None = None, min_periods: int | None = None):
+    """Gleitendes (oder expandierendes) Minimum in O(n)"""
+    return _rolling_extreme(x, window, min_periods, np.minimum, np.inf)
+
+
+def rolling_max(x, window: int | None = None, min_periods: int | None = None):
+    """Gleitendes (oder expandierendes) Maximum in O(n)"""
+    return _rolling_extreme(x, window, min_periods, np.maximum, -np.inf)
+
+
+def _heap_median(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Gleitender Median eines Kanals mit zwei Heaps, O(log window) pro Sample
+
+    low enthält die kleinere Hälfte (Max-Heap über negierte Werte), high die
+    grössere. Herausfallende Werte werden nur vorgemerkt und entfernt,
+    sobald sie oben auf einem Heap liegen; sizes zählt die gültigen Werte.
+    NaN wird übersprungen.
+    """
+    low, high = [], []
+    delayed = {}
+    sizes = [0, 0]
+    out = np.empty(len(values))
+
+    def prune(heap, sign):
+        while heap:
+            value = sign * heap[0]
+            pending = delayed.get(value)
+            if not pending:
+                return
+            if pending == 1:
+                del delayed[value]
+            else:
+                delayed[value] = pending - 1
+            heapq.heappop(heap)
+
+    def balance():
+        # low hat gleich viele oder einen Wert mehr als high
+        if sizes[0] > sizes[1] + 1:
+            heapq.heappush(high, -heapq.heappop(low))
+            sizes[0] -= 1
+            sizes[1] += 1
+            prune(low, -1)
+        elif sizes[0] < sizes[1]:
+            heapq.heappush(low, -heapq.heappop(high))
+            sizes[0] += 1
+            sizes[1] -= 1
+            prune(high, 1)
+
+    values = values.tolist()
+    for i, value in enumerate(values):
+        if value == value:  # NaN ist ungleich sich selbst
+            if not low or value <= -low[0]:
+                heapq.heappush(low, -value)
+                sizes[0] += 1
+            else:
+                heapq.heappush(high, value)
+                sizes[1] += 1
+            balance()
+        if i >= window:
+            old = values[i - window]
+            if old == old:
+                delayed[old] = delayed.get(old, 0) + 1
+                if old <= -low[0]:
+                    sizes[0] -= 1
+                    if old == -low[0]:
+                        prune(low, -1)
+                else:
+                    sizes[1] -= 1
+                    if old == high[0]:
+                        prune(high, 1)
+                balance()
+        if sizes[0] > sizes[1]:
+            out[i] = -low[0]
+        elif sizes[0]:
+            out[i] = (high[0] - low[0]) / 2
+        else:
+            out[i] = math.nan
+    return out
+
+
+def rolling_median(
+    x, window: int, min_periods: int | None = None, chunk_elements: int = 2**22
+):
+    """
+    Gleitender Median (Heaps bzw. sliding_window_view für kurze Fenster)
+
+    Parameters:
+    -----------
+    x : array_like
+        Signal(e), Samples entlang der letzten Achse
+    window : int
+        Fensterlänge in Samples
+    min_periods : int, optional
+        Mindestanzahl gültiger Werte (Standard: window)
+    chunk_elements : int
+        Fensterwerte pro Block bei kurzen Fenstern; begrenzt den
+        Zwischenspeicher
+
+    Returns:
+    --------
+    np.ndarray
+        Mediane, NaN wo zu wenige gültige Werte vorliegen
+    """
+    if window is None:
+        raise ValueError("Der Median braucht eine feste Fensterlänge")
+    min_periods = _min_periods(window, min_periods)
+    x, valid = _prepare(x)
+    count = _window_count(valid, window)
+
+    n = x.shape[-1]
+    if window >= MEDIAN_HEAP_WINDOW:
+        rows = x.reshape(-1, n)
+        result = np.array([_heap_median(row, window) for row in rows])
+        result = result.reshape(x.shape)
+        return np.where(count >= max(min_periods, 1), result, np.nan)
+
+    padded = np.concatenate([np.full(x.shape[:-1] + (window - 1,), np.nan), x], -1)
+    has_nan = np.isnan(padded)
+    windows = sliding_window_view(padded, window, axis=-1)  # (..., n, window)
+    channels = x.size // n if n else 1
+    rows = max(1, chunk_elements // (window * channels))
+
+    result = np.empty(x.shape)
+    for start in range(0, n, rows):
+        block = windows[..., start : start + rows, :]
+        if not has_nan[..., start : start + rows + window - 1].any():
+            result[..., start : start + rows] = np.median(block, axis=-1)
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # Fenster nur NaN
+                result[..., start : start + rows] = np.nanmedian(block, axis=-1)
+    return np.where(count >= max(min_periods, 1), result, np.nan)
+
+
+def create_scope_signals(n_samples: int = 1_800_000, seed: int = 42) -> np.ndarray:
+    """Vier Scope-Kanäle (Strom, Spannung, Position, Temperatur) mit Drift"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_samples) / 10_000  # 10 kHz
+    signals = np.vstack(
+        [
+            12 + 3 * np.sin(2 * np.pi * 50 * t) + rng.normal(0, 0.5, n_samples),
+            400 + rng.normal(0, 2, n_samples),
+            np.cumsum(rng.normal(0, 0.01, n_samples)),
+            65 + 0.0001 * np.arange(n_samples) + rng.normal(0, 0.2, n_samples),
+        ]
+    )
+    signals[:, rng.integers(0, n_samples, 1000)] = np.nan  # Aussetzer
+    return signals
+
+
+def main() -> None:
+    print("=" * 60)
+    print("BYSTRONIC - ROLLENDE STATISTIKEN FÜR SCOPE-SIGNALE")
+    print("=" * 60)
+
+    signals = create_scope_signals()
+    fenster = 2000
+    print(f"Kanäle × Samples: {signals.shape[0]} × {signals.shape[1]:,}")
+    print(f"Fenster: {fenster} Samples")
+
+    # 1. Schleife vs. O(n) auf einem Ausschnitt
+    print("\n1️⃣ Rollende Standardabweichung")
+    print("-" * 50)
+    ausschnitt = signals[1, :50_000]
+
+    start_time = time.perf_counter()
+    schleife = np.array(
+        [
+            np.nanstd(ausschnitt[i - fenster + 1 : i + 1], ddof=1)
+            for i in range(fenster - 1, len(ausschnitt))
+        ]
+    )
+    schleife_zeit = time.perf_counter() - start_time
+    hochgerechnet = schleife_zeit * signals.size / ausschnitt.size
+
+    start_time = time.perf_counter()
+    std = rolling_std(signals, fenster, min_periods=1)
+    o_n_zeit = time.perf_counter() - start_time
+
+    abweichung = np.max(np.abs(std[1, fenster - 1 : 50_000] - schleife))
+    print(f"Schleife (hochgerechnet, alle Kanäle): {hochgerechnet:8.1f} s")
+    print(f"O(n) alle Kanäle:                      {o_n_zeit:8.2f} s")
+    print(f"Max. Abweichung: {abweichung:.1e}")
+
+    # 2. Gleitender Mittelwert: np.convolve vs. kumulative Summen
+    print("\n2️⃣ Gleitender Mittelwert (ohne NaN)")
+    print("-" * 50)
+    strom = np.nan_to_num(signals[0], nan=12.0)
+
+    start_time = time.perf_counter()
+    conv = np.convolve(strom, np.ones(fenster) / fenster, mode="valid")
+    conv_zeit = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    mittel = rolling_mean(strom, fenster)
+    mittel_zeit = time.perf_counter() - start_time
+
+    abweichung = np.max(np.abs(mittel[fenster - 1 :] - conv))
+    print(f"np.convolve:    {conv_zeit:.2f} s")
+    print(f"rolling_mean:   {mittel_zeit:.2f} s (Abweichung {abweichung:.1e})")
+
+    # 3. Extremwerte, Median und z-Score
+    print("\n3️⃣ Min/Max, Median und z-Score")
+    print("-" * 50)
+    start_time = time.perf_counter()
+    maximum = rolling_max(signals, fenster, min_periods=1)
+    minimum = rolling_min(signals, fenster, min_periods=1)
+    print(f"Min/Max alle Kanäle:     {time.perf_counter() - start_time:.2f} s")
+
+    start_time = time.perf_counter()
+    median = rolling_median(signals[1], fenster, min_periods=1)
+    print(f"Median Kanal 1 (Heaps):  {time.perf_counter() - start_time:.2f} s")
+
+    z = rolling_zscore(signals, fenster)
+    ausreisser = np.sum(np.abs(z) > 4, axis=-1)
+    print(f"Spannweite Kanal 0 (Ende): {maximum[0, -1] - minimum[0, -1]:.2f}")
+    print(f"Median Kanal 1 (Ende):     {median[-1]:.2f}")
+    print(f"|z| > 4 pro Kanal:         {ausreisser}")
+
+    # 4. Expandierende Statistik (laufender Mittelwert über alle Samples)
+    print("\n4️⃣ Expandierende Statistiken")
+    print("-" * 50)
+    laufend = rolling_mean(signals)
+    print(f"Laufender Mittelwert Temperatur (Ende): {laufend[3, -1]:.3f}")
+    print(f"np.nanmean Temperatur:                  {np.nanmean(signals[3]):.3f}")
+
+    print(f"\n{'=' * 60}")
+    print("✅ Rollende Statistiken in O(n) berechnet!")
+
+
+if __name__ == "__main__":
+    main()
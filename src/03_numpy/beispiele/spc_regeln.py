@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Bystronic Python Grundkurs - Kapitel 3
+Beispiel: SPC-Regelkarten - alle acht Nelson-Regeln vektorisiert
+
+Eine Regelkarte prüft nicht nur Punkte ausserhalb ±3σ. Die Nelson-Regeln
+(Erweiterung der Western-Electric-Regeln) erkennen auch Muster:
+
+1. Ein Punkt ausserhalb ±3σ
+2. Neun Punkte in Folge auf derselben Seite des Mittelwerts
+3. Sechs Punkte in Folge stetig steigend oder fallend
+4. Vierzehn Punkte in Folge abwechselnd auf und ab
+5. Zwei von drei Punkten ausserhalb ±2σ (gleiche Seite)
+6. Vier von fünf Punkten ausserhalb ±1σ (gleiche Seite)
+7. Fünfzehn Punkte in Folge innerhalb ±1σ
+8. Acht Punkte in Folge ausserhalb ±1σ (beide Seiten)
+
+Statt jede Messung in einer Schleife zu prüfen, wird jede Regel als
+Bedingung auf dem ganzen Array ausgewertet:
+- Serien ("N Punkte in Folge"): Lauflänge über den letzten Rücksetzpunkt
+  (np.maximum.accumulate), O(n)
+- "k von m": Anzahl in einem Fenster über kumulative Summen, O(n)
+
+Mehrere Parameter und Maschinen werden zu einem Array verkettet und in
+einem Aufruf geprüft; Serien brechen an den Grenzen zwischen ihnen ab.
+NelsonMonitor prüft fortlaufend eintreffende Messungen.
+"""
+
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+# Regel: (Fensterlänge, Beschreibung)
+NELSON_RULES = {
+    1: (1, "Punkt ausserhalb ±3σ"),
+    2: (9, "9 Punkte auf einer Seite"),
+    3: (6, "6 Punkte stetig steigend/fallend"),
+    4: (14, "14 Punkte abwechselnd auf/ab"),
+    5: (3, "2 von 3 Punkten ausserhalb ±2σ"),
+    6: (5, "4 von 5 Punkten ausserhalb ±1σ"),
+    7: (15, "15 Punkte innerhalb ±1σ"),
+    8: (8, "8 Punkte ausserhalb ±1σ, beide Seiten"),
+}
+
+# Punkte, die ein Streaming-Monitor von vorherigen Messungen behalten muss
+HISTORY = max(length for length, _ in NELSON_RULES.values()) - 1
+
+
+class RuleHit(NamedTuple):
+    """Verletzung einer Nelson-Regel über die Messungen start bis end"""
+
+    series: object
+    rule: int
+    start: int
+    end: int
+
+
+def _run_length(condition: np.ndarray, index: np.ndarray, base: np.ndarray):
+    """Anzahl aufeinanderfolgender True-Werte, die bei jedem Index enden"""
+    # Letzter Index, an dem die Serie unterbrochen wurde (False oder neue Serie)
+    last_reset = np.maximum.accumulate(np.where(condition, base, index))
+    return np.where(condition, index - last_reset, 0)
+
+
+def _window_count(condition: np.ndarray, window: int) -> np.ndarray:
+    """Anzahl True-Werte in den letzten window Punkten"""
+    counts = np.cumsum(condition, dtype=np.int64)
+    counts[window:] -= counts[:-window].copy()
+    return counts
+
+
+def find_runs(mask, min_length: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Zusammenhängende True-Abschnitte mit Mindestlänge (Run-Length-Encoding)
+
+    Parameters:
+    -----------
+    mask : array_like
+        Boolesches 1-D-Array
+    min_length : int
+        Mindestanzahl aufeinanderfolgender True-Werte
+
+    Returns:
+    --------
+    tuple
+        (Startindizes, Endindizes) der Abschnitte, jeweils inklusive
+    """
+    mask = np.asarray(mask, dtype=bool)
+    edges = np.diff(np.concatenate([[False], mask, [False]]).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    keep = ends - starts + 1 >= min_length
+    return starts[keep], ends[keep]
+
+
+def rule_masks(x, center, sigma, first=None, rules=None) -> dict:
+    """
+    Für jede Regel: an welchen Punkten endet ein verletzendes Muster
+
+    Parameters:
+    -----------
+    x : array_like
+        Messwerte (1-D, ggf. mehrere Serien hintereinander)
+    center, sigma : float or array_like
+        Mittellinie und Standardabweichung (Skalar oder pro Punkt)
+    first : array_like, optional
+        True am ersten Punkt jeder Serie (Standard: nur Index 0)
+    rules : iterable, optional
+        Zu prüfende Regeln (Standard: alle acht)
+
+    Returns:
+    --------
+    dict
+        {Regel: boolesches Array}
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if first is None:
+        first = np.zeros(n, dtype=bool)
+        first[:1] = True
+    first = np.asarray(first, dtype=bool)
+    rules = NELSON_RULES if rules is None else rules
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (x - center) / sigma
+    # Position innerhalb der eigenen Serie - Fenster dürfen nicht überlappen
+    index = np.arange(n)
+    position = index - np.maximum.accumulate(np.where(first, index, 0))
+    # Rücksetzpunkt vor dem ersten Punkt jeder Serie
+    base = np.where(first, index - 1, -1)
+
+    def run(condition):
+        return _run_length(condition, index, base)
+
+    # Differenzen zum Vorgänger (nicht über Seriengrenzen hinweg)
+    step = np.zeros(n)
+    step[1:] = np.diff(x)
+    step[first] = np.nan
+    with np.errstate(invalid="ignore"):
+        rising, falling = step > 0, step < 0
+        above, below = z > 0, z < 0
+
+    masks = {}
+    for rule in rules:
+        length = NELSON_RULES[rule][0]
+        if rule == 1:
+            hit = np.abs(z) > 3
+        elif rule == 2:
+            hit = np.maximum(run(above), run(below)) >= length
+        elif rule == 3:
+            # 6 Punkte = 5 gleichgerichtete Schritte
+            hit = np.maximum(run(rising), run(falling)) >= length - 1
+        elif rule == 4:
+            # 14 Punkte = 13 Schritte mit 12 Richtungswechseln
+            turn = np.zeros(n, dtype=bool)
+            turn[1:] = (rising[1:] & falling[:-1]) | (falling[1:] & rising[:-1])
+            hit = run(turn & ~first) >= length - 2
+        elif rule in (5, 6):
+            limit, needed = (2, 2) if rule == 5 else (1, 4)
+            with np.errstate(invalid="ignore"):
+                high = _window_count(z > limit, length)
+                low = _window_count(z < -limit, length)
+            hit = (np.maximum(high, low) >= needed) & (position >= length - 1)
+        elif rule == 7:
+            with np.errstate(invalid="ignore"):
+                hit = run(np.abs(z) < 1) >= length
+        elif rule == 8:
+            # Beide Seiten der Mittellinie kommen im Fenster vor
+            with np.errstate(invalid="ignore"):
+                high = _window_count(z > 1, length) > 0
+                low = _window_count(z < -1, length) > 0
+                hit = (run(np.abs(z) > 1) >= length) & high & low
+        else:
+            raise ValueError(f"Unbekannte Nelson-Regel: {rule}")
+        masks[rule] = hit
+    return masks
+
+
+def _hit_ranges(hit: np.ndarray, length: int, first: np.ndarray):
+    """Vereinigung der Fenster [i - length + 1, i] aller Treffer i je Serie"""
+    ends = np.flatnonzero(hit)
+    cover = np.zeros(len(hit) + 1, dtype=np.int64)
+    np.add.at(cover, ends - length + 1, 1)
+    np.add.at(cover, ends + 1, -1)
+    covered = np.cumsum(cover[:-1]) > 0
+    # Bereiche enden an Lücken und an den Grenzen zwischen Serien
+    previous = np.concatenate([[False], covered[:-1]]) & ~first
+    following = np.concatenate([covered[1:] & ~first[1:], [False]])
+    return (
+        np.flatnonzero(covered & ~previous),
+        np.flatnonzero(covered & ~following),
+    )
+
+
+def _detect(x, center, sigma, lengths, labels, rules) -> list[RuleHit]:
+    """Regeln auf verketteten Serien prüfen und Treffer je Serie zurückgeben"""
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    series_id = np.repeat(np.arange(len(labels)), lengths)
+    first = np.zeros(len(x), dtype=bool)
+    first[offsets[lengths > 0]] = True
+    hits = []
+    for rule, hit in rule_masks(x, center, sigma, first, rules).items():
+        starts, ends = _hit_ranges(hit, NELSON_RULES[rule][0], first)
+        ids = series_id[starts]
+        hits.extend(
+            RuleHit(labels[sid], rule, start, end)
+            for sid, start, end in zip(
+                ids.tolist(),
+                (starts - offsets[ids]).tolist(),
+                (ends - offsets[ids]).tolist(),
+                strict=True,
+            )
+        )
+    return sorted(hits, key=lambda h: (str(h.series), h.start, h.rule))
+
+
+def detect(values, center=None, sigma=None, rules=None) -> list[RuleHit]:
+    """
+    Nelson-Regeln für eine Serie oder die Zeilen eines 2-D-Arrays
+
+    Parameters:
+    -----------
+    values : array_like
+        1-D-Messreihe oder 2-D-Array (Serien × Messungen, NaN = Lücke)
+    center, sigma : float or array_like, optional
+        Mittellinie und σ je Serie (Standard: Mittelwert/Std je Serie)
+    rules : iterable, optional
+        Zu prüfende Regeln (Standard: alle acht)
+
+    Returns:
+    --------
+    list
+        RuleHit(series, rule, start, end), series = Zeilennummer
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    return detect_groups(dict(enumerate(values)), center, sigma, rules)
+
+
+def detect_groups(series: dict, center=None, sigma=None, rules=None) -> list[RuleHit]:
+    """
+    Nelson-Regeln für viele Serien unterschiedlicher Länge in einem Aufruf
+
+    Parameters:
+    -----------
+    series : dict
+        {Schlüssel: Messwerte}, z.B. {("Laser 1", "dimension_x"): array}
+    center, sigma : float, array_like or dict, optional
+        Mittellinie und σ - Skalar, eine Folge (Reihenfolge wie series) oder
+        dict mit denselben Schlüsseln; Standard: Mittelwert/Std je Serie
+    rules : iterable, optional
+        Zu prüfende Regeln (Standard: alle acht)
+
+    Returns:
+    --------
+    list
+        RuleHit(series, rule, start, end) mit Indizes innerhalb der Serie
+    """
+    labels = list(series)
+    arrays = [np.asarray(series[key], dtype=np.float64) for key in labels]
+    lengths = np.array([len(a) for a in arrays], dtype=np.int64)
+    x = np.concatenate(arrays) if arrays else np.empty(0)
+
+    def per_series(value, default):
+        if value is None:
+            return np.array([default(a) for a in arrays])
+        if isinstance(value, dict):
+            return np.array([value[key] for key in labels], dtype=np.float64)
+        return np.broadcast_to(np.asarray(value, dtype=np.float64), lengths.shape)
+
+    center = per_series(center, np.nanmean)
+    sigma = per_series(sigma, lambda a: np.nanstd(a, ddof=1))
+
+    return _detect(
+        x, np.repeat(center, lengths), np.repeat(sigma, lengths), lengths, labels, rules
+    )
+
+
+class NelsonMonitor:
+    """
+    Fortlaufende Prüfung eintreffender Messungen mehrerer Serien
+
+    Parameters:
+    -----------
+    center, sigma : dict or float
+        Mittellinie und σ je Serie (dict) oder für alle Serien
+    rules : iterable, optional
+        Zu prüfende Regeln (Standard: alle acht)
+    """
+
+    def __init__(self, center, sigma, rules=None):
+        self.center = center
+        self.sigma = sigma
+        self.rules = rules
+        self.history = {}  # Schlüssel -> letzte HISTORY Messungen
+        self.seen = {}  # Schlüssel -> Anzahl bisheriger Messungen
+        self.open = {}  # (Schlüssel, Regel) -> letzter gemeldeter Bereich
+
+    def _limit(self, value, key):
+        return value[key] if isinstance(value, dict) else value
+
+    def update(self, chunk: dict) -> list[RuleHit]:
+        """
+        Prüft neue Messungen {Schlüssel: Werte}
+
+        Returns:
+        --------
+        list
+            Treffer, die in den neuen Messungen enden; Indizes zählen ab der
+            ersten Messung der Serie. Setzt ein Bereich einen bereits
+            gemeldeten fort, wird er mit dem ursprünglichen Start gemeldet.
+        """
+        keys = list(chunk)
+        series, skip = {}, {}
+        for key in keys:
+            previous = self.history.get(key, np.empty(0))
+            new = np.asarray(chunk[key], dtype=np.float64)
+            series[key] = np.concatenate([previous, new])
+            skip[key] = len(previous)
+
+        hits = detect_groups(
+            series,
+            {k: self._limit(self.center, k) for k in keys},
+            {k: self._limit(self.sigma, k) for k in keys},
+            self.rules,
+        )
+
+        reported = []
+        for hit in hits:
+            if hit.end < skip[hit.series]:
+                continue  # vollständig in bereits geprüften Messungen
+            base = self.seen.get(hit.series, 0) - skip[hit.series]
+            start, end = hit.start + base, hit.end + base
+            last = self.open.get((hit.series, hit.rule))
+            if last is not None and start <= last.end + 1:
+                start = min(start, last.start)
+            result = RuleHit(hit.series, hit.rule, start, end)
+            self.open[(hit.series, hit.rule)] = result
+            reported.append(result)
+
+        for key in keys:
+            self.seen[key] = self.seen.get(key, 0) + len(chunk[key])
+            self.history[key] = series[key][-HISTORY:]
+        return reported
+
+
+def main() -> None:
+    print("=" * 60)
+    print("BYSTRONIC - SPC-REGELKARTEN MIT NELSON-REGELN")
+    print("=" * 60)
+
+    rng = np.random.default_rng(2024)
+
+    # 1. Eine Messreihe mit eingebauten Mustern
+    print("\n1️⃣ Durchmesser-Messungen (Soll 25.0 mm, σ = 0.1 mm)")
+    print("-" * 50)
+    messungen = rng.normal(25.0, 0.1, 200)
+    messungen[50] = 25.45  # Ausreisser
+    messungen[80:92] += 0.12  # Verschiebung
+    messungen[120:127] = 25.0 + 0.02 * np.arange(7)  # Drift
+    messungen[150:170] = rng.normal(25.0, 0.02, 20)  # zu ruhig
+
+    for hit in detect(messungen, center=25.0, sigma=0.1):
+        print(
+            f"   Regel {hit.rule} ({NELSON_RULES[hit.rule][1]}): "
+            f"Messung {hit.start + 1}-{hit.end + 1}"
+        )
+
+    # 2. Viele Maschinen und Parameter in einem Aufruf
+    print("\n2️⃣ 3 Maschinen × 4 Parameter × 1 Mio. Messungen")
+    print("-" * 50)
+    serien = {
+        (maschine, parameter): rng.normal(0, 1, 1_000_000)
+        for maschine in ["Laser 1", "Laser 2", "Stanze 1"]
+        for parameter in ["dimension_x", "dimension_y", "roughness", "hardness"]
+    }
+    start_time = time.perf_counter()
+    hits = detect_groups(serien, center=0.0, sigma=1.0)
+    dauer = time.perf_counter() - start_time
+    print(f"   {sum(len(s) for s in serien.values()):,} Punkte in {dauer:.2f} s")
+    for rule, (_, text) in NELSON_RULES.items():
+        anzahl = sum(hit.rule == rule for hit in hits)
+        print(f"   Regel {rule} ({text}): {anzahl:,} Bereiche")
+
+    # 3. Streaming: Messungen treffen in Blöcken ein
+    print("\n3️⃣ Streaming in Blöcken zu 50 Messungen")
+    print("-" * 50)
+    monitor = NelsonMonitor(center=25.0, sigma=0.1)
+    for start in range(0, len(messungen), 50):
+        for hit in monitor.update({"Laser 1": messungen[start : start + 50]}):
+            print(
+                f"   Block ab {start + 1:>3}: Regel {hit.rule} "
+                f"Messung {hit.start + 1}-{hit.end + 1}"
+            )
+
+    print(f"\n{'=' * 60}")
+    print("✅ Nelson-Regeln vektorisiert geprüft!")
+
+
+if __name__ == "__main__":
+    main()
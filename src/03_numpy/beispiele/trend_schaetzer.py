@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Bystronic Python Grundkurs - Kapitel 3
+Beispiel: Trend-Schätzung für laufende Produktionsdaten
+
+Ein Trend wird üblicherweise so bestimmt: Designmatrix aus der gesamten
+Historie bauen, np.linalg.lstsq aufrufen. Für eine laufende Überwachung
+heisst das, mit jeder neuen Sekunde alles neu zu rechnen - O(n) pro
+Aktualisierung und Serie, und es wird mit jeder Stunde teurer.
+
+Hier zwei Alternativen:
+- batched_lstsq / linear_trends: viele unabhängige Serien (Maschine ×
+  Kanal) in einem Aufruf, auch mit Lücken (NaN)
+- RecursiveLeastSquares: rekursive kleinste Quadrate, O(p²) pro Sample
+  und Serie, unabhängig von der Länge der Historie; mit Vergessensfaktor
+  λ < 1 zählen alte Werte exponentiell weniger (Trendwechsel erkennen)
+
+Alle Funktionen erwarten Serien entlang der ersten und Zeit entlang der
+letzten Achse (Serien × Samples), wie rollende_statistik.
+"""
+
+import time
+
+import numpy as np
+
+
+def batched_lstsq(X, Y) -> np.ndarray:
+    """
+    Kleinste-Quadrate-Lösung für viele Serien gleichzeitig
+
+    Parameters:
+    -----------
+    X : array_like
+        Designmatrix (Samples × p) für alle Serien gemeinsam oder
+        (Serien × Samples × p) je Serie
+    Y : array_like
+        Messwerte (Serien × Samples); NaN-Werte werden ausgelassen
+
+    Returns:
+    --------
+    np.ndarray
+        Koeffizienten (Serien × p), NaN bei zu wenigen gültigen Werten
+    """
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    valid = ~np.isnan(Y)
+    if X.ndim == 2 and valid.all():
+        # Gemeinsame Designmatrix: ein lstsq-Aufruf mit vielen rechten Seiten
+        return np.linalg.lstsq(X, Y.T, rcond=None)[0].T
+
+    X = np.broadcast_to(X, Y.shape + X.shape[-1:])
+    weights = valid.astype(np.float64)
+    Y = np.where(valid, Y, 0.0)
+    # Normalgleichungen je Serie: (Xᵀ W X) θ = Xᵀ W y
+    gram = np.einsum("snp,sn,snq->spq", X, weights, X)
+    rhs = np.einsum("snp,sn->sp", X, weights * Y)
+    coef = np.full(rhs.shape, np.nan)
+    solvable = np.linalg.matrix_rank(gram) == X.shape[-1]
+    coef[solvable] = np.linalg.solve(gram[solvable], rhs[solvable, :, None])[..., 0]
+    return coef
+
+
+def linear_trends(t, Y) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Steigung und Achsenabschnitt y = a·t + b für viele Serien
+
+    Geschlossene Form über zentrierte Summen (keine Designmatrix, O(n)
+    Speicher); NaN-Werte werden ausgelassen.
+
+    Parameters:
+    -----------
+    t : array_like
+        Zeitpunkte (Samples) oder (Serien × Samples)
+    Y : array_like
+        Messwerte (Serien × Samples) oder eine einzelne Serie
+
+    Returns:
+    --------
+    tuple
+        (Steigungen, Achsenabschnitte) je Serie
+    """
+    Y = np.asarray(Y, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+    valid = ~np.isnan(Y)
+    if t.ndim == 1 and valid.all():
+        # Gemeinsame Zeitachse ohne Lücken: ein Matrix-Vektor-Produkt
+        dt = t - t.mean()
+        slope = (Y @ dt) / (dt @ dt)
+        return slope, Y.mean(axis=-1) - slope * t.mean()
+
+    t = np.broadcast_to(t, Y.shape)
+    count = valid.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_mean = np.where(valid, t, 0).sum(axis=-1) / count
+        y_mean = np.where(valid, Y, 0).sum(axis=-1) / count
+        dt = np.where(valid, t - t_mean[..., None], 0)
+        dy = np.where(valid, Y - y_mean[..., None], 0)
+        slope = (dt * dy).sum(axis=-1) / (dt * dt).sum(axis=-1)
+    return slope, y_mean - slope * t_mean
+
+
+class RecursiveLeastSquares:
+    """
+    Rekursive kleinste Quadrate für viele Serien gleichzeitig
+
+    Jede Serie hat eigene Koeffizienten θ (p) und eine eigene inverse
+    Informationsmatrix P (p × p). Eine Aktualisierung mit einem neuen
+    Sample (x, y) kostet O(p²) - die Historie wird nie gespeichert.
+
+    Parameters:
+    -----------
+    n_params : int
+        Anzahl Koeffizienten p
+    n_series : int
+        Anzahl unabhängiger Serien
+    forgetting : float
+        Vergessensfaktor λ (1 = alle Werte gleich gewichtet, 0.99 ≈
+        Gedächtnis von 100 Samples)
+    delta : float
+        Startwert P = δ·I; gross = schwache Vorannahme θ = 0
+    """
+
+    def __init__(
+        self,
+        n_params: int,
+        n_series: int = 1,
+        forgetting: float = 1.0,
+        delta: float = 1e6,
+    ):
+        if not 0 < forgetting <= 1:
+            raise ValueError(f"Vergessensfaktor muss in (0, 1] liegen: {forgetting}")
+        self.forgetting = forgetting
+        self.coef_ = np.zeros((n_series, n_params))
+        self.P_ = np.tile(np.eye(n_params) * delta, (n_series, 1, 1))
+        self.n_updates_ = np.zeros(n_series, dtype=np.int64)
+
+    def predict(self, x) -> np.ndarray:
+        """Vorhersage x·θ je Serie; x ist (p) oder (Serien × p)"""
+        return np.einsum("sp,sp->s", np.broadcast_to(x, self.coef_.shape), self.coef_)
+
+    def update(self, x, y) -> np.ndarray:
+        """
+        Aktualisiert alle Serien mit einem neuen Sample
+
+        Parameters:
+        -----------
+        x : array_like
+            Merkmale (p) für alle Serien oder (Serien × p)
+        y : array_like
+            Messwerte (Serien); NaN lässt die Serie unverändert
+
+        Returns:
+        --------
+        np.ndarray
+            Vorhersagefehler vor der Aktualisierung (a-priori-Residuen)
+        """
+        x = np.broadcast_to(np.asarray(x, dtype=np.float64), self.coef_.shape)
+        y = np.broadcast_to(np.asarray(y, dtype=np.float64), self.coef_.shape[:1])
+        error = y - self.predict(x)  # NaN bei fehlenden Werten
+        active = ~np.isnan(y)
+        if active.all():
+            P, coef, e = self.P_, self.coef_, error
+        else:
+            x, e = x[active], error[active]
+            P, coef = self.P_[active], self.coef_[active]
+
+        # Sherman-Morrison: Verstärkung k = P·x / (λ + xᵀ·P·x)
+        Px = np.einsum("spq,sq->sp", P, x)
+        gain = Px / (self.forgetting + np.einsum("sp,sp->s", x, Px))[:, None]
+        coef = coef + gain * e[:, None]
+        P = (P - gain[:, :, None] * Px[:, None, :]) / self.forgetting
+        # Symmetrie erzwingen, sonst driftet P durch Rundungsfehler weg
+        P = 0.5 * (P + P.transpose(0, 2, 1))
+
+        if active.all():
+            self.P_, self.coef_ = P, coef
+        else:
+            self.P_[active], self.coef_[active] = P, coef
+        self.n_updates_ += active
+        return error
+
+    def update_block(self, X, Y) -> np.ndarray:
+        """
+        Aktualisiert mit mehreren Samples nacheinander
+
+        Parameters:
+        -----------
+        X : array_like
+            Merkmale (Samples × p) oder (Serien × Samples × p)
+        Y : array_like
+            Messwerte (Serien × Samples)
+
+        Returns:
+        --------
+        np.ndarray
+            A-priori-Residuen (Serien × Samples)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+        errors = np.empty(Y.shape)
+        for i in range(Y.shape[1]):
+            errors[:, i] = self.update(X[..., i, :], Y[:, i])
+        return errors
+
+
+class TrendTracker:
+    """
+    Laufende Trend-Steigung y = a·t + b für viele Serien
+
+    Die Zeit wird intern relativ zum ersten Zeitpunkt gerechnet, damit
+    grosse Zeitstempel (Sekunden seit Schichtbeginn) P nicht schlecht
+    konditionieren.
+
+    Parameters:
+    -----------
+    n_series : int
+        Anzahl Serien (z.B. Maschinen × Kanäle)
+    forgetting : float
+        Vergessensfaktor λ (siehe RecursiveLeastSquares)
+    """
+
+    def __init__(self, n_series: int, forgetting: float = 1.0, delta: float = 1e6):
+        self._rls = RecursiveLeastSquares(2, n_series, forgetting, delta)
+        self._t0 = None
+
+    def update(self, t: float, values) -> np.ndarray:
+        """Neuer Messwert je Serie zum Zeitpunkt t; liefert die Residuen"""
+        if self._t0 is None:
+            self._t0 = float(t)
+        return self._rls.update([t - self._t0, 1.0], values)
+
+    @property
+    def slope(self) -> np.ndarray:
+        """Aktuelle Steigung je Serie"""
+        return self._rls.coef_[:, 0].copy()
+
+    @property
+    def intercept(self) -> np.ndarray:
+        """Achsenabschnitt je Serie (bezogen auf t = 0)"""
+        coef = self._rls.coef_
+        return coef[:, 1] - coef[:, 0] * (self._t0 or 0.0)
+
+
+def create_machine_series(n_series: int, n: int, seed: int = 4):
+    """
+    Sekundenwerte vieler Maschinen-Kanäle mit Trend und Trendwechsel
+
+    Returns:
+    --------
+    tuple
+        (Zeit in s, Werte Serien × n, Steigung vor und nach dem Wechsel)
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(n, dtype=np.float64)
+    before = rng.normal(0, 0.01, n_series)
+    after = before + rng.normal(0, 0.02, n_series)
+    change = n // 2
+    drift = np.where(t < change, before[:, None] * t, before[:, None] * change)
+    drift += np.where(t < change, 0.0, after[:, None] * (t - change))
+    noise = rng.normal(0, 1, (n_series, n))
+    values = rng.uniform(20, 80, (n_series, 1)) + drift + noise
+    return t, values, before, after
+
+
+def main() -> None:
+    print("=" * 60)
+    print("BYSTRONIC - LAUFENDE TREND-SCHÄTZUNG")
+    print("=" * 60)
+
+    n_series, n = 500, 3600  # 50 Maschinen × 10 Kanäle, 1 Stunde
+    t, werte, vorher, nachher = create_machine_series(n_series, n)
+
+    # 1. Alle Serien auf einmal
+    print(f"\n1️⃣ {n_series} Serien × {n} Sekunden in einem Aufruf")
+    print("-" * 50)
+    start = time.perf_counter()
+    for i in range(n_series):
+        A = np.column_stack([t, np.ones(n)])
+        np.linalg.lstsq(A, werte[i], rcond=None)
+    schleife = time.perf_counter() - start
+    start = time.perf_counter()
+    steigung, _ = linear_trends(t, werte)
+    gebuendelt = time.perf_counter() - start
+    print(f"   lstsq je Serie:  {schleife * 1000:7.1f} ms")
+    print(f"   linear_trends:   {gebuendelt * 1000:7.1f} ms")
+
+    # 2. Sekündliche Aktualisierung
+    print("\n2️⃣ Sekündliche Aktualisierung aller Serien")
+    print("-" * 50)
+    tracker = TrendTracker(n_series)
+    start = time.perf_counter()
+    for i in range(n):
+        tracker.update(t[i], werte[:, i])
+    dauer = (time.perf_counter() - start) / n
+    abweichung = np.abs(tracker.slope - steigung).max()
+    print(f"   {dauer * 1e6:.0f} µs pro Sekunde für {n_series} Serien")
+    print(f"   Max. Abweichung zur Gesamt-Regression: {abweichung:.1e}")
+    print(f"   Zum Vergleich: Neuberechnung {gebuendelt * 1e6:.0f} µs pro Sekunde")
+
+    # 3. Vergessensfaktor: Trendwechsel nach 30 Minuten
+    print("\n3️⃣ Trendwechsel nach 30 Minuten")
+    print("-" * 50)
+    for lam in (1.0, 0.995):
+        tracker = TrendTracker(n_series, forgetting=lam)
+        for i in range(n):
+            tracker.update(t[i], werte[:, i])
+        fehler = np.median(np.abs(tracker.slope - nachher))
+        print(f"   λ = {lam:<6} Median-Fehler zur neuen Steigung: {fehler:.4f}/s")
+
+    print(f"\n{'=' * 60}")
+    print("✅ Trend-Schätzung abgeschlossen!")
+
+
+if __name__ == "__main__":
+    main()
@@ -381,6 +381,33 @@ def uebung_2_6() -> None:
     print(f"   Einsparung pro Jahr: {einsparung_jahr:.1f} kWh")
     print(f"   Kosteneinsparung pro Jahr: {einsparung_kosten_jahr:.2f} €")
 
+    # g) Vom Leistungskanal zur Energie: eine Stunde POWER_001 mit 1 ms
+    # Abtastung (3.6 Mio. Werte in kW). Energie = Summe(Leistung) * dt.
+    # Blockweise für ganze Scope-Exporte: 06_datenimport/energie_lastprofil.py
+    rng = np.random.default_rng(42)
+    dt = 0.001  # s
+    leistung = 60 + 15 * np.sin(np.linspace(0, 4 * np.pi, 3_600_000))
+    leistung += rng.normal(0, 3, leistung.size)
+    leistung[1_500_000:1_560_000] += 40  # eine Minute Anlaufspitze
+
+    energie_stunde = leistung.sum() * dt / 3600  # kWs -> kWh
+    viertelstunden = leistung.reshape(4, -1).sum(axis=1) * dt / 3600
+
+    # Lastspitze: höchster gleitender 1-Minuten-Mittelwert über die Cumsum
+    fenster = 60_000
+    kumuliert = np.concatenate([[0.0], np.cumsum(leistung)])
+    minutenmittel = (kumuliert[fenster:] - kumuliert[:-fenster]) / fenster
+    spitze_ende = (np.argmax(minutenmittel) + fenster) * dt
+
+    print("\ng) Lastprofil aus 1-ms-Leistungswerten (POWER_001):")
+    print(f"   Energie der Stunde: {energie_stunde:.2f} kWh")
+    print(f"   Viertelstunden: {np.round(viertelstunden, 2)} kWh")
+    print(f"   Grundlast (5%-Quantil): {np.percentile(leistung, 5):.1f} kW")
+    print(
+        f"   Spitze (1-min-Mittel): {minutenmittel.max():.1f} kW, "
+        f"endet nach {spitze_ende / 60:.1f} min"
+    )
+
 
 def hauptprogramm() -> None:
     """Hauptprogramm - alle Übungen ausführen"""
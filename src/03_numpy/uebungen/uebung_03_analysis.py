@@ -11,8 +11,20 @@ Diese Übung behandelt statistische Datenanalyse:
 - Trend- und Musteranalyse
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
 
+# Die Beispielmodule sind kein Paket: beispiele/ wie in tests/ über sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "beispiele"))
+from hauptkomponenten import PCA  # noqa: E402
+from kmeans_clustering import MiniBatchKMeans  # noqa: E402
+from mahalanobis_scoring import MahalanobisModel  # noqa: E402
+from rollende_statistik import rolling_mean, rolling_std  # noqa: E402
+from spc_regeln import find_runs  # noqa: E402
+from trend_schaetzer import linear_trends  # noqa: E402
+
 
 def uebung_3_1() -> None:
     """Übung 3.1: Deskriptive Statistik"""
@@ -196,7 +208,8 @@ def uebung_3_3() -> None:
 
     # a) Gleitende Durchschnitte berechnen
     def gleitender_durchschnitt(daten: np.ndarray, fenster: int) -> np.ndarray:
-        return np.convolve(daten, np.ones(fenster) / fenster, mode="valid")
+        # Nur vollständige Fenster (wie np.convolve mode="valid"), in O(n)
+        return rolling_mean(daten, fenster)[fenster - 1 :]
 
     ma_7 = gleitender_durchschnitt(produktion, 7)  # 7-Tage-Durchschnitt
     ma_14 = gleitender_durchschnitt(produktion, 14)  # 14-Tage-Durchschnitt
@@ -207,8 +220,8 @@ def uebung_3_3() -> None:
 
     # b) Trend berechnen (lineare Regression)
     # y = a * x + b
-    A = np.column_stack([t, np.ones(len(t))])
-    koeffizienten = np.linalg.lstsq(A, produktion, rcond=None)[0]
+    # Geschlossene Form ohne Designmatrix (gleiches Ergebnis wie lstsq)
+    koeffizienten = linear_trends(t, produktion)
     trend_linie = koeffizienten[0] * t + koeffizienten[1]
 
     print("\nb) Trendanalyse:")
@@ -233,10 +246,7 @@ def uebung_3_3() -> None:
 
     # d) Volatilität berechnen (rollende Standardabweichung)
     def rollende_std(daten: np.ndarray, fenster: int) -> np.ndarray:
-        volatilitaet = np.zeros(len(daten) - fenster + 1)
-        for i in range(len(volatilitaet)):
-            volatilitaet[i] = np.std(daten[i : i + fenster])
-        return volatilitaet
+        return rolling_std(daten, fenster, ddof=0)[fenster - 1 :]
 
     volatilitaet_14 = rollende_std(produktion, 14)
 
@@ -342,26 +352,14 @@ def uebung_3_4() -> None:
     def trend_erkennung(
         daten: np.ndarray, referenz: float, mindest_laenge: int = 7
     ) -> list[tuple[int, int, str]]:
-        trends: list[tuple[int, int, str]] = []
-        aktuelle_serie = 0
-        letzte_seite: str | None = None
-
-        for i, wert in enumerate(daten):
-            seite = "oben" if wert > referenz else "unten"
-
-            if seite == letzte_seite:
-                aktuelle_serie += 1
-            else:
-                if aktuelle_serie >= mindest_laenge and letzte_seite is not None:
-                    trends.append((i - aktuelle_serie, i - 1, letzte_seite))
-                aktuelle_serie = 1
-                letzte_seite = seite
-
-        # Letzten Trend prüfen
-        if aktuelle_serie >= mindest_laenge and letzte_seite is not None:
-            trends.append((len(daten) - aktuelle_serie, len(daten) - 1, letzte_seite))
-
-        return trends
+        # Serien je Seite per Run-Length-Encoding statt Schleife über alle Punkte
+        oben = daten > referenz
+        trends = [
+            (int(start), int(end), seite)
+            for seite, maske in (("oben", oben), ("unten", ~oben))
+            for start, end in zip(*find_runs(maske, mindest_laenge), strict=True)
+        ]
+        return sorted(trends)
 
     trends = trend_erkennung(alle_messungen, prozess_mittel)
 
@@ -373,13 +371,9 @@ def uebung_3_4() -> None:
         print("   Keine signifikanten Trends erkannt")
 
     # e) Laufende Statistiken
-    laufender_mittel = np.zeros(len(alle_messungen))
-    laufende_std = np.zeros(len(alle_messungen))
-
-    for i in range(1, len(alle_messungen) + 1):
-        laufender_mittel[i - 1] = np.mean(alle_messungen[:i])
-        if i > 1:
-            laufende_std[i - 1] = np.std(alle_messungen[:i], ddof=1)
+    # Expandierende Fenster über kumulative Summen statt O(n²) Präfix-Schleife
+    laufender_mittel = rolling_mean(alle_messungen)
+    laufende_std = np.nan_to_num(rolling_std(alle_messungen, ddof=1))
 
     print("\ne) Laufende Statistiken:")
     print(f"   Messung 20: μ={laufender_mittel[19]:.4f}, σ={laufende_std[19]:.4f}")
@@ -455,17 +449,9 @@ def uebung_3_5() -> None:
         print()
 
     # c) Mahalanobis-Distanz für Ausreißer-Erkennung
+    # Kovarianz einmal per Cholesky zerlegen, alle Punkte als Matrixprodukt
     def mahalanobis_distanz(daten: np.ndarray) -> np.ndarray:
-        mittelwerte = np.mean(daten, axis=0)
-        kovarianz = np.cov(daten.T)
-        inv_kovarianz = np.linalg.inv(kovarianz)
-
-        distanzen = np.zeros(len(daten))
-        for i, punkt in enumerate(daten):
-            diff = punkt - mittelwerte
-            distanzen[i] = np.sqrt(diff @ inv_kovarianz @ diff)
-
-        return distanzen
+        return MahalanobisModel.fit(daten).score(daten)
 
     maha_dist = mahalanobis_distanz(maschinendaten)
 
@@ -489,16 +475,10 @@ def uebung_3_5() -> None:
         maschinendaten, axis=0, ddof=1
     )
 
-    # Kovarianzmatrix der standardisierten Daten
-    kovarianz_std = np.cov(standardisiert.T)
-
-    # Eigenwerte und Eigenvektoren
-    eigenwerte, eigenvektoren = np.linalg.eig(kovarianz_std)
-
-    # Nach Eigenwerten sortieren (absteigend)
-    sort_indices = np.argsort(eigenwerte)[::-1]
-    eigenwerte = eigenwerte[sort_indices]
-    eigenvektoren = eigenvektoren[:, sort_indices]
+    # SVD der standardisierten Daten statt eig(cov): stabiler, bereits sortiert
+    pca = PCA(standardize=True, method="full").fit(maschinendaten)
+    eigenwerte = pca.explained_variance_
+    eigenvektoren = pca.components_.T
 
     # Erklärte Varianz
     erklaerte_varianz = eigenwerte / np.sum(eigenwerte) * 100
@@ -521,34 +501,11 @@ def uebung_3_5() -> None:
     def einfaches_k_means(
         daten: np.ndarray, k: int = 3, max_iter: int = 10
     ) -> tuple[np.ndarray, np.ndarray]:
-        # Zufällige Initialisierung der Zentren
-        np.random.seed(42)
-        zentren = daten[np.random.choice(len(daten), k, replace=False)]
-
-        for _ in range(max_iter):
-            # Distanzen zu allen Zentren berechnen
-            distanzen = np.zeros((len(daten), k))
-            for i, zentrum in enumerate(zentren):
-                distanzen[:, i] = np.sqrt(np.sum((daten - zentrum) ** 2, axis=1))
-
-            # Zugehörigkeiten bestimmen
-            zugehoerigkeiten = np.argmin(distanzen, axis=1)
-
-            # Neue Zentren berechnen
-            neue_zentren = np.zeros_like(zentren)
-            for i in range(k):
-                if np.sum(zugehoerigkeiten == i) > 0:
-                    neue_zentren[i] = np.mean(daten[zugehoerigkeiten == i], axis=0)
-                else:
-                    neue_zentren[i] = zentren[i]
-
-            # Konvergenz prüfen
-            if np.allclose(zentren, neue_zentren, rtol=0.01):
-                break
-
-            zentren = neue_zentren
-
-        return zugehoerigkeiten, zentren
+        # k-means++-Start und blockweise Distanzen statt Schleife über Zentren
+        modell = MiniBatchKMeans(
+            k, batch_size=len(daten), max_iter=max_iter, random_state=42
+        ).fit(daten)
+        return modell.labels_, modell.cluster_centers_
 
     cluster_labels, cluster_zentren = einfaches_k_means(standardisiert, k=3)
 
@@ -11,9 +11,25 @@ Diese Übung behandelt lineare Algebra für technische Anwendungen:
 - Least-Squares-Probleme
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
 import numpy.linalg as la
 
+# Die Beispielmodule sind kein Paket: beispiele/ wie in tests/ über sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "beispiele"))
+from finite_elemente import (  # noqa: E402
+    STAHL,
+    condition_estimate,
+    create_fixture_mesh,
+    lowest_modes,
+    lumped_mass,
+    solve,
+    truss_stiffness,
+)
+from trend_schaetzer import RecursiveLeastSquares  # noqa: E402
+
 
 def uebung_4_1() -> None:
     """Übung 4.1: Matrix-Grundoperationen"""
@@ -564,6 +580,17 @@ def uebung_4_5() -> None:
     for f, d in zip(neue_kraft, deformation_extrapol, strict=False):
         print(f"   Bei {f:3.0f} N: {d:.2f} mm Deformation")
 
+    # g) Laufender Fit: jede neue Messung aktualisiert die Koeffizienten
+    # in O(p²), ohne die Designmatrix neu aufzubauen
+    rls = RecursiveLeastSquares(n_params=2)
+    for f, d in zip(kraft, deformation, strict=False):
+        rls.update([f, 1.0], [d])
+    koeff_rls = rls.coef_[0]
+
+    print("\ng) Rekursive kleinste Quadrate (Messung für Messung):")
+    print(f"   Koeffizienten: {koeff_rls}")
+    print(f"   Identisch mit Normalgleichungen: {np.allclose(koeff_linear, koeff_rls)}")
+
 
 def uebung_4_6() -> None:
     """Übung 4.6: Praktisches Beispiel - Finite-Elemente-Vereinfachung"""
@@ -687,6 +714,37 @@ def uebung_4_6() -> None:
     print(f"   Dehnung: {dehnung:.6f}")
     print(f"   Spannung: {spannung:.1f} N/mm²")
 
+    # g) Dasselbe für ein echtes Netz: dünnbesetzt statt dicht
+    # la.solve/la.eig auf einer dichten Matrix skalieren mit n³ - bei
+    # einer Vorrichtungsplatte mit Tausenden Knoten nicht mehr machbar
+    knoten, staebe = create_fixture_mesh(40, 40)
+    K_netz = truss_stiffness(knoten, staebe, STAHL["E"], 20.0)
+    M_netz = lumped_mass(knoten, staebe, STAHL["rho"], 20.0)
+    links = np.flatnonzero(knoten[:, 0] == 0)
+    gelagert = np.concatenate([2 * links, 2 * links + 1])
+    F_netz = np.zeros(knoten.size)
+    F_netz[2 * np.argmax(knoten[:, 0] + knoten[:, 1]) + 1] = -1000.0
+
+    u_direkt, _ = solve(K_netz, F_netz, gelagert)
+    u_iterativ, info = solve(K_netz, F_netz, gelagert, "cg", "jacobi")
+    frequenzen, _ = lowest_modes(K_netz, M_netz, k=3, fixed=gelagert)
+
+    print("\ng) Fachwerk-Platte mit dünnbesetzter Steifigkeitsmatrix:")
+    print(
+        f"   {knoten.size} Freiheitsgrade, {K_netz.nnz} von "
+        f"{knoten.size**2} Einträgen belegt"
+    )
+    print(f"   Max. Durchbiegung direkt: {u_direkt.min():.4f} mm")
+    print(
+        f"   CG + Jacobi: {info['iterations']} Iterationen, "
+        f"Abweichung {np.abs(u_iterativ - u_direkt).max():.1e} mm"
+    )
+    print(
+        f"   Konditionszahl κ₁: geschätzt {condition_estimate(K_global):.1f}, "
+        f"exakt {la.cond(K_global, 1):.1f} (6×6-Matrix oben)"
+    )
+    print(f"   Tiefste 3 Eigenfrequenzen: {np.round(frequenzen, 1)} Hz")
+
 
 def hauptprogramm() -> None:
     """Hauptprogramm - alle Übungen ausführen"""
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Aggregat-Würfel - Pivot-Tabellen ohne erneuten Scan der Rohdaten
+
+Die Auswertungen bauen immer wieder dieselben Pivot-Tabellen
+(Maschine × Schicht, Halle × Produkt, Typ × Monat, Produkt × KW) und
+lesen dafür jedes Mal die gesamte Historie.
+
+Ein Aggregat-Würfel speichert pro Kombination der Dimensionen nur
+Summen und Anzahlen der Messgrössen:
+- Summen und Anzahlen lassen sich beliebig weiter zusammenfassen
+  (Maschine × Schicht × Tag -> Maschine × Schicht)
+- Mittelwerte und Raten werden daraus abgeleitet (Summe / Anzahl,
+  kWh / Stück)
+- Neue Tagesdaten werden nur aggregiert und dazuaddiert
+
+Die Grösse des Würfels hängt von der Anzahl Kombinationen ab, nicht von
+der Anzahl Rohzeilen. Eine tägliche Aktualisierung über drei Jahre
+Historie aggregiert nur den neuen Tag.
+
+Für Bystronic-Entwickler: Tägliche Pivot-Berichte in Millisekunden
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SUM_SUFFIX = "_Summe"
+COUNT_SUFFIX = "_Anzahl"
+ROWS_COLUMN = "Zeilen"
+
+
+class AggregateCube:
+    """
+    Materialisierte Summen und Anzahlen pro Dimensions-Kombination
+
+    Parameters:
+    -----------
+    dimensions : list
+        Schlüsselspalten, z.B. ["Maschine", "Schicht", "Halle", "Produkt",
+        "Typ", "Monat", "KW"]
+    measures : list
+        Numerische Messgrössen, z.B. ["Stückzahl", "Energieverbrauch_kWh"]
+    """
+
+    def __init__(self, dimensions, measures):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.cells = None
+        self.partitions = set()
+
+    @property
+    def stat_columns(self) -> list:
+        """Spalten der Würfelzellen ausser den Dimensionen"""
+        columns = [m + SUM_SUFFIX for m in self.measures]
+        columns += [m + COUNT_SUFFIX for m in self.measures]
+        return columns + [ROWS_COLUMN]
+
+    def _aggregate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Summen und Anzahlen pro Dimensions-Kombination"""
+        grouped = df.groupby(self.dimensions, observed=True, dropna=False, sort=False)
+        sums = grouped[self.measures].sum().add_suffix(SUM_SUFFIX)
+        counts = grouped[self.measures].count().add_suffix(COUNT_SUFFIX)
+        rows = grouped.size().rename(ROWS_COLUMN)
+        return pd.concat([sums, counts, rows], axis=1).reset_index()
+
+    def update(self, df: pd.DataFrame, partition=None) -> bool:
+        """
+        Nimmt neue Rohdaten auf (z.B. einen Tag)
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Rohdaten mit allen Dimensionen und Messgrössen
+        partition : hashable, optional
+            Kennung der Daten (z.B. das Datum); bereits aufgenommene
+            Partitionen werden übersprungen
+
+        Returns:
+        --------
+        bool
+            False, wenn die Partition schon im Würfel ist
+        """
+        if partition is not None and partition in self.partitions:
+            return False
+
+        fresh = self._aggregate(df)
+        if self.cells is None:
+            self.cells = fresh
+        else:
+            # Nur die Zellen addieren - die Historie wird nicht neu gelesen
+            combined = pd.concat([self.cells, fresh], ignore_index=True)
+            self.cells = self._aggregate_cells(combined, self.dimensions)
+
+        # Erst nach erfolgreicher Aufnahme, sonst bliebe der Tag gesperrt
+        if partition is not None:
+            self.partitions.add(partition)
+        return True
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, dimensions, measures, partition_column: str = None
+    ) -> "AggregateCube":
+        """
+        Baut den Würfel in einem Durchgang über die vorhandene Historie
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Rohdaten
+        dimensions, measures : list
+            Wie beim Konstruktor
+        partition_column : str, optional
+            Spalte, deren Werte als aufgenommene Partitionen gelten
+            (z.B. "Datum"), damit spätere update()-Aufrufe Doppelte erkennen
+
+        Returns:
+        --------
+        AggregateCube
+            Gefüllter Würfel
+        """
+        cube = cls(dimensions, measures)
+        cube.update(df)
+        if partition_column is not None:
+            cube.partitions = set(df[partition_column].unique())
+        return cube
+
+    def merge(self, other: "AggregateCube") -> "AggregateCube":
+        """Führt einen Würfel mit gleichen Dimensionen und Messgrössen hinzu"""
+        if (other.dimensions, other.measures) != (self.dimensions, self.measures):
+            raise ValueError("Würfel haben unterschiedliche Dimensionen/Messgrössen")
+        if other.cells is not None:
+            if self.cells is None:
+                self.cells = other.cells.copy()
+            else:
+                combined = pd.concat([self.cells, other.cells], ignore_index=True)
+                self.cells = self._aggregate_cells(combined, self.dimensions)
+        self.partitions |= other.partitions
+        return self
+
+    def select(self, condition) -> "AggregateCube":
+        """
+        Teilwürfel mit den Zellen, die eine Bedingung auf Dimensionen erfüllen
+
+        Parameters:
+        -----------
+        condition : callable
+            Erhält die Zellen und gibt eine boolesche Maske zurück,
+            z.B. lambda cells: cells["KW"] <= 8
+
+        Returns:
+        --------
+        AggregateCube
+            Neuer Würfel (Partitionen werden nicht übernommen)
+        """
+        if self.cells is None:
+            raise ValueError("Würfel ist leer")
+        cube = AggregateCube(self.dimensions, self.measures)
+        cube.cells = self.cells[condition(self.cells)].reset_index(drop=True)
+        return cube
+
+    def _aggregate_cells(self, cells: pd.DataFrame, by: list) -> pd.DataFrame:
+        """Fasst Würfelzellen auf die Dimensionen by zusammen"""
+        grouped = cells.groupby(by, observed=True, dropna=False, sort=False)
+        return grouped[self.stat_columns].sum().reset_index()
+
+    def _check(self, values: str, keys: list):
+        if self.cells is None:
+            raise ValueError("Würfel ist leer")
+        if values not in self.measures:
+            raise KeyError(f"'{values}' ist keine Messgrösse des Würfels")
+        unknown = [k for k in keys if k not in self.dimensions]
+        if unknown:
+            raise KeyError(f"Keine Dimensionen des Würfels: {unknown}")
+
+    def _table(
+        self, values: str, suffix: str, index, columns, **kwargs
+    ) -> pd.DataFrame:
+        """Pivot einer Summen- oder Anzahlspalte über die Zellen"""
+        table = self.cells.pivot_table(
+            values=values + suffix,
+            index=index,
+            columns=columns,
+            aggfunc="sum",
+            observed=True,
+            **kwargs,
+        )
+        # Ohne Spalten-Dimension heisst die Spalte wie bei pivot_table nach
+        # der Messgrösse - Summen und Anzahlen lassen sich dann teilen
+        if columns is None:
+            table = table.rename(columns={values + suffix: values})
+        return table
+
+    def rollup(self, by) -> pd.DataFrame:
+        """
+        Summen, Anzahlen und Mittelwerte für eine gröbere Gruppierung
+
+        Parameters:
+        -----------
+        by : str or list
+            Dimensionen, nach denen gruppiert wird
+
+        Returns:
+        --------
+        pd.DataFrame
+            Je Messgrösse Summe, Anzahl und Mittelwert (wie groupby().agg())
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        self._check(self.measures[0], by)
+        table = self.cells.groupby(by, observed=True)[self.stat_columns].sum()
+        for measure in self.measures:
+            table[measure + "_Mittel"] = (
+                table[measure + SUM_SUFFIX] / table[measure + COUNT_SUFFIX]
+            )
+        return table
+
+    def pivot(
+        self,
+        values: str,
+        index,
+        columns=None,
+        aggfunc: str = "sum",
+        fill_value=None,
+        margins: bool = False,
+        margins_name: str = "All",
+    ) -> pd.DataFrame:
+        """
+        Pivot-Tabelle aus dem Würfel (wie DataFrame.pivot_table)
+
+        Parameters:
+        -----------
+        values : str
+            Messgrösse
+        index, columns : str or list
+            Dimensionen für Zeilen und Spalten
+        aggfunc : str
+            "sum", "count" (Werte ohne NaN) oder "mean"
+        fill_value : scalar, optional
+            Ersatz für leere Kombinationen
+        margins : bool
+            Zeilen- und Spaltensummen bzw. Gesamtmittelwerte anhängen
+        margins_name : str
+            Beschriftung der Randsummen
+
+        Returns:
+        --------
+        pd.DataFrame
+            Pivot-Tabelle
+        """
+        keys = [index, columns] if columns is not None else [index]
+        keys = [k for key in keys for k in ([key] if isinstance(key, str) else key)]
+        self._check(values, keys)
+        options = {"margins": margins, "margins_name": margins_name}
+
+        if aggfunc in ("sum", "count"):
+            suffix = SUM_SUFFIX if aggfunc == "sum" else COUNT_SUFFIX
+            return self._table(
+                values, suffix, index, columns, fill_value=fill_value, **options
+            )
+        if aggfunc == "mean":
+            sums = self._table(values, SUM_SUFFIX, index, columns, **options)
+            counts = self._table(values, COUNT_SUFFIX, index, columns, **options)
+            result = sums / counts.where(counts > 0)
+            return result if fill_value is None else result.fillna(fill_value)
+        raise ValueError(f"aggfunc '{aggfunc}' wird nicht unterstützt")
+
+    def ratio(
+        self, numerator: str, denominator: str, index, columns=None, fill_value=None
+    ) -> pd.DataFrame:
+        """
+        Verhältnis zweier Summen pro Zelle, z.B. kWh pro Stück
+
+        Parameters:
+        -----------
+        numerator, denominator : str
+            Messgrössen für Zähler und Nenner
+        index, columns : str or list
+            Dimensionen für Zeilen und Spalten
+        fill_value : scalar, optional
+            Ersatz für leere Kombinationen
+
+        Returns:
+        --------
+        pd.DataFrame
+            Summe(numerator) / Summe(denominator); ohne columns eine Spalte
+            "numerator/denominator"
+        """
+        top = self.pivot(numerator, index, columns)
+        bottom = self.pivot(denominator, index, columns)
+        if columns is None:
+            top = top[numerator].to_frame(f"{numerator}/{denominator}")
+            bottom = bottom[denominator].to_frame(f"{numerator}/{denominator}")
+        result = top / bottom
+        return result if fill_value is None else result.fillna(fill_value)
+
+    def save(self, path):
+        """Speichert den Würfel inklusive aufgenommener Partitionen"""
+        state = {
+            "dimensions": self.dimensions,
+            "measures": self.measures,
+            "partitions": sorted(self.partitions, key=str),
+            "cells": self.cells,
+        }
+        pd.to_pickle(state, path)
+
+    @classmethod
+    def load(cls, path) -> "AggregateCube":
+        """Lädt einen mit save() gespeicherten Würfel"""
+        state = pd.read_pickle(path)
+        cube = cls(state["dimensions"], state["measures"])
+        cube.cells = state["cells"]
+        cube.partitions = set(state["partitions"])
+        return cube
+
+
+def create_sample_production(days: int, start="2022-01-01", seed=42) -> pd.DataFrame:
+    """Produktionsdaten mit 40 Schicht-Buchungen pro Maschine und Tag"""
+    rng = np.random.default_rng(seed)
+    maschinen = pd.DataFrame(
+        {
+            "Maschine": [f"Laser_{i:02d}" for i in range(1, 13)],
+            "Halle": [f"Halle_{i % 3 + 1}" for i in range(12)],
+            "Typ": ["ByStar", "Xpert", "ByTrans", "ByStar"] * 3,
+        }
+    )
+    n_rows = days * len(maschinen) * 40
+    datum = pd.Timestamp(start) + pd.to_timedelta(
+        np.repeat(np.arange(days), n_rows // days), unit="D"
+    )
+    machine_index = rng.integers(0, len(maschinen), n_rows)
+    df = maschinen.iloc[machine_index].reset_index(drop=True)
+    df["Datum"] = datum
+    df["Schicht"] = rng.choice(["Früh", "Spät", "Nacht"], n_rows)
+    df["Produkt"] = rng.choice([f"Teil_{c}" for c in "ABCDEFGH"], n_rows)
+    df["Monat"] = datum.month
+    df["KW"] = datum.isocalendar().week.to_numpy()
+    df["Stückzahl"] = rng.integers(0, 60, n_rows)
+    df["Energieverbrauch_kWh"] = rng.gamma(4, 5, n_rows).round(2)
+    df["Ausschuss_Rate"] = rng.beta(2, 60, n_rows).round(4)
+    return df
+
+
+def main():
+    """Vergleicht pivot_table über die Historie mit dem Würfel"""
+    print("🧊 Aggregat-Würfel für Pivot-Berichte")
+    print("=" * 50)
+
+    dimensions = ["Maschine", "Schicht", "Halle", "Produkt", "Typ", "Monat", "KW"]
+    measures = ["Stückzahl", "Energieverbrauch_kWh", "Ausschuss_Rate"]
+    history = create_sample_production(days=3 * 365)
+    new_day = create_sample_production(days=1, start="2025-01-01", seed=7)
+    print(f"Historie: {len(history):,} Zeilen, neuer Tag: {len(new_day):,} Zeilen")
+
+    t0 = time.perf_counter()
+    cube = AggregateCube.from_frame(
+        history, dimensions, measures, partition_column="Datum"
+    )
+    build_seconds = time.perf_counter() - t0
+    print(f"🧊 Würfel aufgebaut: {len(cube.cells):,} Zellen in {build_seconds:.2f} s")
+
+    # Tägliche Aktualisierung: Rescan aller Daten vs. neuen Tag addieren
+    full = pd.concat([history, new_day], ignore_index=True)
+    reports = [
+        ("Stückzahl", "Maschine", "Schicht", "sum"),
+        ("Ausschuss_Rate", "Halle", "Produkt", "mean"),
+        ("Energieverbrauch_kWh", "Typ", "Monat", "sum"),
+        ("Stückzahl", "Produkt", "KW", "sum"),
+    ]
+
+    t0 = time.perf_counter()
+    expected = [
+        full.pivot_table(values=v, index=i, columns=c, aggfunc=a)
+        for v, i, c, a in reports
+    ]
+    rescan_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cube.update(new_day, partition=new_day["Datum"].iloc[0])
+    served = [cube.pivot(v, i, c, aggfunc=a) for v, i, c, a in reports]
+    cube_seconds = time.perf_counter() - t0
+
+    print(f"\n⏱️ 4 Pivots mit Rescan:       {rescan_seconds:.2f} s")
+    print(f"⏱️ Tag addieren + 4 Pivots:   {cube_seconds:.2f} s")
+    same = all(
+        np.allclose(a.to_numpy(), b.to_numpy(), equal_nan=True)
+        for a, b in zip(expected, served, strict=True)
+    )
+    print(f"Identisch zu pivot_table(): {'✅' if same else '❌'}")
+    again = cube.update(new_day, partition=new_day["Datum"].iloc[0])
+    print(f"Gleichen Tag erneut aufnehmen: {'addiert' if again else 'übersprungen'}")
+
+    print("\n⚡ Energie pro Stück (kWh) - Typ × Monat:")
+    energie = cube.ratio("Energieverbrauch_kWh", "Stückzahl", "Typ", "Monat")
+    print(energie.loc[:, :6].round(3))
+
+    path = Path("aggregat_wuerfel.pkl")
+    cube.save(path)
+    reloaded = AggregateCube.load(path)
+    print(f"\n💾 Gespeichert und geladen: {len(reloaded.partitions):,} Tage")
+    path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,10 @@ import warnings
 
 import numpy as np
 import pandas as pd
+from aggregat_wuerfel import AggregateCube
+from korrelationen import correlation_matrix, correlation_pairs
+from quantil_sketch import find_outliers_iqr
+from zeit_pyramide import RollupPyramid
 
 warnings.filterwarnings("ignore")
 
@@ -164,6 +168,12 @@ df_time_series = df_produktion.copy()
 df_time_series["Datum"] = pd.to_datetime(df_time_series["Datum"])
 df_time_series = df_time_series.set_index("Datum")
 
+# Summen, Anzahlen und Extremwerte pro Stunde/Tag/Woche einmal vorberechnen;
+# die Zeitreihen-Auswertungen lesen danach keine Rohzeilen mehr
+zeit_pyramide = RollupPyramid(
+    ["Produktionszeit", "Stückzahl", "Ausschuss_Rate", "Energieverbrauch"]
+).update(df_time_series)
+
 # 2. Grundlegende Aggregationen
 print("\n2️⃣ Grundlegende Aggregationen")
 print("-" * 40)
@@ -251,28 +261,32 @@ print(weekly_trends.head(10))
 print("\n5️⃣ Pivot-Tabellen für komplexe Analysen")
 print("-" * 40)
 
+# Summen und Anzahlen einmal pro Dimensions-Kombination; alle Pivots
+# werden aus diesem Würfel statt aus den Rohdaten berechnet
+df_produktion["Energie_pro_Stück"] = (
+    df_produktion["Energieverbrauch"] / df_produktion["Stückzahl"]
+)
+produktions_wuerfel = AggregateCube.from_frame(
+    df_produktion,
+    dimensions=["Maschine", "Schicht", "Halle", "Produkt", "Typ"],
+    measures=["Produktionszeit", "Ausschuss_Rate", "Energie_pro_Stück"],
+)
+
 print("📋 Produktionszeit: Maschine × Schicht:")
-pivot_prod = df_produktion.pivot_table(
-    values="Produktionszeit",
-    index="Maschine",
-    columns="Schicht",
-    aggfunc="sum",
-    fill_value=0,
+pivot_prod = produktions_wuerfel.pivot(
+    "Produktionszeit", index="Maschine", columns="Schicht", fill_value=0
 ).round(2)
 print(pivot_prod)
 
 print("\n📋 Ausschussrate: Halle × Produkt:")
-pivot_ausschuss = df_produktion.pivot_table(
-    values="Ausschuss_Rate", index="Halle", columns="Produkt", aggfunc="mean"
+pivot_ausschuss = produktions_wuerfel.pivot(
+    "Ausschuss_Rate", index="Halle", columns="Produkt", aggfunc="mean"
 ).round(4)
 print(pivot_ausschuss)
 
 print("\n📋 Energieeffizienz (kWh pro Stück):")
-df_produktion["Energie_pro_Stück"] = (
-    df_produktion["Energieverbrauch"] / df_produktion["Stückzahl"]
-)
-pivot_effizienz = df_produktion.pivot_table(
-    values="Energie_pro_Stück", index="Typ", columns="Produkt", aggfunc="mean"
+pivot_effizienz = produktions_wuerfel.pivot(
+    "Energie_pro_Stück", index="Typ", columns="Produkt", aggfunc="mean"
 ).round(3)
 print(pivot_effizienz)
 
@@ -282,39 +296,36 @@ print("-" * 40)
 
 print("📈 Tägliche Produktionstrends:")
 daily_production = (
-    df_time_series.groupby(df_time_series.index.date)
-    .agg({"Produktionszeit": "sum", "Stückzahl": "sum", "Ausschuss_Rate": "mean"})
+    zeit_pyramide.query(
+        "D", {"Produktionszeit": "sum", "Stückzahl": "sum", "Ausschuss_Rate": "mean"}
+    )
+    .rename_axis(None)
     .round(2)
 )
 print(daily_production.head(10))
 
 print("\n📊 Wöchentliche Aggregate (Resampling):")
-weekly_resample = (
-    df_time_series.resample("W")
-    .agg(
-        {
-            "Produktionszeit": "sum",
-            "Stückzahl": "sum",
-            "Ausschuss_Rate": "mean",
-            "Energieverbrauch": "sum",
-        }
-    )
-    .round(2)
-)
+weekly_resample = zeit_pyramide.query(
+    "W",
+    {
+        "Produktionszeit": "sum",
+        "Stückzahl": "sum",
+        "Ausschuss_Rate": "mean",
+        "Energieverbrauch": "sum",
+    },
+).round(2)
 print(weekly_resample.head())
 
 print("\n📅 Monatliche Trends:")
-monthly_trends = (
-    df_time_series.resample("M")
-    .agg({"Produktionszeit": "sum", "Stückzahl": "sum", "Ausschuss_Rate": "mean"})
-    .round(2)
-)
+monthly_trends = zeit_pyramide.query(
+    "ME", {"Produktionszeit": "sum", "Stückzahl": "sum", "Ausschuss_Rate": "mean"}
+).round(2)
 print(monthly_trends)
 
 # Rolling Windows für gleitende Durchschnitte
 print("\n📈 Gleitender 7-Tage Durchschnitt:")
-daily_agg = df_time_series.groupby(df_time_series.index.date)["Produktionszeit"].sum()
-daily_agg.index = pd.to_datetime(daily_agg.index)
+daily_agg = zeit_pyramide.query("D", {"Produktionszeit": "sum"})["Produktionszeit"]
+daily_agg = daily_agg.rename_axis(None)
 rolling_avg = daily_agg.rolling(window=7, center=True).mean().round(2)
 print(rolling_avg.head(10))
 
@@ -379,26 +390,14 @@ numeric_cols = [
     "Temperatur",
     "Energieverbrauch",
 ]
-correlation_matrix = df_produktion[numeric_cols].corr().round(3)
-print(correlation_matrix)
+corr_matrix = correlation_matrix(df_produktion, numeric_cols).round(3)
+print(corr_matrix)
 
-# Starke Korrelationen finden
+# Starke Korrelationen finden (oberes Dreieck, vektorisiert)
 print("\n🔍 Starke Korrelationen (|r| > 0.5):")
-strong_corr = []
-for i in range(len(correlation_matrix.columns)):
-    for j in range(i + 1, len(correlation_matrix.columns)):
-        corr_value = correlation_matrix.iloc[i, j]
-        if abs(corr_value) > 0.5:
-            strong_corr.append(
-                {
-                    "Variable_1": correlation_matrix.columns[i],
-                    "Variable_2": correlation_matrix.columns[j],
-                    "Korrelation": corr_value,
-                }
-            )
-
-if strong_corr:
-    df_strong_corr = pd.DataFrame(strong_corr)
+df_strong_corr = correlation_pairs(corr_matrix, threshold=0.5)
+
+if not df_strong_corr.empty:
     print(df_strong_corr)
 else:
     print("Keine starken Korrelationen gefunden")
@@ -408,18 +407,6 @@ print("\n9️⃣ Outlier-Analyse")
 print("-" * 40)
 
 
-def find_outliers_iqr(df, column):
-    """Findet Outliers mit der IQR-Methode"""
-    Q1 = df[column].quantile(0.25)
-    Q3 = df[column].quantile(0.75)
-    IQR = Q3 - Q1
-    lower_bound = Q1 - 1.5 * IQR
-    upper_bound = Q3 + 1.5 * IQR
-
-    outliers = df[(df[column] < lower_bound) | (df[column] > upper_bound)]
-    return outliers, lower_bound, upper_bound
-
-
 print("🚨 Ausreisser-Analyse für Produktionszeit:")
 outliers_prod, lower_prod, upper_prod = find_outliers_iqr(
     df_produktion, "Produktionszeit"
@@ -474,11 +461,10 @@ print("\n1️⃣1️⃣ Trendanalyse")
 print("-" * 40)
 
 print("📈 Monatliche Entwicklung:")
-monthly_dev = (
-    df_time_series.groupby(df_time_series.index.to_period("M"))
-    .agg({"Produktionszeit": "sum", "Ausschuss_Rate": "mean"})
-    .round(2)
-)
+monthly_dev = zeit_pyramide.query(
+    "ME", {"Produktionszeit": "sum", "Ausschuss_Rate": "mean"}
+).round(2)
+monthly_dev.index = monthly_dev.index.to_period("M")
 
 # Prozentuale Veränderung berechnen
 monthly_dev["Prod_Change_%"] = monthly_dev["Produktionszeit"].pct_change() * 100
@@ -17,6 +17,8 @@ from datetime import datetime
 
 import numpy as np
 import pandas as pd
+from datums_parser import parse_dates
+from quantil_sketch import ColumnSketches
 
 warnings.filterwarnings("ignore")
 
@@ -171,23 +173,11 @@ print("-" * 40)
 print("Datum-Konvertierung:")
 df_clean["Datum_Original"] = df_clean["Datum"].copy()
 
-
-# Verschiedene Datumsformate versuchen
-def parse_date_flexible(date_str):
-    """Flexibles Datum-Parsing für verschiedene Formate"""
-    if pd.isna(date_str):
-        return np.nan
-
-    formats = ["%Y-%m-%d", "%d.%m.%Y", "%Y/%m/%d"]
-    for fmt in formats:
-        try:
-            return pd.to_datetime(date_str, format=fmt)
-        except (ValueError, TypeError):
-            continue
-    return np.nan
-
-
-df_clean["Datum"] = df_clean["Datum"].apply(parse_date_flexible)
+# Verschiedene Datumsformate vektorisiert versuchen (siehe datums_parser.py)
+df_clean["Datum"], datum_stats = parse_dates(
+    df_clean["Datum"], formats=["%Y-%m-%d", "%d.%m.%Y", "%Y/%m/%d"], fallback=False
+)
+print(f"Formate: {datum_stats['per_format']}")
 print(f"Erfolgreich konvertierte Daten: {df_clean['Datum'].notna().sum()}")
 print(f"Fehlgeschlagene Konvertierungen: {df_clean['Datum'].isna().sum()}")
 
@@ -204,31 +194,28 @@ print("\n5️⃣ Ausreisser-Behandlung")
 print("-" * 40)
 
 # Statistische Analyse der numerischen Spalten
-numeric_cols = ["Temperatur", "Produktionszeit"]
-
-for col in numeric_cols:
-    if col in df_clean.columns:
-        print(f"\n{col} - Statistische Übersicht:")
-        print(df_clean[col].describe())
+numeric_cols = [c for c in ["Temperatur", "Produktionszeit"] if c in df_clean.columns]
 
-        # Quartilsabstände-Methode (IQR)
-        Q1 = df_clean[col].quantile(0.25)
-        Q3 = df_clean[col].quantile(0.75)
-        IQR = Q3 - Q1
+# Quartilsabstände-Methode (IQR): Quantil-Sketches für alle Spalten in
+# einem Durchlauf, danach eine Ausreisser-Maske pro Spalte
+sketches = ColumnSketches(numeric_cols).update(df_clean)
+iqr_bounds = sketches.bounds()
+outlier_masks = sketches.outlier_mask(df_clean)
 
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
+for col in numeric_cols:
+    print(f"\n{col} - Statistische Übersicht:")
+    print(df_clean[col].describe())
 
-        outliers = df_clean[
-            (df_clean[col] < lower_bound) | (df_clean[col] > upper_bound)
-        ]
+    lower_bound = iqr_bounds.loc[col, "Untergrenze"]
+    upper_bound = iqr_bounds.loc[col, "Obergrenze"]
+    outliers = df_clean[outlier_masks[col]]
 
-        print(f"Ausreisser-Grenzen: {lower_bound:.2f} bis {upper_bound:.2f}")
-        print(f"Gefundene Ausreisser: {len(outliers)}")
+    print(f"Ausreisser-Grenzen: {lower_bound:.2f} bis {upper_bound:.2f}")
+    print(f"Gefundene Ausreisser: {len(outliers)}")
 
-        if not outliers.empty:
-            print("Ausreisser-Werte:")
-            print(outliers[[col]].dropna())
+    if not outliers.empty:
+        print("Ausreisser-Werte:")
+        print(outliers[[col]].dropna())
 
 # Geschäftslogik-basierte Bereinigung
 print("\nGeschäftslogik-basierte Bereinigung:")
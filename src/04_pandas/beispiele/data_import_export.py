@@ -7,6 +7,7 @@ Dieses Beispiel demonstriert verschiedene Import/Export-Möglichkeiten:
 - Excel-Dateien verarbeiten
 - JSON-Daten handhaben
 - Verschiedene Formatierungsoptionen
+- Spaltenorientierte Formate (Parquet, Feather)
 
 Für Bystronic-Entwickler: Alternativen zu Excel-VBA für Datenverarbeitung
 """
@@ -404,6 +405,51 @@ export_df.to_csv(
 )
 print(f"✅ Formatierte CSV-Datei exportiert: {export_csv}")
 
+# 10. Spaltenorientierte Formate: Parquet und Feather
+print("\n🔟 Parquet und Feather")
+print("-" * 40)
+
+try:
+    # Datum als Zeitstempel speichern, damit Zeitfilter funktionieren
+    df_spalten = df_produktion.assign(Datum=pd.to_datetime(df_produktion["Datum"]))
+    df_spalten = df_spalten.sort_values(["Maschine", "Datum"])
+
+    parquet_datei = "data/generated/produktionsdaten.parquet"
+    df_spalten.to_parquet(
+        parquet_datei,
+        index=False,
+        compression="zstd",  # Komprimierung pro Spalte
+        row_group_size=100,  # Row-Groups mit eigenen Min/Max-Statistiken
+    )
+    print(f"✅ Parquet exportiert: {Path(parquet_datei).stat().st_size / 1024:.1f} KB")
+    print(f"   (CSV: {Path(csv_datei).stat().st_size / 1024:.1f} KB)")
+
+    # Nur benötigte Spalten und Zeilen lesen (Projection + Pushdown)
+    df_laser = pd.read_parquet(
+        parquet_datei,
+        columns=["Datum", "Maschine", "Stückzahl"],
+        filters=[
+            ("Maschine", "==", "Laser_01"),
+            ("Datum", ">=", pd.Timestamp("2024-01-10")),
+        ],
+    )
+    print(f"Gefiltert gelesen: {len(df_laser)} Zeilen, {len(df_laser.columns)} Spalten")
+    print("Datentypen bleiben erhalten:")
+    print(df_laser.dtypes)
+
+    # Feather: schnelles Zwischenformat für lokale Verarbeitung
+    feather_datei = "data/generated/produktionsdaten.feather"
+    df_spalten.reset_index(drop=True).to_feather(feather_datei, compression="lz4")
+    df_feather = pd.read_feather(feather_datei, columns=["Maschine", "Temperatur"])
+    print(f"✅ Feather geschrieben und {len(df_feather.columns)} Spalten gelesen")
+
+    # Binärdateien nur für die Demo - wieder entfernen
+    Path(parquet_datei).unlink()
+    Path(feather_datei).unlink()
+
+except ImportError:
+    print("⚠️ pyarrow nicht installiert - Parquet/Feather übersprungen")
+
 # Aufräumen - Temporäre Dateien löschen (optional)
 temp_files = [
     "data/generated/produktionsdaten.csv",
@@ -428,6 +474,7 @@ print("✅ Datenbereinigung beim Import")
 print("✅ Chunked Reading für grosse Dateien")
 print("✅ Datenvalidierung implementieren")
 print("✅ Formatierter Export für verschiedene Systeme")
+print("✅ Parquet/Feather mit Spaltenauswahl und Filtern")
 print("\n💡 Als Bystronic-Entwickler können Sie jetzt alle gängigen")
 print("   Datenformate effizient mit Pandas verarbeiten!")
 print("   Nächster Schritt: Datenbereinigung und -validierung")
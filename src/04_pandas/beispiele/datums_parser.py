@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Vektorisierter Datums-Parser für gemischte Formate
+
+MES-Exporte enthalten Datumswerte in mehreren Formaten ("2024-01-15",
+"15.01.2024", "2024/01/15 08:30", ...). Der klassische Weg über
+.apply() mit try/except pro Zeile ist auf Millionen Zeilen sehr langsam.
+
+Dieser Parser arbeitet spaltenweise:
+1. Nur eindeutige Werte parsen (Zeitstempel wiederholen sich stark)
+2. Jedes Format vektorisiert auf den noch ungeparsten Rest anwenden
+3. Ergebnis über die Faktorisierungs-Codes auf alle Zeilen zurückverteilen
+
+Für Bystronic-Entwickler: Ersetzt zeilenweise Parser-Funktionen
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+# Reihenfolge = Priorität bei mehrdeutigen Werten
+DEFAULT_DATE_FORMATS = [
+    "%Y-%m-%d",  # 2024-01-01
+    "%d.%m.%Y",  # 01.01.2024
+    "%Y/%m/%d",  # 2024/01/01
+    "%m-%d-%Y",  # 01-01-2024
+    "%Y-%m-%d %H:%M:%S",  # Mit Zeit
+    "%d.%m.%Y %H:%M",  # Deutsches Format mit Zeit
+]
+
+DEFAULT_NULL_VALUES = ["", "invalid_date", "NULL", "nan", "NaN", "None"]
+
+
+def parse_dates(
+    series: pd.Series,
+    formats: list[str] = None,
+    null_values: list[str] = None,
+    fallback: bool = True,
+) -> tuple[pd.Series, dict]:
+    """
+    Parst eine Spalte mit gemischten Datumsformaten
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Rohwerte (Strings, Timestamps oder NaN)
+    formats : list, optional
+        strftime-Formate in Prioritätsreihenfolge (Standard:
+        DEFAULT_DATE_FORMATS)
+    null_values : list, optional
+        Werte, die als fehlend gelten (Standard: DEFAULT_NULL_VALUES)
+    fallback : bool
+        Nicht passende Werte zuletzt mit dem automatischen Parser von
+        pandas versuchen
+
+    Returns:
+    --------
+    tuple
+        (datetime64-Series mit NaT für ungültige Werte, Statistik-Dict mit
+        total, null, parsed, failed, unique, per_format, seconds)
+    """
+    start = time.perf_counter()
+    formats = DEFAULT_DATE_FORMATS if formats is None else formats
+    null_values = DEFAULT_NULL_VALUES if null_values is None else null_values
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        stats = {
+            "total": len(series),
+            "null": int(series.isna().sum()),
+            "parsed": int(series.notna().sum()),
+            "failed": 0,
+            "unique": int(series.nunique()),
+            "per_format": {"datetime": int(series.notna().sum())},
+            "seconds": time.perf_counter() - start,
+        }
+        return series, stats
+
+    # Eindeutige Werte einmal bestimmen; NaN bekommt Code -1
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    unique_str = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    is_null = unique_str.isin(null_values).to_numpy()
+
+    parsed = np.full(len(uniques), np.datetime64("NaT"), dtype="datetime64[ns]")
+    source = np.full(len(uniques), -1, dtype=np.int64)
+    remaining = ~is_null
+
+    labels = list(formats) + (["fallback"] if fallback else [])
+    for i, fmt in enumerate(labels):
+        if not remaining.any():
+            break
+        candidates = unique_str[remaining]
+        # utc=True: gemischte Offsets bzw. mit/ohne Zeitzone ergeben sonst
+        # object-Werte; Angaben mit Zeitzone werden zu UTC ohne Zeitzone
+        fmt_arg = "mixed" if fmt == "fallback" else fmt
+        result = pd.to_datetime(candidates, errors="coerce", format=fmt_arg, utc=True)
+        result = result.dt.tz_convert(None)
+        hit = result.notna().to_numpy()
+
+        index = np.flatnonzero(remaining)[hit]
+        parsed[index] = result.to_numpy(dtype="datetime64[ns]")[hit]
+        source[index] = i
+        remaining[index] = False
+
+    # Zurückverteilen: Code -1 (NaN) greift auf das angehängte NaT zu
+    values = np.append(parsed, np.datetime64("NaT", "ns"))[codes]
+    out = pd.Series(values, index=series.index, name=series.name)
+
+    # Zeilen pro Format zählen (Gewichtung der eindeutigen Werte)
+    row_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    per_format = {
+        label: int(row_counts[source == i].sum())
+        for i, label in enumerate(labels)
+        if (source == i).any()
+    }
+    n_null = int((codes < 0).sum() + row_counts[is_null].sum())
+    n_parsed = int(out.notna().sum())
+
+    stats = {
+        "total": len(series),
+        "null": n_null,
+        "parsed": n_parsed,
+        "failed": len(series) - n_null - n_parsed,
+        "unique": len(uniques),
+        "per_format": per_format,
+        "seconds": time.perf_counter() - start,
+    }
+    return out, stats
+
+
+def main():
+    """Vergleicht den vektorisierten Parser mit zeilenweisem .apply()"""
+    print("📅 Vektorisierter Datums-Parser")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    base = pd.date_range("2024-01-01", periods=5000, freq="37min")
+    varianten = np.concatenate(
+        [
+            base.strftime("%Y-%m-%d %H:%M:%S"),
+            base.strftime("%d.%m.%Y %H:%M"),
+            base.normalize().unique().strftime("%d.%m.%Y"),
+            ["invalid_date", "NULL", "", "31.02.2024"],
+        ]
+    )
+    n_rows = 1_000_000
+    roh = pd.Series(rng.choice(varianten, n_rows), name="Timestamp")
+
+    ergebnis, stats = parse_dates(roh)
+    print(f"Zeilen:           {stats['total']:,}")
+    print(f"Eindeutige Werte: {stats['unique']:,}")
+    print(f"Geparst:          {stats['parsed']:,}")
+    print(f"Fehlend:          {stats['null']:,}")
+    print(f"Ungültig:         {stats['failed']:,}")
+    print("Pro Format:")
+    for fmt, count in stats["per_format"].items():
+        print(f"  {fmt:<20} {count:>10,}")
+
+    # Zeilenweise Referenz auf einer Stichprobe messen und hochrechnen
+    def zeilenweise(date_str):
+        for fmt in DEFAULT_DATE_FORMATS:
+            try:
+                return pd.to_datetime(date_str, format=fmt)
+            except (ValueError, TypeError):
+                continue
+        return pd.NaT
+
+    sample = roh.head(5000)
+    t0 = time.perf_counter()
+    sample.apply(zeilenweise)
+    apply_seconds = (time.perf_counter() - t0) * n_rows / len(sample)
+
+    print(f"\n⏱️ Vektorisiert: {stats['seconds']:.2f} s")
+    print(f"⏱️ .apply (hochgerechnet): {apply_seconds:.1f} s")
+    print(f"🚀 Faktor: {apply_seconds / stats['seconds']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
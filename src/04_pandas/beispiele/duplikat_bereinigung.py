@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Quasi-Duplikate in Zeitreihen entfernen - vektorisiert
+
+Quasi-Duplikate sind Messungen derselben Maschine, die innerhalb eines
+kurzen Zeitfensters nach der letzten behaltenen Messung eintreffen.
+Die Regel ist gierig: Die erste Messung wird behalten, jede weitere nur,
+wenn sie mindestens das Zeitfenster nach der zuletzt behaltenen liegt.
+
+Weil jede Entscheidung von der vorherigen abhängt, wird dafür meist
+zeilenweise mit iterrows() iteriert. Hier wird die Kette stattdessen mit
+NumPy berechnet:
+1. Einmal nach (Schlüssel, Zeit) sortieren
+2. Für jede Zeile per searchsorted den Nachfolger bestimmen: die erste
+   Zeile derselben Gruppe, die mindestens ein Zeitfenster später liegt
+3. Die behaltenen Zeilen sind die Kette Start -> Nachfolger -> ... jeder
+   Gruppe. Sie wird mit Pointer-Doubling in O(n log n) für alle Gruppen
+   gleichzeitig ermittelt.
+
+Für Bystronic-Entwickler: Sekunden statt Minuten für eine Woche 1-Hz-Telemetrie
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def greedy_window_mask(
+    times: np.ndarray, group_starts: np.ndarray, window: int
+) -> np.ndarray:
+    """
+    Gierige Zeitfenster-Auswahl auf sortierten Zeiten
+
+    Parameters:
+    -----------
+    times : np.ndarray
+        int64-Zeiten, innerhalb jeder Gruppe aufsteigend sortiert
+    group_starts : np.ndarray
+        Startposition jeder Gruppe (aufsteigend, beginnt mit 0)
+    window : int
+        Mindestabstand zur zuletzt behaltenen Zeile (gleiche Einheit wie
+        times)
+
+    Returns:
+    --------
+    np.ndarray
+        Boolesche Maske der behaltenen Zeilen
+    """
+    n = len(times)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+
+    # Nachfolger jeder Zeile innerhalb ihrer Gruppe; n = kein Nachfolger
+    successor = np.empty(n + 1, dtype=np.int64)
+    successor[n] = n
+    group_ends = np.append(group_starts[1:], n)
+    for start, end in zip(group_starts, group_ends, strict=True):
+        segment = times[start:end]
+        target = np.searchsorted(segment, segment + window, side="left") + start
+        target[target >= end] = n
+        successor[start:end] = target
+
+    # Pointer-Doubling: Nach Stufe k enthält chain alle Glieder mit
+    # Abstand < 2^k vom Gruppenstart
+    chain = group_starts.astype(np.int64)
+    jump = successor
+    while True:
+        reached = jump[chain]
+        reached = reached[reached < n]
+        if len(reached) == 0:
+            break
+        chain = np.concatenate([chain, reached])
+        jump = jump[jump]
+
+    keep[chain] = True
+    return keep
+
+
+def remove_quasi_duplicates(
+    df: pd.DataFrame,
+    time_window_minutes: float = 1,
+    keys: list[str] = None,
+    time_column: str = "Timestamp",
+) -> tuple[pd.DataFrame, int]:
+    """
+    Entfernt Quasi-Duplikate innerhalb eines Zeitfensters pro Gruppe
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Messdaten
+    time_window_minutes : float
+        Mindestabstand zur zuletzt behaltenen Messung derselben Gruppe
+    keys : list, optional
+        Gruppierungsspalten (Standard: ["Maschine"])
+    time_column : str
+        Zeitspalte
+
+    Returns:
+    --------
+    tuple
+        (bereinigter DataFrame, Anzahl entfernter Zeilen)
+
+    Zeilen ohne Zeitstempel werden immer behalten, Zeilen mit fehlendem
+    Schlüssel entfernt. Das Ergebnis ist nach Schlüssel und Zeit sortiert
+    und neu indiziert.
+    """
+    keys = ["Maschine"] if keys is None else list(keys)
+    if df[time_column].isna().all():
+        return df, 0
+
+    # Einmal sortieren: Schlüssel-Codes und Zeit, fehlende Werte jeweils zuletzt
+    # (entspricht df.sort_values(keys + [time_column]), stabil)
+    key_codes, valid_key = [], np.ones(len(df), dtype=bool)
+    for key in keys:
+        codes, uniques = pd.factorize(df[key], sort=True)
+        valid_key &= codes >= 0
+        key_codes.append(np.where(codes < 0, len(uniques), codes))
+    raw_times = df[time_column].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    has_time = raw_times != np.iinfo(np.int64).min  # NaT
+    sort_times = np.where(has_time, raw_times, np.iinfo(np.int64).max)
+
+    order = np.lexsort([sort_times] + key_codes[::-1])
+    df_sorted = df.take(order).reset_index(drop=True)
+    key_codes = [codes[order] for codes in key_codes]
+    valid_key = valid_key[order]
+    has_time = has_time[order]
+    times = raw_times[order]
+
+    # Kette nur über Zeilen mit Schlüssel und Zeit bilden
+    chain_rows = np.flatnonzero(valid_key & has_time)
+    changed = np.zeros(len(chain_rows), dtype=bool)
+    for codes in key_codes:
+        changed |= np.diff(codes[chain_rows], prepend=-1) != 0
+    group_starts = np.flatnonzero(changed)
+
+    window = int(pd.Timedelta(minutes=time_window_minutes).value)
+    keep = valid_key & ~has_time
+    keep[chain_rows] = greedy_window_mask(times[chain_rows], group_starts, window)
+
+    df_cleaned = df_sorted[keep].copy()
+    return df_cleaned, len(df_sorted) - len(df_cleaned)
+
+
+def main():
+    """Entfernt Quasi-Duplikate aus einer Woche 1-Hz-Telemetrie"""
+    print("🔁 Quasi-Duplikate entfernen (vektorisiert)")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    n_machines = 8
+    seconds = 7 * 24 * 3600
+    start = pd.Timestamp("2024-01-01")
+
+    frames = []
+    for i in range(n_machines):
+        # 1 Hz mit zufälligen Aussetzern (10 % fehlende Sekunden)
+        offsets = np.sort(rng.choice(seconds, size=int(seconds * 0.9), replace=False))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Maschine": f"Laser_{i + 1:02d}",
+                    "Timestamp": start + pd.to_timedelta(offsets, unit="s"),
+                    "Leistung_kW": rng.gamma(4, 2.5, len(offsets)),
+                }
+            )
+        )
+    df = pd.concat(frames, ignore_index=True).sample(frac=1, random_state=1)
+
+    t0 = time.perf_counter()
+    df_clean, removed = remove_quasi_duplicates(df, time_window_minutes=1)
+    seconds_needed = time.perf_counter() - t0
+
+    print(f"Zeilen:      {len(df):,}")
+    print(f"Behalten:    {len(df_clean):,}")
+    print(f"Entfernt:    {removed:,}")
+    print(f"⏱️ Laufzeit: {seconds_needed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
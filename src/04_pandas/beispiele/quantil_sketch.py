@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Quantil-Sketches für die IQR-Ausreissererkennung auf grossen Datenmengen
+
+Die IQR-Methode braucht Q1 und Q3. Exakt berechnet muss dafür die ganze
+Spalte im Speicher liegen und sortiert werden - bei mehreren GB
+Telemetrie pro Spalte und Maschine nicht machbar.
+
+Ein KLL-Sketch (Karnin, Lang, Liberty) fasst einen Datenstrom in wenigen
+tausend gewichteten Stützwerten zusammen:
+- Ebene h enthält Werte mit Gewicht 2^h
+- Läuft eine Ebene über, wird sie sortiert und jeder zweite Wert steigt
+  mit doppeltem Gewicht eine Ebene auf
+- Der Speicherbedarf bleibt fix (ca. 3·k Werte), der Rangfehler liegt bei
+  etwa 1/k, unabhängig von der Datenmenge
+- Sketches lassen sich zusammenführen (merge): Chunks, Dateien oder
+  Prozesse können getrennt gesketcht und danach kombiniert werden
+
+Bis etwa 3·k Werte muss ein Sketch nicht verdichten; seine Quantile sind
+dann exakt und identisch zu pandas' quantile().
+
+Ablauf für Ausreisser: 1. Durchlauf baut die Sketches (pro Spalte und
+Gruppe), 2. Durchlauf markiert Ausreisser chunkweise mit den Grenzen.
+
+Für Bystronic-Entwickler: IQR-Grenzen über Millionen Zeilen pro Maschine
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_K = 1000  # Genauigkeit: Rangfehler ca. 1/k, Speicher ca. 3·k Werte
+
+
+class QuantileSketch:
+    """
+    Zusammenführbarer KLL-Quantil-Sketch für einen Zahlenstrom
+
+    Parameters:
+    -----------
+    k : int
+        Kapazität der obersten Ebene (Genauigkeit vs. Speicher)
+    seed : int
+        Startwert für die zufällige Auswahl beim Verdichten
+    """
+
+    C = 2 / 3  # Kapazitätsfaktor zwischen benachbarten Ebenen
+
+    def __init__(self, k: int = DEFAULT_K, seed: int = 42):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return int(np.ceil(self.k * self.C**depth)) + 1
+
+    @property
+    def size(self) -> int:
+        """Anzahl gespeicherter Stützwerte"""
+        return sum(len(level) for level in self.levels)
+
+    @property
+    def max_size(self) -> int:
+        """Gesamtkapazität; mindestens 3·k, damit kleine Ströme exakt bleiben"""
+        capacity = sum(self._capacity(h) for h in range(len(self.levels)))
+        return max(capacity, int(self.k / (1 - self.C)))
+
+    @property
+    def is_exact(self) -> bool:
+        """True, solange noch nie verdichtet wurde"""
+        return len(self.levels) == 1
+
+    def _compress(self):
+        """Verdichtet übervolle Ebenen, bis die Gesamtkapazität eingehalten ist"""
+        while self.size >= self.max_size:
+            for h, items in enumerate(self.levels):
+                if len(items) < self._capacity(h):
+                    continue
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+
+                items = np.sort(items)
+                # Bei ungerader Anzahl bleibt ein Wert auf dieser Ebene
+                keep = items[:0] if len(items) % 2 == 0 else items[-1:]
+                items = items[: len(items) - len(keep)]
+                offset = int(self.rng.integers(2))
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate(
+                    [self.levels[h + 1], items[offset::2]]
+                )
+                break
+
+    def update(self, values) -> "QuantileSketch":
+        """Fügt Werte hinzu (NaN wird ignoriert)"""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Übernimmt die Werte eines anderen Sketches (z.B. aus einem Worker)"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """
+        Geschätzte Quantile
+
+        Parameters:
+        -----------
+        q : float or array-like
+            Wahrscheinlichkeiten zwischen 0 und 1
+
+        Returns:
+        --------
+        float or np.ndarray
+            Quantile (NaN für einen leeren Sketch); exakt mit linearer
+            Interpolation wie pandas, solange is_exact gilt
+        """
+        q_arr = np.asarray(q, dtype=float)
+        if self.count == 0:
+            result = np.full(q_arr.shape, np.nan)
+        elif self.is_exact:
+            result = np.quantile(self.levels[0], q_arr)
+        else:
+            values = np.concatenate(self.levels)
+            weights = np.concatenate(
+                [np.full(len(items), 2.0**h) for h, items in enumerate(self.levels)]
+            )
+            order = np.argsort(values, kind="stable")
+            values, weights = values[order], weights[order]
+            # Jeder Stützwert steht für die Mitte seines Gewichtsbereichs
+            ranks = (np.cumsum(weights) - weights / 2) / weights.sum()
+            result = np.interp(q_arr, ranks, values, left=self.min, right=self.max)
+        return float(result) if np.ndim(result) == 0 else result
+
+
+def iqr_bounds(q1: float, q3: float, factor: float = 1.5) -> tuple[float, float]:
+    """Ausreisser-Grenzen Q1 - factor·IQR und Q3 + factor·IQR"""
+    iqr = q3 - q1
+    return q1 - factor * iqr, q3 + factor * iqr
+
+
+class ColumnSketches:
+    """
+    Quantil-Sketches pro Spalte und optional pro Gruppe (z.B. Maschine)
+
+    Parameters:
+    -----------
+    columns : list
+        Numerische Spalten
+    by : str or list, optional
+        Gruppierungsspalte(n); ohne by gibt es einen Sketch pro Spalte
+    k, seed :
+        Parameter der einzelnen QuantileSketch-Objekte
+    """
+
+    def __init__(self, columns, by=None, k: int = DEFAULT_K, seed: int = 42):
+        self.columns = [columns] if isinstance(columns, str) else list(columns)
+        self.by = [by] if isinstance(by, str) else (list(by) if by else None)
+        self.k = k
+        self.seed = seed
+        self.sketches = {}  # (Gruppe, Spalte) -> QuantileSketch
+
+    def _sketch(self, group, column) -> QuantileSketch:
+        key = (group, column)
+        if key not in self.sketches:
+            self.sketches[key] = QuantileSketch(self.k, self.seed)
+        return self.sketches[key]
+
+    def update(self, df: pd.DataFrame) -> "ColumnSketches":
+        """Nimmt einen Chunk auf"""
+        if self.by is None:
+            for column in self.columns:
+                self._sketch(None, column).update(self._values(df[column]))
+            return self
+
+        keys = self.by[0] if len(self.by) == 1 else self.by
+        for group, part in df.groupby(keys, observed=True, sort=False):
+            for column in self.columns:
+                self._sketch(group, column).update(self._values(part[column]))
+        return self
+
+    @staticmethod
+    def _values(series: pd.Series) -> np.ndarray:
+        return series.to_numpy(dtype=float, na_value=np.nan)
+
+    def merge(self, other: "ColumnSketches") -> "ColumnSketches":
+        """Führt die Sketches eines anderen Objekts (gleiche Spalten) hinzu"""
+        for (group, column), sketch in other.sketches.items():
+            self._sketch(group, column).merge(sketch)
+        return self
+
+    def bounds(
+        self, factor: float = 1.5, q_low: float = 0.25, q_high: float = 0.75
+    ) -> pd.DataFrame:
+        """
+        IQR-Grenzen aller Sketches
+
+        Returns:
+        --------
+        pd.DataFrame
+            Index Spalte (bzw. Gruppe(n) und Spalte); Spalten Anzahl, Q1, Q3,
+            IQR, Untergrenze, Obergrenze, Exakt
+        """
+        index = (self.by or []) + ["Spalte"]
+        rows = []
+        for (group, column), sketch in self.sketches.items():
+            q1, q3 = sketch.quantile([q_low, q_high])
+            lower, upper = iqr_bounds(q1, q3, factor)
+            if self.by is None:
+                keys = ()
+            else:
+                keys = group if isinstance(group, tuple) else (group,)
+            row = dict(zip(index, (*keys, column), strict=True))
+            row.update(
+                {
+                    "Anzahl": sketch.count,
+                    "Q1": q1,
+                    "Q3": q3,
+                    "IQR": q3 - q1,
+                    "Untergrenze": lower,
+                    "Obergrenze": upper,
+                    "Exakt": sketch.is_exact,
+                }
+            )
+            rows.append(row)
+
+        return pd.DataFrame(rows).set_index(index).sort_index()
+
+    def outlier_mask(self, df: pd.DataFrame, factor: float = 1.5) -> pd.DataFrame:
+        """
+        Markiert Ausreisser eines Chunks (zweiter Durchlauf)
+
+        Returns:
+        --------
+        pd.DataFrame
+            Boolesche Spalte pro Sketch-Spalte mit dem Index von df; NaN und
+            unbekannte Gruppen sind nie Ausreisser
+        """
+        bounds = self.bounds(factor)
+        if self.by is None:
+            keys = None
+        elif len(self.by) == 1:
+            keys = pd.Index(df[self.by[0]])
+        else:
+            keys = pd.MultiIndex.from_frame(df[self.by])
+
+        mask = {}
+        for column in self.columns:
+            values = self._values(df[column])
+            if keys is None:
+                lower = bounds.loc[column, "Untergrenze"]
+                upper = bounds.loc[column, "Obergrenze"]
+            else:
+                limits = bounds.xs(column, level="Spalte")
+                lower = limits["Untergrenze"].reindex(keys).to_numpy()
+                upper = limits["Obergrenze"].reindex(keys).to_numpy()
+            with np.errstate(invalid="ignore"):
+                mask[column] = (values < lower) | (values > upper)
+        return pd.DataFrame(mask, index=df.index)
+
+
+def build_sketches(
+    chunks, columns, by=None, k: int = DEFAULT_K, seed: int = 42
+) -> ColumnSketches:
+    """Erster Durchlauf: Sketches über einen Strom von Chunks aufbauen"""
+    sketches = ColumnSketches(columns, by=by, k=k, seed=seed)
+    for chunk in chunks:
+        sketches.update(chunk)
+    return sketches
+
+
+def stream_iqr_outliers(chunk_source, columns, by=None, factor: float = 1.5, **kwargs):
+    """
+    IQR-Ausreisser in zwei Durchläufen mit begrenztem Speicher
+
+    Parameters:
+    -----------
+    chunk_source : callable
+        Liefert bei jedem Aufruf einen neuen Chunk-Iterator, z.B.
+        lambda: pd.read_csv(pfad, chunksize=100_000)
+    columns, by, **kwargs :
+        Wie bei build_sketches
+
+    Yields:
+    -------
+    tuple
+        (Chunk, boolesche Ausreisser-Maske pro Spalte)
+    """
+    sketches = build_sketches(chunk_source(), columns, by=by, **kwargs)
+    for chunk in chunk_source():
+        yield chunk, sketches.outlier_mask(chunk, factor)
+
+
+def find_outliers_iqr(df: pd.DataFrame, column: str, factor: float = 1.5):
+    """
+    IQR-Ausreisser einer Spalte über einen Sketch
+
+    Returns:
+    --------
+    tuple
+        (Ausreisser-Zeilen, Untergrenze, Obergrenze)
+    """
+    sketches = ColumnSketches([column]).update(df)
+    lower, upper = sketches.bounds(factor).loc[column, ["Untergrenze", "Obergrenze"]]
+    outliers = df[sketches.outlier_mask(df, factor)[column]]
+    return outliers, lower, upper
+
+
+def create_sample_telemetry(n_rows: int, seed: int) -> pd.DataFrame:
+    """Beispiel-Telemetrie: Maschine, Temperatur, Leistung_kW"""
+    rng = np.random.default_rng(seed)
+    machines = np.array([f"Laser_{i:02d}" for i in range(1, 5)])
+    return pd.DataFrame(
+        {
+            "Maschine": rng.choice(machines, n_rows),
+            "Temperatur": rng.normal(23, 2, n_rows),
+            "Leistung_kW": rng.gamma(4, 2.5, n_rows),
+        }
+    )
+
+
+def _sketch_part(seed: int) -> ColumnSketches:
+    """Worker: liest (hier: erzeugt) einen Datenteil und sketcht ihn"""
+    part = create_sample_telemetry(1_250_000, seed)
+    return ColumnSketches(["Temperatur", "Leistung_kW"], by="Maschine").update(part)
+
+
+def main():
+    """Vergleicht Sketch-Quantile mit exakten Werten auf 5 Mio. Zeilen"""
+    print("📐 Quantil-Sketches für IQR-Ausreisser")
+    print("=" * 50)
+
+    columns = ["Temperatur", "Leistung_kW"]
+    seeds = [1, 2, 3, 4]
+
+    # Parallel: jeder Prozess sketcht seinen Teil, danach zusammenführen
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=len(seeds)) as executor:
+        partial = list(executor.map(_sketch_part, seeds))
+    sketches = partial[0]
+    for other in partial[1:]:
+        sketches.merge(other)
+    sketch_seconds = time.perf_counter() - t0
+
+    # Referenz: alle Daten im Speicher, exakte Quantile
+    t0 = time.perf_counter()
+    chunks = [create_sample_telemetry(1_250_000, seed) for seed in seeds]
+    df = pd.concat(chunks, ignore_index=True)
+    exact = df.groupby("Maschine")[columns].quantile([0.25, 0.75])
+    exact_seconds = time.perf_counter() - t0
+
+    bounds = sketches.bounds()
+    print(f"Zeilen: {len(df):,} in {len(seeds)} Teilen")
+    print(f"Stützwerte pro Sketch: {max(s.size for s in sketches.sketches.values())}")
+    print(f"⏱️ {len(seeds)} Prozesse + merge: {sketch_seconds:.2f} s")
+    print(f"⏱️ Exakt (alles im Speicher): {exact_seconds:.2f} s")
+
+    print("\nQ1/Q3 Sketch vs. exakt (Laser_01):")
+    for column in columns:
+        sketch_q = bounds.loc[("Laser_01", column), ["Q1", "Q3"]].to_numpy(float)
+        exact_q = exact.loc[("Laser_01", slice(None)), column].to_numpy()
+        print(f"  {column:<12} {sketch_q.round(3)}  {exact_q.round(3)}")
+
+    # Zweiter Durchlauf: Ausreisser chunkweise markieren
+    n_outliers = sum(sketches.outlier_mask(chunk).sum() for chunk in chunks)
+    print("\n🚨 Ausreisser pro Spalte:")
+    for column in columns:
+        print(f"  {column:<12} {n_outliers[column]:>8,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Vektorisierte Spaltenbereinigung mit regulären Ausdrücken
+
+Bediener-IDs, Stückzahlen oder Maschinennamen werden oft mit einer
+Python-Funktion pro Zelle bereinigt (.apply mit re.findall). Bei 5 Mio.
+Zeilen und nur ~200 verschiedenen Werten wird dieselbe Arbeit dabei
+zehntausendfach wiederholt.
+
+Diese Bereinigung arbeitet in zwei Schritten:
+1. Eindeutige Werte bestimmen (pd.factorize)
+2. Regex-Extraktion und Normalisierung vektorisiert mit .str.extract /
+   .str.replace nur auf den eindeutigen Werten ausführen und das Ergebnis
+   über die Codes auf alle Zeilen zurückverteilen
+
+Der Aufwand wächst damit praktisch nur noch mit der Anzahl eindeutiger Werte.
+
+Für Bystronic-Entwickler: Ersetzt zeilenweise Bereinigungsfunktionen
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def map_unique(series: pd.Series, func, as_category: bool = False) -> pd.Series:
+    """
+    Wendet eine spaltenweise Funktion nur auf die eindeutigen Werte an
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Rohwerte (NaN bleibt NaN)
+    func : callable
+        func(pd.Series) -> pd.Series gleicher Länge, z.B. eine Kette von
+        .str-Operationen
+    as_category : bool
+        Ergebnis als Categorical zurückgeben (spart Speicher bei wenigen
+        verschiedenen Werten)
+
+    Returns:
+    --------
+    pd.Series
+        Bereinigte Werte mit dem Index der Eingabe
+    """
+    codes, uniques = pd.factorize(series)
+    cleaned = func(pd.Series(uniques, dtype=object)).reset_index(drop=True)
+
+    if as_category:
+        # Mehrere Rohwerte können auf denselben bereinigten Wert fallen
+        clean_codes, categories = pd.factorize(cleaned)
+        row_codes = np.append(clean_codes, -1)[codes]
+        values = pd.Categorical.from_codes(row_codes, categories=categories)
+        return pd.Series(values, index=series.index, name=series.name)
+
+    # Code -1 (NaN) existiert im Index nicht und wird beim reindex zu NaN
+    out = cleaned.reindex(codes)
+    out.index = series.index
+    out.name = series.name
+    return out
+
+
+def regex_clean(
+    series: pd.Series,
+    replace: list[tuple[str, str]] = (),
+    extract: str = None,
+    strip: bool = True,
+    upper: bool = False,
+    null_values: list[str] = ("", "nan"),
+    as_category: bool = False,
+) -> pd.Series:
+    """
+    Regex-Bereinigung einer Textspalte (einmal pro eindeutigem Wert)
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Rohwerte beliebigen Typs (werden als Text behandelt)
+    replace : list of tuple
+        (Muster, Ersatz)-Paare für .str.replace(regex=True), in Reihenfolge
+    extract : str, optional
+        Muster mit einer Gruppe für .str.extract; Werte ohne Treffer -> NaN
+    strip, upper : bool
+        Leerzeichen entfernen / Grossbuchstaben
+    null_values : list
+        Werte (nach strip), die als fehlend gelten
+    as_category : bool
+        Ergebnis als Categorical
+
+    Returns:
+    --------
+    pd.Series
+        Bereinigte Textwerte
+    """
+
+    def clean(values: pd.Series) -> pd.Series:
+        text = values.astype(str)
+        if strip:
+            text = text.str.strip()
+        text = text.mask(text.isin(null_values))
+        if upper:
+            text = text.str.upper()
+        for pattern, replacement in replace:
+            text = text.str.replace(pattern, replacement, regex=True)
+        if extract is not None:
+            text = text.str.extract(extract, expand=False)
+        return text
+
+    return map_unique(series, clean, as_category=as_category)
+
+
+def standardize_ids(
+    series: pd.Series, prefix: str = "BY", width: int = 3, as_category: bool = False
+) -> pd.Series:
+    """
+    Standardisiert IDs auf <prefix><Nummer> (z.B. "by 7", "BY-007" -> "BY007")
+
+    Verwendet wird die erste Zahl im Wert; Werte ohne Zahl werden NaN.
+    """
+
+    def to_id(values: pd.Series) -> pd.Series:
+        digits = regex_clean(values, extract=r"(\d+)")
+        # Führende Nullen entfernen und neu auffüllen (entspricht f"{int:03d}")
+        number = digits.str.lstrip("0").replace("", "0")
+        return (prefix + number.str.zfill(width)).where(digits.notna())
+
+    return map_unique(series, to_id, as_category=as_category)
+
+
+def clean_counts(
+    series: pd.Series, null_values: list[str] = ("", "N/A", "nan")
+) -> pd.Series:
+    """
+    Bereinigt Stückzahlen wie "1.250", "150 Stk" oder "N/A" zu Zahlen
+
+    Alle Nicht-Ziffern (auch Tausender-Trennzeichen) werden entfernt und
+    die Ziffern des Werts zusammengesetzt; Werte ohne Ziffern werden NaN.
+    """
+
+    def to_count(values: pd.Series) -> pd.Series:
+        digits = regex_clean(values, replace=[(r"\D", "")], null_values=null_values)
+        return pd.to_numeric(digits.replace("", np.nan))
+
+    return map_unique(series, to_count)
+
+
+def main():
+    """Vergleicht die Bereinigung mit zeilenweisem .apply()"""
+    import re
+
+    print("🧹 Vektorisierte Spaltenbereinigung")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    formate = ["BY{:03d}", "by{}", "BY-{}", " Bediener {} ", "B{:02d}", "{}"]
+    varianten = [fmt.format(i) for i in range(1, 35) for fmt in formate]
+    varianten += ["", "unbekannt"]
+    n_rows = 5_000_000
+    bediener = pd.Series(rng.choice(varianten, n_rows), name="Bediener")
+
+    t0 = time.perf_counter()
+    ergebnis = standardize_ids(bediener, as_category=True)
+    vektor_sekunden = time.perf_counter() - t0
+
+    def zeilenweise(value):
+        zahlen = re.findall(r"\d+", str(value).strip().upper())
+        return f"BY{int(zahlen[0]):03d}" if zahlen else np.nan
+
+    sample = bediener.head(200_000)
+    t0 = time.perf_counter()
+    referenz = sample.apply(zeilenweise)
+    apply_sekunden = (time.perf_counter() - t0) * n_rows / len(sample)
+
+    identisch = referenz.equals(ergebnis.head(len(sample)).astype(object))
+    print(f"Zeilen:           {n_rows:,}")
+    print(f"Eindeutige Werte: {bediener.nunique()} -> {ergebnis.nunique()}")
+    print(f"Speicher:         {ergebnis.memory_usage(deep=True) / 1e6:.1f} MB")
+    print(f"Identisch zu .apply: {'✅' if identisch else '❌'}")
+    print(f"\n⏱️ Vektorisiert: {vektor_sekunden:.2f} s")
+    print(f"⏱️ .apply (hochgerechnet): {apply_sekunden:.1f} s")
+    print(f"🚀 Faktor: {apply_sekunden / vektor_sekunden:.0f}x")
+
+    stueckzahl = pd.Series(["1.250", "150 Stk", "N/A", 80, None, "abc"])
+    print("\nStückzahlen:", clean_counts(stueckzahl).tolist())
+
+
+if __name__ == "__main__":
+    main()
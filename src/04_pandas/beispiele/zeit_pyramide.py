@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Zeit-Pyramide - Vorberechnete Minuten-, Stunden-, Tages- und Wochenwerte
+
+Zeitreihen-Auswertungen gruppieren immer wieder dieselben Rohdaten:
+groupby(index.date), resample("W"), resample("M"), groupby(index.hour)
+und gleitende Durchschnitte über Tageswerte. Jede dieser Abfragen liest
+alle Rohzeilen erneut.
+
+Die Pyramide speichert pro Ebene (Minute, Stunde, Tag, Woche) Summe,
+Anzahl, Minimum und Maximum jeder Messgrösse:
+- Nur die Minuten-Ebene wird aus den Rohdaten berechnet, jede gröbere
+  Ebene aus der nächstfeineren
+- Neue Rohdaten aktualisieren nur die betroffenen Zeitabschnitte
+- Eine Abfrage nutzt die gröbste Ebene, aus der sie sich exakt
+  zusammensetzen lässt (Monat -> Tage, 2 Stunden -> Stunden)
+
+Mittelwerte ergeben sich aus Summe / Anzahl und sind damit exakt gleich
+wie auf den Rohdaten.
+
+Für Bystronic-Entwickler: Dashboards fragen Tageswerte ab, nie Rohzeilen
+"""
+
+import time
+from itertools import pairwise
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from aggregat_wuerfel import COUNT_SUFFIX, ROWS_COLUMN, SUM_SUFFIX
+from pandas.tseries.frequencies import to_offset
+
+MIN_SUFFIX = "_Min"
+MAX_SUFFIX = "_Max"
+
+# Ebenen von fein nach grob; Wochen enden wie bei resample("W") am Sonntag
+LEVELS = ("min", "h", "D", "W")
+
+# Kalender-Profile und die Ebene, aus der sie berechnet werden
+PROFILES = {"hour": "h", "dayofweek": "D", "month": "D"}
+
+
+def _bucket(index: pd.DatetimeIndex, level: str) -> pd.DatetimeIndex:
+    """Beschriftung des Zeitabschnitts jeder Zeit (Woche: deren Sonntag)"""
+    if level == "W":
+        day = index.normalize()
+        return day + pd.to_timedelta(6 - day.dayofweek, unit="D")
+    return index.floor(level)
+
+
+class RollupPyramid:
+    """
+    Summen, Anzahlen, Minima und Maxima auf mehreren Zeitebenen
+
+    Parameters:
+    -----------
+    measures : list
+        Numerische Messgrössen, z.B. ["Stückzahl", "Produktionszeit"]
+    """
+
+    def __init__(self, measures):
+        self.measures = list(measures)
+        self.levels = {}
+
+    def _spec(self) -> dict:
+        """Wie die Spalten einer Ebene weiter zusammengefasst werden"""
+        spec = {}
+        for m in self.measures:
+            spec[m + SUM_SUFFIX] = "sum"
+            spec[m + COUNT_SUFFIX] = "sum"
+            spec[m + MIN_SUFFIX] = "min"
+            spec[m + MAX_SUFFIX] = "max"
+        spec[ROWS_COLUMN] = "sum"
+        return spec
+
+    def _aggregate_raw(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Minuten-Ebene aus Rohdaten mit DatetimeIndex"""
+        grouped = df[self.measures].groupby(_bucket(df.index, "min"))
+        parts = [
+            grouped.sum().add_suffix(SUM_SUFFIX),
+            grouped.count().add_suffix(COUNT_SUFFIX),
+            grouped.min().add_suffix(MIN_SUFFIX),
+            grouped.max().add_suffix(MAX_SUFFIX),
+            grouped.size().rename(ROWS_COLUMN),
+        ]
+        return pd.concat(parts, axis=1)[list(self._spec())]
+
+    def update(self, df: pd.DataFrame, time_column: str = None) -> "RollupPyramid":
+        """
+        Nimmt neue Rohdaten auf und aktualisiert alle Ebenen
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Rohdaten mit DatetimeIndex oder Zeitspalte
+        time_column : str, optional
+            Zeitspalte, falls der Index keine Zeiten enthält
+
+        Returns:
+        --------
+        RollupPyramid
+            self
+        """
+        if time_column is not None:
+            df = df.set_index(pd.DatetimeIndex(df[time_column]))
+        fresh = self._aggregate_raw(df)
+        spec = self._spec()
+
+        changed = fresh.index
+        finest = self.levels.get(LEVELS[0])
+        if finest is not None:
+            # Minuten, die schon Werte haben, mit den neuen zusammenführen
+            overlap = finest[finest.index.isin(changed)]
+            if len(overlap):
+                fresh = pd.concat([overlap, fresh]).groupby(level=0).agg(spec)
+            fresh = pd.concat([finest.drop(overlap.index), fresh])
+        self.levels[LEVELS[0]] = fresh.sort_index()
+
+        for finer, level in pairwise(LEVELS):
+            touched = _bucket(changed, level).unique()
+            source = self.levels[finer]
+            # Nur den betroffenen Zeitraum der feineren Ebene neu zusammenfassen
+            source = source.loc[touched.min() - pd.Timedelta(days=7) :]
+            keys = _bucket(source.index, level)
+            source = source[keys.isin(touched)]
+            rolled = source.groupby(_bucket(source.index, level)).agg(spec)
+
+            previous = self.levels.get(level)
+            if previous is not None:
+                rolled = pd.concat([previous.drop(touched, errors="ignore"), rolled])
+            self.levels[level] = rolled.sort_index()
+            changed = touched
+        return self
+
+    @staticmethod
+    def level_for(freq) -> str:
+        """
+        Gröbste Ebene, aus der sich Abschnitte der Frequenz exakt ergeben
+
+        Parameters:
+        -----------
+        freq : str or DateOffset
+            pandas-Frequenz, z.B. "D", "W", "ME", "2h", "15min"
+
+        Returns:
+        --------
+        str
+            Ebene aus LEVELS
+        """
+        offset = to_offset(freq)
+        if isinstance(offset, pd.offsets.Week) and offset.n == 1:
+            return "W" if offset.weekday == 6 else "D"
+        if isinstance(offset, pd.offsets.Tick):
+            for level in ("D", "h", "min"):
+                if offset.nanos % to_offset(level).nanos == 0:
+                    return level
+            raise ValueError(f"Frequenz '{freq}' ist feiner als eine Minute")
+        # Monate, Quartale, Jahre, Arbeitstage bestehen aus ganzen Tagen
+        return "D"
+
+    def _finish(self, table: pd.DataFrame, agg: dict) -> pd.DataFrame:
+        """Aus Summen/Anzahlen/Extremwerten die gewünschten Kennzahlen"""
+        result = {}
+        for measure, stat in agg.items():
+            if measure not in self.measures:
+                raise KeyError(f"'{measure}' ist keine Messgrösse der Pyramide")
+            sums = table[measure + SUM_SUFFIX]
+            counts = table[measure + COUNT_SUFFIX]
+            if stat == "mean":
+                result[measure] = sums / counts.where(counts > 0)
+            elif stat in ("sum", "count"):
+                result[measure] = sums if stat == "sum" else counts
+            elif stat in ("min", "max"):
+                result[measure] = table[measure + f"_{stat.capitalize()}"]
+            else:
+                raise ValueError(f"Kennzahl '{stat}' wird nicht unterstützt")
+        return pd.DataFrame(result, index=table.index)
+
+    def query(self, freq, agg=None, start=None, end=None) -> pd.DataFrame:
+        """
+        Zeitreihe in beliebiger Frequenz (wie df.resample(freq).agg(agg))
+
+        Parameters:
+        -----------
+        freq : str or DateOffset
+            Zielfrequenz, z.B. "D", "W", "ME", "h"
+        agg : dict, optional
+            {Messgrösse: "sum" | "mean" | "count" | "min" | "max"};
+            Standard: Summe aller Messgrössen
+        start, end : str or Timestamp, optional
+            Zeitraum (inklusive) auf der verwendeten Ebene
+
+        Returns:
+        --------
+        pd.DataFrame
+            Ein Abschnitt pro Zeile, lückenlos wie bei resample()
+        """
+        if not self.levels:
+            raise ValueError("Pyramide ist leer")
+        agg = agg or dict.fromkeys(self.measures, "sum")
+        table = self.levels[self.level_for(freq)].loc[start:end]
+        return self._finish(table.resample(freq).agg(self._spec()), agg)
+
+    def profile(self, by: str, agg=None) -> pd.DataFrame:
+        """
+        Kalender-Profil wie df.groupby(df.index.hour).agg(agg)
+
+        Parameters:
+        -----------
+        by : str
+            "hour", "dayofweek" (0=Montag) oder "month"
+        agg : dict, optional
+            Wie bei query()
+
+        Returns:
+        --------
+        pd.DataFrame
+            Eine Zeile pro Stunde, Wochentag bzw. Monat
+        """
+        if by not in PROFILES:
+            raise ValueError(f"Profil '{by}' wird nicht unterstützt: {list(PROFILES)}")
+        agg = agg or dict.fromkeys(self.measures, "sum")
+        table = self.levels[PROFILES[by]]
+        grouped = table.groupby(getattr(table.index, by))
+        return self._finish(grouped.agg(self._spec()), agg)
+
+    def save(self, path):
+        """Speichert alle Ebenen"""
+        pd.to_pickle({"measures": self.measures, "levels": self.levels}, path)
+
+    @classmethod
+    def load(cls, path) -> "RollupPyramid":
+        """Lädt eine mit save() gespeicherte Pyramide"""
+        state = pd.read_pickle(path)
+        pyramid = cls(state["measures"])
+        pyramid.levels = state["levels"]
+        return pyramid
+
+
+def create_sample_series(days: int, start="2024-01-01", seed=42) -> pd.DataFrame:
+    """Sekundengenaue Maschinenbuchungen (alle 10 s) mit Tagesgang"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=days * 8640, freq="10s")
+    hour = index.hour.to_numpy()
+    load = 0.6 + 0.4 * np.sin((hour - 6) / 24 * 2 * np.pi)
+    return pd.DataFrame(
+        {
+            "Stückzahl": rng.poisson(3 * load),
+            "Leistung_kW": rng.gamma(4, 5 * load),
+            "Temperatur": rng.normal(23 + 4 * load, 1.0),
+        },
+        index=index,
+    )
+
+
+def main():
+    """Vergleicht Abfragen auf Rohdaten mit der Pyramide"""
+    print("🔺 Zeit-Pyramide für Zeitreihen")
+    print("=" * 50)
+
+    measures = ["Stückzahl", "Leistung_kW", "Temperatur"]
+    raw = create_sample_series(days=365)
+    new_day = create_sample_series(days=1, start="2025-01-01", seed=7)
+    print(f"Rohdaten: {len(raw):,} Zeilen")
+
+    t0 = time.perf_counter()
+    pyramid = RollupPyramid(measures).update(raw)
+    build_seconds = time.perf_counter() - t0
+    sizes = ", ".join(f"{lvl}: {len(t):,}" for lvl, t in pyramid.levels.items())
+    print(f"🔺 Aufgebaut in {build_seconds:.2f} s ({sizes})")
+
+    t0 = time.perf_counter()
+    pyramid.update(new_day)
+    update_seconds = time.perf_counter() - t0
+    print(f"➕ Neuer Tag ({len(new_day):,} Zeilen) in {update_seconds:.2f} s")
+
+    full = pd.concat([raw, new_day])
+    agg = {"Stückzahl": "sum", "Leistung_kW": "mean", "Temperatur": "max"}
+    queries = [("D", "2024-10-03", None), ("W", None, None), ("ME", None, None)]
+
+    print("\n⏱️ Abfrage        Rohdaten   Pyramide  Ebene")
+    for freq, start, end in queries:
+        t0 = time.perf_counter()
+        expected = full.loc[start:end].resample(freq).agg(agg)
+        raw_seconds = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        result = pyramid.query(freq, agg, start=start, end=end)
+        pyramid_seconds = time.perf_counter() - t0
+
+        same = np.allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+        print(
+            f"   {freq:<4} {len(result):>5} Zeilen {raw_seconds:>7.3f} s "
+            f"{pyramid_seconds:>8.4f} s  {pyramid.level_for(freq):<4}"
+            f"{'✅' if same else '❌'}"
+        )
+
+    print("\n🕐 Stundenprofil (mittlere Leistung kW):")
+    hourly = pyramid.profile("hour", {"Leistung_kW": "mean"})["Leistung_kW"]
+    print(hourly.loc[6:12].round(2).to_string())
+
+    print("\n📈 Tagesproduktion der letzten 90 Tage, 7-Tage-Mittel:")
+    daily = pyramid.query("D", {"Stückzahl": "sum"}, start="2024-10-03")
+    print(daily["Stückzahl"].rolling(7).mean().tail(3).round(1).to_string())
+
+    path = Path("zeit_pyramide.pkl")
+    pyramid.save(path)
+    reloaded = RollupPyramid.load(path)
+    print(f"\n💾 Gespeichert und geladen: {len(reloaded.levels['D'])} Tage")
+    path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ LERNZIELE:
 """
 
 import json
+import sys
 import warnings
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -648,67 +649,15 @@ print("a) Universelle Import-Funktion:")
 
 
 # IHRE LÖSUNG HIER:
-def robust_import(file_path, file_type=None, **kwargs):
-    """
-    Robuste Import-Funktion für verschiedene Dateiformate
-    """
-    import_log = {
-        "file_path": str(file_path),
-        "timestamp": datetime.now(),
-        "success": False,
-        "error": None,
-        "records_imported": 0,
-        "warnings": [],
-    }
-
-    try:
-        # Dateityp automatisch erkennen
-        if file_type is None:
-            if str(file_path).endswith(".csv"):
-                file_type = "csv"
-            elif str(file_path).endswith((".xls", ".xlsx")):
-                file_type = "excel"
-            elif str(file_path).endswith(".json"):
-                file_type = "json"
-            else:
-                raise ValueError(f"Unbekannter Dateityp: {file_path}")
-
-        # Datei importieren
-        if file_type == "csv":
-            # Automatische Separator-Erkennung
-            with open(file_path) as f:
-                first_line = f.readline()
-                if ";" in first_line:
-                    separator = ";"
-                    decimal = ","
-                else:
-                    separator = ","
-                    decimal = "."
-
-            df = pd.read_csv(file_path, sep=separator, decimal=decimal, **kwargs)
-
-        elif file_type == "excel":
-            df = pd.read_excel(file_path, **kwargs)
-
-        elif file_type == "json":
-            with open(file_path, encoding="utf-8") as f:
-                json_data = json.load(f)
-            # Für JSON: Vereinfachte DataFrame-Erstellung
-            df = pd.json_normalize(json_data)
-
-        else:
-            raise ValueError(f"Nicht unterstützter Dateityp: {file_type}")
-
-        # Erfolg protokollieren
-        import_log["success"] = True
-        import_log["records_imported"] = len(df)
-
-        return df, import_log
-
-    except Exception as e:
-        import_log["error"] = str(e)
-        return None, import_log
+# Die Formaterkennung (Magic Bytes, JSON, Trennzeichen/Dezimalzeichen) und die
+# Reader-Registry liegen in Modul 06 - hier wird sie nur eingebunden.
+# Die Beispielmodule sind kein Paket: Modul 06 wie in tests/ über sys.path.
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[2] / "06_datenimport" / "beispiele")
+)
+from import_registry import registry, robust_import  # noqa: E402
 
+print(f"Registrierte Formate: {', '.join(registry.readers)}")
 
 print("✅ Universelle Import-Funktion erstellt")
 
@@ -19,12 +19,25 @@ LERNZIELE:
 - Bereinigungsprotokoll erstellen
 """
 
+import sys
 import warnings
 from datetime import datetime
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+# Die Beispielmodule sind kein Paket: beispiele/ wie in tests/ über sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "beispiele"))
+from datums_parser import parse_dates  # noqa: E402
+from duplikat_bereinigung import remove_quasi_duplicates  # noqa: E402
+from spalten_bereinigung import clean_counts, standardize_ids  # noqa: E402
+
+# Die Validierungsregeln liegen in Modul 06 (ebenfalls über sys.path)
+DATENIMPORT_PATH = Path(__file__).resolve().parents[2] / "06_datenimport" / "beispiele"
+sys.path.insert(0, str(DATENIMPORT_PATH))
+from validierungs_regeln import ValidationRuleEngine  # noqa: E402
+
 warnings.filterwarnings("ignore")
 
 print("=" * 60)
@@ -401,29 +414,9 @@ print("\\nd) Bediener-IDs standardisieren:")
 print("Vorher - Bediener-Formate (erste 10):")
 print(df_clean["Bediener"].head(10).tolist())
 
-
-def standardize_bediener_id(bediener_str):
-    """Standardisiert Bediener-IDs zu BY### Format"""
-    if pd.isna(bediener_str) or str(bediener_str).strip() == "":
-        return np.nan
-
-    # String bereinigen
-    clean_str = str(bediener_str).strip().upper()
-
-    # Nur Zahlen extrahieren
-    import re
-
-    zahlen = re.findall(r"\d+", clean_str)
-
-    if zahlen:
-        # Erste gefundene Zahl verwenden
-        nummer = int(zahlen[0])
-        return f"BY{nummer:03d}"  # Format: BY001, BY002, etc.
-    else:
-        return np.nan
-
-
-df_clean["Bediener"] = df_clean["Bediener"].apply(standardize_bediener_id)
+# Erste Zahl extrahieren und als BY### formatieren - vektorisiert und nur
+# einmal pro eindeutigem Wert (siehe beispiele/spalten_bereinigung.py)
+df_clean["Bediener"] = standardize_ids(df_clean["Bediener"], prefix="BY", width=3)
 
 print("\\nNachher - Bediener-Formate (erste 10):")
 print(df_clean["Bediener"].head(10).tolist())
@@ -516,32 +509,8 @@ print("Stückzahl - Problematische Werte identifizieren:")
 print("Beispiele aktueller Werte:")
 print(df_clean["Stückzahl"].head(10).tolist())
 
-
-def clean_stueckzahl(value):
-    """Bereinigt Stückzahl-Werte"""
-    if pd.isna(value):
-        return np.nan
-
-    value_str = str(value).strip()
-
-    # Leer oder 'N/A'
-    if value_str in ["", "N/A", "nan"]:
-        return np.nan
-
-    # Nur Zahlen extrahieren
-    import re
-
-    # Alle Zahlen finden (auch mit deutschen Tausender-Trennzeichen)
-    numbers = re.findall(r"\d+", value_str.replace(".", ""))
-
-    if numbers:
-        # Erste (längste) Zahl verwenden
-        return int("".join(numbers))
-    else:
-        return np.nan
-
-
-df_clean["Stückzahl"] = df_clean["Stückzahl"].apply(clean_stueckzahl)
+# Tausender-Trennzeichen und Text entfernen, "N/A" als fehlend behandeln
+df_clean["Stückzahl"] = clean_counts(df_clean["Stückzahl"])
 
 print("\\nNach Bereinigung:")
 print(f"Typ: {df_clean['Stückzahl'].dtype}")
@@ -553,45 +522,52 @@ print("\\nd) Geschäftslogik-Validierung:")
 
 
 # IHRE LÖSUNG HIER:
+BUSINESS_RULES = ValidationRuleEngine(
+    [
+        # Regel 1: Produktionszeit zwischen 0 und 24 Stunden
+        {
+            "name": "Produktionszeit",
+            "column": "Produktionszeit_h",
+            "min": 0,
+            "max": 24,
+            "message": "Produktionszeit außerhalb 0-24h",
+        },
+        # Regel 2: Stückzahl sollte positiv sein
+        {
+            "name": "Stückzahl",
+            "column": "Stückzahl",
+            "check": lambda d: d["Stückzahl"] > 0,
+            "message": "Stückzahl <= 0",
+        },
+        # Regel 3: Sehr hohe Stückzahlen sind verdächtig (> 1000 pro Messung)
+        {
+            "name": "Stückzahl_hoch",
+            "column": "Stückzahl",
+            "max": 1000,
+            "message": "Verdächtig hohe Stückzahl >1000",
+        },
+        # Regel 4: Temperatur sollte bei Laser-Maschinen höher sein
+        {
+            "name": "Laser-Temperatur",
+            "column": "Temperatur_C",
+            "min": 20,
+            "when": {"column": "Maschine", "pattern": "Laser"},
+            "message": "Laser-Temperaturen unter 20°C",
+        },
+    ]
+)
+
+
 def validate_business_rules(df):
     """Implementiert Bystronic-spezifische Geschäftsregeln"""
-    validation_errors = []
-
-    # Regel 1: Produktionszeit zwischen 0 und 24 Stunden
-    invalid_prod_time = df["Produktionszeit_h"].notna() & (
-        (df["Produktionszeit_h"] < 0) | (df["Produktionszeit_h"] > 24)
-    )
-    if invalid_prod_time.any():
-        validation_errors.append(
-            f"Produktionszeit außerhalb 0-24h: {invalid_prod_time.sum()}"
-        )
-        df.loc[invalid_prod_time, "Produktionszeit_h"] = np.nan
-
-    # Regel 2: Stückzahl sollte positiv sein
-    invalid_stueckzahl = df["Stückzahl"].notna() & (df["Stückzahl"] <= 0)
-    if invalid_stueckzahl.any():
-        validation_errors.append(f"Stückzahl <= 0: {invalid_stueckzahl.sum()}")
-        df.loc[invalid_stueckzahl, "Stückzahl"] = np.nan
-
-    # Regel 3: Sehr hohe Stückzahlen sind verdächtig (> 1000 pro Messung)
-    suspicious_stueckzahl = df["Stückzahl"].notna() & (df["Stückzahl"] > 1000)
-    if suspicious_stueckzahl.any():
-        validation_errors.append(
-            f"Verdächtig hohe Stückzahl >1000: {suspicious_stueckzahl.sum()}"
-        )
+    report = BUSINESS_RULES.evaluate(df)
+    flags = BUSINESS_RULES.violation_frame(report, index=df.index)
 
-    # Regel 4: Temperatur sollte bei Laser-Maschinen höher sein
-    laser_temp_check = (
-        df["Maschine"].str.contains("Laser", na=False)
-        & df["Temperatur_C"].notna()
-        & (df["Temperatur_C"] < 20)
-    )
-    if laser_temp_check.any():
-        validation_errors.append(
-            f"Laser-Temperaturen unter 20°C: {laser_temp_check.sum()}"
-        )
+    # Ungültige Werte entfernen (verdächtige Werte bleiben erhalten)
+    df.loc[flags["Produktionszeit"], "Produktionszeit_h"] = np.nan
+    df.loc[flags["Stückzahl"], "Stückzahl"] = np.nan
 
-    return validation_errors
+    return report["errors"]
 
 
 business_errors = validate_business_rules(df_clean)
@@ -639,46 +615,25 @@ print("a) Verschiedene Datumsformate konvertieren:")
 print("Beispiele aktueller Timestamp-Werte:")
 print(df_clean["Timestamp"].head(10).tolist())
 
-
-def flexible_date_parser(date_str):
-    """Parst Daten in verschiedenen Formaten"""
-    if pd.isna(date_str) or str(date_str).strip() == "":
-        return np.nan
-
-    date_str = str(date_str).strip()
-
-    # Ungültige Werte abfangen
-    if date_str in ["invalid_date", "NULL", "nan"]:
-        return np.nan
-
-    # Verschiedene Formate versuchen
-    formats = [
+# Alle Formate vektorisiert auf die eindeutigen Werte anwenden, statt
+# pro Zeile mit try/except zu parsen (siehe beispiele/datums_parser.py)
+print("Konvertiere Timestamps...")
+df_clean["Timestamp"], timestamp_stats = parse_dates(
+    df_clean["Timestamp"],
+    formats=[
         "%Y-%m-%d",  # 2024-01-01
         "%d.%m.%Y",  # 01.01.2024
         "%Y/%m/%d",  # 2024/01/01
         "%m-%d-%Y",  # 01-01-2024
         "%Y-%m-%d %H:%M:%S",  # Mit Zeit
         "%d.%m.%Y %H:%M",  # Deutsche Format mit Zeit
-    ]
-
-    for fmt in formats:
-        try:
-            return pd.to_datetime(date_str, format=fmt)
-        except (ValueError, TypeError):
-            continue
-
-    # Pandas automatisches Parsing als Fallback
-    try:
-        return pd.to_datetime(date_str)
-    except:
-        return np.nan
-
-
-print("Konvertiere Timestamps...")
-df_clean["Timestamp"] = df_clean["Timestamp"].apply(flexible_date_parser)
+    ],
+    null_values=["", "invalid_date", "NULL", "nan"],
+)
 
 print(f"Erfolgreich konvertierte Daten: {df_clean['Timestamp'].notna().sum()}")
 print(f"Fehlgeschlagene Konvertierungen: {df_clean['Timestamp'].isna().sum()}")
+print(f"Treffer pro Format: {timestamp_stats['per_format']}")
 
 print("\\nb) Ungültige Datumswerte behandeln:")
 # IHRE LÖSUNG HIER:
@@ -846,51 +801,9 @@ if key_duplikate > 0:
 print(f"\\nNach Standard-Duplikate-Bereinigung: {len(df_clean)} Zeilen")
 
 print("\\nc) Quasi-Duplikate behandeln:")
-
-
 # IHRE LÖSUNG HIER:
-def remove_quasi_duplicates(df, time_window_minutes=1):
-    """Entfernt Quasi-Duplikate basierend auf Zeitfenster"""
-    if df["Timestamp"].isna().all():
-        return df, 0
-
-    df_sorted = df.sort_values(["Maschine", "Timestamp"]).reset_index(drop=True)
-
-    # Markiere Zeilen zum Behalten
-    keep_rows = []
-
-    for maschine in df_sorted["Maschine"].dropna().unique():
-        maschine_data = df_sorted[df_sorted["Maschine"] == maschine].copy()
-
-        if len(maschine_data) <= 1:
-            keep_rows.extend(maschine_data.index.tolist())
-            continue
-
-        # Erste Zeile immer behalten
-        last_kept_time = None
-        for idx, row in maschine_data.iterrows():
-            current_time = row["Timestamp"]
-
-            if pd.isna(current_time):
-                keep_rows.append(idx)
-            elif last_kept_time is None:
-                # Erste gültige Zeit
-                keep_rows.append(idx)
-                last_kept_time = current_time
-            else:
-                # Prüfe Zeitdifferenz
-                time_diff = current_time - last_kept_time
-                if time_diff >= pd.Timedelta(minutes=time_window_minutes):
-                    keep_rows.append(idx)
-                    last_kept_time = current_time
-                # Sonst: Quasi-Duplikat, nicht behalten
-
-    df_cleaned = df_sorted.iloc[keep_rows].copy()
-    removed_count = len(df_sorted) - len(df_cleaned)
-
-    return df_cleaned, removed_count
-
-
+# Gierige Zeitfenster-Regel pro Maschine, vektorisiert statt iterrows()
+# (siehe beispiele/duplikat_bereinigung.py)
 df_clean, quasi_entfernt = remove_quasi_duplicates(df_clean)
 duplikate_log["quasi_duplikate_entfernt"] = quasi_entfernt
 print(f"✅ {quasi_entfernt} Quasi-Duplikate entfernt")
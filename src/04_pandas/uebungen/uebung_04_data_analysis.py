@@ -20,11 +20,23 @@ LERNZIELE:
 - Umfassende Analysereports erstellen
 """
 
+import sys
 import warnings
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+# Die Beispielmodule sind kein Paket: beispiele/ wie in tests/ über sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "beispiele"))
+from aggregat_wuerfel import AggregateCube  # noqa: E402
+from korrelationen import correlation_matrix as compute_correlations  # noqa: E402
+from korrelationen import correlation_pairs  # noqa: E402
+from quantil_sketch import QuantileSketch, iqr_bounds  # noqa: E402
+from stammdaten_lookup import enrich  # noqa: E402
+from telemetrie_generator import generate_production_log  # noqa: E402
+from zeit_pyramide import RollupPyramid  # noqa: E402
+
 warnings.filterwarnings("ignore")
 
 print("=" * 60)
@@ -40,173 +52,10 @@ print("\n🔧 Vorbereitung: Erstelle umfassende Produktionsdaten...")
 
 def create_comprehensive_production_data():
     """Erstelle realistische Produktionsdaten für 3 Monate"""
-    np.random.seed(42)
-
-    # Setup
-    start_date = pd.Timestamp("2024-01-01")
-    end_date = pd.Timestamp("2024-03-31")
-    date_range = pd.date_range(start_date, end_date, freq="H")
-
-    maschinen_config = [
-        {
-            "name": "Laser_01",
-            "typ": "ByStar",
-            "halle": "A",
-            "baujahr": 2019,
-            "kapazitaet": 10,
-        },
-        {
-            "name": "Laser_02",
-            "typ": "ByStar",
-            "halle": "A",
-            "baujahr": 2020,
-            "kapazitaet": 10,
-        },
-        {
-            "name": "Laser_03",
-            "typ": "ByStar",
-            "halle": "A",
-            "baujahr": 2021,
-            "kapazitaet": 12,
-        },
-        {
-            "name": "Presse_01",
-            "typ": "Xpert",
-            "halle": "B",
-            "baujahr": 2018,
-            "kapazitaet": 8,
-        },
-        {
-            "name": "Presse_02",
-            "typ": "Xpert",
-            "halle": "B",
-            "baujahr": 2021,
-            "kapazitaet": 8,
-        },
-        {
-            "name": "Stanze_01",
-            "typ": "ByTrans",
-            "halle": "C",
-            "baujahr": 2017,
-            "kapazitaet": 6,
-        },
-    ]
-
-    produkte = ["Teil_A", "Teil_B", "Teil_C", "Teil_D", "Teil_E"]
-
-    # Produktkomplexität definieren
-    produkt_faktoren = {
-        "Teil_A": {"komplexitaet": 1.2, "ausschuss_basis": 0.02},
-        "Teil_B": {"komplexitaet": 1.0, "ausschuss_basis": 0.03},
-        "Teil_C": {"komplexitaet": 0.8, "ausschuss_basis": 0.05},
-        "Teil_D": {"komplexitaet": 1.1, "ausschuss_basis": 0.025},
-        "Teil_E": {"komplexitaet": 1.3, "ausschuss_basis": 0.02},
-    }
-
-    data = []
-    for timestamp in date_range:
-        for maschine in maschinen_config:
-            # 85% Wahrscheinlichkeit für Produktionsdaten pro Stunde
-            if np.random.random() < 0.85:
-                # Wochenende: reduzierte Produktion
-                if timestamp.weekday() >= 5:  # Samstag/Sonntag
-                    if np.random.random() < 0.7:  # 70% weniger Produktion
-                        continue
-
-                # Nachtschicht: etwas weniger Produktion
-                stunde = timestamp.hour
-                if 22 <= stunde or stunde < 6:  # Nachtschicht
-                    if np.random.random() < 0.1:  # 10% weniger
-                        continue
-
-                # Schicht bestimmen
-                if 6 <= stunde < 14:
-                    schicht = "Früh"
-                elif 14 <= stunde < 22:
-                    schicht = "Spät"
-                else:
-                    schicht = "Nacht"
-
-                # Produkt wählen (gewichtet nach Häufigkeit)
-                produkt = np.random.choice(
-                    produkte,
-                    p=[0.3, 0.25, 0.2, 0.15, 0.1],  # Teil_A am häufigsten
-                )
-
-                # Basis-Produktionszeit mit Maschinen- und Schicht-Faktoren
-                basis_prod = np.random.uniform(
-                    maschine["kapazitaet"] * 0.6, maschine["kapazitaet"] * 0.95
-                )
-
-                # Schicht-Faktoren
-                schicht_faktoren = {"Früh": 1.0, "Spät": 0.95, "Nacht": 0.85}
-                produktionszeit = basis_prod * schicht_faktoren[schicht]
-
-                # Produkt-Komplexität berücksichtigen
-                produktionszeit *= produkt_faktoren[produkt]["komplexitaet"]
-
-                # Maschinen-Alter berücksichtigen
-                alter = 2024 - maschine["baujahr"]
-                effizienz_faktor = max(0.8, 1 - (alter * 0.02))  # 2% pro Jahr
-                produktionszeit *= effizienz_faktor
-
-                # Stückzahl berechnen
-                stueck_pro_stunde = np.random.uniform(15, 25) / produktionszeit
-                stueckzahl = int(stueck_pro_stunde * produktionszeit)
-
-                # Qualitäts-Parameter
-                basis_ausschuss = produkt_faktoren[produkt]["ausschuss_basis"]
-                # Nachtschicht: etwas höherer Ausschuss
-                if schicht == "Nacht":
-                    basis_ausschuss *= 1.2
-                ausschuss_rate = np.random.normal(
-                    basis_ausschuss, basis_ausschuss * 0.3
-                )
-                ausschuss_rate = max(0.001, min(0.15, ausschuss_rate))  # Grenzen
-
-                # Temperatur (abhängig von Maschinentyp und Auslastung)
-                basis_temp = {"ByStar": 24, "Xpert": 22, "ByTrans": 20}[maschine["typ"]]
-                temp_variation = (
-                    produktionszeit / maschine["kapazitaet"]
-                ) * 3  # Höhere Last = höhere Temp
-                temperatur = basis_temp + temp_variation + np.random.normal(0, 1.5)
-
-                # Energie (abhängig von Typ und Last)
-                energie_basis = {"ByStar": 200, "Xpert": 150, "ByTrans": 100}[
-                    maschine["typ"]
-                ]
-                energieverbrauch = energie_basis * (
-                    produktionszeit / maschine["kapazitaet"]
-                ) + np.random.normal(0, 20)
-
-                # Wartungsindikatoren
-                wartung_score = np.random.uniform(0.8, 1.0)
-                if alter > 5:  # Ältere Maschinen
-                    wartung_score -= 0.1
-
-                data.append(
-                    {
-                        "Timestamp": timestamp,
-                        "Maschine": maschine["name"],
-                        "Typ": maschine["typ"],
-                        "Halle": maschine["halle"],
-                        "Baujahr": maschine["baujahr"],
-                        "Schicht": schicht,
-                        "Produkt": produkt,
-                        "Produktionszeit_h": round(produktionszeit, 2),
-                        "Stückzahl": stueckzahl,
-                        "Ausschuss_Rate": round(ausschuss_rate, 4),
-                        "Temperatur_C": round(temperatur, 1),
-                        "Energieverbrauch_kWh": round(energieverbrauch, 1),
-                        "Wartung_Score": round(wartung_score, 3),
-                        "Wochentag": timestamp.strftime("%A"),
-                        "KW": timestamp.isocalendar()[1],
-                        "Monat": timestamp.month,
-                        "Quartal": timestamp.quarter,
-                    }
-                )
-
-    return pd.DataFrame(data)
+    # Maschinenpark, Produkte, Schicht- und Altersfaktoren: siehe
+    # telemetrie_generator.MACHINE_FLEET / PRODUCTS
+    date_range = pd.date_range("2024-01-01", "2024-03-31", freq="h")
+    return generate_production_log(date_range, seed=42)
 
 
 def create_master_data():
@@ -457,13 +306,26 @@ d) Stückzahl nach Produkt × KW (Kalenderwoche)
 """
 )
 
+# Summen und Anzahlen einmal pro Dimensions-Kombination aggregieren;
+# alle Pivots werden aus dem Würfel statt aus den Rohdaten berechnet
+produktions_wuerfel = AggregateCube.from_frame(
+    df_produktion,
+    dimensions=["Maschine", "Schicht", "Halle", "Produkt", "Typ", "Monat", "KW"],
+    measures=[
+        "Produktionszeit_h",
+        "Ausschuss_Rate",
+        "Energieverbrauch_kWh",
+        "Stückzahl",
+    ],
+)
+print(f"🧊 Aggregat-Würfel: {len(produktions_wuerfel.cells)} Zellen")
+
 print("a) Produktionszeit nach Maschine × Schicht:")
 # IHRE LÖSUNG HIER:
-pivot_prod_maschine_schicht = df_produktion.pivot_table(
-    values="Produktionszeit_h",
+pivot_prod_maschine_schicht = produktions_wuerfel.pivot(
+    "Produktionszeit_h",
     index="Maschine",
     columns="Schicht",
-    aggfunc="sum",
     fill_value=0,
     margins=True,  # Gesamtsummen
     margins_name="Total",
@@ -473,13 +335,11 @@ print("📋 PIVOT: Produktionszeit (Stunden) - Maschine × Schicht")
 print(pivot_prod_maschine_schicht)
 
 # Zusätzliche Analyse: Prozentuale Verteilung
-pivot_prod_prozent = df_produktion.pivot_table(
-    values="Produktionszeit_h",
-    index="Maschine",
-    columns="Schicht",
-    aggfunc="sum",
-    fill_value=0,
-    normalize="index",  # Prozent pro Zeile (Maschine)
+pivot_prod_summe = produktions_wuerfel.pivot(
+    "Produktionszeit_h", index="Maschine", columns="Schicht", fill_value=0
+)
+pivot_prod_prozent = pivot_prod_summe.div(
+    pivot_prod_summe.sum(axis=1), axis=0  # Anteil pro Zeile (Maschine)
 ).round(3)
 
 print("\\n📊 PIVOT: Produktionszeit-Verteilung (%) - Maschine × Schicht")
@@ -487,8 +347,8 @@ print(pivot_prod_prozent)
 
 print("\\nb) Ausschussrate nach Halle × Produkt:")
 # IHRE LÖSUNG HIER:
-pivot_ausschuss_halle_produkt = df_produktion.pivot_table(
-    values="Ausschuss_Rate",
+pivot_ausschuss_halle_produkt = produktions_wuerfel.pivot(
+    "Ausschuss_Rate",
     index="Halle",
     columns="Produkt",
     aggfunc="mean",
@@ -509,11 +369,10 @@ for halle in problem_combinations.index:
 
 print("\\nc) Energieverbrauch nach Typ × Monat:")
 # IHRE LÖSUNG HIER:
-pivot_energie_typ_monat = df_produktion.pivot_table(
-    values="Energieverbrauch_kWh",
+pivot_energie_typ_monat = produktions_wuerfel.pivot(
+    "Energieverbrauch_kWh",
     index="Typ",
     columns="Monat",
-    aggfunc="sum",
     fill_value=0,
     margins=True,
 ).round(1)
@@ -521,33 +380,22 @@ pivot_energie_typ_monat = df_produktion.pivot_table(
 print("📋 PIVOT: Energieverbrauch (kWh) - Typ × Monat")
 print(pivot_energie_typ_monat)
 
-# Energieeffizienz pro Stück
-pivot_energie_effizienz = (
-    df_produktion.groupby(["Typ", "Monat"])
-    .agg({"Energieverbrauch_kWh": "sum", "Stückzahl": "sum"})
-    .reset_index()
-)
-pivot_energie_effizienz["Energie_pro_Stück"] = (
-    pivot_energie_effizienz["Energieverbrauch_kWh"]
-    / pivot_energie_effizienz["Stückzahl"]
+# Energieeffizienz pro Stück: Verhältnis der Summen je Zelle
+pivot_effizienz = produktions_wuerfel.ratio(
+    "Energieverbrauch_kWh", "Stückzahl", index="Typ", columns="Monat", fill_value=0
 ).round(3)
 
-pivot_effizienz = pivot_energie_effizienz.pivot_table(
-    values="Energie_pro_Stück", index="Typ", columns="Monat", fill_value=0
-)
-
 print("\\n⚡ PIVOT: Energieeffizienz (kWh/Stück) - Typ × Monat")
 print(pivot_effizienz)
 
 print("\\nd) Stückzahl nach Produkt × KW:")
 # IHRE LÖSUNG HIER:
 # Nur erste 8 Kalenderwochen für bessere Lesbarkeit
-kw_filter = df_produktion["KW"] <= 8
-pivot_stueck_produkt_kw = df_produktion[kw_filter].pivot_table(
-    values="Stückzahl",
+erste_wochen = produktions_wuerfel.select(lambda cells: cells["KW"] <= 8)
+pivot_stueck_produkt_kw = erste_wochen.pivot(
+    "Stückzahl",
     index="Produkt",
     columns="KW",
-    aggfunc="sum",
     fill_value=0,
     margins=True,
 )
@@ -607,23 +455,36 @@ d) Analysieren Sie saisonale Muster und Trends
 df_time = df_produktion.copy()
 df_time = df_time.set_index("Timestamp")
 
+# Zeit-Pyramide: Stunden-, Tages- und Wochenwerte einmal vorberechnen,
+# alle folgenden Zeitreihen-Abfragen lesen keine Rohzeilen mehr
+zeit_pyramide = RollupPyramid(
+    [
+        "Produktionszeit_h",
+        "Stückzahl",
+        "Ausschuss_Rate",
+        "Energieverbrauch_kWh",
+        "Temperatur_C",
+        "Wartung_Score",
+    ]
+).update(df_time)
+
 print("a) Tägliche Produktions-Aggregate:")
 # IHRE LÖSUNG HIER:
 daily_production = (
-    df_time.groupby(df_time.index.date)
-    .agg(
+    zeit_pyramide.query(
+        "D",
         {
             "Produktionszeit_h": "sum",
             "Stückzahl": "sum",
             "Ausschuss_Rate": "mean",
             "Energieverbrauch_kWh": "sum",
             "Temperatur_C": "mean",
-        }
+        },
     )
+    .rename_axis(None)
     .round(2)
 )
 
-daily_production.index = pd.to_datetime(daily_production.index)
 daily_production["Produktivitaet"] = (
     daily_production["Stückzahl"] / daily_production["Produktionszeit_h"]
 ).round(2)
@@ -641,8 +502,8 @@ print(
 print("\\nb) Wöchentliches Resampling:")
 # IHRE LÖSUNG HIER:
 weekly_production = (
-    df_time.resample("W")
-    .agg(
+    zeit_pyramide.query(
+        "W",
         {
             "Produktionszeit_h": "sum",
             "Stückzahl": "sum",
@@ -650,7 +511,7 @@ weekly_production = (
             "Energieverbrauch_kWh": "sum",
             "Temperatur_C": "mean",
             "Wartung_Score": "mean",
-        }
+        },
     )
     .round(2)
 )
@@ -710,12 +571,10 @@ print(
 print("\\nd) Saisonale Muster und Trends:")
 # IHRE LÖSUNG HIER:
 # Wochentags-Analyse
-df_time["Wochentag_Num"] = df_time.index.dayofweek  # 0=Montag, 6=Sonntag
-wochentag_pattern = (
-    df_time.groupby("Wochentag_Num")
-    .agg({"Produktionszeit_h": "mean", "Stückzahl": "mean", "Ausschuss_Rate": "mean"})
-    .round(2)
-)
+wochentag_pattern = zeit_pyramide.profile(
+    "dayofweek",  # 0=Montag, 6=Sonntag
+    {"Produktionszeit_h": "mean", "Stückzahl": "mean", "Ausschuss_Rate": "mean"},
+).round(2)
 
 # Wochentags-Namen hinzufügen
 wochentag_namen = [
@@ -734,11 +593,10 @@ print("📅 WOCHENTAGS-MUSTER:")
 print(wochentag_pattern)
 
 # Stunden-Analyse (Produktionsverteilung über den Tag)
-stunden_pattern = (
-    df_time.groupby(df_time.index.hour)
-    .agg({"Produktionszeit_h": "mean", "Stückzahl": "mean", "Ausschuss_Rate": "mean"})
-    .round(2)
-)
+stunden_pattern = zeit_pyramide.profile(
+    "hour",
+    {"Produktionszeit_h": "mean", "Stückzahl": "mean", "Ausschuss_Rate": "mean"},
+).round(2)
 
 print("\\n🕐 STUNDEN-MUSTER (Auswahl: 6-22 Uhr):")
 print(stunden_pattern.loc[6:22])
@@ -750,11 +608,10 @@ print(f"\\n🏆 Produktivste Stunde: {beste_stunde_prod:02d}:00 Uhr")
 print(f"⚠️ Schlechteste Qualität: {schlechteste_stunde_qual:02d}:00 Uhr")
 
 # Monatliche Trends
-monthly_comparison = (
-    df_time.groupby(df_time.index.month)
-    .agg({"Produktionszeit_h": "sum", "Stückzahl": "sum", "Ausschuss_Rate": "mean"})
-    .round(2)
-)
+monthly_comparison = zeit_pyramide.profile(
+    "month",
+    {"Produktionszeit_h": "sum", "Stückzahl": "sum", "Ausschuss_Rate": "mean"},
+).round(2)
 
 monthly_comparison.index = ["Januar", "Februar", "März"][: len(monthly_comparison)]
 print("\\n📆 MONATLICHE ENTWICKLUNG:")
@@ -791,7 +648,7 @@ d) Erstellen Sie einen vollständig angereicherten Datensatz
 
 print("a) Produktionsdaten mit Maschinenstamm verknüpfen:")
 # IHRE LÖSUNG HIER:
-df_enriched = df_produktion.merge(df_maschinen, on="Maschine", how="left")
+df_enriched = enrich(df_produktion, {"Maschine": df_maschinen})
 
 print(f"✅ Maschinenstamm-JOIN: {len(df_enriched)} Datensätze")
 print("Neue Spalten durch JOIN:")
@@ -824,7 +681,7 @@ print(
 
 print("\\nb) Produktdaten für Kosten-Analyse joinen:")
 # IHRE LÖSUNG HIER:
-df_enriched = df_enriched.merge(df_produkte, on="Produkt", how="left")
+df_enriched = enrich(df_enriched, {"Produkt": df_produkte})
 
 print(f"✅ Produktstamm-JOIN: {len(df_enriched)} Datensätze")
 print("Neue Spalten durch Produkt-JOIN:")
@@ -868,7 +725,7 @@ print(df_enriched[cost_columns].head())
 
 print("\\nc) Kostenstellen-Informationen ergänzen:")
 # IHRE LÖSUNG HIER:
-df_enriched = df_enriched.merge(df_kostenstellen, on="Halle", how="left")
+df_enriched = enrich(df_enriched, {"Halle": df_kostenstellen})
 
 print(f"✅ Kostenstellen-JOIN: {len(df_enriched)} Datensätze")
 
@@ -984,7 +841,7 @@ numeric_columns = df_enriched.select_dtypes(include=[np.number]).columns.tolist(
 exclude_cols = ["Timestamp", "KW", "Monat", "Quartal", "Baujahr"]
 numeric_columns = [col for col in numeric_columns if col not in exclude_cols]
 
-correlation_matrix = df_enriched[numeric_columns].corr().round(3)
+correlation_matrix = compute_correlations(df_enriched, numeric_columns).round(3)
 
 print("📊 KORRELATIONSMATRIX (Auswahl wichtiger Variablen):")
 # Nur wichtigste Variablen anzeigen
@@ -1003,23 +860,10 @@ print(correlation_matrix.loc[wichtige_vars, wichtige_vars])
 
 print("\\nb) Starke Korrelationen identifizieren:")
 # IHRE LÖSUNG HIER:
-starke_korrelationen = []
-
-for i in range(len(correlation_matrix.columns)):
-    for j in range(i + 1, len(correlation_matrix.columns)):
-        corr_value = correlation_matrix.iloc[i, j]
-        if abs(corr_value) > 0.5:  # Starke Korrelation
-            starke_korrelationen.append(
-                {
-                    "Variable_1": correlation_matrix.columns[i],
-                    "Variable_2": correlation_matrix.columns[j],
-                    "Korrelation": corr_value,
-                    "Stärke": "Stark" if abs(corr_value) > 0.7 else "Mittel",
-                }
-            )
+korr_df = correlation_pairs(correlation_matrix, threshold=0.5)
+korr_df["Stärke"] = np.where(korr_df["Korrelation"].abs() > 0.7, "Stark", "Mittel")
 
-if starke_korrelationen:
-    korr_df = pd.DataFrame(starke_korrelationen)
+if not korr_df.empty:
     korr_df = korr_df.sort_values("Korrelation", key=abs, ascending=False)
     print("🔍 STARKE KORRELATIONEN (|r| > 0.5):")
     print(korr_df.head(10))
@@ -1038,12 +882,9 @@ print("\\nc) Ausreisser-Analyse:")
 
 # IHRE LÖSUNG HIER:
 def identify_outliers_iqr(series, column_name):
-    """Identifiziert Ausreisser mit IQR-Methode"""
-    Q1 = series.quantile(0.25)
-    Q3 = series.quantile(0.75)
-    IQR = Q3 - Q1
-    lower_bound = Q1 - 1.5 * IQR
-    upper_bound = Q3 + 1.5 * IQR
+    """Identifiziert Ausreisser mit IQR-Methode (Quantil-Sketch)"""
+    Q1, Q3 = QuantileSketch().update(series).quantile([0.25, 0.75])
+    lower_bound, upper_bound = iqr_bounds(Q1, Q3)
 
     outliers_mask = (series < lower_bound) | (series > upper_bound)
     outliers_count = outliers_mask.sum()
@@ -8,8 +8,10 @@ mit verschiedenen Plot-Techniken speziell für Bystronic-Anwendungen.
 Autor: Python Grundkurs Bystronic
 """
 
+import sys
 import warnings
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
@@ -17,6 +19,18 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+# Die Beispielmodule sind kein Paket: Modul 06 wie in tests/ über sys.path
+DATENIMPORT_PATH = Path(__file__).resolve().parents[2] / "06_datenimport" / "beispiele"
+sys.path.insert(0, str(DATENIMPORT_PATH))
+from energie_lastprofil import (  # noqa: E402
+    KANAL_BEREICHE,
+    LoadProfileAccumulator,
+    area_share,
+    daily_profile,
+    energy_per_period,
+    simulate_power_blocks,
+)
+
 # Warnings für bessere Lesbarkeit unterdrücken
 warnings.filterwarnings("ignore")
 
@@ -692,65 +706,20 @@ def demo_energieanalyse() -> None:
     # Energiedaten für verschiedene Bereiche
     bereiche = ["Laser-Schneiden", "Biegen", "Stanzen", "Schweißen", "Hilfssysteme"]
 
-    # 24-Stunden Verbrauchsprofil
-    stunden = np.arange(24)
-    np.random.seed(42)
-
-    # Grundlast und Produktionszeiten simulieren
-    grundlast = [
-        20,
-        18,
-        16,
-        15,
-        15,
-        18,
-        25,
-        35,
-        45,
-        50,
-        55,
-        60,
-        65,
-        70,
-        68,
-        65,
-        60,
-        55,
-        45,
-        40,
-        35,
-        30,
-        25,
-        22,
-    ]
-
-    verbrauch_profile = {}
-    for _i, bereich in enumerate(bereiche):
-        # Individuelle Profile mit unterschiedlichen Faktoren
-        if "Laser" in bereich:
-            faktor = 1.5
-            spitzenzeiten = [8, 9, 10, 13, 14, 15]  # Hauptproduktionszeiten
-        elif "Biegen" in bereich:
-            faktor = 0.8
-            spitzenzeiten = [10, 11, 14, 15, 16]
-        elif "Stanzen" in bereich:
-            faktor = 1.2
-            spitzenzeiten = [9, 10, 11, 13, 14]
-        else:
-            faktor = 0.6
-            spitzenzeiten = [8, 9, 10, 11, 12, 13, 14, 15, 16]
-
-        profile = np.array(grundlast) * faktor
-
-        # Spitzenzeiten verstärken
-        for spitze in spitzenzeiten:
-            profile[spitze] *= 1.4
+    # Eine Woche Leistungskanäle (1 s Abtastung) zu Viertelstunden integrieren
+    woche = pd.Timestamp("2025-03-03")
+    kanaele = list(KANAL_BEREICHE)
+    lastprofil = LoadProfileAccumulator(1000, woche, kanaele, areas=KANAL_BEREICHE)
+    for block in simulate_power_blocks(woche, days=7, channels=kanaele):
+        lastprofil.update(block.to_numpy())
+    lastprofil = lastprofil.profile()
 
-        # Rauschen hinzufügen
-        profile += np.random.normal(0, profile * 0.1)
-        profile = np.maximum(profile, 0)  # Keine negativen Werte
-
-        verbrauch_profile[bereich] = profile
+    # 24-Stunden Verbrauchsprofil: mittlere Leistung je Stunde über die Woche
+    stunden = np.arange(24)
+    tagesprofil = daily_profile(lastprofil)
+    verbrauch_profile = {
+        bereich: tagesprofil[bereich].to_numpy() for bereich in bereiche
+    }
 
     plt.figure(figsize=(16, 12))
 
@@ -780,9 +749,8 @@ def demo_energieanalyse() -> None:
     # 2. Verbrauch nach Bereichen (Pie Chart)
     ax2 = plt.subplot2grid((3, 3), (0, 2))
 
-    tagesverbrauch = {
-        bereich: np.sum(profile) for bereich, profile in verbrauch_profile.items()
-    }
+    anteile = area_share(lastprofil)["Energie_kWh"]
+    tagesverbrauch = {bereich: anteile[bereich] / 7 for bereich in bereiche}
 
     wedges, texts, autotexts = ax2.pie(
         tagesverbrauch.values(),
@@ -800,16 +768,12 @@ def demo_energieanalyse() -> None:
     # 3. Wöchlicher Trend
     ax3 = plt.subplot2grid((3, 3), (1, 0), colspan=2)
 
-    # 7-Tage-Daten simulieren
+    # Tagesenergie je Bereich aus dem Lastprofil (Wochenende reduziert)
     wochentage = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
-    wochen_faktoren = [1.0, 1.0, 1.0, 1.0, 1.0, 0.6, 0.3]  # Wochenende reduziert
-
-    wochenverbrauch = {}
-    for bereich in bereiche:
-        tagesverbrauch_bereich = np.sum(verbrauch_profile[bereich])
-        wochenverbrauch[bereich] = [
-            tagesverbrauch_bereich * faktor for faktor in wochen_faktoren
-        ]
+    tagesenergie = energy_per_period(lastprofil, "1D")
+    wochenverbrauch = {
+        bereich: tagesenergie[bereich].to_numpy() for bereich in bereiche
+    }
 
     # Stacked Bar Chart
     bottom = np.zeros(7)
@@ -15,13 +15,20 @@ Lernziele:
 Autor: Python Grundkurs Bystronic
 """
 
+import sys
 import warnings
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+# Die Beispielmodule sind kein Paket: Modul 04 wie in tests/ über sys.path
+PANDAS_PATH = Path(__file__).resolve().parents[2] / "04_pandas" / "beispiele"
+sys.path.insert(0, str(PANDAS_PATH))
+from telemetrie_generator import generate_performance_data  # noqa: E402
+
 # Plotly für interaktive Dashboards (optional)
 try:
     import plotly.express as px  # noqa: F401
@@ -69,56 +76,22 @@ class ProductionDataGenerator:
 
     def __init__(self, seed: int = 42):
         np.random.seed(seed)
-        self.machines = ["Laser A", "Laser B", "Presse C", "Biege D", "Stanz E"]
+        self.rng = np.random.default_rng(seed)
+        # Realistische Grundleistung je Maschine in %
+        self.base_performance = {
+            "Laser A": 85,
+            "Laser B": 90,
+            "Presse C": 75,
+            "Biege D": 80,
+            "Stanz E": 95,
+        }
+        self.machines = list(self.base_performance)
         self.shifts = ["Früh", "Spät", "Nacht"]
 
     def generate_realtime_data(self, hours: int = 24) -> pd.DataFrame:
-        """Generiert Echtzeit-Produktionsdaten"""
-        now = datetime.now()
-        timestamps = [now - timedelta(minutes=x * 5) for x in range(hours * 12)]
-        timestamps.reverse()
-
-        data = []
-        for ts in timestamps:
-            for machine in self.machines:
-                # Realistische Schwankungen je Maschine
-                base_performance = {
-                    "Laser A": 85,
-                    "Laser B": 90,
-                    "Presse C": 75,
-                    "Biege D": 80,
-                    "Stanz E": 95,
-                }
-
-                performance = base_performance[machine] + np.random.normal(0, 5)
-                performance = np.clip(performance, 50, 100)
-
-                # Temperatur abhängig von Performance
-                temperature = 65 + performance * 0.3 + np.random.normal(0, 3)
-                temperature = np.clip(temperature, 60, 120)
-
-                # Qualität korreliert negativ mit zu hoher Temperatur
-                quality = 98 - max(0, temperature - 95) * 2 + np.random.normal(0, 1)
-                quality = np.clip(quality, 85, 100)
-
-                # Energieverbrauch
-                power = 2000 + performance * 15 + np.random.normal(0, 100)
-                power = np.clip(power, 1500, 4000)
-
-                data.append(
-                    {
-                        "timestamp": ts,
-                        "machine": machine,
-                        "performance": performance,
-                        "temperature": temperature,
-                        "quality": quality,
-                        "power_consumption": power,
-                        "shift": self.get_shift(ts),
-                        "status": self.get_machine_status(performance),
-                    }
-                )
-
-        return pd.DataFrame(data)
+        """Generiert Echtzeit-Produktionsdaten (alle Zeilen auf einmal)"""
+        timestamps = pd.date_range(end=datetime.now(), periods=hours * 12, freq="5min")
+        return generate_performance_data(self.base_performance, timestamps, self.rng)
 
     def get_shift(self, timestamp: datetime) -> str:
         """Bestimmt Schicht basierend auf Uhrzeit"""
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Batch Import - Paralleler Import vieler Dateien mit Import-Log
+
+Importiert Listen oder Glob-Muster gemischter CSV/XLSX/JSON-Dateien
+parallel: Threads lesen die Dateien (I/O), Prozesse parsen sie (CPU).
+Optional werden die Daten chunkweise validiert. Alle Ergebnisse landen in
+einem gemeinsamen Import-Log mit Zeilen/s, Bytes/s und Fehlerdetails.
+
+Autor: Python Grundkurs Bystronic
+"""
+
+import io
+import json
+import multiprocessing
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from import_registry import registry
+from validierungs_regeln import ValidationRuleEngine
+
+warnings.filterwarnings("ignore")
+
+
+def get_data_path(*args):
+    """
+    Hilfsfunktion zum korrekten Konstruieren der Datenpfade
+    """
+    project_root = Path(__file__).parent.parent.parent.parent
+    data_path = project_root / "data"
+    for arg in args:
+        data_path = data_path / arg
+    return data_path
+
+
+def expand_sources(sources) -> list[Path]:
+    """
+    Löst Dateilisten und Glob-Muster in eine sortierte Dateiliste auf
+
+    Parameters:
+    -----------
+    sources : str, Path or list
+        Einzelne Datei, Glob-Muster (z.B. "daten/**/*.csv") oder Liste davon
+
+    Returns:
+    --------
+    list
+        Eindeutige Dateipfade in Eingabereihenfolge
+    """
+    if isinstance(sources, str | Path):
+        sources = [sources]
+
+    files = []
+    for source in sources:
+        source = Path(source)
+        if "**" in source.parts:
+            anchor = Path(*source.parts[: source.parts.index("**")])
+            pattern = str(Path(*source.parts[source.parts.index("**") :]))
+            files.extend(sorted(p for p in anchor.glob(pattern) if p.is_file()))
+        elif any(char in source.name for char in "*?["):
+            files.extend(
+                sorted(p for p in source.parent.glob(source.name) if p.is_file())
+            )
+        else:
+            files.append(source)
+
+    return list(dict.fromkeys(files))
+
+
+def _prefetch_file(file_path) -> dict:
+    """Liest eine Datei komplett in den Speicher (läuft im Thread-Pool)"""
+    start = time.perf_counter()
+    payload = {"file_path": str(file_path), "data": None, "error": None}
+    try:
+        payload["data"] = Path(file_path).read_bytes()
+    except Exception as e:
+        payload["error"] = str(e)
+    payload["read_seconds"] = time.perf_counter() - start
+    return payload
+
+
+def _parse_payload(payload, settings, validator=None, chunksize=None, **kwargs) -> dict:
+    """
+    Parst eine vorab gelesene Datei (läuft im Prozess-Pool)
+
+    Liegt auf Modulebene, damit sie gepickelt werden kann. Bei gesetztem
+    chunksize werden CSV und NDJSON chunkweise gelesen und jeder Chunk sofort
+    validiert; andere Formate werden nach dem Parsen in Chunks validiert.
+    """
+    start = time.perf_counter()
+    result = {"data": None, "error": None, "validation": []}
+
+    try:
+        buffer = io.BytesIO(payload["data"])
+        if chunksize and settings["format"] in ("csv", "ndjson"):
+            reader, _ = registry.read(
+                buffer, settings=settings, chunksize=chunksize, **kwargs
+            )
+            chunks = []
+            offset = 0
+            for chunk in reader:
+                if validator is not None:
+                    result["validation"].extend(
+                        _validate_chunk(validator, chunk, offset)
+                    )
+                offset += len(chunk)
+                chunks.append(chunk)
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+        else:
+            df, _ = registry.read(buffer, settings=settings, **kwargs)
+            if validator is not None:
+                step = chunksize or max(len(df), 1)
+                for offset in range(0, len(df), step):
+                    result["validation"].extend(
+                        _validate_chunk(
+                            validator, df.iloc[offset : offset + step], offset
+                        )
+                    )
+
+        result["data"] = df
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["parse_seconds"] = time.perf_counter() - start
+    return result
+
+
+def _validate_chunk(validator, chunk: pd.DataFrame, offset: int) -> list[str]:
+    """Ruft den Validator für einen Chunk auf und ergänzt den Zeilenbereich"""
+    issues = validator(chunk) or []
+    if isinstance(issues, str):
+        issues = [issues]
+    return [f"Zeilen {offset}-{offset + len(chunk) - 1}: {issue}" for issue in issues]
+
+
+def create_import_summary(import_results, wall_seconds: float = None) -> dict:
+    """
+    Erstellt eine Zusammenfassung der Import-Ergebnisse
+
+    Erweitert die Zusammenfassung aus Übung 2 (04_pandas) um
+    Durchsatzkennzahlen über alle Dateien.
+    """
+    total_bytes = sum(r.get("bytes", 0) for r in import_results)
+    total_records = sum(r.get("records_imported", 0) for r in import_results)
+
+    summary = {
+        "total_imports": len(import_results),
+        "successful_imports": sum(1 for r in import_results if r["success"]),
+        "failed_imports": sum(1 for r in import_results if not r["success"]),
+        "total_records": total_records,
+        "total_bytes": total_bytes,
+        "validation_issues": sum(len(r.get("validation", [])) for r in import_results),
+        "wall_seconds": wall_seconds,
+        "import_log": import_results,
+    }
+
+    if wall_seconds:
+        summary["rows_per_s"] = round(total_records / wall_seconds, 1)
+        summary["bytes_per_s"] = round(total_bytes / wall_seconds, 1)
+
+    return summary
+
+
+def batch_import(
+    sources,
+    io_workers: int = 8,
+    parse_workers: int = None,
+    validator=None,
+    chunksize: int = None,
+    combine: bool = False,
+    source_column: str = "Quelldatei",
+    window: int = None,
+    **kwargs,
+):
+    """
+    Importiert viele Dateien parallel und erstellt ein gemeinsames Import-Log
+
+    Die Dateien werden fensterweise verarbeitet: Während ein Fenster im
+    Prozess-Pool geparst wird, liest der Thread-Pool bereits das nächste.
+    So bleibt der Speicherbedarf auf zwei Fenster begrenzt.
+
+    Parameters:
+    -----------
+    sources : str, Path or list
+        Dateien oder Glob-Muster (gemischt CSV/XLSX/JSON)
+    io_workers : int
+        Threads für das Lesen der Dateien
+    parse_workers : int, optional
+        Prozesse für das Parsen (Standard: Anzahl CPU-Kerne). Mit 1 wird
+        im aktuellen Prozess geparst.
+    validator : callable, optional
+        Funktion validator(chunk) -> Liste von Meldungen; muss für den
+        Prozess-Pool auf Modulebene definiert sein
+    chunksize : int, optional
+        Zeilen pro Validierungs-Chunk (CSV und NDJSON werden dann
+        gestreamt gelesen)
+    combine : bool
+        Alle Ergebnisse zu einem DataFrame mit Quelldatei-Spalte vereinen
+    source_column : str
+        Name der Quelldatei-Spalte bei combine=True
+    window : int, optional
+        Dateien pro Fenster (Standard: 4 × parse_workers)
+    **kwargs
+        Weitere Reader-Optionen (z.B. usecols, dtype)
+
+    Returns:
+    --------
+    tuple
+        (DataFrame bei combine=True, sonst Dict {Datei: DataFrame}; Zusammenfassung)
+    """
+    files = expand_sources(sources)
+    parse_workers = max(1, parse_workers or os.cpu_count() or 1)
+    window = window or 4 * parse_workers
+    windows = [files[i : i + window] for i in range(0, len(files), window)]
+
+    print(
+        f"📦 Batch-Import: {len(files)} Dateien, {io_workers} I/O-Threads, "
+        f"{parse_workers} Parse-Prozess(e)"
+    )
+
+    frames = {}
+    import_results = []
+    start = time.perf_counter()
+
+    parse_pool = None
+    if parse_workers > 1:
+        # Kein fork(): der Thread-Pool läuft bereits, fork wäre nicht sicher
+        start_methods = multiprocessing.get_all_start_methods()
+        method = "forkserver" if "forkserver" in start_methods else "spawn"
+        parse_pool = ProcessPoolExecutor(
+            parse_workers, mp_context=multiprocessing.get_context(method)
+        )
+    try:
+        with ThreadPoolExecutor(io_workers) as io_pool:
+            pending = (
+                [io_pool.submit(_prefetch_file, f) for f in windows[0]]
+                if windows
+                else []
+            )
+
+            for index in range(len(windows)):
+                # Nächstes Fenster schon lesen, während dieses geparst wird
+                upcoming = []
+                if index + 1 < len(windows):
+                    upcoming = [
+                        io_pool.submit(_prefetch_file, f) for f in windows[index + 1]
+                    ]
+
+                jobs = []
+                for future in pending:
+                    payload = future.result()
+                    log = _new_log_entry(payload)
+
+                    if payload["error"] is None:
+                        try:
+                            # Erkennung im Hauptprozess: der Cache gilt für alle Dateien
+                            settings = registry.sniff(
+                                io.BytesIO(payload["data"]), name=payload["file_path"]
+                            )
+                            log["format"] = settings["format"]
+                            log["settings"] = settings
+                        except Exception as e:
+                            payload["error"] = f"{type(e).__name__}: {e}"
+
+                    if payload["error"] is not None:
+                        log["error"] = payload["error"]
+                        jobs.append((log, None))
+                        continue
+
+                    args = (payload, log["settings"], validator, chunksize)
+                    if parse_pool is not None:
+                        jobs.append(
+                            (log, parse_pool.submit(_parse_payload, *args, **kwargs))
+                        )
+                    else:
+                        jobs.append((log, _parse_payload(*args, **kwargs)))
+
+                for log, job in jobs:
+                    if job is not None:
+                        result = job.result() if hasattr(job, "result") else job
+                        _finish_log_entry(log, result)
+                        if result["data"] is not None:
+                            frames[log["file_path"]] = result["data"]
+                    import_results.append(log)
+                    _print_log_entry(log)
+
+                pending = upcoming
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
+
+    summary = create_import_summary(import_results, time.perf_counter() - start)
+    print(
+        f"✅ {summary['successful_imports']}/{summary['total_imports']} Dateien, "
+        f"{summary['total_records']:,} Zeilen in {summary['wall_seconds']:.2f}s"
+    )
+
+    if combine:
+        parts = [
+            df.assign(**{source_column: Path(name).name}) for name, df in frames.items()
+        ]
+        return (
+            pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+        ), summary
+
+    return frames, summary
+
+
+def _new_log_entry(payload: dict) -> dict:
+    """Log-Eintrag im Format von robust_import, ergänzt um Durchsatz"""
+    data = payload["data"]
+    return {
+        "file_path": payload["file_path"],
+        "timestamp": datetime.now(),
+        "success": False,
+        "error": None,
+        "records_imported": 0,
+        "warnings": [],
+        "format": None,
+        "settings": {},
+        "bytes": len(data) if data is not None else 0,
+        "read_seconds": round(payload["read_seconds"], 4),
+        "parse_seconds": 0.0,
+        "rows_per_s": 0.0,
+        "bytes_per_s": 0.0,
+        "validation": [],
+    }
+
+
+def _finish_log_entry(log: dict, result: dict) -> None:
+    """Überträgt Parse-Ergebnis und Durchsatz in den Log-Eintrag"""
+    log["parse_seconds"] = round(result["parse_seconds"], 4)
+    log["validation"] = result["validation"]
+
+    if result["error"] is not None:
+        log["error"] = result["error"]
+        return
+
+    rows = len(result["data"])
+    seconds = log["read_seconds"] + result["parse_seconds"]
+    log["success"] = True
+    log["records_imported"] = rows
+    if seconds > 0:
+        log["rows_per_s"] = round(rows / seconds, 1)
+        log["bytes_per_s"] = round(log["bytes"] / seconds, 1)
+    if log["validation"]:
+        log["warnings"].append(f"{len(log['validation'])} Validierungsmeldungen")
+
+
+def _print_log_entry(log: dict) -> None:
+    """Gibt eine Zeile pro importierter Datei aus"""
+    name = Path(log["file_path"]).name
+    if log["success"]:
+        print(
+            f"  ✅ {name}: {log['records_imported']:,} Zeilen, "
+            f"{log['rows_per_s']:,.0f} Zeilen/s, {log['bytes_per_s'] / 1024:,.0f} KB/s"
+        )
+    else:
+        print(f"  ❌ {name}: {log['error']}")
+
+
+def import_log_frame(summary: dict) -> pd.DataFrame:
+    """Wandelt das Import-Log in einen DataFrame (eine Zeile pro Datei)"""
+    columns = [
+        "file_path",
+        "format",
+        "success",
+        "records_imported",
+        "bytes",
+        "read_seconds",
+        "parse_seconds",
+        "rows_per_s",
+        "bytes_per_s",
+        "error",
+    ]
+    log_df = pd.DataFrame(summary["import_log"], columns=columns + ["validation"])
+    log_df["validation_issues"] = log_df.pop("validation").map(len)
+    return log_df
+
+
+def export_import_log(summary: dict, output_path: str) -> None:
+    """
+    Exportiert das konsolidierte Import-Log als JSON
+
+    Parameters:
+    -----------
+    summary : dict
+        Ergebnis von create_import_summary() bzw. batch_import()
+    output_path : str
+        Pfad für die JSON-Datei
+    """
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False, default=str)
+
+    print(f"📊 Import-Log exportiert: {output_path}")
+
+
+PRODUCTION_RULES = ValidationRuleEngine(
+    [
+        {
+            "name": "Temperatur",
+            "column": "Temperatur",
+            "min": 10,
+            "max": 40,
+            "message": "Temperatur ausserhalb 10-40°C",
+        },
+        {
+            "name": "Produktion",
+            "column": "Produktion",
+            "min": 0,
+            "message": "Negative Produktionswerte",
+        },
+    ]
+)
+
+
+def validate_production_chunk(chunk: pd.DataFrame) -> list[str]:
+    """Beispiel-Validator: Wertebereiche typischer Produktionsspalten"""
+    return PRODUCTION_RULES(chunk)
+
+
+def main():
+    """
+    Demonstriert den Batch-Import gemischter Dateien
+    """
+    print("📦 Batch Import - Demo")
+    print("=" * 50)
+
+    demo_dir = get_data_path("generated", "batch_demo")
+    demo_dir.mkdir(parents=True, exist_ok=True)
+
+    rng = np.random.default_rng(42)
+    for day in range(1, 7):
+        df = pd.DataFrame(
+            {
+                "Datum": pd.date_range(f"2024-03-{day:02d}", periods=500, freq="min"),
+                "Maschine": rng.choice(["Laser_01", "Laser_02", "Presse_01"], 500),
+                "Produktion": rng.integers(50, 200, 500),
+                "Temperatur": rng.normal(23, 6, 500).round(1),
+            }
+        )
+        if day % 3 == 0:
+            df.to_excel(demo_dir / f"maschine_2024-03-{day:02d}.xlsx", index=False)
+        elif day % 3 == 1:
+            df.to_csv(
+                demo_dir / f"maschine_2024-03-{day:02d}.csv",
+                sep=";",
+                decimal=",",
+                index=False,
+            )
+        else:
+            df.to_json(
+                demo_dir / f"maschine_2024-03-{day:02d}.json",
+                orient="records",
+                date_format="iso",
+            )
+
+    data, summary = batch_import(
+        demo_dir / "maschine_*",
+        validator=validate_production_chunk,
+        chunksize=200,
+        combine=True,
+    )
+
+    print(f"\n📊 Kombinierte Daten: {data.shape}")
+    print(import_log_frame(summary).to_string(index=False))
+    export_import_log(summary, demo_dir / "import_log.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,9 +15,17 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
+from speicher_optimierung import format_memory_report, optimize_frame
 
 warnings.filterwarnings("ignore")
 
+# "Starttime of export" ist eine Windows-FILETIME: 100-ns-Schritte seit
+# 1601-01-01 UTC. So viele Schritte liegen vor 1970-01-01.
+FILETIME_UNIX_OFFSET = 116_444_736_000_000_000
+
+# Zeitzone der Anlage: Datum und Uhrzeit im Export sind Ortszeit
+PLANT_TIMEZONE = "Europe/Zurich"
+
 
 def get_data_path(*args):
     """
@@ -301,6 +309,7 @@ class BystronicCSVParser:
         encoding: str = None,
         delimiter: str = None,
         max_rows: int = None,
+        optimize: bool = False,
     ) -> dict:
         """
         Hauptfunktion zum Parsen komplexer CSV-Dateien
@@ -319,6 +328,9 @@ class BystronicCSVParser:
             Trennzeichen (automatisch erkannt wenn None)
         max_rows : int, optional
             Maximale Anzahl der zu lesenden Datenzeilen
+        optimize : bool
+            Datentypen mit optimize_frame verkleinern (Bericht in
+            info['memory'])
 
         Returns:
         --------
@@ -346,6 +358,7 @@ class BystronicCSVParser:
 
         # DataFrame erstellen
         df = pd.DataFrame()
+        memory_report = None
 
         if header_line and data_start_line and columns:
             try:
@@ -383,6 +396,10 @@ class BystronicCSVParser:
                             # Behalte als String bei Fehlern
                             pass
 
+                    if optimize:
+                        df, memory_report = optimize_frame(df)
+                        print(f"🗜️ {format_memory_report(memory_report)}")
+
                     print(
                         f"✅ DataFrame erstellt: {df.shape[0]:,} Zeilen × {df.shape[1]} Spalten"
                     )
@@ -411,9 +428,121 @@ class BystronicCSVParser:
                 "data_start_line": data_start_line,
                 "columns": columns if columns else [],
                 "parsing_success": not df.empty,
+                "memory": memory_report,
             },
         }
 
+    def read_scope_header(
+        self,
+        file_path: str,
+        encoding: str = None,
+        delimiter: str = "\t",
+        tz: str = PLANT_TIMEZONE,
+    ) -> dict:
+        """
+        Liest den Kanal-Header eines Scope-Exports (Kanäle als Spaltenpaare)
+
+        Parameters:
+        -----------
+        file_path : str
+            Pfad zum Scope-Export
+        encoding : str, optional
+            Encoding (automatisch erkannt wenn None)
+        delimiter : str
+            Trennzeichen des Exports
+        tz : str, optional
+            Zeitzone der Anlage für 'start_time' (None = UTC ohne Zeitzone)
+
+        Returns:
+        --------
+        Dict
+            'channels', 'comments', 'sample_time_ms', 'value_columns' (Spalte
+            des Werts je Kanal), 'data_start_line' (0-basiert) und, falls
+            vorhanden, 'start_time' (Beginn des Exports in Ortszeit)
+        """
+        encoding = encoding or self.detect_encoding(file_path)
+        header = {"comments": [], "sample_time_ms": []}
+
+        with open(file_path, encoding=encoding, errors="ignore") as f:
+            for line_number, line in enumerate(f):
+                parts = line.rstrip("\r\n").split(delimiter)
+                key = parts[0].strip()
+                # Kanalzeile: "Name<Tab>TEMP_01<Tab>Name<Tab>VIBR_01 ..."
+                if key == "Name" and parts[2:3] == ["Name"]:
+                    header["channels"] = [p.strip() for p in parts[1::2]]
+                    header["value_columns"] = list(range(1, len(parts), 2))
+                elif key == "SymbolComment":
+                    header["comments"] = [p.strip() for p in parts[1::2]]
+                elif key.startswith("SampleTime"):
+                    header["sample_time_ms"] = [float(p) for p in parts[1::2]]
+                elif key == "Starttime of export" and len(parts) > 1:
+                    header["start_time"] = filetime_to_timestamp(parts[1], tz)
+                elif "channels" in header and key:
+                    try:
+                        float(key)
+                    except ValueError:
+                        continue
+                    header["data_start_line"] = line_number
+                    break
+
+        if "data_start_line" not in header:
+            raise ValueError(f"Kein Scope-Export: {Path(file_path).name}")
+        return header
+
+    def iter_scope_chunks(
+        self,
+        file_path: str,
+        channels: list = None,
+        chunksize: int = 100_000,
+        encoding: str = None,
+        delimiter: str = "\t",
+    ):
+        """
+        Liest die Kanalwerte eines Scope-Exports blockweise
+
+        Parameters:
+        -----------
+        file_path : str
+            Pfad zum Scope-Export
+        channels : list, optional
+            Zu lesende Kanäle (Standard: alle); nur deren Spalten werden
+            geparst
+        chunksize : int
+            Zeilen pro Block
+        encoding : str, optional
+            Encoding (automatisch erkannt wenn None)
+        delimiter : str
+            Trennzeichen des Exports
+
+        Yields:
+        -------
+        pd.DataFrame
+            Block mit einer float64-Spalte je Kanal
+        """
+        encoding = encoding or self.detect_encoding(file_path)
+        header = self.read_scope_header(file_path, encoding, delimiter)
+        positions = dict(zip(header["channels"], header["value_columns"], strict=True))
+        channels = channels or header["channels"]
+        missing = [c for c in channels if c not in positions]
+        if missing:
+            raise ValueError(f"Kanäle nicht im Export: {missing}")
+
+        usecols = [positions[c] for c in channels]
+        reader = pd.read_csv(
+            file_path,
+            sep=delimiter,
+            header=None,
+            skiprows=header["data_start_line"],
+            usecols=usecols,
+            dtype=np.float64,
+            encoding=encoding,
+            chunksize=chunksize,
+        )
+        for chunk in reader:
+            # usecols liefert die Spalten in Dateireihenfolge
+            chunk.columns = [c for _, c in sorted(zip(usecols, channels, strict=True))]
+            yield chunk[channels]
+
     def export_parsing_report(self, output_path: str) -> None:
         """
         Exportiert einen Bericht über alle Parsing-Vorgänge
@@ -553,5 +682,91 @@ VariableSize\t8\tVariableSize\t8\tVariableSize\t8\tVariableSize\t8\tVariableSize
     print(f"✅ Beispiel-CSV erstellt: {output_path}")
 
 
+def filetime_to_timestamp(filetime, tz: str = PLANT_TIMEZONE) -> pd.Timestamp:
+    """
+    Windows-FILETIME (100 ns seit 1601-01-01 UTC) als Timestamp in Ortszeit
+
+    Mit tz=None wird die UTC-Zeit ohne Zeitzone zurückgegeben.
+    """
+    utc = pd.Timestamp(
+        (int(filetime) - FILETIME_UNIX_OFFSET) * 100, unit="ns", tz="UTC"
+    )
+    return utc.tz_convert(tz) if tz is not None else utc.tz_localize(None)
+
+
+def write_scope_csv(
+    output_path: str,
+    signals: dict,
+    sample_time_ms: float = 1.0,
+    comments: dict = None,
+    start_time=None,
+    tz: str = PLANT_TIMEZONE,
+) -> None:
+    """
+    Schreibt Kanäle im Scope-Exportformat (Zeitindex/Wert-Paare je Kanal)
+
+    Parameters:
+    -----------
+    output_path : str
+        Zieldatei
+    signals : dict
+        {Kanalname: Werte}, alle gleich lang
+    sample_time_ms : float
+        Abtastzeit in Millisekunden
+    comments : dict, optional
+        {Kanalname: Beschreibung} für die Zeile SymbolComment
+    start_time : str or Timestamp, optional
+        Beginn des Exports für die Zeile "Starttime of export"; ohne
+        Zeitzone gilt die Ortszeit tz
+    tz : str, optional
+        Zeitzone der Anlage; Datum und Uhrzeit der Zeile stehen wie im
+        echten Export in Ortszeit, die FILETIME in UTC (None = alles UTC)
+    """
+    names = list(signals)
+    comments = comments or {}
+    n = len(signals[names[0]])
+    index = np.arange(n) * sample_time_ms
+
+    def row(label, values):
+        return "\t".join(f"{label}\t{value}" for value in values)
+
+    header = [
+        "Name\tScope Export",
+        f"File\t{Path(output_path).name}",
+    ]
+    if start_time is not None:
+        start_time = pd.Timestamp(start_time)
+        if start_time.tzinfo is None:
+            start_time = start_time.tz_localize(tz or "UTC")
+        elif tz is not None:
+            start_time = start_time.tz_convert(tz)
+        # value zählt ab 1970-01-01 UTC, unabhängig von der Zeitzone
+        filetime = start_time.value // 100 + FILETIME_UNIX_OFFSET
+        clock = f"{start_time:%H:%M:%S.%f}"[:-3]
+        header.append(
+            f"Starttime of export\t{filetime}\t{start_time:%d.%m.%Y}\t{clock}"
+        )
+    header += [
+        "",
+        row("Name", names),
+        row("SymbolComment", [comments.get(name, name) for name in names]),
+        row("Data-Type", ["REAL64"] * len(names)),
+        row("SampleTime[ms]", [f"{sample_time_ms:g}"] * len(names)),
+        row("VariableSize", [8] * len(names)),
+        "",
+    ]
+    # Spaltenpaare (Zeit, Wert) je Kanal nebeneinander
+    columns = {}
+    for i, name in enumerate(names):
+        columns[2 * i] = index
+        columns[2 * i + 1] = np.asarray(signals[name], dtype=np.float64)
+    body = pd.DataFrame(columns)
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("\n".join(header) + "\n")
+        body.to_csv(f, sep="\t", header=False, index=False, float_format="%.10g")
+
+
 if __name__ == "__main__":
     main()
@@ -13,6 +13,7 @@ from pathlib import Path
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from speicher_optimierung import format_memory_report, optimize_frame
 
 
 def get_data_path(*args):
@@ -267,6 +268,14 @@ def csv_performance_optimierung():
         f"Einsparung: {(memory_original - memory_optimized) / memory_original * 100:.1f}%"
     )
 
+    # Methode 4: Datentypen automatisch wählen
+    print("\n4️⃣ Automatisch optimierte Datentypen")
+
+    df_auto, report = optimize_frame(pd.read_csv(large_file, parse_dates=["Timestamp"]))
+    print(format_memory_report(report))
+    for column, (old, new) in report["columns"].items():
+        print(f"  {column}: {old} → {new}")
+
 
 def visualisiere_csv_daten(dataframes_dict):
     """
@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+"""
+Energie-Lastprofile aus Leistungskanälen der Scope-Exporte
+
+Leistungskanäle (POWER_...) werden im Scope mit 1 ms abgetastet. Für das
+Energiemanagement zählen aber Viertelstunden: Energie je Intervall,
+mittlere Leistung und die höchste Lastspitze, nach der der Leistungspreis
+abgerechnet wird.
+
+Dieses Modul arbeitet auf den Blöcken von
+BystronicCSVParser.iter_scope_chunks:
+- Integration Leistung -> Energie je Viertelstunde; angefangene
+  Intervalle werden an den nächsten Block übergeben
+- Gleitender Mittelwert über ein Spitzenfenster (z.B. 1 min) und dessen
+  Maximum je Intervall, inkl. Zeitpunkt des Fensters
+- Intervalle am Uhrzeit-Raster (:00, :15, ...) der Anlage, damit sich
+  Profile mehrerer Exporte zusammenführen lassen; die Startzeit des
+  Exports (UTC) wird dafür in die Ortszeit umgerechnet (PLANT_TIMEZONE)
+- Monatsweise Parquet-Ablage der Viertelstundenprofile; Dashboards lesen
+  Monate statt Millionen Rohwerte
+- Auswertungen: Tagesprofil je Bereich, Spitzenstunden, Grundlast,
+  Anteil je Bereich, grösste Lastspitzen
+
+Autor: Python Grundkurs Bystronic
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from bystronic_csv_parser import (
+    PLANT_TIMEZONE,
+    BystronicCSVParser,
+    get_data_path,
+    write_scope_csv,
+)
+from parquet_io import TIME_COLUMN, read_parquet, write_parquet
+
+CHANNEL_COLUMN = "Kanal"
+AREA_COLUMN = "Bereich"
+SOURCE_COLUMN = "Quelle"
+TOTAL_CHANNEL = "Gesamt"
+
+# Leistungskanäle je Produktionsbereich
+KANAL_BEREICHE = {
+    "POWER_001": "Laser-Schneiden",
+    "POWER_002": "Biegen",
+    "POWER_003": "Stanzen",
+    "POWER_004": "Schweißen",
+    "POWER_005": "Hilfssysteme",
+}
+
+# Lastfaktor und Spitzenstunden je Bereich für simulierte Kanäle
+BEREICH_LAST = {
+    "Laser-Schneiden": (1.5, (8, 9, 10, 13, 14, 15)),
+    "Biegen": (0.8, (10, 11, 14, 15, 16)),
+    "Stanzen": (1.2, (9, 10, 11, 13, 14)),
+    "Schweißen": (0.6, tuple(range(8, 17))),
+    "Hilfssysteme": (0.6, tuple(range(8, 17))),
+}
+
+# Typischer Lastgang eines Werktags in kW (0-23 Uhr)
+LASTGANG_KW = np.array(
+    [20, 18, 16, 15, 15, 18, 25, 35, 45, 50, 55, 60]
+    + [65, 70, 68, 65, 60, 55, 45, 40, 35, 30, 25, 22],
+    dtype=np.float64,
+)
+WOCHENTAG_FAKTOR = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 0.6, 0.3])
+
+
+def _wall_clock(times):
+    """Ortszeit ohne Zeitzone (Uhrzeit an der Anlage) für Raster und Monate"""
+    if isinstance(times, pd.Series):
+        return times.dt.tz_localize(None) if times.dt.tz is not None else times
+    return times.tz_localize(None)
+
+
+def _samples(duration, dt: float) -> int:
+    """Anzahl Samples einer Dauer; muss ein Vielfaches der Abtastzeit sein"""
+    samples = pd.Timedelta(duration).total_seconds() / dt
+    if samples < 1 or not np.isclose(samples, round(samples)):
+        raise ValueError(f"{duration} ist kein Vielfaches der Abtastzeit {dt} s")
+    return int(round(samples))
+
+
+class LoadProfileAccumulator:
+    """
+    Lastprofil über einen Strom von Leistungsblöcken (Samples × Kanäle, kW)
+
+    Jedes Sample steht für die Leistung während einer Abtastzeit; die
+    Energie eines Intervalls ist daher die Summe der Samples mal Abtastzeit.
+    Zusätzlich zu den Kanälen wird die Summe aller Kanäle als Kanal
+    "Gesamt" geführt - die Lastspitze der Anlage ist nicht die Summe der
+    Spitzen einzelner Bereiche.
+
+    Parameters:
+    -----------
+    sample_time_ms : float
+        Abtastzeit in Millisekunden
+    start : str or Timestamp
+        Zeitpunkt des ersten Samples; mit Zeitzone (z.B. Europe/Zurich)
+        bleiben Intervalle über Sommer-/Winterzeit lückenlos
+    channels : list
+        Namen der Leistungskanäle
+    interval : str
+        Länge der Profil-Intervalle (Standard: Viertelstunde)
+    peak_window : str
+        Fenster des gleitenden Mittelwerts für Lastspitzen
+    areas : dict, optional
+        {Kanal: Bereich} für die Spalte "Bereich"
+    """
+
+    def __init__(
+        self,
+        sample_time_ms: float,
+        start,
+        channels: list,
+        interval: str = "15min",
+        peak_window: str = "1min",
+        areas: dict = None,
+    ):
+        self.dt = sample_time_ms / 1000
+        self.interval = pd.Timedelta(interval)
+        self.samples_per_interval = _samples(interval, self.dt)
+        self.window = _samples(peak_window, self.dt)
+        if self.window > self.samples_per_interval:
+            raise ValueError("Spitzenfenster länger als das Intervall")
+        self.channels = list(channels) + [TOTAL_CHANNEL]
+        self.areas = {**(areas or {}), TOTAL_CHANNEL: TOTAL_CHANNEL}
+
+        # Intervalle am Uhrzeit-Raster der Ortszeit: Samples ab dem
+        # Rasterpunkt zählen
+        start = pd.Timestamp(start)
+        wall = _wall_clock(start)
+        self.origin = start - (wall - wall.floor(self.interval))
+        self.position = int(round((start - self.origin).total_seconds() / self.dt))
+        self.tail = np.empty((0, len(self.channels)))
+        self.parts = []
+        self.carry = None  # angefangenes Intervall am Blockende
+
+    def update(self, block) -> None:
+        """Verarbeitet einen weiteren Block (Samples × Kanäle oder 1-D)"""
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[:, None]
+        if len(block) == 0:
+            return
+        block = np.column_stack([block, block.sum(axis=1)])
+        n = len(block)
+
+        # Gleitender Mittelwert; die Vorgeschichte kommt aus dem Puffer
+        history = np.concatenate([self.tail, block])
+        cumulative = np.concatenate(
+            [np.zeros((1, block.shape[1])), np.cumsum(history, axis=0)]
+        )
+        ends = np.arange(len(self.tail) + 1, len(history) + 1)
+        valid = ends >= self.window
+        rolling = np.full(block.shape, np.nan)
+        rolling[valid] = (
+            cumulative[ends[valid]] - cumulative[ends[valid] - self.window]
+        ) / self.window
+        self.tail = history[max(0, len(history) - (self.window - 1)) :]
+
+        # Block an den Intervallgrenzen zerlegen
+        size = self.samples_per_interval
+        phase = self.position % size
+        starts = np.concatenate([[0], np.arange(size - phase, n, size)])
+        counts = np.diff(np.append(starts, n))
+        intervals = self.position // size + np.arange(len(starts))
+        energy = np.add.reduceat(block, starts, axis=0) * self.dt / 3600
+        maxima = np.maximum.reduceat(block, starts, axis=0)
+        peaks = np.fmax.reduceat(rolling, starts, axis=0)
+
+        # Erstes Sample mit der Spitze je Intervall und Kanal
+        segment = np.repeat(np.arange(len(starts)), counts)
+        peak_index = np.full(peaks.shape, -1, dtype=np.int64)
+        for c in range(block.shape[1]):
+            hits = np.flatnonzero(rolling[:, c] == peaks[segment, c])
+            found, first = np.unique(segment[hits], return_index=True)
+            peak_index[found, c] = self.position + hits[first]
+
+        if self.carry is not None:
+            _, c_energy, c_max, c_peak, c_index, c_count = self.carry
+            energy[0] += c_energy[0]
+            maxima[0] = np.fmax(maxima[0], c_max[0])
+            keep = (c_peak[0] >= peaks[0]) | np.isnan(peaks[0])
+            peaks[0] = np.where(keep, c_peak[0], peaks[0])
+            peak_index[0] = np.where(keep, c_index[0], peak_index[0])
+            counts[0] += c_count[0]
+
+        rows = (intervals, energy, maxima, peaks, peak_index, counts)
+        done = len(starts) if counts[-1] == size else len(starts) - 1
+        if done:
+            self.parts.append(tuple(values[:done] for values in rows))
+        self.carry = None if done == len(starts) else tuple(v[-1:] for v in rows)
+        self.position += n
+
+    def profile(self) -> pd.DataFrame:
+        """
+        Lastprofil aller bisher verarbeiteten Samples
+
+        Returns:
+        --------
+        pd.DataFrame
+            Eine Zeile je Intervall und Kanal: Zeitstempel (Intervallbeginn),
+            Kanal, Bereich, Energie_kWh, Leistung_kW (Mittel), Max_kW
+            (Einzelsample), Spitze_kW (höchster gleitender Mittelwert),
+            Spitze_Beginn/Spitze_Ende (Fenster, das im Intervall endet) und
+            Dauer_s (erfasste Zeit)
+        """
+        parts = self.parts + ([self.carry] if self.carry is not None else [])
+        if not parts:
+            raise ValueError("Noch keine Samples verarbeitet")
+        intervals, energy, maxima, peaks, peak_index, counts = (
+            np.concatenate(values) for values in zip(*parts, strict=True)
+        )
+        k = len(self.channels)
+        seconds = counts * self.dt
+        starts = self.origin + pd.to_timedelta(
+            intervals * self.interval.total_seconds(), unit="s"
+        )
+        peak_end = pd.to_timedelta(
+            np.where(peak_index >= 0, (peak_index + 1) * self.dt, np.nan).ravel(),
+            unit="s",
+        )
+        peak_end = self.origin + peak_end
+        window = pd.Timedelta(seconds=self.window * self.dt)
+        return pd.DataFrame(
+            {
+                TIME_COLUMN: np.repeat(starts, k),
+                CHANNEL_COLUMN: np.tile(self.channels, len(intervals)),
+                AREA_COLUMN: np.tile(
+                    [self.areas.get(c, c) for c in self.channels], len(intervals)
+                ),
+                "Energie_kWh": energy.ravel(),
+                "Leistung_kW": (energy * 3600 / seconds[:, None]).ravel(),
+                "Max_kW": maxima.ravel(),
+                "Spitze_kW": peaks.ravel(),
+                "Spitze_Beginn": peak_end - window,
+                "Spitze_Ende": peak_end,
+                "Dauer_s": np.repeat(seconds, k),
+            }
+        )
+
+
+def combine_profiles(profile: pd.DataFrame) -> pd.DataFrame:
+    """
+    Führt Zeilen desselben Intervalls und Kanals zusammen
+
+    Zwei Exporte, die sich eine Viertelstunde teilen (z.B. Ende 10:07 und
+    Beginn 10:07), liefern je ein angefangenes Intervall. Energie und
+    erfasste Zeit werden addiert, Maxima und Spitzen übernommen.
+    """
+    keys = [TIME_COLUMN, CHANNEL_COLUMN]
+    ordered = profile.sort_values("Spitze_kW", ascending=False, kind="stable")
+    combined = (
+        ordered.groupby(keys, sort=True)
+        .agg(
+            **{
+                AREA_COLUMN: (AREA_COLUMN, "first"),
+                "Energie_kWh": ("Energie_kWh", "sum"),
+                "Max_kW": ("Max_kW", "max"),
+                "Spitze_kW": ("Spitze_kW", "first"),
+                "Spitze_Beginn": ("Spitze_Beginn", "first"),
+                "Spitze_Ende": ("Spitze_Ende", "first"),
+                "Dauer_s": ("Dauer_s", "sum"),
+            }
+        )
+        .reset_index()
+    )
+    combined.insert(
+        4, "Leistung_kW", combined["Energie_kWh"] * 3600 / combined["Dauer_s"]
+    )
+    return combined
+
+
+class LoadProfileStore:
+    """
+    Monatsweise Parquet-Ablage von Lastprofilen
+
+    Jede Zeile trägt ihre Quelle (z.B. den Dateinamen des Exports). Wird
+    eine Quelle erneut abgelegt, ersetzt sie ihre alten Zeilen - doppelt
+    importierte Exporte zählen also nicht doppelt. Zeitstempel werden in
+    der Zeitzone der Anlage abgelegt, Monate enden um Mitternacht Ortszeit.
+
+    Parameters:
+    -----------
+    directory : str or Path
+        Verzeichnis mit einer Datei lastprofil_JJJJ-MM.parquet je Monat
+    tz : str
+        Zeitzone der Anlage; Zeitstempel ohne Zeitzone gelten als Ortszeit
+    """
+
+    def __init__(self, directory, tz: str = PLANT_TIMEZONE):
+        self.directory = Path(directory)
+        self.tz = tz
+
+    def _local(self, times):
+        """Zeitstempel (Timestamp oder Series) in der Zeitzone der Ablage"""
+        zoned = times.dt if isinstance(times, pd.Series) else times
+        if zoned.tz is None:
+            return zoned.tz_localize(self.tz)
+        return zoned.tz_convert(self.tz)
+
+    def _month_file(self, month: pd.Period) -> Path:
+        return self.directory / f"lastprofil_{month}.parquet"
+
+    def months(self) -> list[pd.Period]:
+        """Monate mit abgelegten Profilen"""
+        files = self.directory.glob("lastprofil_*.parquet")
+        return sorted(pd.Period(f.stem.split("_", 1)[1], freq="M") for f in files)
+
+    def append(self, profile: pd.DataFrame, source: str) -> list[Path]:
+        """
+        Legt ein Profil ab und ersetzt ältere Zeilen derselben Quelle
+
+        Returns:
+        --------
+        list
+            Geschriebene Monatsdateien
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        times = [TIME_COLUMN, "Spitze_Beginn", "Spitze_Ende"]
+        profile = profile.assign(
+            **{column: self._local(profile[column]) for column in times},
+            **{SOURCE_COLUMN: source},
+        )
+        months = _wall_clock(profile[TIME_COLUMN]).dt.to_period("M")
+        written = []
+        for month, part in profile.groupby(months):
+            path = self._month_file(month)
+            if path.exists():
+                old = read_parquet(path)
+                part = pd.concat([old[old[SOURCE_COLUMN] != source], part])
+            write_parquet(part, path, sort_by=[TIME_COLUMN, CHANNEL_COLUMN])
+            written.append(path)
+        return written
+
+    def query(self, start=None, end=None, channels=None) -> pd.DataFrame:
+        """
+        Lastprofil für Zeitraum [start, end) und Kanäle
+
+        Es werden nur die Monatsdateien im Zeitraum geöffnet; innerhalb
+        einer Datei überspringt Parquet Row-Groups ausserhalb des Filters.
+        Zeilen mehrerer Quellen werden mit combine_profiles zusammengeführt.
+        start und end ohne Zeitzone gelten als Ortszeit der Anlage.
+        """
+        start = self._local(pd.Timestamp(start)) if start is not None else None
+        end = self._local(pd.Timestamp(end)) if end is not None else None
+        first = _wall_clock(start).to_period("M") if start is not None else None
+        last = _wall_clock(end).to_period("M") if end is not None else None
+        frames = [
+            read_parquet(
+                self._month_file(month),
+                machines=channels,
+                start=start,
+                end=end,
+                machine_column=CHANNEL_COLUMN,
+            )
+            for month in self.months()
+            if (first is None or month >= first) and (last is None or month <= last)
+        ]
+        if not frames:
+            raise ValueError(f"Keine Lastprofile in {self.directory}")
+        return combine_profiles(pd.concat(frames, ignore_index=True))
+
+
+def _total(profile: pd.DataFrame) -> pd.DataFrame:
+    return profile[profile[CHANNEL_COLUMN] == TOTAL_CHANNEL]
+
+
+def _areas(profile: pd.DataFrame) -> pd.DataFrame:
+    return profile[profile[CHANNEL_COLUMN] != TOTAL_CHANNEL]
+
+
+def daily_profile(profile: pd.DataFrame, freq: str = "1h") -> pd.DataFrame:
+    """
+    Mittlere Leistung je Tageszeit und Bereich (gestapeltes Tagesprofil)
+
+    Parameters:
+    -----------
+    profile : pd.DataFrame
+        Lastprofil (LoadProfileAccumulator.profile oder Store-Abfrage)
+    freq : str
+        Raster der Tageszeit, z.B. "1h" oder "15min"
+
+    Returns:
+    --------
+    pd.DataFrame
+        Index: Stunde des Tages in Ortszeit (0.0, 1.0, ...); Spalten:
+        Bereiche in kW, gemittelt über alle Tage mit Daten
+    """
+
+    def slot(frame):
+        begin = _wall_clock(frame[TIME_COLUMN]).dt.floor(freq)
+        return ((begin - begin.dt.normalize()) / pd.Timedelta("1h")).rename("Stunde")
+
+    areas, total = _areas(profile), _total(profile)
+    energy = (
+        areas.groupby([slot(areas), AREA_COLUMN])["Energie_kWh"]
+        .sum()
+        .unstack(AREA_COLUMN)
+    )
+    hours = total.groupby(slot(total))["Dauer_s"].sum() / 3600
+    result = energy.div(hours, axis=0)
+    return result.reindex(columns=areas[AREA_COLUMN].unique())
+
+
+def energy_per_period(profile: pd.DataFrame, freq: str = "1D") -> pd.DataFrame:
+    """Energie in kWh je Zeitraum (z.B. Tag, Woche, Monat) und Bereich"""
+    areas = _areas(profile)
+    energy = areas.pivot_table(
+        index=TIME_COLUMN, columns=AREA_COLUMN, values="Energie_kWh", aggfunc="sum"
+    )
+    return energy.resample(freq).sum().reindex(columns=areas[AREA_COLUMN].unique())
+
+
+def peak_hours(profile: pd.DataFrame, n: int = 3) -> pd.Series:
+    """Die n Tagesstunden mit der höchsten mittleren Gesamtleistung (kW)"""
+    return daily_profile(profile).sum(axis=1).nlargest(n)
+
+
+def base_load(profile: pd.DataFrame, quantile: float = 0.05) -> float:
+    """Grundlast: unteres Quantil der Viertelstunden-Gesamtleistung in kW"""
+    return float(_total(profile)["Leistung_kW"].quantile(quantile))
+
+
+def area_share(profile: pd.DataFrame) -> pd.DataFrame:
+    """Energie und Anteil in % je Bereich, absteigend sortiert"""
+    energy = _areas(profile).groupby(AREA_COLUMN)["Energie_kWh"].sum()
+    energy = energy.sort_values(ascending=False)
+    share = energy / energy.sum() * 100
+    return pd.DataFrame({"Energie_kWh": energy, "Anteil_%": share})
+
+
+def peak_windows(profile: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """Die n höchsten Lastspitzen der Anlage (ein Fenster je Intervall)"""
+    total = _total(profile).nlargest(n, "Spitze_kW")
+    return total[["Spitze_Beginn", "Spitze_Ende", "Spitze_kW"]].reset_index(drop=True)
+
+
+def analyze_power_export(
+    file_path,
+    channels: list = None,
+    areas: dict = None,
+    start=None,
+    interval: str = "15min",
+    peak_window: str = "1min",
+    chunksize: int = 200_000,
+    store: LoadProfileStore = None,
+    tz: str = PLANT_TIMEZONE,
+) -> pd.DataFrame:
+    """
+    Lastprofil eines Scope-Exports, blockweise gelesen
+
+    Parameters:
+    -----------
+    file_path : str or Path
+        Scope-Export mit Leistungskanälen in kW
+    channels : list, optional
+        Kanäle (Standard: alle, deren Name mit "POWER" beginnt)
+    areas : dict, optional
+        {Kanal: Bereich}; Standard: SymbolComment des Exports, sonst
+        KANAL_BEREICHE
+    start : str or Timestamp, optional
+        Zeitpunkt des ersten Samples (Standard: "Starttime of export")
+    interval, peak_window : str
+        Siehe LoadProfileAccumulator
+    chunksize : int
+        Zeilen pro gelesenem Block
+    store : LoadProfileStore, optional
+        Ablage; das Profil wird unter dem Dateinamen gespeichert
+    tz : str
+        Zeitzone der Anlage: die Startzeit des Exports (UTC) wird vor dem
+        Ausrichten der Intervalle in Ortszeit umgerechnet
+
+    Returns:
+    --------
+    pd.DataFrame
+        Lastprofil (siehe LoadProfileAccumulator.profile)
+    """
+    file_path = Path(file_path)
+    parser = BystronicCSVParser()
+    header = parser.read_scope_header(str(file_path), tz=tz)
+    if channels is None:
+        channels = [c for c in header["channels"] if c.startswith("POWER")]
+    if start is None:
+        if "start_time" not in header:
+            raise ValueError(f"Keine Startzeit in {file_path.name}: start angeben")
+        start = header["start_time"]
+    if areas is None:
+        # Die Zeile SymbolComment ist optional (dann leere Liste)
+        comments = dict(zip(header["channels"], header["comments"], strict=False))
+        areas = {c: KANAL_BEREICHE.get(c, c) for c in channels}
+        for c in channels:
+            if comments.get(c) not in (None, "", c):
+                areas[c] = comments[c]
+
+    sample_times = dict(zip(header["channels"], header["sample_time_ms"], strict=True))
+    if len({sample_times[c] for c in channels}) != 1:
+        raise ValueError("Kanäle mit unterschiedlicher Abtastzeit")
+
+    accumulator = LoadProfileAccumulator(
+        sample_times[channels[0]], start, channels, interval, peak_window, areas
+    )
+    for chunk in parser.iter_scope_chunks(str(file_path), channels, chunksize):
+        accumulator.update(chunk.to_numpy())
+
+    profile = accumulator.profile()
+    if store is not None:
+        store.append(profile, source=file_path.name)
+    return profile
+
+
+def _start_peaks(rng, n: int, dt: float) -> np.ndarray:
+    """Kurze Lastblöcke von 30-120 s (Anläufe, Stichschnitte), 2 pro Stunde"""
+    count = rng.poisson(2 * n * dt / 3600)
+    starts = rng.integers(0, n, count)
+    lengths = (rng.uniform(30, 120, count) / dt).astype(np.int64)
+    height = rng.uniform(0.3, 0.6, count)
+    steps = np.zeros(n + 1)
+    np.add.at(steps, starts, height)
+    np.add.at(steps, np.minimum(starts + lengths, n), -height)
+    return np.cumsum(steps[:n])
+
+
+def simulate_power(
+    start, duration, sample_time_ms: float = 1000.0, channels=None, seed: int = 42
+) -> pd.DataFrame:
+    """
+    Simulierte Leistungskanäle in kW (Samples × Kanäle)
+
+    Tageslastgang LASTGANG_KW je Bereich skaliert (BEREICH_LAST), am
+    Wochenende reduziert, mit Anlaufspitzen und 5% Rauschen.
+    """
+    channels = list(KANAL_BEREICHE) if channels is None else list(channels)
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(start)
+    dt = sample_time_ms / 1000
+    n = _samples(duration, dt)
+
+    day_hours = ((start - start.normalize()).total_seconds() + np.arange(n) * dt) / 3600
+    hour_of_day = day_hours % 24
+    weekday = (start.dayofweek + (day_hours // 24).astype(np.int64)) % 7
+    base = np.interp(hour_of_day, np.arange(25), np.append(LASTGANG_KW, LASTGANG_KW[0]))
+    base *= WOCHENTAG_FAKTOR[weekday]
+
+    signals = {}
+    for channel in channels:
+        faktor, spitzen = BEREICH_LAST[KANAL_BEREICHE[channel]]
+        peak = np.isin(hour_of_day.astype(np.int64), spitzen)
+        power = base * faktor * np.where(peak, 1.4, 1.0)
+        power *= 1 + _start_peaks(rng, n, dt) + rng.normal(0, 0.05, n)
+        signals[channel] = np.maximum(power, 0)
+    return pd.DataFrame(signals)
+
+
+def simulate_power_blocks(
+    start, days: int, sample_time_ms: float = 1000.0, channels=None, seed: int = 42
+):
+    """
+    Simulierte Leistungskanäle tageweise als Blöcke (Generator)
+
+    Mit Zeitzone sind die Blöcke Kalendertage in Ortszeit: beim Wechsel auf
+    Sommerzeit 23 h, zurück 25 h lang. So schliessen sie lückenlos an und
+    enden jeweils um Mitternacht Ortszeit.
+    """
+    start = pd.Timestamp(start)
+    for day in range(days):
+        begin = start + pd.DateOffset(days=day)
+        end = start + pd.DateOffset(days=day + 1)
+        yield simulate_power(begin, end - begin, sample_time_ms, channels, seed + day)
+
+
+def create_sample_power_export(
+    output_path,
+    start="2025-03-03 09:52:00",
+    minutes: float = 20.0,
+    channels=("POWER_001", "POWER_002", "POWER_003"),
+) -> None:
+    """Scope-Export mit 1 ms Abtastung und Startzeit im Header"""
+    data = simulate_power(start, pd.Timedelta(minutes=minutes), 1.0, channels)
+    write_scope_csv(
+        output_path,
+        {c: data[c] for c in channels},
+        sample_time_ms=1.0,
+        comments={c: KANAL_BEREICHE[c] for c in channels},
+        start_time=start,
+    )
+
+
+def main():
+    """Lastprofile aus einem Scope-Export und einer Monatsablage"""
+    print("⚡ Energie-Lastprofile aus Leistungskanälen")
+    print("=" * 50)
+
+    export = get_data_path("generated", "power_scope_demo.csv")
+    store = LoadProfileStore(get_data_path("generated", "lastprofile"))
+    create_sample_power_export(export)
+    print(f"📁 Scope-Export: {export.name} ({export.stat().st_size / 1e6:.1f} MB)")
+
+    start = time.perf_counter()
+    profile = analyze_power_export(export, store=store)
+    dauer = time.perf_counter() - start
+    print(f"⏱️ Blockweise integriert in {dauer:.2f} s")
+    total = _total(profile)
+    for _, row in total.iterrows():
+        print(
+            f"   {row[TIME_COLUMN]:%H:%M}  {row['Energie_kWh']:6.2f} kWh"
+            f"  Mittel {row['Leistung_kW']:6.1f} kW  Spitze {row['Spitze_kW']:6.1f} kW"
+            f"  ({row['Dauer_s'] / 60:.0f} min erfasst)"
+        )
+
+    print("\n🗓️ Zwei Monate Leistungsdaten (1 s Abtastung) ablegen ...")
+    # Zwei Monate über den Wechsel zur Sommerzeit: Start mit Zeitzone
+    beginn = pd.Timestamp("2025-02-01", tz=PLANT_TIMEZONE)
+    accumulator = LoadProfileAccumulator(
+        1000, beginn, list(KANAL_BEREICHE), areas=KANAL_BEREICHE
+    )
+    start = time.perf_counter()
+    for block in simulate_power_blocks(beginn, days=59):
+        accumulator.update(block.to_numpy())
+    store.append(accumulator.profile(), source="simulation")
+    dauer = time.perf_counter() - start
+    print(f"   {accumulator.position:,} Samples je Kanal in {dauer:.1f} s")
+    print(f"   Monate in der Ablage: {[str(m) for m in store.months()]}")
+
+    start = time.perf_counter()
+    march = store.query("2025-03-01", "2025-04-01")
+    dauer = time.perf_counter() - start
+    print(f"\n🔎 Abfrage März: {len(march):,} Zeilen in {dauer * 1000:.0f} ms")
+
+    print("\n⏰ Spitzenstunden (mittlere Gesamtleistung):")
+    for stunde, leistung in peak_hours(march).items():
+        print(f"   {int(stunde):02d}:00 Uhr: {leistung:.1f} kW")
+    print(f"\n🔋 Grundlast (5%-Quantil): {base_load(march):.1f} kW")
+
+    print("\n🥧 Anteil je Bereich:")
+    for bereich, row in area_share(march).iterrows():
+        energie, anteil = row["Energie_kWh"], row["Anteil_%"]
+        print(f"   {bereich:<16} {energie:9.0f} kWh  {anteil:5.1f}%")
+
+    print("\n📍 Grösste Lastspitzen (1-min-Mittel):")
+    for _, row in peak_windows(march, n=3).iterrows():
+        print(
+            f"   {row['Spitze_Beginn']:%d.%m. %H:%M:%S} - "
+            f"{row['Spitze_Ende']:%H:%M:%S}  {row['Spitze_kW']:.1f} kW"
+        )
+
+
+if __name__ == "__main__":
+    main()
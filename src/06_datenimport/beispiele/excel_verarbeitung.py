@@ -8,13 +8,17 @@ Behandelt mehrere Arbeitsblätter, Formatierung und komplexe Strukturen.
 Autor: Python Grundkurs Bystronic
 """
 
+import os
+import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from speicher_optimierung import format_memory_report, optimize_frame
 
 warnings.filterwarnings("ignore")
 
@@ -30,6 +34,31 @@ def get_data_path(*args):
     return data_path
 
 
+def _load_workbook_worker(file_path):
+    """
+    Lädt alle Arbeitsblätter einer Arbeitsmappe (läuft im Worker-Prozess)
+
+    Die Funktion liegt auf Modulebene, damit sie an einen
+    ProcessPoolExecutor übergeben (gepickelt) werden kann.
+    """
+    start = time.perf_counter()
+    result = {
+        "file_path": str(file_path),
+        "sheets": None,
+        "error": None,
+        "size_kb": 0.0,
+    }
+
+    try:
+        result["size_kb"] = Path(file_path).stat().st_size / 1024
+        result["sheets"] = pd.read_excel(file_path, sheet_name=None)
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
 class BystronicExcelHandler:
     """
     Klasse für die Verarbeitung von Excel-Dateien in Bystronic-Umgebung
@@ -38,6 +67,7 @@ class BystronicExcelHandler:
     def __init__(self):
         self.loaded_data = {}
         self.processing_log = []
+        self.file_timings = pd.DataFrame()
 
     def log_action(self, message):
         """Protokolliert Aktionen"""
@@ -171,9 +201,12 @@ class BystronicExcelHandler:
         self.log_action(f"Arbeitsmappe erstellt: {file_size:.1f} KB")
         return file_path
 
-    def load_excel_comprehensive(self, file_path: str):
+    def load_excel_comprehensive(self, file_path: str, optimize: bool = False):
         """
         Lädt eine Excel-Datei mit allen Arbeitsblättern
+
+        Mit optimize=True werden die Datentypen jedes Blatts mit
+        optimize_frame verkleinert.
         """
         self.log_action(f"Lade Excel-Datei: {file_path}")
 
@@ -185,6 +218,9 @@ class BystronicExcelHandler:
 
             # Daten speichern und analysieren
             for sheet_name, df in excel_data.items():
+                if optimize:
+                    df = self._optimize_sheet(sheet_name, df)
+                    excel_data[sheet_name] = df
                 self.loaded_data[sheet_name] = df
 
                 # Basis-Analyse
@@ -202,6 +238,135 @@ class BystronicExcelHandler:
             self.log_action(f"Fehler beim Excel-Import: {e}")
             return None
 
+    def _optimize_sheet(self, sheet_name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Verkleinert die Datentypen eines Blatts und protokolliert die Einsparung"""
+        df, report = optimize_frame(df)
+        self.log_action(f"  {sheet_name}: {format_memory_report(report)}")
+        return df
+
+    def load_workbooks_parallel(
+        self,
+        file_paths,
+        max_workers: int = None,
+        source_column: str = "Quelldatei",
+        optimize: bool = False,
+    ):
+        """
+        Lädt viele Arbeitsmappen parallel in einem Prozess-Pool
+
+        Das Parsen mit openpyxl ist CPU-gebunden und hält den GIL, Threads
+        bringen daher nichts. Jede Datei wird in einem eigenen Prozess
+        gelesen; gleichnamige Arbeitsblätter werden anschliessend zu einem
+        DataFrame zusammengeführt.
+
+        Parameters:
+        -----------
+        file_paths : list or str
+            Liste von Dateipfaden oder Glob-Muster (z.B. "daten/*.xlsx")
+        max_workers : int, optional
+            Anzahl Prozesse (Standard: Anzahl CPU-Kerne, höchstens Anzahl
+            Dateien). Mit 1 wird ohne Pool im aktuellen Prozess geladen.
+        source_column : str
+            Name der Spalte, die die Quelldatei jeder Zeile enthält (Pfad
+            relativ zum gemeinsamen Verzeichnis aller Dateien). Eine
+            vorhandene Spalte gleichen Namens wird ersetzt.
+        optimize : bool
+            Zusammengeführte Blätter mit optimize_frame verkleinern (nach
+            dem Zusammenführen, damit die Kategorien aller Dateien passen)
+
+        Returns:
+        --------
+        Dict
+            Zusammengeführte Arbeitsblätter {Blattname: DataFrame}. Die
+            Ladezeiten pro Datei stehen danach in ``self.file_timings``.
+        """
+        if isinstance(file_paths, str | Path):
+            pattern = Path(file_paths)
+            file_paths = sorted(pattern.parent.glob(pattern.name))
+
+        file_paths = [str(p) for p in file_paths]
+        if not file_paths:
+            self.log_action("Keine Arbeitsmappen zum Laden gefunden")
+            self.file_timings = pd.DataFrame()
+            return {}
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers, len(file_paths)))
+
+        self.log_action(
+            f"Lade {len(file_paths)} Arbeitsmappen mit {max_workers} Prozess(en)"
+        )
+        start = time.perf_counter()
+
+        if max_workers == 1:
+            results = [_load_workbook_worker(p) for p in file_paths]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_load_workbook_worker, file_paths))
+
+        wall_time = time.perf_counter() - start
+
+        # Quelle relativ zum gemeinsamen Verzeichnis: gleichnamige Dateien
+        # aus verschiedenen Ordnern bleiben unterscheidbar
+        folders = [str(Path(p).resolve().parent) for p in file_paths]
+        common = Path(os.path.commonpath(folders))
+
+        # Gleichnamige Arbeitsblätter sammeln (Reihenfolge der Eingabe)
+        sheet_parts = {}
+        timings = []
+        for result in results:
+            source = Path(result["file_path"]).resolve().relative_to(common)
+            source = source.as_posix()
+            rows = 0
+
+            if result["error"] is not None:
+                self.log_action(f"  {source}: Fehler - {result['error']}")
+            else:
+                for sheet_name, df in result["sheets"].items():
+                    # z.B. eine bereits zusammengeführte Datei erneut laden
+                    if source_column in df.columns:
+                        df = df.drop(columns=source_column)
+                    df.insert(0, source_column, source)
+                    sheet_parts.setdefault(sheet_name, []).append(df)
+                    rows += len(df)
+                self.log_action(
+                    f"  {source}: {len(result['sheets'])} Blätter, "
+                    f"{rows:,} Zeilen in {result['seconds']:.2f}s"
+                )
+
+            timings.append(
+                {
+                    "Datei": source,
+                    "Sekunden": round(result["seconds"], 3),
+                    "Zeilen": rows,
+                    "Groesse_KB": round(result["size_kb"], 1),
+                    "Erfolg": result["error"] is None,
+                    "Fehler": result["error"],
+                }
+            )
+
+        merged = {
+            sheet_name: pd.concat(parts, ignore_index=True)
+            for sheet_name, parts in sheet_parts.items()
+        }
+        if optimize:
+            merged = {
+                sheet_name: self._optimize_sheet(sheet_name, df)
+                for sheet_name, df in merged.items()
+            }
+        self.loaded_data.update(merged)
+        self.file_timings = pd.DataFrame(timings)
+
+        cpu_time = self.file_timings["Sekunden"].sum()
+        self.log_action(
+            f"Parallel-Import abgeschlossen: {wall_time:.2f}s Wandzeit, "
+            f"{cpu_time:.2f}s Summe Einzelzeiten "
+            f"(Faktor {cpu_time / wall_time if wall_time > 0 else 0:.1f})"
+        )
+
+        return merged
+
     def analyze_workbook_structure(self, excel_data):
         """
         Analysiert die Struktur der geladenen Arbeitsmappe
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Import Registry - Formaterkennung und Reader-Registry
+
+Wählt den passenden Reader nicht über die Dateiendung, sondern über den
+Dateiinhalt: Magic Bytes (XLSX, XLS, Parquet, Feather, gzip), das erste
+JSON-Zeichen und eine Trennzeichen-/Dezimalanalyse auf einer Byte-Stichprobe.
+Die erkannten Einstellungen werden pro Quellmuster zwischengespeichert, damit
+wiederholte Importe desselben Feeds die Erkennung überspringen.
+
+Autor: Python Grundkurs Bystronic
+"""
+
+import gzip
+import json
+import re
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from json_streaming import FLATTEN_SEPARATOR, read_json_chunks
+from parquet_io import FEATHER_MAGIC, PARQUET_MAGIC, read_feather, read_parquet
+from speicher_optimierung import optimize_frame
+
+warnings.filterwarnings("ignore")
+
+try:
+    import pyarrow  # noqa: F401
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def get_data_path(*args):
+    """
+    Hilfsfunktion zum korrekten Konstruieren der Datenpfade
+    """
+    project_root = Path(__file__).parent.parent.parent.parent
+    data_path = project_root / "data"
+    for arg in args:
+        data_path = data_path / arg
+    return data_path
+
+
+# Magic Bytes bekannter Binärformate
+MAGIC_BYTES = {
+    b"PK\x03\x04": "excel",  # XLSX ist ein ZIP-Archiv
+    b"\xd0\xcf\x11\xe0": "excel",  # XLS (OLE2)
+    PARQUET_MAGIC: "parquet",
+    FEATHER_MAGIC: "feather",
+}
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Optionen, die die pyarrow-Engine von pandas nicht unterstützt
+PYARROW_UNSUPPORTED = {
+    "chunksize",
+    "comment",
+    "converters",
+    "iterator",
+    "nrows",
+    "on_bad_lines",
+    "skipfooter",
+    "thousands",
+    "low_memory",
+}
+
+
+def source_pattern(file_path) -> str:
+    """
+    Bildet das Quellmuster einer Datei für den Sniffing-Cache
+
+    Ziffern im Dateinamen werden durch '#' ersetzt, damit z.B.
+    'laser_2024-01-03.csv' und 'laser_2024-01-04.csv' denselben
+    Cache-Eintrag teilen.
+    """
+    path = Path(file_path)
+    return str(path.parent / re.sub(r"\d", "#", path.name))
+
+
+class FormatRegistry:
+    """
+    Registry für Dateiformate mit inhaltsbasierter Formaterkennung
+
+    Unterstützt:
+    - Registrierung eigener Reader pro Format
+    - Erkennung über Magic Bytes, JSON-Startzeichen und CSV-Stichprobe
+    - Cache der erkannten Einstellungen pro Quellmuster
+    - Schnellpfade (pyarrow-CSV-Reader, usecols, dtype)
+    """
+
+    def __init__(self, sample_size: int = 64 * 1024, register_defaults: bool = True):
+        self.sample_size = sample_size
+        self.readers = {}
+        self.extensions = {}
+        self.sniff_cache = {}
+        self.delimiters = [",", ";", "\t", "|"]
+
+        if register_defaults:
+            for name, reader, extensions in DEFAULT_READERS:
+                self.register(name, reader, extensions)
+
+    def register(self, name: str, reader, extensions=()):
+        """
+        Registriert einen Reader für ein Format
+
+        Parameters:
+        -----------
+        name : str
+            Formatname (z.B. "csv", "excel", "json")
+        reader : callable
+            Funktion reader(file_path, settings, **kwargs) -> DataFrame
+        extensions : tuple
+            Dateiendungen als Fallback, wenn der Inhalt nicht eindeutig ist
+        """
+        self.readers[name] = reader
+        for ext in extensions:
+            self.extensions[ext.lower()] = name
+
+    def reader(self, name: str, extensions=()):
+        """Decorator-Variante von register()"""
+
+        def decorator(func):
+            self.register(name, func, extensions)
+            return func
+
+        return decorator
+
+    def clear_cache(self):
+        """Leert den Sniffing-Cache"""
+        self.sniff_cache.clear()
+
+    def _read_sample(self, source) -> tuple[bytes, str | None]:
+        """Liest eine Byte-Stichprobe (bei gzip dekomprimiert)"""
+        if hasattr(source, "read"):
+            # Dateiobjekt (z.B. BytesIO): Position danach zurücksetzen
+            position = source.tell()
+            head = source.read(self.sample_size)
+            source.seek(position)
+            if head.startswith(GZIP_MAGIC):
+                sample = gzip.GzipFile(fileobj=source).read(self.sample_size)
+                source.seek(position)
+                return sample, "gzip"
+            return head, None
+
+        with open(source, "rb") as f:
+            head = f.read(self.sample_size)
+
+        if head.startswith(GZIP_MAGIC):
+            with gzip.open(source, "rb") as f:
+                return f.read(self.sample_size), "gzip"
+
+        return head, None
+
+    def sniff_delimited(self, sample: bytes) -> dict:
+        """
+        Erkennt Encoding, Trennzeichen und Dezimalzeichen einer CSV-Stichprobe
+
+        Parameters:
+        -----------
+        sample : bytes
+            Anfang der (dekomprimierten) Datei
+
+        Returns:
+        --------
+        Dict
+            Einstellungen mit 'encoding', 'sep' und 'decimal'
+        """
+        encoding = "utf-8"
+        try:
+            text = sample.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            # Abgeschnittenes Mehrbyte-Zeichen am Ende der Stichprobe
+            if e.start >= len(sample) - 3:
+                text = sample[: e.start].decode("utf-8-sig")
+            else:
+                encoding = "latin1"
+                text = sample.decode(encoding)
+
+        lines = text.splitlines()
+        if len(lines) > 1 and len(sample) >= self.sample_size:
+            lines = lines[:-1]  # Letzte Zeile ist evtl. abgeschnitten
+        lines = [line for line in lines if line.strip()][:50]
+
+        best_sep, best_score = ",", 0.0
+        for sep in self.delimiters:
+            counts = np.array([line.count(sep) for line in lines])
+            if len(counts) == 0 or counts.mean() == 0:
+                continue
+            # Häufig und konsistent über alle Zeilen = guter Kandidat
+            score = counts.mean() / (counts.std() + 1)
+            if score > best_score:
+                best_sep, best_score = sep, score
+
+        decimal = "."
+        if best_sep != ",":
+            fields = [f for line in lines[1:] for f in line.split(best_sep)]
+            comma_numbers = sum(
+                1 for f in fields if re.fullmatch(r"\s*-?\d+,\d+\s*", f)
+            )
+            dot_numbers = sum(1 for f in fields if re.fullmatch(r"\s*-?\d+\.\d+\s*", f))
+            if comma_numbers > dot_numbers:
+                decimal = ","
+
+        return {"encoding": encoding, "sep": best_sep, "decimal": decimal}
+
+    def sniff(self, file_path, use_cache: bool = True, name: str = None) -> dict:
+        """
+        Erkennt Format und Leseeinstellungen einer Datei
+
+        Parameters:
+        -----------
+        file_path : str or file-like
+            Pfad zur Datei oder bereits geladener Puffer (z.B. BytesIO)
+        use_cache : bool
+            Einstellungen aus dem Cache des Quellmusters verwenden
+        name : str, optional
+            Dateiname für Cache und Endungs-Fallback bei Puffern
+
+        Returns:
+        --------
+        Dict
+            Einstellungen mit mindestens 'format', 'compression' und
+            'from_cache'
+        """
+        if name is None:
+            is_buffer = hasattr(file_path, "read")
+            name = getattr(file_path, "name", None) if is_buffer else file_path
+        pattern = source_pattern(name) if name is not None else None
+        if use_cache and pattern in self.sniff_cache:
+            return {**self.sniff_cache[pattern], "from_cache": True}
+
+        sample, compression = self._read_sample(file_path)
+        settings = {"format": None, "compression": compression}
+
+        for magic, fmt in MAGIC_BYTES.items():
+            if sample.startswith(magic):
+                settings["format"] = fmt
+                break
+
+        if settings["format"] is None:
+            first_byte = sample.lstrip(b"\xef\xbb\xbf \t\r\n")[:1]
+            if first_byte in (b"{", b"["):
+                settings["format"] = "ndjson" if _looks_like_ndjson(sample) else "json"
+
+        if settings["format"] is None:
+            suffixes = [s.lower() for s in Path(str(name or "")).suffixes]
+            by_extension = [
+                self.extensions[s] for s in suffixes if s in self.extensions
+            ]
+            if by_extension and by_extension[-1] != "csv":
+                settings["format"] = by_extension[-1]
+            elif sample:
+                settings["format"] = "csv"
+                settings.update(self.sniff_delimited(sample))
+            else:
+                raise ValueError(f"Leere Datei: {name}")
+
+        if pattern is not None:
+            self.sniff_cache[pattern] = settings
+        return {**settings, "from_cache": False}
+
+    def read(self, file_path, file_type: str = None, settings: dict = None, **kwargs):
+        """
+        Liest eine Datei mit dem passenden Reader
+
+        Parameters:
+        -----------
+        file_path : str or file-like
+            Pfad zur Datei oder Puffer
+        file_type : str, optional
+            Format erzwingen; sonst Inhaltserkennung
+        settings : dict, optional
+            Bereits erkannte Einstellungen (überspringt die Erkennung)
+
+        Returns:
+        --------
+        tuple
+            (DataFrame, verwendete Einstellungen)
+        """
+        if settings is not None:
+            pass
+        elif file_type is None:
+            settings = self.sniff(file_path)
+        else:
+            settings = {"format": file_type, "compression": None, "from_cache": False}
+            if file_type == "csv":
+                sample, settings["compression"] = self._read_sample(file_path)
+                settings.update(self.sniff_delimited(sample))
+
+        fmt = settings["format"]
+        if fmt not in self.readers:
+            raise ValueError(f"Nicht unterstützter Dateityp: {fmt}")
+
+        return self.readers[fmt](file_path, settings, **kwargs), settings
+
+
+def read_csv_fast(file_path, settings: dict, **kwargs) -> pd.DataFrame:
+    """
+    CSV-Reader mit pyarrow-Schnellpfad
+
+    Explizit übergebene Optionen (sep, decimal, usecols, dtype, ...)
+    haben Vorrang vor den erkannten Einstellungen.
+    """
+    options = {
+        "sep": settings.get("sep", ","),
+        "decimal": settings.get("decimal", "."),
+        "encoding": settings.get("encoding", "utf-8"),
+        "compression": settings.get("compression"),
+    }
+    options.update(kwargs)
+
+    if PYARROW_AVAILABLE and not PYARROW_UNSUPPORTED & options.keys():
+        try:
+            return pd.read_csv(file_path, engine="pyarrow", **options)
+        except Exception:
+            pass  # Fallback auf die C-Engine, z.B. bei Encoding-Problemen
+
+    return pd.read_csv(file_path, **options)
+
+
+def read_excel_sheet(file_path, settings: dict, **kwargs) -> pd.DataFrame:
+    """Excel-Reader (usecols/dtype werden direkt an pandas übergeben)"""
+    return pd.read_excel(file_path, **kwargs)
+
+
+def _looks_like_ndjson(sample: bytes) -> bool:
+    """Erste Zeile ein vollständiges Objekt, nächste Zeile beginnt mit '{'"""
+    lines = [line.strip() for line in sample.splitlines() if line.strip()]
+    if len(lines) < 2 or not lines[0].startswith(b"{"):
+        return False
+    try:
+        json.loads(lines[0])
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return False
+    return lines[1].startswith(b"{")
+
+
+def _select_columns(df: pd.DataFrame, usecols=None, dtype=None) -> pd.DataFrame:
+    if usecols is not None:
+        df = df[[col for col in df.columns if col in usecols]]
+    if dtype is not None:
+        df = df.astype({col: t for col, t in dtype.items() if col in df.columns})
+    return df
+
+
+def read_json_records(file_path, settings: dict, **kwargs):
+    """
+    JSON-Reader mit Normalisierung verschachtelter Objekte
+
+    NDJSON, ein punktierter record_path (z.B. "data.machines") oder ein
+    gesetztes chunksize lesen die Datei inkrementell über json_streaming.
+    Mit chunksize wird wie bei pd.read_csv ein Iterator über DataFrames
+    zurückgegeben.
+    """
+    usecols = kwargs.pop("usecols", None)
+    dtype = kwargs.pop("dtype", None)
+    chunksize = kwargs.pop("chunksize", None)
+    record_path = kwargs.get("record_path")
+    lines = settings.get("format") == "ndjson"
+    # Gleiche Spaltennamen, egal ob gestreamt oder am Stück gelesen
+    kwargs.setdefault("sep", FLATTEN_SEPARATOR)
+
+    if chunksize or lines or (isinstance(record_path, str) and "." in record_path):
+        chunks = (
+            _select_columns(chunk, usecols, dtype)
+            for chunk in read_json_chunks(
+                file_path,
+                chunksize=chunksize or 10_000,
+                record_path=record_path,
+                lines=lines,
+                separator=kwargs["sep"],
+            )
+        )
+        if chunksize:
+            return chunks
+        frames = list(chunks)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    gzipped = settings.get("compression") == "gzip"
+    if hasattr(file_path, "read"):
+        json_data = json.load(
+            gzip.GzipFile(fileobj=file_path) if gzipped else file_path
+        )
+    else:
+        opener = gzip.open if gzipped else open
+        with opener(file_path, "rt", encoding="utf-8") as f:
+            json_data = json.load(f)
+
+    return _select_columns(pd.json_normalize(json_data, **kwargs), usecols, dtype)
+
+
+def read_parquet_columns(file_path, settings: dict, **kwargs) -> pd.DataFrame:
+    """
+    Parquet-Reader mit Column Projection und Predicate Pushdown
+
+    usecols wird auf die Spaltenauswahl abgebildet; machines, start, end
+    und filters werden als Row-Group-Filter an pyarrow übergeben.
+    """
+    dtype = kwargs.pop("dtype", None)
+    columns = kwargs.pop("usecols", kwargs.pop("columns", None))
+    df = read_parquet(file_path, columns=columns, **kwargs)
+    return _select_columns(df, dtype=dtype)
+
+
+def read_feather_columns(file_path, settings: dict, **kwargs) -> pd.DataFrame:
+    """Feather-Reader (usecols wird auf die Spaltenauswahl abgebildet)"""
+    columns = kwargs.pop("usecols", kwargs.pop("columns", None))
+    return _select_columns(read_feather(file_path, columns=columns), **kwargs)
+
+
+# Standard-Reader: (Format, Reader, Dateiendungen)
+DEFAULT_READERS = [
+    ("csv", read_csv_fast, (".csv", ".txt", ".tsv")),
+    ("excel", read_excel_sheet, (".xlsx", ".xlsm", ".xls")),
+    ("json", read_json_records, (".json",)),
+    ("ndjson", read_json_records, (".ndjson", ".jsonl")),
+    ("parquet", read_parquet_columns, (".parquet", ".pq")),
+    ("feather", read_feather_columns, (".feather", ".arrow")),
+]
+
+registry = FormatRegistry()
+
+
+def robust_import(file_path, file_type=None, optimize: bool = False, **kwargs):
+    """
+    Robuste Import-Funktion für verschiedene Dateiformate
+
+    Parameters:
+    -----------
+    file_path : str
+        Pfad zur Datei
+    file_type : str, optional
+        Format erzwingen ("csv", "excel", "json", "parquet", ...); sonst Inhaltserkennung
+    optimize : bool
+        Datentypen mit optimize_frame verkleinern (Bericht im Log unter "memory")
+    **kwargs
+        Zusätzliche Reader-Optionen, z.B. usecols oder dtype
+
+    Returns:
+    --------
+    tuple
+        (DataFrame oder None, Import-Log)
+    """
+    import_log = {
+        "file_path": str(file_path),
+        "timestamp": datetime.now(),
+        "success": False,
+        "error": None,
+        "records_imported": 0,
+        "warnings": [],
+        "format": file_type,
+        "settings": {},
+        "memory": None,
+    }
+
+    try:
+        df, settings = registry.read(file_path, file_type, **kwargs)
+        if optimize:
+            df, import_log["memory"] = optimize_frame(df)
+
+        import_log["success"] = True
+        import_log["records_imported"] = len(df)
+        import_log["format"] = settings["format"]
+        import_log["settings"] = settings
+
+        return df, import_log
+
+    except Exception as e:
+        import_log["error"] = str(e)
+        return None, import_log
+
+
+def main():
+    """
+    Demonstriert Formaterkennung und Sniffing-Cache
+    """
+    print("🔎 Import Registry - Demo")
+    print("=" * 50)
+
+    examples = get_data_path("examples")
+    files = sorted(examples.glob("sample_*.csv"))
+
+    for file_path in files:
+        df, log = robust_import(file_path)
+        settings = log["settings"]
+        if log["success"]:
+            print(
+                f"✅ {file_path.name}: {log['records_imported']} Zeilen, "
+                f"Format={settings['format']}, sep={settings.get('sep')!r}, "
+                f"decimal={settings.get('decimal')!r}"
+            )
+        else:
+            print(f"❌ {file_path.name}: {log['error']}")
+
+    print(f"\n📋 Registrierte Formate: {', '.join(registry.readers)}")
+    print(f"💾 Gecachte Quellmuster: {len(registry.sniff_cache)}")
+
+
+if __name__ == "__main__":
+    main()
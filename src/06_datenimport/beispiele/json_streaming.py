@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+JSON Streaming - Inkrementeller Import grosser JSON/NDJSON-Dateien
+
+Maschinen-API-Dumps erreichen schnell hunderte MB. json.load() und
+pd.json_normalize() auf dem ganzen Dokument brauchen ein Vielfaches davon
+an Arbeitsspeicher. Dieses Modul liest die Datei blockweise, gibt die
+Datensätze eines Arrays einzeln zurück und flacht sie chunkweise ab.
+Der Speicherbedarf hängt damit nur von der Chunk-Grösse ab.
+
+Autor: Python Grundkurs Bystronic
+"""
+
+import gzip
+import io
+import json
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+warnings.filterwarnings("ignore")
+
+GZIP_MAGIC = b"\x1f\x8b"
+WHITESPACE = " \t\r\n"
+# Trennzeichen für abgeflachte Schlüssel ("sensor_temperature"), wie in
+# verschachteltes_dict_zu_flach() aus Modul 02 - auch für die Registry
+FLATTEN_SEPARATOR = "_"
+
+
+def get_data_path(*args):
+    """
+    Hilfsfunktion zum korrekten Konstruieren der Datenpfade
+    """
+    project_root = Path(__file__).parent.parent.parent.parent
+    data_path = project_root / "data"
+    for arg in args:
+        data_path = data_path / arg
+    return data_path
+
+
+def open_text(source):
+    """
+    Öffnet Pfad oder Binärpuffer als Textstrom (gzip wird erkannt)
+
+    Returns:
+    --------
+    tuple
+        (Textstrom, True wenn der Strom vom Aufrufer geschlossen werden muss)
+    """
+    if hasattr(source, "read"):
+        head = source.read(2)
+        source.seek(source.tell() - len(head))
+        raw = gzip.GzipFile(fileobj=source) if head == GZIP_MAGIC else source
+        if isinstance(raw.read(0), str):
+            return raw, False
+        return io.TextIOWrapper(raw, encoding="utf-8-sig"), False
+
+    with open(source, "rb") as f:
+        gzipped = f.read(2) == GZIP_MAGIC
+    opener = gzip.open if gzipped else open
+    return opener(source, "rt", encoding="utf-8-sig"), True
+
+
+def close_text(stream, source, owned: bool) -> None:
+    """
+    Schliesst einen mit open_text() geöffneten Strom
+
+    Fremde Puffer bleiben offen und werden an den Anfang zurückgesetzt.
+    """
+    if owned:
+        stream.close()
+        return
+    if isinstance(stream, io.TextIOWrapper):
+        stream.detach()
+    source.seek(0)
+
+
+class JsonRecordStream:
+    """
+    Blockweiser JSON-Leser, der die Elemente eines Arrays einzeln liefert
+
+    Der Leser navigiert über Objekt-Schlüssel zum gewünschten Array und
+    überspringt alles andere, ohne es zu dekodieren. Nur das jeweils
+    aktuelle Element wird mit json.JSONDecoder.raw_decode() gelesen.
+    """
+
+    def __init__(self, stream, block_size: int = 1 << 20):
+        self.stream = stream
+        self.block_size = block_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Lädt den nächsten Block; gibt False am Dateiende zurück"""
+        if self.eof:
+            return False
+        block = self.stream.read(self.block_size)
+        if not block:
+            self.eof = True
+            return False
+        # Verbrauchten Anfang verwerfen, damit der Puffer klein bleibt
+        self.buffer = self.buffer[self.pos :] + block
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Nächstes Nicht-Leerzeichen (ohne es zu verbrauchen)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"JSON: '{char}' erwartet, '{found}' gefunden")
+        self.pos += 1
+
+    def _decode(self):
+        """Dekodiert den nächsten vollständigen Wert (lädt bei Bedarf nach)"""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Zahlen am Blockende könnten abgeschnitten sein
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _skip(self) -> None:
+        """Überspringt einen Wert per Klammerzählung, ohne ihn zu dekodieren"""
+        if self._peek() not in "[{":
+            self._decode()
+            return
+
+        depth = 0
+        in_string = escaped = False
+        while True:
+            if self.pos >= len(self.buffer) and not self._fill():
+                raise ValueError("JSON: unerwartetes Dateiende")
+            char = self.buffer[self.pos]
+            self.pos += 1
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "[{":
+                depth += 1
+            elif char in "]}":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _find_array(self, path: list[str] | None) -> bool:
+        """
+        Navigiert zum Array unter path (Liste von Schlüsseln)
+
+        Ohne path wird das erste Array in Dokumentreihenfolge verwendet,
+        z.B. data.machines in einer API-Antwort.
+        """
+        char = self._peek()
+        if char == "[":
+            if path:
+                raise ValueError(f"JSON: Array gefunden, Schlüssel {path} erwartet")
+            return True
+        if char != "{":
+            self._skip()
+            return False
+
+        self._expect("{")
+        while self._peek() != "}":
+            key = self._decode()
+            self._expect(":")
+            if path is None or (path and key == path[0]):
+                if self._find_array(None if path is None else path[1:]):
+                    return True
+                if path is not None:
+                    return False
+            else:
+                self._skip()
+            if self._peek() == ",":
+                self.pos += 1
+        self.pos += 1
+        return False
+
+    def records(self, record_path: str | list[str] | None = None):
+        """
+        Liefert die Elemente des Datensatz-Arrays einzeln
+
+        Parameters:
+        -----------
+        record_path : str or list, optional
+            Pfad zum Array, z.B. "data.machines" oder ["data", "machines"];
+            ohne Angabe wird das erste Array verwendet
+        """
+        if isinstance(record_path, str):
+            record_path = record_path.split(".")
+
+        if self._peek() == "":
+            return  # leere Datei: keine Datensätze
+        if not self._find_array(record_path):
+            raise ValueError(f"JSON: kein Array unter {record_path} gefunden")
+
+        self._expect("[")
+        while self._peek() not in ("]", ""):
+            yield self._decode()
+            if self._peek() == ",":
+                self.pos += 1
+        self._expect("]")
+
+
+def is_ndjson(source, sample_size: int = 64 * 1024) -> bool:
+    """
+    Prüft, ob eine Datei NDJSON (ein JSON-Objekt pro Zeile) enthält
+
+    Kriterium: Die erste Zeile ist ein vollständiges JSON-Objekt und die
+    nächste nicht-leere Zeile beginnt ebenfalls mit '{'.
+    """
+    if isinstance(source, str | Path) and Path(source).suffix.lower() in (
+        ".ndjson",
+        ".jsonl",
+    ):
+        return True
+
+    stream, owned = open_text(source)
+    try:
+        sample = stream.read(sample_size)
+    finally:
+        close_text(stream, source, owned)
+
+    lines = [line.strip() for line in sample.splitlines() if line.strip()]
+    if len(lines) < 2 or not lines[0].startswith("{"):
+        return False
+    try:
+        json.loads(lines[0])
+    except json.JSONDecodeError:
+        return False
+    return lines[1].startswith("{")
+
+
+def iter_json_records(source, record_path=None, lines: bool = None):
+    """
+    Liefert die Datensätze einer JSON- oder NDJSON-Datei einzeln
+
+    Parameters:
+    -----------
+    source : str, Path or file-like
+        Datei (auch gzip-komprimiert) oder Binärpuffer
+    record_path : str or list, optional
+        Pfad zum Datensatz-Array (nur für JSON-Dokumente)
+    lines : bool, optional
+        NDJSON erzwingen (True) oder ausschliessen (False); sonst Erkennung
+    """
+    if lines is None:
+        lines = is_ndjson(source)
+
+    stream, owned = open_text(source)
+    try:
+        if lines:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from JsonRecordStream(stream).records(record_path)
+    finally:
+        close_text(stream, source, owned)
+
+
+def flatten_records(
+    records: list[dict], separator: str = FLATTEN_SEPARATOR
+) -> pd.DataFrame:
+    """
+    Flacht eine Liste verschachtelter Datensätze in einem Schritt ab
+
+    Entspricht verschachteltes_dict_zu_flach() aus Modul 02, arbeitet aber
+    auf dem ganzen Chunk statt Datensatz für Datensatz.
+    """
+    if not records:
+        return pd.DataFrame()
+    return pd.json_normalize(records, sep=separator)
+
+
+def read_json_chunks(
+    source,
+    chunksize: int = 10_000,
+    record_path=None,
+    lines: bool = None,
+    separator: str = FLATTEN_SEPARATOR,
+    columns: list[str] = None,
+):
+    """
+    Liest JSON/NDJSON inkrementell als Folge flacher DataFrame-Chunks
+
+    Parameters:
+    -----------
+    source : str, Path or file-like
+        Datei oder Binärpuffer
+    chunksize : int
+        Datensätze pro Chunk
+    record_path : str or list, optional
+        Pfad zum Datensatz-Array, z.B. "production.data.machines"
+    lines : bool, optional
+        NDJSON erzwingen/ausschliessen; sonst automatische Erkennung
+    separator : str
+        Trennzeichen für abgeflachte Spaltennamen
+    columns : list, optional
+        Feste Spaltenliste (fehlende Spalten werden mit NaN ergänzt), damit
+        alle Chunks dasselbe Schema haben
+
+    Yields:
+    -------
+    pd.DataFrame
+        Abgeflachte Datensätze, höchstens chunksize Zeilen
+    """
+    batch = []
+    for record in iter_json_records(source, record_path, lines):
+        batch.append(record if isinstance(record, dict) else {"value": record})
+        if len(batch) >= chunksize:
+            yield _finish_chunk(batch, separator, columns)
+            batch = []
+
+    if batch:
+        yield _finish_chunk(batch, separator, columns)
+
+
+def _finish_chunk(batch, separator, columns) -> pd.DataFrame:
+    df = flatten_records(batch, separator)
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    return df
+
+
+def main():
+    """
+    Demonstriert das Streaming einer grossen API-Antwort
+    """
+    print("🌊 JSON Streaming - Demo")
+    print("=" * 50)
+
+    demo_file = get_data_path("generated", "api_dump_demo.json.gz")
+    demo_file.parent.mkdir(parents=True, exist_ok=True)
+
+    rng = np.random.default_rng(7)
+    n_records = 50_000
+    with gzip.open(demo_file, "wt", encoding="utf-8") as f:
+        f.write('{"status": "success", "timestamp": "2024-01-15T10:30:00Z",')
+        f.write(' "data": {"machines": [')
+        for i in range(n_records):
+            record = {
+                "id": f"LC{i % 40:03d}",
+                "status": "running" if rng.random() > 0.1 else "maintenance",
+                "sensor": {
+                    "temperature": round(float(rng.normal(23, 2)), 2),
+                    "vibration": {"rms": round(float(rng.gamma(2, 0.3)), 3)},
+                },
+                "parts_produced_today": int(rng.integers(0, 1200)),
+            }
+            f.write(("," if i else "") + json.dumps(record))
+        f.write('], "summary": {"active_machines": 40}}}')
+
+    total_rows = 0
+    for i, chunk in enumerate(read_json_chunks(demo_file, chunksize=20_000)):
+        total_rows += len(chunk)
+        print(f"  Chunk {i + 1}: {chunk.shape[0]:,} Zeilen × {chunk.shape[1]} Spalten")
+
+    print(f"\n✅ {total_rows:,} Datensätze gestreamt")
+    print(f"📋 Spalten: {', '.join(chunk.columns)}")
+    demo_file.unlink()
+
+
+if __name__ == "__main__":
+    main()
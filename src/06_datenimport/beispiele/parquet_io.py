@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Parquet/Feather I/O - Spaltenorientierter Export und Import
+
+CSV, Excel und JSON speichern Zeilen als Text: Jeder Leser muss die ganze
+Datei parsen, auch wenn er nur zwei Spalten einer Maschine braucht.
+Parquet speichert Spalten typisiert und komprimiert in Row-Groups mit
+Min/Max-Statistiken. Damit kann ein Leser
+- nur die benötigten Spalten laden (Column Projection) und
+- Row-Groups überspringen, deren Zeitraum oder Maschine nicht passt
+  (Predicate Pushdown).
+
+Feather (Arrow IPC) ist das schnelle Zwischenformat für lokale Pipelines.
+
+Autor: Python Grundkurs Bystronic
+"""
+
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+warnings.filterwarnings("ignore")
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+PARQUET_MAGIC = b"PAR1"
+FEATHER_MAGIC = b"ARROW1"
+
+TIME_COLUMN = "Zeitstempel"
+MACHINE_COLUMN = "Maschine"
+
+
+def get_data_path(*args):
+    """
+    Hilfsfunktion zum korrekten Konstruieren der Datenpfade
+    """
+    project_root = Path(__file__).parent.parent.parent.parent
+    data_path = project_root / "data"
+    for arg in args:
+        data_path = data_path / arg
+    return data_path
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("Parquet/Feather benötigen pyarrow: pip install pyarrow")
+
+
+def write_parquet(
+    df: pd.DataFrame,
+    path,
+    compression: str = "zstd",
+    row_group_size: int = 100_000,
+    sort_by: list[str] = None,
+    partition_cols: list[str] = None,
+):
+    """
+    Schreibt einen DataFrame als Parquet-Datei
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Zu schreibende Daten
+    path : str, Path or file-like
+        Zieldatei, Verzeichnis (bei partition_cols) oder Binärpuffer
+    compression : str
+        "zstd", "snappy", "gzip", "lz4" oder None
+    row_group_size : int
+        Zeilen pro Row-Group; kleinere Gruppen erlauben feineres Überspringen
+    sort_by : list, optional
+        Sortierung vor dem Schreiben. Standard: Maschine und Zeitstempel,
+        sofern vorhanden - so werden die Row-Group-Statistiken selektiv.
+    partition_cols : list, optional
+        Spalten für ein Hive-partitioniertes Verzeichnis (z.B. ["Maschine"])
+
+    Returns:
+    --------
+    str, Path or file-like
+        Das übergebene Ziel
+    """
+    _require_pyarrow()
+
+    if sort_by is None:
+        sort_by = [c for c in (MACHINE_COLUMN, TIME_COLUMN) if c in df.columns]
+    if sort_by:
+        df = df.sort_values(sort_by, kind="stable")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if partition_cols:
+        pq.write_to_dataset(
+            table,
+            root_path=str(path),
+            partition_cols=partition_cols,
+            compression=compression,
+            row_group_size=row_group_size,
+        )
+    else:
+        pq.write_table(
+            table, path, compression=compression, row_group_size=row_group_size
+        )
+    return path
+
+
+def build_filters(
+    machines=None,
+    start=None,
+    end=None,
+    time_column: str = TIME_COLUMN,
+    machine_column: str = MACHINE_COLUMN,
+    filters: list = None,
+) -> list | None:
+    """
+    Baut Parquet-Filter (DNF-Liste von Tupeln) für Zeitraum und Maschinen
+
+    start ist inklusiv, end exklusiv. Weitere Bedingungen können über
+    filters ergänzt werden, z.B. [("Temperatur", ">", 30)].
+    """
+    conditions = list(filters or [])
+    if machines is not None:
+        if isinstance(machines, str):
+            machines = [machines]
+        conditions.append((machine_column, "in", list(machines)))
+    if start is not None:
+        conditions.append((time_column, ">=", pd.Timestamp(start)))
+    if end is not None:
+        conditions.append((time_column, "<", pd.Timestamp(end)))
+    return conditions or None
+
+
+def read_parquet(
+    path,
+    columns: list[str] = None,
+    machines=None,
+    start=None,
+    end=None,
+    filters: list = None,
+    time_column: str = TIME_COLUMN,
+    machine_column: str = MACHINE_COLUMN,
+) -> pd.DataFrame:
+    """
+    Liest nur die benötigten Spalten und Zeilen einer Parquet-Datei
+
+    Parameters:
+    -----------
+    path : str, Path or file-like
+        Parquet-Datei, partitioniertes Verzeichnis oder Puffer
+    columns : list, optional
+        Zu ladende Spalten (alle, wenn None)
+    machines : str or list, optional
+        Nur diese Maschinen
+    start, end : str or Timestamp, optional
+        Zeitraum [start, end) auf der Zeitspalte
+    filters : list, optional
+        Zusätzliche pyarrow-Filter, z.B. [("Temperatur", ">", 30)]
+
+    Returns:
+    --------
+    pd.DataFrame
+        Gefilterte Daten; Row-Groups ausserhalb des Filters werden anhand
+        ihrer Statistiken gar nicht erst gelesen
+    """
+    _require_pyarrow()
+    conditions = build_filters(
+        machines, start, end, time_column, machine_column, filters
+    )
+    return pd.read_parquet(path, engine="pyarrow", columns=columns, filters=conditions)
+
+
+def parquet_row_groups(path, column: str = TIME_COLUMN) -> pd.DataFrame:
+    """
+    Übersicht der Row-Groups mit Zeilenzahl und Min/Max einer Spalte
+
+    Zeigt, welche Row-Groups ein Filter auf dieser Spalte überspringen kann.
+    """
+    _require_pyarrow()
+    metadata = pq.ParquetFile(path).metadata
+    column_index = metadata.schema.names.index(column)
+
+    rows = []
+    for i in range(metadata.num_row_groups):
+        group = metadata.row_group(i)
+        stats = group.column(column_index).statistics
+        rows.append(
+            {
+                "Row_Group": i,
+                "Zeilen": group.num_rows,
+                "Min": stats.min if stats is not None and stats.has_min_max else None,
+                "Max": stats.max if stats is not None and stats.has_min_max else None,
+                "Bytes": group.total_byte_size,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def write_feather(df: pd.DataFrame, path, compression: str = "lz4"):
+    """
+    Schreibt einen DataFrame als Feather-Datei (Arrow IPC)
+
+    Feather ist unkomprimiert oder mit lz4/zstd komprimiert und lässt sich
+    ohne Parsen direkt in den Speicher abbilden.
+    """
+    _require_pyarrow()
+    feather.write_feather(df.reset_index(drop=True), path, compression=compression)
+    return path
+
+
+def read_feather(path, columns: list[str] = None) -> pd.DataFrame:
+    """Liest eine Feather-Datei, optional nur ausgewählte Spalten"""
+    _require_pyarrow()
+    return feather.read_feather(path, columns=columns)
+
+
+def to_parquet_bytes(df: pd.DataFrame, **kwargs) -> bytes:
+    """Parquet-Export in den Speicher, z.B. für Download-Buttons"""
+    import io
+
+    buffer = io.BytesIO()
+    write_parquet(df, buffer, **kwargs)
+    return buffer.getvalue()
+
+
+def create_sample_telemetry(n_rows: int = 200_000, seed: int = 42) -> pd.DataFrame:
+    """
+    Erstellt Beispiel-Telemetrie für die Demo
+
+    Returns:
+    --------
+    pd.DataFrame
+        Zeitstempel, Maschine, Temperatur, Leistung_kW, Status
+    """
+    rng = np.random.default_rng(seed)
+    machines = np.array([f"Laser_{i:02d}" for i in range(1, 9)])
+    return pd.DataFrame(
+        {
+            "Zeitstempel": pd.date_range("2024-01-01", periods=n_rows, freq="10s"),
+            "Maschine": pd.Categorical(rng.choice(machines, n_rows)),
+            "Temperatur": rng.normal(23, 2, n_rows).round(2),
+            "Leistung_kW": rng.gamma(4, 2.5, n_rows).round(2),
+            "Status": pd.Categorical(
+                rng.choice(
+                    ["Produktion", "Standby", "Wartung"], n_rows, p=[0.8, 0.15, 0.05]
+                )
+            ),
+        }
+    )
+
+
+def main():
+    """
+    Vergleicht CSV mit Parquet/Feather und demonstriert Pushdown
+    """
+    print("🧱 Parquet/Feather I/O - Demo")
+    print("=" * 50)
+
+    if not PYARROW_AVAILABLE:
+        print("❌ pyarrow ist nicht installiert")
+        return
+
+    output_dir = get_data_path("generated", "parquet_demo")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    df = create_sample_telemetry()
+
+    files = {
+        "CSV": output_dir / "telemetrie.csv",
+        "Parquet": output_dir / "telemetrie.parquet",
+        "Feather": output_dir / "telemetrie.feather",
+    }
+    df.to_csv(files["CSV"], index=False)
+    write_parquet(df, files["Parquet"], row_group_size=20_000)
+    write_feather(df, files["Feather"])
+
+    print("\n📦 Dateigrössen:")
+    for name, path in files.items():
+        print(f"  {name:<8} {path.stat().st_size / 1024:>10,.0f} KB")
+
+    print("\n⏱️ Nur Laser_03, 1 Tag, 2 Spalten lesen:")
+    start, end = "2024-01-05", "2024-01-06"
+
+    t0 = time.perf_counter()
+    csv_df = pd.read_csv(files["CSV"], parse_dates=["Zeitstempel"])
+    csv_df = csv_df[
+        (csv_df["Maschine"] == "Laser_03")
+        & (csv_df["Zeitstempel"] >= start)
+        & (csv_df["Zeitstempel"] < end)
+    ][["Zeitstempel", "Temperatur"]]
+    csv_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pq_df = read_parquet(
+        files["Parquet"],
+        columns=["Zeitstempel", "Temperatur"],
+        machines="Laser_03",
+        start=start,
+        end=end,
+    )
+    pq_seconds = time.perf_counter() - t0
+
+    print(f"  CSV:     {csv_seconds * 1000:8.1f} ms ({len(csv_df):,} Zeilen)")
+    print(f"  Parquet: {pq_seconds * 1000:8.1f} ms ({len(pq_df):,} Zeilen)")
+
+    groups = parquet_row_groups(files["Parquet"])
+    print(f"\n🗂️ {len(groups)} Row-Groups, sortiert nach Maschine und Zeit")
+    print(groups.head(3).to_string(index=False))
+
+    for path in files.values():
+        path.unlink()
+    output_dir.rmdir()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Speicher-Optimierung - Kleinste sichere Datentypen für geladene Daten
+
+pandas liest Zahlen standardmässig als int64/float64 und Texte als
+Python-Objekte. Für Maschinendaten ist das meist viel zu gross:
+- Stückzahlen passen in int16, Zähler in int32
+- Messwerte mit 1-2 Nachkommastellen sind in float32 genau genug;
+  ganzzahlige Werte (z.B. Unix-Zeiten) bleiben float64, sobald float32
+  sie nicht mehr exakt darstellen kann (ab 2**24)
+- Spalten wie Maschine, Schicht, Status oder Bediener haben nur wenige
+  verschiedene Werte und sind als Categorical um ein Vielfaches kleiner
+
+optimize_frame() wählt diese Typen automatisch und meldet den
+Speicherbedarf vorher und nachher. Die Loader dieses Kapitels bieten dafür
+die Option optimize=True an.
+
+Autor: Python Grundkurs Bystronic
+"""
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+warnings.filterwarnings("ignore")
+
+# Textspalten, die immer als Categorical gespeichert werden
+CATEGORY_COLUMNS = ("Maschine", "Schicht", "Status", "Bediener")
+
+# Rundungsfehler einer einzelnen float32-Umwandlung (Maschinengenauigkeit)
+FLOAT32_RTOL = float(np.finfo(np.float32).eps)
+
+
+def _downcast_float(series: pd.Series, float_rtol: float) -> pd.Series:
+    """float64 -> float32, wenn alle Werte innerhalb float_rtol erhalten bleiben"""
+    values = series.to_numpy()
+    with np.errstate(over="ignore", invalid="ignore"):
+        # Überläufe werden zu inf und bestehen den Vergleich nicht
+        converted = values.astype(np.float32)
+        if not np.allclose(converted, values, rtol=float_rtol, atol=0, equal_nan=True):
+            return series
+        # Ganze Zahlen müssen exakt bleiben: 16777217.0 würde sonst zu
+        # 16777216.0 und benachbarte Zeitstempel fielen zusammen
+        integral = np.isfinite(values) & (values == np.round(values))
+        if (converted[integral].astype(np.float64) != values[integral]).any():
+            return series
+    return pd.Series(converted, index=series.index, name=series.name)
+
+
+def _to_category(
+    series: pd.Series, force: bool, max_category_ratio: float
+) -> pd.Series | None:
+    """Textspalte als Categorical, wenn wenige verschiedene Werte vorkommen"""
+    if pd.api.types.infer_dtype(series, skipna=True) != "string":
+        return None
+
+    codes, uniques = pd.factorize(series, sort=True)
+    if not force and len(uniques) > max_category_ratio * len(series):
+        return None
+
+    values = pd.Categorical.from_codes(codes, categories=uniques)
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def optimize_frame(
+    df: pd.DataFrame,
+    categorical_columns=CATEGORY_COLUMNS,
+    max_category_ratio: float = 0.5,
+    float_rtol: float | None = FLOAT32_RTOL,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Wandelt alle Spalten in die kleinsten sicheren Datentypen um
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Geladene Daten (wird nicht verändert)
+    categorical_columns : iterable
+        Textspalten, die immer Categorical werden (Standard: CATEGORY_COLUMNS)
+    max_category_ratio : float
+        Übrige Textspalten werden Categorical, wenn höchstens dieser Anteil
+        der Zeilen verschiedene Werte hat (0 = nie)
+    float_rtol : float or None
+        Zulässiger relativer Rundungsfehler für float32 (Standard: eine
+        Rundung, None = nie float32). Ganzzahlige Werte müssen immer exakt
+        erhalten bleiben.
+
+    Returns:
+    --------
+    tuple
+        (optimierter DataFrame, Bericht mit bytes_before, bytes_after,
+        saved_bytes, saved_pct, columns {Spalte: (alter Typ, neuer Typ)}
+        und seconds)
+    """
+    start = time.perf_counter()
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    force = set(categorical_columns or ())
+
+    converted = {}
+    for column in df.columns:
+        series = df[column]
+        kind = series.dtype.kind
+        result = None
+
+        if kind in "iu" and isinstance(series.dtype, np.dtype):
+            downcast = "unsigned" if kind == "u" else "integer"
+            result = pd.to_numeric(series, downcast=downcast)
+        elif kind == "f" and series.dtype == np.float64 and float_rtol is not None:
+            result = _downcast_float(series, float_rtol)
+        elif series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+            result = _to_category(series, column in force, max_category_ratio)
+
+        if result is not None and result.dtype != series.dtype:
+            converted[column] = result
+
+    optimized = df.copy()
+    for column, result in converted.items():
+        optimized[column] = result
+
+    bytes_after = int(optimized.memory_usage(deep=True).sum())
+    report = {
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "saved_bytes": bytes_before - bytes_after,
+        "saved_pct": (1 - bytes_after / bytes_before) * 100 if bytes_before else 0.0,
+        "columns": {
+            column: (str(df[column].dtype), str(result.dtype))
+            for column, result in converted.items()
+        },
+        "seconds": time.perf_counter() - start,
+    }
+    return optimized, report
+
+
+def format_memory_report(report: dict) -> str:
+    """Kurzfassung eines Berichts, z.B. 'Speicher: 12.4 MB → 2.1 MB (-83.1%)'"""
+    unit, scale = ("MB", 1024**2) if report["bytes_before"] >= 1024**2 else ("KB", 1024)
+    before = report["bytes_before"] / scale
+    after = report["bytes_after"] / scale
+    return (
+        f"Speicher: {before:.1f} {unit} → {after:.1f} {unit} "
+        f"(-{report['saved_pct']:.1f}%)"
+    )
+
+
+def main():
+    """Optimiert typische Maschinendaten und zeigt die Einsparung"""
+    print("🗜️ Speicher-Optimierung - Demo")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    n_rows = 1_000_000
+    df = pd.DataFrame(
+        {
+            "ID": np.arange(n_rows),
+            "Zeitstempel": pd.date_range("2024-01-01", periods=n_rows, freq="s"),
+            "Maschine": rng.choice([f"Laser_{i:02d}" for i in range(1, 13)], n_rows),
+            "Schicht": rng.choice(["Früh", "Spät", "Nacht"], n_rows),
+            "Status": rng.choice(["Produktion", "Standby", "Wartung"], n_rows),
+            "Bediener": rng.choice([f"BY{i:03d}" for i in range(1, 41)], n_rows),
+            "Stückzahl": rng.integers(0, 500, n_rows),
+            "Temperatur": rng.normal(23, 2, n_rows).round(1),
+            "Leistung_kW": rng.gamma(4, 2.5, n_rows),
+            "Auftrag": [f"A{i:07d}" for i in range(n_rows)],
+        }
+    )
+
+    optimized, report = optimize_frame(df)
+
+    print(f"Zeilen: {len(df):,} in {report['seconds']:.2f} s")
+    print(f"📦 {format_memory_report(report)}")
+    print("\nUmgewandelte Spalten:")
+    for column, (old, new) in report["columns"].items():
+        print(f"  {column:<12} {old:<8} → {new}")
+
+    unchanged = [c for c in df.columns if c not in report["columns"]]
+    print(f"\nUnverändert: {unchanged}")
+    print(
+        "Stückzahl identisch:",
+        "✅" if (optimized["Stückzahl"] == df["Stückzahl"]).all() else "❌",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Spektralanalyse für Vibrationskanäle aus Scope-Exporten
+
+Vibrationskanäle (VIBR_...) werden im Scope mit 1 ms abgetastet - eine
+Stunde sind 3.6 Mio. Werte pro Kanal. Für die vorausschauende Wartung
+interessiert nicht der Rohwert, sondern das Spektrum: Lagerschäden und
+Unwucht zeigen sich als Energie in bestimmten Frequenzbändern.
+
+Dieses Modul arbeitet auf den Blöcken von
+BystronicCSVParser.iter_scope_chunks:
+- Welch-PSD: überlappende Hann-Segmente, der Rest eines Blocks wird an
+  den nächsten übergeben - Speicher hängt nur von der Blockgrösse ab
+- Bandenergien und dominante Frequenz je Segment (Zeitreihen-Merkmale)
+- Spektrogramme aller Kanäle in einem FFT-Aufruf, parallel über
+  scipy.fft (workers)
+- Peak-Tracking mit Parabel-Interpolation zwischen den FFT-Bins
+- Ergebnisse pro Datei gecacht (Pfad, Grösse, Änderungszeit, Parameter)
+
+Autor: Python Grundkurs Bystronic
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from bystronic_csv_parser import BystronicCSVParser, get_data_path, write_scope_csv
+from scipy import fft, signal
+
+# Frequenzbänder für Vibrationsmerkmale in Hz
+DEFAULT_BANDS = {
+    "0-10 Hz": (0, 10),
+    "10-50 Hz": (10, 50),
+    "50-150 Hz": (50, 150),
+    "150-500 Hz": (150, 500),
+}
+
+
+def _segments(data: np.ndarray, nperseg: int, step: int) -> np.ndarray:
+    """Überlappende Segmente ohne Kopie (Segmente × Kanäle × nperseg)"""
+    view = np.lib.stride_tricks.sliding_window_view(data, nperseg, axis=0)
+    return view[::step]
+
+
+def _power(segments: np.ndarray, window: np.ndarray, fs: float, workers: int):
+    """Einseitige Leistungsdichte je Segment wie scipy.signal.welch"""
+    centered = segments - segments.mean(axis=-1, keepdims=True)
+    spectrum = fft.rfft(centered * window, axis=-1, workers=workers)
+    power = spectrum.real**2 + spectrum.imag**2
+    power /= fs * np.sum(window**2)
+    # Negative Frequenzen auf die positiven falten (ohne DC und Nyquist)
+    last = -1 if len(window) % 2 == 0 else None
+    power[..., 1:last] *= 2
+    return power
+
+
+def band_energy(freqs: np.ndarray, psd: np.ndarray, bands: dict) -> np.ndarray:
+    """
+    Leistung je Frequenzband (Integral der PSD)
+
+    Parameters:
+    -----------
+    freqs : np.ndarray
+        Frequenzen der PSD-Bins
+    psd : np.ndarray
+        Leistungsdichte, Frequenz in der letzten Achse
+    bands : dict
+        {Name: (von Hz, bis Hz)}
+
+    Returns:
+    --------
+    np.ndarray
+        Leistung mit den Bändern in der letzten Achse
+    """
+    df = freqs[1] - freqs[0]
+    # Kumulative Summe: jedes Band ist eine Differenz zweier Einträge
+    cumulative = np.concatenate(
+        [np.zeros(psd.shape[:-1] + (1,)), np.cumsum(psd, axis=-1)], axis=-1
+    )
+    low = np.searchsorted(freqs, [low for low, _ in bands.values()], side="left")
+    high = np.searchsorted(freqs, [high for _, high in bands.values()], side="left")
+    return (cumulative[..., high] - cumulative[..., low]) * df
+
+
+def peak_frequency(freqs: np.ndarray, power: np.ndarray, fmin=0.0, fmax=None):
+    """
+    Dominante Frequenz je Spektrum, zwischen den Bins interpoliert
+
+    Parameters:
+    -----------
+    freqs : np.ndarray
+        Frequenzen der Bins
+    power : np.ndarray
+        Spektren, Frequenz in der letzten Achse (z.B. Zeit × Frequenz)
+    fmin, fmax : float
+        Suchbereich in Hz
+
+    Returns:
+    --------
+    tuple
+        (Frequenz, Leistungsdichte) des Maximums je Spektrum
+    """
+    fmax = freqs[-1] if fmax is None else fmax
+    inside = np.flatnonzero((freqs >= fmin) & (freqs <= fmax))
+    lo, hi = inside[0], inside[-1]
+    best = lo + np.argmax(power[..., lo : hi + 1], axis=-1)
+
+    # Parabel durch log-Leistung der Nachbarbins (Randbins nicht verschieben)
+    left = np.take_along_axis(power, np.maximum(best - 1, 0)[..., None], -1)[..., 0]
+    mid = np.take_along_axis(power, best[..., None], -1)[..., 0]
+    right_index = np.minimum(best + 1, power.shape[-1] - 1)
+    right = np.take_along_axis(power, right_index[..., None], -1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a, b, c = np.log(left), np.log(mid), np.log(right)
+        offset = 0.5 * (a - c) / (a - 2 * b + c)
+    interior = (best > lo) & (best < hi) & np.isfinite(offset)
+    offset = np.where(interior, np.clip(offset, -0.5, 0.5), 0.0)
+    df = freqs[1] - freqs[0]
+    return freqs[best] + offset * df, mid
+
+
+class WelchAccumulator:
+    """
+    Welch-PSD über einen Strom von Blöcken (Samples × Kanäle)
+
+    Parameters:
+    -----------
+    fs : float
+        Abtastrate in Hz
+    nperseg : int
+        Samples pro Segment (Frequenzauflösung fs / nperseg)
+    overlap : float
+        Überlappung der Segmente (0.5 = 50%)
+    window : str
+        Fensterfunktion (scipy.signal.get_window)
+    bands : dict, optional
+        Frequenzbänder für Merkmale je Segment (Standard: DEFAULT_BANDS)
+    workers : int
+        Threads für die FFT (-1 = alle Kerne)
+    """
+
+    def __init__(
+        self,
+        fs: float,
+        nperseg: int = 1024,
+        overlap: float = 0.5,
+        window: str = "hann",
+        bands: dict = None,
+        workers: int = -1,
+    ):
+        self.fs = fs
+        self.nperseg = nperseg
+        self.step = nperseg - int(nperseg * overlap)
+        self.window = signal.get_window(window, nperseg)
+        self.bands = DEFAULT_BANDS if bands is None else bands
+        self.workers = workers
+        self.freqs = fft.rfftfreq(nperseg, 1 / fs)
+        self.buffer = None
+        self.consumed = 0  # Samples vor dem Puffer
+        self.power_sum = 0.0
+        self.n_segments = 0
+        self.segment_starts = []
+        self.band_parts = []
+        self.peak_parts = []
+
+    def update(self, block) -> None:
+        """Verarbeitet einen weiteren Block (Samples × Kanäle oder 1-D)"""
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[:, None]
+        data = block if self.buffer is None else np.concatenate([self.buffer, block])
+        n_segments = max(0, (len(data) - self.nperseg) // self.step + 1)
+
+        if n_segments:
+            power = _power(
+                _segments(data, self.nperseg, self.step)[:n_segments],
+                self.window,
+                self.fs,
+                self.workers,
+            )
+            self.power_sum = self.power_sum + power.sum(axis=0)
+            self.n_segments += n_segments
+            starts = self.consumed + np.arange(n_segments) * self.step
+            self.segment_starts.append(starts)
+            self.band_parts.append(band_energy(self.freqs, power, self.bands))
+            self.peak_parts.append(peak_frequency(self.freqs, power)[0])
+
+        # Rest für das nächste Segment aufheben
+        keep_from = n_segments * self.step
+        self.buffer = data[keep_from:]
+        self.consumed += keep_from
+
+    def psd(self) -> tuple[np.ndarray, np.ndarray]:
+        """Frequenzen und gemittelte PSD (Frequenz × Kanäle)"""
+        if self.n_segments == 0:
+            raise ValueError(f"Weniger als {self.nperseg} Samples verarbeitet")
+        return self.freqs, (self.power_sum / self.n_segments).T
+
+    def segment_features(self, channels: list) -> pd.DataFrame:
+        """
+        Bandenergien und dominante Frequenz je Segment
+
+        Returns:
+        --------
+        pd.DataFrame
+            Index: Segmentmitte in Sekunden; Spalten (Kanal, Merkmal)
+        """
+        starts = np.concatenate(self.segment_starts)
+        bands = np.concatenate(self.band_parts)  # Segmente × Kanäle × Bänder
+        peaks = np.concatenate(self.peak_parts)  # Segmente × Kanäle
+        columns, values = [], []
+        for c, channel in enumerate(channels):
+            for b, band in enumerate(self.bands):
+                columns.append((channel, band))
+                values.append(bands[:, c, b])
+            columns.append((channel, "Peak Hz"))
+            values.append(peaks[:, c])
+        index = pd.Index((starts + self.nperseg / 2) / self.fs, name="Zeit_s")
+        return pd.DataFrame(
+            np.column_stack(values),
+            index=index,
+            columns=pd.MultiIndex.from_tuples(columns, names=["Kanal", "Merkmal"]),
+        )
+
+
+def welch_psd(data, fs: float, nperseg: int = 1024, overlap: float = 0.5):
+    """Welch-PSD eines Arrays (Samples × Kanäle) im Speicher"""
+    accumulator = WelchAccumulator(fs, nperseg, overlap)
+    accumulator.update(data)
+    return accumulator.psd()
+
+
+def spectrograms(
+    data, fs: float, nperseg: int = 256, overlap: float = 0.5, workers: int = -1
+):
+    """
+    Spektrogramme aller Kanäle in einem FFT-Aufruf
+
+    Parameters:
+    -----------
+    data : array_like
+        Signale (Samples × Kanäle)
+    fs : float
+        Abtastrate in Hz
+    nperseg : int
+        Samples pro Segment
+    overlap : float
+        Überlappung der Segmente
+    workers : int
+        Threads für scipy.fft (-1 = alle Kerne), parallel über Kanäle und
+        Segmente
+
+    Returns:
+    --------
+    tuple
+        (Frequenzen, Zeiten in s, PSD mit Form Kanäle × Frequenzen × Zeiten)
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim == 1:
+        data = data[:, None]
+    step = nperseg - int(nperseg * overlap)
+    window = signal.get_window("hann", nperseg)
+    power = _power(_segments(data, nperseg, step), window, fs, workers)
+    times = (np.arange(power.shape[0]) * step + nperseg / 2) / fs
+    return fft.rfftfreq(nperseg, 1 / fs), times, power.transpose(1, 2, 0)
+
+
+def _cache_file(file_path: Path, cache_dir: Path, params: dict) -> Path:
+    """Cache-Datei aus Pfad, Grösse, Änderungszeit und Parametern"""
+    stat = file_path.stat()
+    key = json.dumps(
+        [str(file_path.resolve()), stat.st_size, stat.st_mtime_ns, params],
+        sort_keys=True,
+    )
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return cache_dir / f"{file_path.stem}_{digest}.pkl"
+
+
+def analyze_scope_file(
+    file_path,
+    channels: list = None,
+    nperseg: int = 1024,
+    overlap: float = 0.5,
+    bands: dict = None,
+    chunksize: int = 200_000,
+    cache_dir=None,
+) -> dict:
+    """
+    Spektralanalyse eines Scope-Exports, blockweise gelesen
+
+    Parameters:
+    -----------
+    file_path : str or Path
+        Scope-Export
+    channels : list, optional
+        Kanäle (Standard: alle, deren Name mit "VIBR" beginnt)
+    nperseg, overlap : int, float
+        Welch-Parameter
+    bands : dict, optional
+        Frequenzbänder (Standard: DEFAULT_BANDS)
+    chunksize : int
+        Zeilen pro gelesenem Block
+    cache_dir : str or Path, optional
+        Verzeichnis für gecachte Ergebnisse; ändert sich die Datei, wird
+        neu gerechnet
+
+    Returns:
+    --------
+    dict
+        'psd' (DataFrame Frequenz × Kanal), 'features' (DataFrame je
+        Segment), 'fs', 'from_cache'
+    """
+    file_path = Path(file_path)
+    bands = DEFAULT_BANDS if bands is None else bands
+    parser = BystronicCSVParser()
+    header = parser.read_scope_header(str(file_path))
+    if channels is None:
+        channels = [c for c in header["channels"] if c.startswith("VIBR")]
+
+    params = {
+        "channels": channels,
+        "nperseg": nperseg,
+        "overlap": overlap,
+        "bands": {name: list(limits) for name, limits in bands.items()},
+    }
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = _cache_file(file_path, Path(cache_dir), params)
+        if cache_file.exists():
+            return {**pd.read_pickle(cache_file), "from_cache": True}
+
+    sample_times = dict(zip(header["channels"], header["sample_time_ms"], strict=True))
+    rates = {1000.0 / sample_times[c] for c in channels}
+    if len(rates) != 1:
+        raise ValueError("Kanäle mit unterschiedlicher Abtastzeit")
+    fs = rates.pop()
+
+    accumulator = WelchAccumulator(fs, nperseg, overlap, bands=bands)
+    for chunk in parser.iter_scope_chunks(str(file_path), channels, chunksize):
+        accumulator.update(chunk.to_numpy())
+
+    freqs, psd = accumulator.psd()
+    result = {
+        "fs": fs,
+        "psd": pd.DataFrame(
+            psd, index=pd.Index(freqs, name="Frequenz_Hz"), columns=channels
+        ),
+        "features": accumulator.segment_features(channels),
+    }
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        pd.to_pickle(result, cache_file)
+    return {**result, "from_cache": False}
+
+
+def create_sample_vibration_export(output_path, seconds: float = 120.0) -> None:
+    """
+    Scope-Export mit 1 ms Abtastung: drei Vibrationskanäle und Temperatur
+
+    VIBR_002 entwickelt ab der Hälfte einen Lagerschaden (zusätzlicher
+    Ton bei 237 Hz), VIBR_003 läuft mit langsam steigender Drehzahl.
+    """
+    rng = np.random.default_rng(12)
+    fs = 1000
+    t = np.arange(int(seconds * fs)) / fs
+    schaden = np.where(t > seconds / 2, 0.8, 0.0)
+    drehzahl = 20 + 30 * t / seconds  # Hz, Hochlauf
+    signals = {
+        "TEMP_001": 35 + 0.01 * t + rng.normal(0, 0.05, len(t)),
+        "VIBR_001": np.sin(2 * np.pi * 25 * t) + rng.normal(0, 0.3, len(t)),
+        "VIBR_002": np.sin(2 * np.pi * 25 * t)
+        + schaden * np.sin(2 * np.pi * 237 * t)
+        + rng.normal(0, 0.3, len(t)),
+        "VIBR_003": np.sin(2 * np.pi * np.cumsum(drehzahl) / fs)
+        + rng.normal(0, 0.3, len(t)),
+    }
+    write_scope_csv(output_path, signals, sample_time_ms=1000 / fs)
+
+
+def main():
+    """Spektralanalyse eines Scope-Exports mit Cache"""
+    print("📈 Spektralanalyse für Vibrationskanäle")
+    print("=" * 50)
+
+    export = get_data_path("generated", "vibration_scope_demo.csv")
+    cache_dir = get_data_path("generated", "spektral_cache")
+    create_sample_vibration_export(export)
+    print(f"📁 Scope-Export: {export.name} ({export.stat().st_size / 1e6:.1f} MB)")
+
+    for durchlauf in ("erster Lauf", "aus Cache"):
+        start = time.perf_counter()
+        result = analyze_scope_file(export, chunksize=20_000, cache_dir=cache_dir)
+        dauer = time.perf_counter() - start
+        print(f"⏱️ {durchlauf}: {dauer:.2f} s (from_cache={result['from_cache']})")
+
+    psd = result["psd"]
+    print(f"\n🔊 Dominante Frequenz je Kanal (fs = {result['fs']:.0f} Hz):")
+    for channel in psd.columns:
+        print(f"   {channel}: {psd[channel].idxmax():.1f} Hz")
+
+    features = result["features"]
+    band = features[("VIBR_002", "150-500 Hz")]
+    mitte = features.index[-1] / 2
+    print("\n🛠️ VIBR_002 Energie 150-500 Hz (Lagerschaden ab Hälfte):")
+    print(f"   erste Hälfte:  {band[features.index < mitte].mean():.4f}")
+    print(f"   zweite Hälfte: {band[features.index >= mitte].mean():.4f}")
+
+    peaks = features[("VIBR_003", "Peak Hz")]
+    print("\n📍 VIBR_003 Peak-Tracking (Hochlauf 20 -> 50 Hz):")
+    for zeit in (10, 60, 110):
+        position = peaks.index.get_indexer([zeit], method="nearest")[0]
+        print(f"   t = {zeit:>3} s: {peaks.iloc[position]:.1f} Hz")
+
+    # Spektrogramme aller Kanäle in einem FFT-Aufruf
+    chunks = BystronicCSVParser().iter_scope_chunks(str(export), chunksize=50_000)
+    daten = pd.concat(chunks).to_numpy()
+    start = time.perf_counter()
+    _, _, power = spectrograms(daten, fs=result["fs"], workers=os.cpu_count())
+    dauer = time.perf_counter() - start
+    print(f"\n🌈 Spektrogramme (Kanäle × Frequenzen × Zeiten) {power.shape}")
+    print(f"   berechnet in {dauer:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
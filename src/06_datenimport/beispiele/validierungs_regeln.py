@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Validierungsregeln - Deklarative, vektorisierte Datenprüfung
+
+Statt jede Prüfung als eigene Funktion zu schreiben, werden Regeln als
+Dictionaries beschrieben und von einer Engine gemeinsam ausgewertet:
+
+    {"name": "Temperatur", "column": "Temperatur", "min": 10, "max": 40}
+    {"name": "Status", "column": "Status", "allowed": ["OK", "NOK"]}
+    {"name": "Bediener-ID", "column": "Bediener", "pattern": r"^BY\\d{3}$"}
+    {"name": "Laser-Temperatur", "column": "Temperatur_C", "min": 20,
+     "when": {"column": "Maschine", "pattern": "Laser"}}
+
+Jede Regel wird als boolesche NumPy-Maske ausgewertet und in einer
+Bitmap pro Zeile abgelegt (Bit i = Regel i verletzt). Damit liefert ein
+Durchlauf sowohl die Anzahl pro Regel als auch, welche Zeile welche
+Regeln verletzt - auch chunkweise bei Streaming-Importen.
+
+Autor: Python Grundkurs Bystronic
+"""
+
+import re
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+warnings.filterwarnings("ignore")
+
+MAX_RULES = 64  # Eine uint64-Bitmap pro Zeile
+
+# Spalten für die Bereichsregeln aus TEST_CONFIG["validation_rules"]
+RANGE_COLUMNS = {
+    "temperature": ["Temperatur", "Temperatur_C"],
+    "production": ["Produktion", "Stückzahl"],
+    "availability": ["Verfügbarkeit", "Verfuegbarkeit"],
+    "pressure": ["Druck", "Druck_bar"],
+}
+
+RULE_KEYS = {
+    "name",
+    "column",
+    "min",
+    "max",
+    "allowed",
+    "pattern",
+    "required",
+    "check",
+    "when",
+    "severity",
+    "message",
+}
+
+
+def rules_from_config(validation_rules: dict, columns: dict = None) -> list[dict]:
+    """
+    Erstellt Bereichsregeln aus einer Konfiguration wie TEST_CONFIG
+
+    Parameters:
+    -----------
+    validation_rules : dict
+        z.B. {"temperature_range": (-50, 200), "production_range": (0, 10000)}
+    columns : dict, optional
+        Zuordnung Präfix -> Spaltenname(n); Standard: RANGE_COLUMNS
+
+    Returns:
+    --------
+    list
+        Regeln für ValidationRuleEngine
+    """
+    columns = RANGE_COLUMNS if columns is None else {**RANGE_COLUMNS, **columns}
+    rules = []
+    for key, (low, high) in validation_rules.items():
+        prefix = key.removesuffix("_range")
+        rules.append(
+            {
+                "name": prefix,
+                "column": columns.get(prefix, prefix),
+                "min": low,
+                "max": high,
+            }
+        )
+    return rules
+
+
+class ValidationRuleEngine:
+    """
+    Wertet deklarative Validierungsregeln vektorisiert aus
+
+    Regel-Schlüssel:
+    - name: Regelname (Pflicht, eindeutig)
+    - column: Spalte oder Liste alternativer Spaltennamen
+    - min / max: zulässiger Wertebereich (inklusiv)
+    - allowed: Liste zulässiger Werte
+    - pattern: Regex (re.search; mit ^...$ für exakte Treffer)
+    - required: fehlende Werte sind eine Verletzung (sonst ignoriert)
+    - check: Funktion df -> boolesche Maske, True = gültig
+    - when: Bedingung (Regel ohne name), auf deren Treffer die Regel
+      beschränkt wird, z.B. nur Laser-Maschinen
+    - severity: "error" (Standard) oder "warning"
+    - message: Meldungstext; Standard aus Name und Grenzen
+
+    Regeln mit fehlender Spalte werden übersprungen und gemeldet.
+    """
+
+    def __init__(self, rules: list[dict]):
+        if len(rules) > MAX_RULES:
+            raise ValueError(f"Maximal {MAX_RULES} Regeln pro Engine")
+
+        names = [rule.get("name") for rule in rules]
+        if None in names or len(set(names)) != len(names):
+            raise ValueError("Jede Regel braucht einen eindeutigen Namen")
+        for rule in rules:
+            unknown = set(rule) - RULE_KEYS
+            if unknown:
+                name = rule["name"]
+                raise ValueError(f"Regel '{name}': unbekannte Schlüssel {unknown}")
+
+        self.rules = list(rules)
+        self.names = names
+
+    # ------------------------------------------------------------------
+    # Auswertung einzelner Regeln
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _resolve_column(rule: dict, df: pd.DataFrame) -> str | None:
+        candidates = rule.get("column")
+        if candidates is None:
+            return None
+        if isinstance(candidates, str):
+            candidates = [candidates]
+        return next((c for c in candidates if c in df.columns), False)
+
+    @staticmethod
+    def _match_unique(series: pd.Series, func) -> np.ndarray:
+        """Prüft nur die eindeutigen Werte und verteilt das Ergebnis zurück"""
+        codes, uniques = pd.factorize(series)
+        matches = np.asarray(func(pd.Series(uniques, dtype=object)), dtype=bool)
+        return np.append(matches, False)[codes]
+
+    def _matches(self, rule: dict, df: pd.DataFrame):
+        """
+        Maske der Zeilen, die die Bedingung der Regel erfüllen
+
+        Returns:
+        --------
+        tuple
+            (Treffer-Maske, Maske nicht-fehlender Werte) oder None, wenn
+            die Spalte fehlt. Fehlende Werte sind nie Treffer.
+        """
+        column = self._resolve_column(rule, df)
+        if column is False:
+            return None
+
+        n = len(df)
+        matches = np.ones(n, dtype=bool)
+        present = np.ones(n, dtype=bool)
+
+        if column is not None:
+            series = df[column]
+            present = series.notna().to_numpy()
+            matches &= present
+
+            if "min" in rule or "max" in rule:
+                if pd.api.types.is_numeric_dtype(series):
+                    values = series.to_numpy(dtype=float, na_value=np.nan)
+                else:
+                    # Nicht-numerische Einträge gelten als Verletzung
+                    values = pd.to_numeric(series, errors="coerce").to_numpy(float)
+                with np.errstate(invalid="ignore"):
+                    if rule.get("min") is not None:
+                        matches &= values >= rule["min"]
+                    if rule.get("max") is not None:
+                        matches &= values <= rule["max"]
+                matches &= ~np.isnan(values)
+
+            if "allowed" in rule:
+                matches &= series.isin(rule["allowed"]).to_numpy()
+
+            if "pattern" in rule:
+                regex = re.compile(rule["pattern"])
+                matches &= self._match_unique(
+                    series, lambda u: u.astype(str).str.contains(regex, na=False)
+                )
+
+        if "check" in rule:
+            result = rule["check"](df)
+            matches &= np.asarray(result, dtype=bool)
+
+        return matches, present
+
+    def _violations(self, rule: dict, df: pd.DataFrame) -> np.ndarray | None:
+        evaluated = self._matches(rule, df)
+        if evaluated is None:
+            return None
+        matches, present = evaluated
+
+        # Fehlende Werte verletzen nur Pflichtregeln
+        violations = ~matches & (present | bool(rule.get("required")))
+
+        if "when" in rule:
+            condition = self._matches(rule["when"], df)
+            if condition is None:
+                return None
+            violations &= condition[0]
+        return violations
+
+    def _message(self, rule: dict, count: int) -> str:
+        if "message" in rule:
+            return f"{rule['message']}: {count}"
+        low, high = rule.get("min"), rule.get("max")
+        if low is not None and high is not None:
+            return f"{rule['name']} ausserhalb {low}-{high}: {count}"
+        if low is not None:
+            return f"{rule['name']} unter {low}: {count}"
+        if high is not None:
+            return f"{rule['name']} über {high}: {count}"
+        return f"{rule['name']} verletzt: {count}"
+
+    # ------------------------------------------------------------------
+    # Öffentliche Schnittstelle
+    # ------------------------------------------------------------------
+
+    def evaluate(self, df: pd.DataFrame) -> dict:
+        """
+        Wertet alle Regeln auf einem DataFrame aus
+
+        Returns:
+        --------
+        dict
+            total_records, counts (pro Regel), rows_with_violations,
+            bitmap (uint64 pro Zeile, Bit i = Regel i verletzt), skipped,
+            errors und warnings (Meldungstexte)
+        """
+        bitmap = np.zeros(len(df), dtype=np.uint64)
+        counts = {}
+        skipped = []
+
+        for bit, rule in enumerate(self.rules):
+            violations = self._violations(rule, df)
+            if violations is None:
+                skipped.append(rule["name"])
+                counts[rule["name"]] = 0
+                continue
+            counts[rule["name"]] = int(violations.sum())
+            bitmap |= violations.astype(np.uint64) << np.uint64(bit)
+
+        return self._report(counts, bitmap, skipped)
+
+    def _report(self, counts: dict, bitmap: np.ndarray, skipped: list) -> dict:
+        report = {
+            "total_records": len(bitmap),
+            "counts": counts,
+            "rows_with_violations": int(np.count_nonzero(bitmap)),
+            "bitmap": bitmap,
+            "skipped": skipped,
+            "errors": [],
+            "warnings": [],
+        }
+        for rule in self.rules:
+            count = counts[rule["name"]]
+            if count:
+                level = "warnings" if rule.get("severity") == "warning" else "errors"
+                report[level].append(self._message(rule, count))
+        return report
+
+    def evaluate_chunks(self, chunks, keep_bitmap: bool = True) -> dict:
+        """
+        Wertet einen Strom von Chunks aus (z.B. pd.read_csv(chunksize=...))
+
+        Die Zählungen werden aufsummiert; mit keep_bitmap=False bleibt der
+        Speicherbedarf unabhängig von der Gesamtzahl der Zeilen.
+        """
+        counts = dict.fromkeys(self.names, 0)
+        skipped = set()
+        bitmaps = []
+        total = flagged = 0
+
+        for chunk in chunks:
+            result = self.evaluate(chunk)
+            for name, count in result["counts"].items():
+                counts[name] += count
+            skipped.update(result["skipped"])
+            total += result["total_records"]
+            flagged += result["rows_with_violations"]
+            if keep_bitmap:
+                bitmaps.append(result["bitmap"])
+
+        bitmap = np.concatenate(bitmaps) if bitmaps else np.zeros(0, np.uint64)
+        report = self._report(counts, bitmap, sorted(skipped))
+        report["total_records"] = total
+        report["rows_with_violations"] = flagged
+        return report
+
+    def violation_frame(self, report: dict, index=None) -> pd.DataFrame:
+        """Dekodiert die Bitmap zu einer booleschen Spalte pro Regel"""
+        bitmap = report["bitmap"]
+        bits = np.arange(len(self.rules), dtype=np.uint64)
+        flags = (bitmap[:, None] >> bits) & np.uint64(1)
+        return pd.DataFrame(flags.astype(bool), columns=self.names, index=index)
+
+    def __call__(self, chunk: pd.DataFrame) -> list[str]:
+        """Validator-Schnittstelle für batch_import (Liste von Meldungen)"""
+        report = self.evaluate(chunk)
+        return report["errors"] + report["warnings"]
+
+
+def main():
+    """Demonstriert die Regel-Engine auf Produktionsdaten"""
+    print("✅ Validierungsregeln - Demo")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    n_rows = 1_000_000
+    df = pd.DataFrame(
+        {
+            "Maschine": rng.choice(["Laser_01", "Laser_02", "Presse_01"], n_rows),
+            "Temperatur": rng.normal(24, 6, n_rows).round(1),
+            "Produktion": rng.integers(-5, 1200, n_rows),
+            "Verfügbarkeit": rng.uniform(70, 105, n_rows).round(1),
+            "Status": rng.choice(
+                ["OK", "NOK", "ok", None], n_rows, p=[0.8, 0.1, 0.05, 0.05]
+            ),
+            "Bediener": rng.choice(["BY001", "BY017", "by9", "BY123"], n_rows),
+        }
+    )
+
+    test_config_ranges = {
+        "temperature_range": (-50, 200),
+        "production_range": (0, 10000),
+        "availability_range": (0, 100),
+        "pressure_range": (0, 1000),
+    }
+    rules = rules_from_config(test_config_ranges) + [
+        {
+            "name": "Status",
+            "column": "Status",
+            "allowed": ["OK", "NOK"],
+            "required": True,
+        },
+        {"name": "Bediener-ID", "column": "Bediener", "pattern": r"^BY\d{3}$"},
+        {
+            "name": "Laser-Temperatur",
+            "column": "Temperatur",
+            "min": 20,
+            "when": {"column": "Maschine", "pattern": "Laser"},
+            "severity": "warning",
+        },
+    ]
+    engine = ValidationRuleEngine(rules)
+
+    t0 = time.perf_counter()
+    report = engine.evaluate(df)
+    seconds = time.perf_counter() - t0
+
+    print(f"Datensätze: {report['total_records']:,} in {seconds:.2f} s")
+    print(f"Zeilen mit Verletzungen: {report['rows_with_violations']:,}")
+    print(f"Übersprungen (Spalte fehlt): {report['skipped']}")
+    for message in report["errors"]:
+        print(f"  ❌ {message}")
+    for message in report["warnings"]:
+        print(f"  ⚠️ {message}")
+
+    flags = engine.violation_frame(report)
+    print("\nErste Zeilen mit Verletzungen:")
+    print(flags[flags.any(axis=1)].head())
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,7 @@ import sqlite3
 import sys
 import tempfile
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
@@ -47,6 +48,17 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+# Die Beispielmodule sind kein Paket: Modul 06 wie in tests/ über sys.path
+DATENIMPORT_PATH = Path(__file__).resolve().parents[3] / "06_datenimport" / "beispiele"
+sys.path.insert(0, str(DATENIMPORT_PATH))
+from json_streaming import read_json_chunks  # noqa: E402
+from parquet_io import (  # noqa: E402
+    read_feather,
+    read_parquet,
+    write_feather,
+    write_parquet,
+)
+
 # SQLite datetime adapter setup
 sqlite3.register_adapter(datetime, lambda dt: dt.isoformat())
 sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
@@ -901,7 +913,8 @@ class DatenbankBrowser(QMainWindow):
             self,
             "Daten exportieren",
             f"{self.current_table}_export.csv",
-            "CSV Files (*.csv);;JSON Files (*.json);;Excel Files (*.xlsx)",
+            "CSV Files (*.csv);;JSON Files (*.json);;Excel Files (*.xlsx);;"
+            "Parquet Files (*.parquet);;Feather Files (*.feather)",
         )
 
         if filename:
@@ -916,6 +929,10 @@ class DatenbankBrowser(QMainWindow):
                     df.to_json(filename, orient="records", indent=2)
                 elif filename.endswith(".xlsx"):
                     df.to_excel(filename, index=False)
+                elif filename.endswith(".parquet"):
+                    write_parquet(df, filename)
+                elif filename.endswith(".feather"):
+                    write_feather(df, filename)
 
                 QMessageBox.information(
                     self, "Export", f"Daten erfolgreich exportiert nach: {filename}"
@@ -933,29 +950,50 @@ class DatenbankBrowser(QMainWindow):
             self,
             "Daten importieren",
             "",
-            "CSV Files (*.csv);;JSON Files (*.json);;Excel Files (*.xlsx)",
+            "CSV Files (*.csv);;JSON Files (*.json *.ndjson *.jsonl *.json.gz);;"
+            "Excel Files (*.xlsx);;Parquet Files (*.parquet);;"
+            "Feather Files (*.feather)",
         )
 
         if filename:
             try:
                 # DataFrame basierend auf Dateierweiterung laden
+                df = None
                 if filename.endswith(".csv"):
                     df = pd.read_csv(filename)
-                elif filename.endswith(".json"):
-                    df = pd.read_json(filename)
+                elif filename.endswith((".json", ".ndjson", ".jsonl", ".json.gz")):
+                    # Grosse API-Dumps chunkweise lesen: jeder Chunk wird
+                    # verarbeitet und verworfen, nie die ganze Datei gehalten
+                    n_records, columns = 0, {}
+                    for chunk in read_json_chunks(filename, chunksize=10_000):
+                        n_records += len(chunk)
+                        columns.update(dict.fromkeys(chunk.columns))
+                    columns = list(columns)
                 elif filename.endswith(".xlsx"):
                     df = pd.read_excel(filename)
+                elif filename.endswith(".parquet"):
+                    df = read_parquet(filename)
+                elif filename.endswith(".feather"):
+                    df = read_feather(filename)
                 else:
                     QMessageBox.warning(
                         self, "Fehler", "Nicht unterstütztes Dateiformat"
                     )
                     return
 
+                if df is not None:
+                    n_records, columns = len(df), df.columns.tolist()
+                if n_records == 0:
+                    QMessageBox.information(
+                        self, "Import", "Die Datei enthält keine Datensätze."
+                    )
+                    return
+
                 # Import-Dialog zeigen
                 reply = QMessageBox.question(
                     self,
                     "Daten importieren",
-                    f"Möchten Sie {len(df)} Datensätze in die Tabelle {self.current_table} importieren?",
+                    f"Möchten Sie {n_records} Datensätze in die Tabelle {self.current_table} importieren?",
                     QMessageBox.Yes | QMessageBox.No,
                 )
 
@@ -964,8 +1002,8 @@ class DatenbankBrowser(QMainWindow):
                     QMessageBox.information(
                         self,
                         "Import",
-                        f"Import-Simulation:\n{len(df)} Datensätze würden importiert werden.\n"
-                        f"Spalten: {', '.join(df.columns.tolist())}",
+                        f"Import-Simulation:\n{n_records} Datensätze würden importiert werden.\n"
+                        f"Spalten: {', '.join(map(str, columns))}",
                     )
 
             except Exception as e:
@@ -3,7 +3,7 @@ Daten-Upload und -verarbeitung mit Streamlit
 ============================================
 
 Beispiel für Datei-Upload, -verarbeitung und -analyse:
-- CSV/Excel Upload
+- CSV/Excel/Parquet Upload
 - Datenvalidierung
 - Interaktive Datenexploration
 - Datenbereinigung
@@ -14,23 +14,46 @@ Starten mit: uv run streamlit run src/08_ui/beispiele/streamlit/daten_upload.py
 Autor: Daniel Senften
 """
 
+import sys
 from io import BytesIO
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
+# Die Beispielmodule sind kein Paket: Module 04/06 wie in tests/ über sys.path
+DATENIMPORT_PATH = Path(__file__).resolve().parents[3] / "06_datenimport" / "beispiele"
+PANDAS_PATH = Path(__file__).resolve().parents[3] / "04_pandas" / "beispiele"
+sys.path.insert(0, str(DATENIMPORT_PATH))
+sys.path.insert(0, str(PANDAS_PATH))
+from parquet_io import read_parquet, to_parquet_bytes  # noqa: E402
+from speicher_optimierung import format_memory_report, optimize_frame  # noqa: E402
+from telemetrie_generator import generate_machine_telemetry  # noqa: E402
+
 st.set_page_config(page_title="Bystronic Daten-Upload", page_icon="📁", layout="wide")
 
+# Demo-Daten: Sollwert und Streuung für alle Maschinen gleich
+DEMO_PROFILE = {
+    "temperature": (65.0, 5.0),
+    "pressure": (8.2, 0.8),
+    "cutting_speed": (2.5, 0.3),
+}
+
 
 def main():
     st.title("📁 Daten-Upload und -verarbeitung")
 
     uploaded_file = st.file_uploader(
         "Wählen Sie eine Datei aus:",
-        type=["csv", "xlsx", "xls"],
-        help="Unterstützte Formate: CSV, Excel (xlsx, xls)",
+        type=["csv", "xlsx", "xls", "parquet"],
+        help="Unterstützte Formate: CSV, Excel (xlsx, xls), Parquet",
+    )
+    optimize = st.checkbox(
+        "🗜️ Speicher optimieren",
+        value=False,
+        help="Kleinste sichere Zahlentypen und Kategorien für wiederkehrende Texte",
     )
 
     if uploaded_file is not None:
@@ -38,11 +61,17 @@ def main():
         try:
             if uploaded_file.name.endswith(".csv"):
                 df = pd.read_csv(uploaded_file)
+            elif uploaded_file.name.endswith(".parquet"):
+                df = read_parquet(uploaded_file)
             else:
                 df = pd.read_excel(uploaded_file)
 
             st.success(f"✅ Datei '{uploaded_file.name}' erfolgreich geladen!")
 
+            if optimize:
+                df, memory_report = optimize_frame(df)
+                st.caption(f"🗜️ {format_memory_report(memory_report)}")
+
             # Tabs für verschiedene Analysen
             tab1, tab2, tab3, tab4 = st.tabs(
                 ["📊 Übersicht", "🔍 Exploration", "🧹 Bereinigung", "📤 Export"]
@@ -96,29 +125,31 @@ def main():
 
 def create_demo_data():
     """Erstellt Demo-Maschinendaten."""
-    np.random.seed(42)
-
     timestamps = pd.date_range(start="2024-09-01", end="2024-09-04", freq="h")
     machines = ["Laser_1", "Laser_2", "Stanze_1", "Biegemaschine"]
-
-    data = []
-    for ts in timestamps:
-        for machine in machines:
-            data.append(
-                {
-                    "Timestamp": ts,
-                    "Machine": machine,
-                    "Temperature": np.random.normal(65, 5),
-                    "Pressure": np.random.normal(8.2, 0.8),
-                    "Speed": np.random.normal(2.5, 0.3),
-                    "Parts_Produced": np.random.poisson(25),
-                    "Quality_Index": np.random.normal(98.5, 1.5),
-                    "Operator": np.random.choice(["Schmidt", "Mueller", "Weber"]),
-                    "Shift": np.random.choice([1, 2, 3]),
-                }
-            )
-
-    return pd.DataFrame(data)
+    columns = {
+        "timestamp": "Timestamp",
+        "machine": "Machine",
+        "temperature": "Temperature",
+        "pressure": "Pressure",
+        "cutting_speed": "Speed",
+        "parts_produced": "Parts_Produced",
+        "quality_index": "Quality_Index",
+        "operator": "Operator",
+        "shift": "Shift",
+    }
+    # Gleiche Verteilungen wie bisher: ein Profil für alle Maschinen, keine
+    # Störungen, drei Bediener und zufällige Schichten
+    df = generate_machine_telemetry(
+        machines,
+        timestamps,
+        seed=42,
+        faults={},
+        profile=DEMO_PROFILE,
+        operators=["Schmidt", "Mueller", "Weber"],
+        shifts=[1, 2, 3],
+    )
+    return df[list(columns)].rename(columns=columns)
 
 
 def show_data_overview(df):
@@ -313,9 +344,9 @@ def show_data_cleaning(df):
 
             if action == "Zeilen löschen":
                 cleaned_df = cleaned_df.dropna(subset=[col])
-            elif action == "Mittelwert" and df[col].dtype in ["int64", "float64"]:
+            elif action == "Mittelwert" and pd.api.types.is_numeric_dtype(df[col]):
                 cleaned_df[col] = cleaned_df[col].fillna(cleaned_df[col].mean())
-            elif action == "Median" and df[col].dtype in ["int64", "float64"]:
+            elif action == "Median" and pd.api.types.is_numeric_dtype(df[col]):
                 cleaned_df[col] = cleaned_df[col].fillna(cleaned_df[col].median())
             elif action == "Modus":
                 mode_val = cleaned_df[col].mode()
@@ -324,6 +355,14 @@ def show_data_cleaning(df):
             elif action == "Konstante":
                 fill_value = st.text_input(f"Füllwert für {col}:", key=f"fill_{col}")
                 if fill_value:
+                    dtype = cleaned_df[col].dtype
+                    if (
+                        isinstance(dtype, pd.CategoricalDtype)
+                        and fill_value not in dtype.categories
+                    ):
+                        cleaned_df[col] = cleaned_df[col].cat.add_categories(
+                            [fill_value]
+                        )
                     cleaned_df[col] = cleaned_df[col].fillna(fill_value)
     else:
         st.success("✅ Keine fehlenden Werte gefunden!")
@@ -418,7 +457,9 @@ def show_export_options(df):
         st.info("✅ Verwende bereinigte Daten für Export")
 
     # Export-Format
-    export_format = st.selectbox("Export-Format:", ["CSV", "Excel (xlsx)", "JSON"])
+    export_format = st.selectbox(
+        "Export-Format:", ["CSV", "Excel (xlsx)", "JSON", "Parquet"]
+    )
 
     # Spalten-Auswahl
     selected_cols = st.multiselect(
@@ -436,7 +477,7 @@ def show_export_options(df):
     st.dataframe(final_df.head(), width="stretch")
 
     # Download-Buttons
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
 
     with col1:
         if export_format == "CSV":
@@ -471,6 +512,16 @@ def show_export_options(df):
                 mime="application/json",
             )
 
+    with col4:
+        if export_format == "Parquet":
+            # Spaltenorientiert und komprimiert - ideal für Folgeauswertungen
+            st.download_button(
+                "📥 Parquet Download",
+                to_parquet_bytes(final_df),
+                file_name=f"export_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.parquet",
+                mime="application/vnd.apache.parquet",
+            )
+
 
 if __name__ == "__main__":
     main()
@@ -14,8 +14,10 @@ Starten mit: uv run streamlit run src/08_ui/beispiele/streamlit/produktions_dash
 Autor: Daniel Senften
 """
 
+import sys
 import time
 from datetime import date, datetime, timedelta
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
@@ -24,6 +26,11 @@ import plotly.graph_objects as go
 import streamlit as st
 from plotly.subplots import make_subplots
 
+# Die Beispielmodule sind kein Paket: Modul 04 wie in tests/ über sys.path
+PANDAS_PATH = Path(__file__).resolve().parents[3] / "04_pandas" / "beispiele"
+sys.path.insert(0, str(PANDAS_PATH))
+from telemetrie_generator import generate_machine_telemetry  # noqa: E402
+
 # Seitenkonfiguration
 st.set_page_config(
     page_title="Bystronic Produktions-Dashboard",
@@ -106,62 +113,10 @@ class ProductionData:
     @staticmethod
     @st.cache_data(ttl=60)  # Cache für 1 Minute
     def generate_machine_data():
-        """Generiert realistische Maschinendaten."""
+        """Generiert realistische Maschinendaten (Profile je Maschinentyp)."""
         machines = ["Laser 1", "Laser 2", "Stanze 1", "Biegemaschine"]
-
-        data = []
-        base_time = datetime.now()
-
-        for i in range(100):
-            timestamp = base_time - timedelta(minutes=i * 5)
-
-            for machine in machines:
-                # Maschinentypspezifische Parameter
-                if "Laser" in machine:
-                    base_temp = 65
-                    base_power = 75
-                    base_speed = 2.5
-                elif "Stanze" in machine:
-                    base_temp = 45
-                    base_power = 60
-                    base_speed = 1.8
-                else:  # Biegemaschine
-                    base_temp = 35
-                    base_power = 40
-                    base_speed = 1.2
-
-                # Realistische Schwankungen
-                temp_variation = np.random.normal(0, 3)
-                power_variation = np.random.normal(0, 8)
-                speed_variation = np.random.normal(0, 0.2)
-
-                # Gelegentliche "Probleme" simulieren
-                status = "Normal"
-                if np.random.random() < 0.05:  # 5% Chance auf Warnung
-                    status = "Warnung"
-                    temp_variation += 10
-                elif np.random.random() < 0.02:  # 2% Chance auf Fehler
-                    status = "Fehler"
-                    power_variation -= 20
-
-                data.append(
-                    {
-                        "timestamp": timestamp,
-                        "machine": machine,
-                        "temperature": max(20, base_temp + temp_variation),
-                        "power_consumption": max(10, base_power + power_variation),
-                        "cutting_speed": max(0.5, base_speed + speed_variation),
-                        "parts_produced": np.random.poisson(25),
-                        "quality_index": np.random.normal(98.5, 1.5),
-                        "operator": np.random.choice(
-                            ["Schmidt", "Müller", "Weber", "Meyer"]
-                        ),
-                        "shift": ((timestamp.hour // 8) % 3) + 1,
-                        "status": status,
-                    }
-                )
-
-        return pd.DataFrame(data)
+        timestamps = pd.date_range(end=datetime.now(), periods=100, freq="5min")
+        return generate_machine_telemetry(machines, timestamps)
 
     @staticmethod
     @st.cache_data(ttl=300)  # Cache für 5 Minuten
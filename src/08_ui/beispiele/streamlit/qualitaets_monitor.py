@@ -14,7 +14,9 @@ Starten mit: uv run streamlit run src/08_ui/beispiele/streamlit/qualitaets_monit
 Autor: Daniel Senften
 """
 
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
@@ -23,6 +25,14 @@ import plotly.graph_objects as go
 import streamlit as st
 from plotly.subplots import make_subplots
 
+# Die Beispielmodule sind kein Paket: Module 03/04 wie in tests/ über sys.path
+NUMPY_PATH = Path(__file__).resolve().parents[3] / "03_numpy" / "beispiele"
+PANDAS_PATH = Path(__file__).resolve().parents[3] / "04_pandas" / "beispiele"
+sys.path.insert(0, str(NUMPY_PATH))
+sys.path.insert(0, str(PANDAS_PATH))
+import telemetrie_generator  # noqa: E402
+from spc_regeln import NELSON_RULES, detect, detect_groups  # noqa: E402
+
 # Seitenkonfiguration
 st.set_page_config(
     page_title="Bystronic Qualitäts-Monitor", page_icon="🔍", layout="wide"
@@ -35,29 +45,10 @@ def main():
     # Beispieldaten generieren
     @st.cache_data(ttl=30)
     def generate_quality_data():
-        np.random.seed(42)
         timestamps = pd.date_range(
             start=datetime.now() - timedelta(hours=24), end=datetime.now(), freq="5min"
         )
-
-        data = []
-        for ts in timestamps:
-            for part_id in range(1, 6):
-                data.append(
-                    {
-                        "timestamp": ts,
-                        "part_id": f"P{part_id:03d}",
-                        "dimension_x": np.random.normal(100.0, 0.15),
-                        "dimension_y": np.random.normal(50.0, 0.08),
-                        "surface_roughness": np.random.normal(1.6, 0.3),
-                        "hardness": np.random.normal(55, 2),
-                        "pass_fail": np.random.choice(["Pass", "Fail"], p=[0.97, 0.03]),
-                        "inspector": np.random.choice(["Schmidt", "Weber", "Mueller"]),
-                        "machine": np.random.choice(["Laser 1", "Laser 2", "Stanze 1"]),
-                    }
-                )
-
-        return pd.DataFrame(data)
+        return telemetrie_generator.generate_quality_data(timestamps, seed=42)
 
     df = generate_quality_data()
 
@@ -199,6 +190,12 @@ def show_spc_charts(df):
     ucl = mean_val + 3 * std_val  # Upper Control Limit
     lcl = mean_val - 3 * std_val  # Lower Control Limit
 
+    # Nelson-Regeln: Punkte in verletzenden Bereichen markieren
+    hits = detect(data, center=mean_val, sigma=std_val)
+    violating = np.zeros(len(data), dtype=bool)
+    for hit in hits:
+        violating[hit.start : hit.end + 1] = True
+
     # X-Chart (Individual measurements)
     fig_xbar = go.Figure()
     fig_xbar.add_trace(
@@ -206,6 +203,15 @@ def show_spc_charts(df):
             x=df["timestamp"], y=df[parameter], mode="lines+markers", name="Messwerte"
         )
     )
+    fig_xbar.add_trace(
+        go.Scatter(
+            x=df["timestamp"][violating],
+            y=df[parameter][violating],
+            mode="markers",
+            marker={"color": "red", "size": 9},
+            name="Nelson-Regel verletzt",
+        )
+    )
     fig_xbar.add_hline(y=mean_val, line_color="green", annotation_text="Mittelwert")
     fig_xbar.add_hline(y=ucl, line_color="red", line_dash="dash", annotation_text="UCL")
     fig_xbar.add_hline(y=lcl, line_color="red", line_dash="dash", annotation_text="LCL")
@@ -214,6 +220,48 @@ def show_spc_charts(df):
     )
     st.plotly_chart(fig_xbar, width="stretch")
 
+    if hits:
+        timestamps = df["timestamp"].to_numpy()
+        st.dataframe(
+            pd.DataFrame(
+                {
+                    "Regel": [hit.rule for hit in hits],
+                    "Beschreibung": [NELSON_RULES[hit.rule][1] for hit in hits],
+                    "Von": [timestamps[hit.start] for hit in hits],
+                    "Bis": [timestamps[hit.end] for hit in hits],
+                    "Punkte": [hit.end - hit.start + 1 for hit in hits],
+                }
+            ),
+            width="stretch",
+        )
+    else:
+        st.success("Keine Verletzung der Nelson-Regeln")
+
+    # Alle Maschinen und Parameter in einem Aufruf prüfen
+    parameters = ["dimension_x", "dimension_y", "surface_roughness", "hardness"]
+    series = {
+        (machine, name): group[name].to_numpy()
+        for machine, group in df.groupby("machine")
+        for name in parameters
+    }
+    all_hits = detect_groups(
+        series,
+        center={key: np.mean(values) for key, values in series.items()},
+        sigma={key: np.std(values) for key, values in series.items()},
+    )
+    overview = pd.DataFrame(
+        [(*hit.series, hit.rule) for hit in all_hits],
+        columns=["Maschine", "Parameter", "Regel"],
+    )
+    if not overview.empty:
+        st.write("**Nelson-Regel-Verletzungen je Maschine und Parameter**")
+        st.dataframe(
+            pd.crosstab(
+                [overview["Maschine"], overview["Parameter"]], overview["Regel"]
+            ),
+            width="stretch",
+        )
+
     # Moving Range Chart
     moving_range = np.abs(np.diff(data))
     mr_mean = np.mean(moving_range)
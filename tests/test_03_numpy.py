@@ -25,6 +25,34 @@ try:
     import linear_algebra
     import mathematical_operations
     import vba_vs_numpy
+    from finite_elemente import (
+        condition_estimate,
+        create_fixture_mesh,
+        frame_stiffness,
+        lowest_modes,
+        lumped_mass,
+        solve,
+        truss_stiffness,
+    )
+    from hauptkomponenten import PCA
+    from kmeans_clustering import MiniBatchKMeans, assign, kmeans_plus_plus
+    from mahalanobis_scoring import MahalanobisModel
+    from rollende_statistik import (
+        MEDIAN_HEAP_WINDOW,
+        rolling_max,
+        rolling_mean,
+        rolling_median,
+        rolling_min,
+        rolling_std,
+        rolling_zscore,
+    )
+    from spc_regeln import NelsonMonitor, detect, detect_groups, find_runs
+    from trend_schaetzer import (
+        RecursiveLeastSquares,
+        TrendTracker,
+        batched_lstsq,
+        linear_trends,
+    )
 except ImportError as e:
     pytest.skip(
         f"NumPy Beispiele können nicht importiert werden: {e}", allow_module_level=True
@@ -568,6 +596,490 @@ class TestVBAvsNumPy:
         assert abs(numpy_std - manual_std) < 1e-10
 
 
+class TestRollendeStatistik:
+    """Tests für rollende_statistik.py Beispiel"""
+
+    def setup_method(self) -> None:
+        """Zwei Kanäle mit grossem Offset und fehlenden Werten"""
+        rng = np.random.default_rng(7)
+        self.signals = rng.normal([[1e6], [5.0]], 1.0, size=(2, 400))
+        self.signals[rng.random(self.signals.shape) < 0.05] = np.nan
+
+    def _naive(self, func, window: int, min_periods: int) -> np.ndarray:
+        """Referenz: Funktion auf jedes Fenster einzeln anwenden"""
+        result = np.full(self.signals.shape, np.nan)
+        for c, kanal in enumerate(self.signals):
+            for i in range(len(kanal)):
+                fenster = kanal[max(0, i - window + 1) : i + 1]
+                fenster = fenster[~np.isnan(fenster)]
+                if len(fenster) >= min_periods:
+                    result[c, i] = func(fenster)
+        return result
+
+    def test_matches_window_loop(self) -> None:
+        """Alle Kennzahlen entsprechen der Schleife über die Fenster"""
+        for func, rolling in [
+            (np.mean, rolling_mean),
+            (lambda w: np.std(w, ddof=1), rolling_std),
+            (np.min, rolling_min),
+            (np.max, rolling_max),
+            (np.median, rolling_median),
+        ]:
+            expected = self._naive(func, window=25, min_periods=2)
+            result = rolling(self.signals, 25, min_periods=2)
+            np.testing.assert_allclose(result, expected, rtol=1e-12, equal_nan=True)
+
+    def test_heap_median_matches_window_loop(self) -> None:
+        """Lange Fenster (Heaps) mit NaN und vielen gleichen Werten"""
+        window = MEDIAN_HEAP_WINDOW + 3
+        expected = self._naive(np.median, window=window, min_periods=1)
+        result = rolling_median(self.signals, window, min_periods=1)
+        np.testing.assert_allclose(result, expected, rtol=1e-12, equal_nan=True)
+
+        rng = np.random.default_rng(4)
+        stufen = rng.integers(0, 5, 2000).astype(float)
+        stufen[rng.random(2000) < 0.2] = np.nan
+        result = rolling_median(stufen, 200, min_periods=1)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # Fenster nur NaN
+            expected = [
+                np.nanmedian(stufen[max(0, i - 199) : i + 1]) for i in range(2000)
+            ]
+        np.testing.assert_array_equal(result, expected)
+
+    def test_expanding_and_default_min_periods(self) -> None:
+        """window=None ist expandierend; Standard verlangt volle Fenster"""
+        kanal = self.signals[1]
+        gueltig = ~np.isnan(kanal)
+        laufend = rolling_mean(kanal)
+        erwartet = np.cumsum(np.where(gueltig, kanal, 0)) / np.cumsum(gueltig)
+        np.testing.assert_allclose(laufend, erwartet, rtol=1e-12)
+        assert rolling_max(kanal)[-1] == np.nanmax(kanal)
+
+        mittel = rolling_mean(kanal, 10)
+        assert np.all(np.isnan(mittel[:9]))
+        voll = np.convolve(gueltig, np.ones(10), mode="valid") == 10
+        assert np.array_equal(~np.isnan(mittel[9:]), voll)
+
+    def test_zscore_and_invalid_window(self) -> None:
+        """z-Score bezieht sich auf das Fenster inklusive aktuellem Wert"""
+        daten = np.array([1.0, 1.0, 1.0, 1.0, 5.0])
+        z = rolling_zscore(daten, 5)
+        assert np.isnan(z[:4]).all()
+        assert z[-1] == pytest.approx((5 - 1.8) / np.std(daten, ddof=1))
+        with pytest.raises(ValueError):
+            rolling_mean(daten, 0)
+
+
+class TestSPCRegeln:
+    """Tests für spc_regeln.py Beispiel"""
+
+    def test_rules_on_constructed_patterns(self) -> None:
+        """Jedes eingebaute Muster verletzt genau die erwartete Regel"""
+        daten = np.tile([0.5, -0.5], 40)  # abwechselnd, innerhalb ±1σ
+        daten[3] = 3.5  # Regel 1
+        muster = {
+            2: (np.full(9, 0.5), 20),
+            3: (np.linspace(-0.9, 0.9, 6), 40),
+            5: (np.array([2.5, 0.0, 2.5]), 60),
+        }
+        for werte, pos in muster.values():
+            daten[pos : pos + len(werte)] = werte
+
+        hits = detect(daten, center=0.0, sigma=1.0, rules=[1, 2, 3, 5])
+        found = {(h.rule, h.start, h.end) for h in hits}
+        assert (1, 3, 3) in found
+        assert (2, 20, 28) in found
+        assert (3, 40, 45) in found
+        assert (5, 60, 62) in found
+        assert {h.rule for h in detect(daten[:40], 0.0, 1.0, rules=[4])} == {4}
+        ruhig = np.tile([0.5, -0.5], 10)
+        assert [(h.rule, h.start, h.end) for h in detect(ruhig, 0.0, 1.0, [7])] == [
+            (7, 0, 19)
+        ]
+
+    def test_rule_8_needs_both_sides(self) -> None:
+        """Regel 8 nur mit Punkten ober- und unterhalb der Mittellinie"""
+        einseitig = np.full(10, 1.5)
+        assert detect(einseitig, 0.0, 1.0, rules=[8]) == []
+
+        daten = np.zeros(20)
+        daten[5:13] = [1.5, 1.5, 1.5, 1.5, 1.5, 1.5, 1.5, -1.5]
+        assert [(h.rule, h.start, h.end) for h in detect(daten, 0.0, 1.0, [8])] == [
+            (8, 5, 12)
+        ]
+
+    def test_groups_do_not_run_across_series(self) -> None:
+        """Serien brechen an Grenzen ab; Ergebnis wie Einzelaufrufe"""
+        gruppen = {"Laser 1": np.full(5, 1.5), "Laser 2": np.full(5, 1.5)}
+        assert detect_groups(gruppen, center=0.0, sigma=1.0, rules=[2, 8]) == []
+
+        rng = np.random.default_rng(11)
+        serien = {k: rng.normal(0, 1, n) for k, n in [("a", 500), ("b", 0), ("c", 300)]}
+        gemeinsam = detect_groups(serien, center=0.0, sigma=1.0)
+        einzeln = [
+            hit for k, v in serien.items() for hit in detect_groups({k: v}, 0.0, 1.0)
+        ]
+        assert gemeinsam == einzeln
+
+        starts, ends = find_runs([1, 1, 0, 1, 1, 1, 0], min_length=2)
+        assert starts.tolist() == [0, 3] and ends.tolist() == [1, 5]
+
+    def test_streaming_matches_batch(self) -> None:
+        """Blockweise Prüfung meldet dieselben Bereiche wie ein Gesamtaufruf"""
+        rng = np.random.default_rng(5)
+        daten = rng.normal(0, 1, 2000)
+        monitor = NelsonMonitor(center=0.0, sigma=1.0)
+        gemeldet = {}
+        for start in range(0, len(daten), 37):
+            for hit in monitor.update({"x": daten[start : start + 37]}):
+                assert hit.end >= start  # nur Treffer in neuen Messungen
+                gemeldet[(hit.rule, hit.start)] = hit.end
+
+        batch = detect(daten, center=0.0, sigma=1.0)
+        assert gemeldet == {(h.rule, h.start): h.end for h in batch}
+
+
+class TestMahalanobisScoring:
+    """Tests für mahalanobis_scoring.py Beispiel"""
+
+    def setup_method(self) -> None:
+        """Korrelierte Daten mit 10% verschobenen Fehlmessungen"""
+        rng = np.random.default_rng(3)
+        kovarianz = np.array([[4.0, 1.5, 0.5], [1.5, 2.0, 0.3], [0.5, 0.3, 1.0]])
+        self.daten = rng.multivariate_normal([10.0, 5.0, 0.0], kovarianz, 5000)
+        self.fehler = np.zeros(len(self.daten), dtype=bool)
+        self.fehler[:500] = True
+        self.daten[:500] += 6.0
+
+    def test_matches_inverse_loop(self) -> None:
+        """Blockweise Cholesky-Bewertung entspricht der Schleife mit inv()"""
+        modell = MahalanobisModel.fit(self.daten)
+        inv = np.linalg.inv(np.cov(self.daten.T))
+        diffs = self.daten - self.daten.mean(axis=0)
+        erwartet = np.sqrt(np.array([d @ inv @ d for d in diffs]))
+
+        np.testing.assert_allclose(modell.score(self.daten, chunk_size=777), erwartet)
+        assert modell.score(self.daten[0]) == pytest.approx(erwartet[0])
+        np.testing.assert_allclose(
+            modell.score(self.daten, squared=True), erwartet**2, rtol=1e-10
+        )
+        with pytest.raises(ValueError):
+            modell.score(self.daten[:, :2])
+
+    def test_robust_fit_ignores_outliers(self) -> None:
+        """MCD schätzt den Normalbetrieb trotz Fehlmessungen"""
+        klassisch = MahalanobisModel.fit(self.daten)
+        robust = MahalanobisModel.fit(self.daten, robust=True)
+        sauber = self.daten[~self.fehler]
+
+        np.testing.assert_allclose(robust.mean, sauber.mean(axis=0), atol=0.1)
+        assert np.abs(klassisch.mean - sauber.mean(axis=0)).max() > 0.5
+        grenze = robust.threshold(0.001)
+        assert (robust.score(self.daten[self.fehler]) > grenze).mean() > 0.95
+        assert (robust.score(sauber) > grenze).mean() < 0.01
+
+    def test_frozen_model_scores_stream(self, tmp_path: Path) -> None:
+        """Gespeichertes Modell bewertet Blöcke wie einen Gesamtaufruf"""
+        modell = MahalanobisModel.fit(self.daten[500:], robust=True)
+        pfad = tmp_path / "modell.npz"
+        modell.save(pfad)
+        geladen = MahalanobisModel.load(pfad)
+
+        bloecke = np.array_split(self.daten, 7)
+        ergebnisse = list(geladen.score_stream(bloecke, alpha=0.01))
+        distanzen = np.concatenate([d for d, _ in ergebnisse])
+        maske = np.concatenate([m for _, m in ergebnisse])
+        np.testing.assert_allclose(distanzen, modell.score(self.daten))
+        assert np.array_equal(maske, distanzen > modell.threshold(0.01))
+        with pytest.raises(ValueError):
+            MahalanobisModel([0.0, 0.0], [[1.0, 2.0], [2.0, 1.0]])
+
+
+class TestKMeansClustering:
+    """Tests für kmeans_clustering.py Beispiel"""
+
+    def setup_method(self) -> None:
+        """Vier deutlich getrennte Zustände in drei Kanälen"""
+        rng = np.random.default_rng(21)
+        self.zentren = np.array(
+            [[0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [0.0, 10.0, 0.0], [0.0, 0.0, 10.0]]
+        )
+        self.zustand = rng.integers(0, 4, 20_000)
+        self.daten = self.zentren[self.zustand] + rng.normal(0, 0.5, (20_000, 3))
+
+    def test_blocked_assignment_matches_full_distances(self) -> None:
+        """Blockweise Zuordnung entspricht der vollen Distanzmatrix"""
+        zentren = self.daten[:7]
+        labels, distanzen = assign(self.daten, zentren, block_size=999)
+        voll = ((self.daten[:, None, :] - zentren[None]) ** 2).sum(axis=2)
+        assert np.array_equal(labels, voll.argmin(axis=1))
+        np.testing.assert_allclose(distanzen, voll.min(axis=1), atol=1e-9)
+
+        start = kmeans_plus_plus(self.daten, 4, np.random.default_rng(0))
+        assert sorted(assign(start, self.zentren)[0]) == [0, 1, 2, 3]
+
+    def test_fit_recovers_states(self) -> None:
+        """fit() findet die Zustände; predict() ordnet neue Punkte gleich zu"""
+        modell = MiniBatchKMeans(4, batch_size=1000, random_state=3).fit(self.daten)
+        zuordnung = assign(modell.cluster_centers_, self.zentren)[0]
+        assert sorted(zuordnung) == [0, 1, 2, 3]
+        np.testing.assert_allclose(
+            modell.cluster_centers_, self.zentren[zuordnung], atol=0.05
+        )
+        assert np.array_equal(zuordnung[modell.labels_], self.zustand)
+        assert np.array_equal(modell.predict(self.daten[:100]), modell.labels_[:100])
+        assert modell.score(self.daten) == pytest.approx(modell.inertia_)
+
+        # Zuordnung in zwei Prozessen
+        modell.n_jobs, modell.block_size = 2, 1000
+        assert np.array_equal(modell.predict(self.daten), modell.labels_)
+
+    def test_partial_fit_on_stream(self) -> None:
+        """Gestreamte Blöcke finden die Zustände ebenfalls"""
+        stream = MiniBatchKMeans(4, batch_size=500, random_state=3)
+        for block in np.array_split(self.daten, 10):
+            stream.partial_fit(block)
+        assert stream.n_iter_ == 10
+        assert stream.counts_.sum() == len(self.daten)
+        zuordnung = assign(stream.cluster_centers_, self.zentren)[0]
+        np.testing.assert_allclose(
+            stream.cluster_centers_, self.zentren[zuordnung], atol=0.05
+        )
+        with pytest.raises(ValueError):
+            MiniBatchKMeans(4).predict(self.daten)
+
+
+class TestHauptkomponenten:
+    """Tests für hauptkomponenten.py Beispiel"""
+
+    def setup_method(self) -> None:
+        """3 Quellen auf 40 Kanäle mit unterschiedlichen Einheiten gemischt"""
+        rng = np.random.default_rng(8)
+        quellen = rng.normal(0, [5.0, 3.0, 2.0], (3000, 3))
+        mischung = rng.normal(0, 1, (3, 40))
+        rauschen = rng.normal(0, 0.1, (3000, 40))
+        einheiten = rng.uniform(1, 100, 40)
+        self.daten = (quellen @ mischung + rauschen) * einheiten + 1e4
+
+    def _reference(self) -> tuple[np.ndarray, np.ndarray]:
+        """Lehrbuch-PCA: eigh der Korrelationsmatrix"""
+        werte, vektoren = np.linalg.eigh(np.corrcoef(self.daten.T))
+        return werte[::-1], vektoren[:, ::-1].T
+
+    def test_full_and_randomized_match_eigen_decomposition(self) -> None:
+        """Exakte und randomisierte SVD liefern die Eigenwerte der Korrelation"""
+        werte, vektoren = self._reference()
+        for method in ("full", "randomized"):
+            pca = PCA(3, method=method).fit(self.daten)
+            np.testing.assert_allclose(pca.explained_variance_, werte[:3], rtol=1e-8)
+            np.testing.assert_allclose(
+                np.abs(pca.components_), np.abs(vektoren[:3]), atol=1e-8
+            )
+            assert pca.explained_variance_ratio_.sum() == pytest.approx(
+                werte[:3].sum() / 40
+            )
+        with pytest.raises(ValueError):
+            PCA(method="eig")
+
+    def test_partial_fit_equals_full_fit(self) -> None:
+        """Blockweiser Fit ergibt dieselben Komponenten wie der Gesamtfit"""
+        exakt = PCA(3, method="full").fit(self.daten)
+        for method in ("full", "randomized"):
+            blockweise = PCA(3, method=method)
+            for block in np.array_split(self.daten, 7):
+                blockweise.partial_fit(block)
+            assert blockweise.n_samples_seen_ == len(self.daten)
+            np.testing.assert_allclose(blockweise.mean_, exakt.mean_)
+            np.testing.assert_allclose(blockweise.scale_, exakt.scale_)
+            np.testing.assert_allclose(
+                blockweise.components_, exakt.components_, atol=1e-8
+            )
+
+    def test_partial_fit_decomposes_lazily(self) -> None:
+        """Zerlegt wird erst beim Zugriff, nicht bei jedem Block"""
+        pca = PCA(3, method="full")
+        with pytest.raises(AttributeError):
+            pca.transform(self.daten)
+        erste, zweite = np.array_split(self.daten, 2)
+        pca.partial_fit(erste)
+        assert "components_" not in vars(pca)
+        teil = pca.transform(erste)
+        assert "components_" in vars(pca)
+
+        pca.partial_fit(zweite)
+        assert "components_" not in vars(pca)
+        exakt = PCA(3, method="full").fit(self.daten)
+        np.testing.assert_allclose(pca.transform(zweite), exakt.transform(zweite))
+        assert not np.allclose(teil[:5], pca.transform(erste)[:5])
+
+    def test_transform_and_reconstruction(self) -> None:
+        """Werte wie Projektion der standardisierten Daten, Rekonstruktion genau"""
+        pca = PCA(3).fit(self.daten)
+        standardisiert = (self.daten - self.daten.mean(axis=0)) / self.daten.std(
+            axis=0, ddof=1
+        )
+        werte = pca.transform(self.daten)
+        np.testing.assert_allclose(werte, standardisiert @ pca.components_.T, atol=1e-8)
+        np.testing.assert_allclose(werte.var(axis=0, ddof=1), pca.explained_variance_)
+
+        rekonstruiert = pca.inverse_transform(werte)
+        fehler = (rekonstruiert - self.daten) / pca.scale_
+        assert np.sqrt(np.mean(fehler**2)) < 0.1
+
+
+class TestFiniteElemente:
+    """Tests für finite_elemente.py Beispiel"""
+
+    def setup_method(self) -> None:
+        """Kleine Fachwerk-Platte, links eingespannt, Last rechts unten"""
+        self.knoten, self.staebe = create_fixture_mesh(6, 4)
+        links = np.flatnonzero(self.knoten[:, 0] == 0)
+        self.gelagert = np.concatenate([2 * links, 2 * links + 1])
+        self.lasten = np.zeros(self.knoten.size)
+        self.lasten[-1] = -500.0
+
+    def _dense_stiffness(self) -> np.ndarray:
+        """Lehrbuch-Assemblierung: Element für Element in eine dichte Matrix"""
+        K = np.zeros((self.knoten.size, self.knoten.size))
+        for a, b in self.staebe:
+            delta = self.knoten[b] - self.knoten[a]
+            laenge = np.linalg.norm(delta)
+            cs = np.outer(delta, delta) / laenge**2 * 210_000.0 * 20.0 / laenge
+            dofs = [2 * a, 2 * a + 1, 2 * b, 2 * b + 1]
+            K[np.ix_(dofs, dofs)] += np.block([[cs, -cs], [-cs, cs]])
+        return K
+
+    def test_sparse_assembly_matches_dense_loop(self) -> None:
+        """Scatter-Add ergibt dieselbe Matrix wie die Schleife"""
+        K = truss_stiffness(self.knoten, self.staebe, 210_000.0, 20.0)
+        np.testing.assert_allclose(K.toarray(), self._dense_stiffness(), atol=1e-9)
+        # Starrkörperverschiebung erzeugt keine Kräfte
+        np.testing.assert_allclose(
+            K @ np.tile([1.0, 0.0], len(self.knoten)), 0, atol=1e-6
+        )
+
+        # Kragbalken aus 10 Rahmenelementen: Durchbiegung P·L³/(3·E·I)
+        balken = np.column_stack([np.linspace(0, 1000, 11), np.zeros(11)])
+        elemente = np.column_stack([np.arange(10), np.arange(1, 11)])
+        K_rahmen = frame_stiffness(balken, elemente, 210_000.0, 100.0, 833.3)
+        F = np.zeros(33)
+        F[-2] = -10.0
+        u, _ = solve(K_rahmen, F, [0, 1, 2])
+        assert u[-2] == pytest.approx(-10.0 * 1000**3 / (3 * 210_000.0 * 833.3))
+
+    def test_solvers_agree(self) -> None:
+        """Direkt, CG und BiCGSTAB mit Vorkonditionierung liefern dasselbe"""
+        K = truss_stiffness(self.knoten, self.staebe, 210_000.0, 20.0)
+        referenz, _ = solve(K, self.lasten, self.gelagert)
+        np.testing.assert_allclose(referenz[self.gelagert], 0)
+        for method, vorkonditionierung in [
+            ("cg", None),
+            ("cg", "jacobi"),
+            ("cg", "ilu"),
+            ("bicgstab", "ilu"),
+        ]:
+            u, info = solve(K, self.lasten, self.gelagert, method, vorkonditionierung)
+            np.testing.assert_allclose(u, referenz, rtol=1e-7, atol=1e-12)
+            assert info["residual"] < 1e-8
+        with pytest.raises(ValueError):
+            solve(K, self.lasten, self.gelagert, "gauss")
+
+    def test_condition_and_lowest_modes_match_dense(self) -> None:
+        """Schätzung von κ₁ und eigsh stimmen mit den dichten Verfahren überein"""
+        K = truss_stiffness(self.knoten, self.staebe, 210_000.0, 20.0)
+        M = lumped_mass(self.knoten, self.staebe, 7.85e-9, 20.0)
+        frei = np.setdiff1d(np.arange(self.knoten.size), self.gelagert)
+        K_frei = K.toarray()[np.ix_(frei, frei)]
+        m_frei = M.diagonal()[frei]
+
+        assert condition_estimate(K_frei) == pytest.approx(
+            np.linalg.cond(K_frei, 1), rel=1e-6
+        )
+        laenge = sum(
+            np.linalg.norm(self.knoten[b] - self.knoten[a]) for a, b in self.staebe
+        )
+        assert M.diagonal().sum() == pytest.approx(2 * 7.85e-9 * 20.0 * laenge)
+
+        frequenzen, moden = lowest_modes(K, M, k=3, fixed=self.gelagert)
+        skaliert = K_frei / np.sqrt(np.outer(m_frei, m_frei))
+        erwartet = np.sqrt(np.linalg.eigvalsh(skaliert)[:3]) / (2 * np.pi)
+        np.testing.assert_allclose(frequenzen, erwartet, rtol=1e-8)
+        np.testing.assert_allclose(moden[self.gelagert], 0)
+
+
+class TestTrendSchaetzer:
+    """Tests für trend_schaetzer.py Beispiel"""
+
+    def setup_method(self) -> None:
+        """20 Serien mit unterschiedlichem Trend, einzelne Lücken"""
+        rng = np.random.default_rng(12)
+        self.t = np.arange(200, dtype=np.float64) + 5000
+        self.steigungen = rng.normal(0, 0.5, 20)
+        self.werte = (
+            rng.uniform(0, 100, (20, 1))
+            + self.steigungen[:, None] * (self.t - 5000)
+            + rng.normal(0, 1, (20, 200))
+        )
+        self.mit_luecken = self.werte.copy()
+        self.mit_luecken[rng.random(self.werte.shape) < 0.1] = np.nan
+
+    def _reference(self, werte: np.ndarray) -> np.ndarray:
+        """lstsq je Serie über die gültigen Werte"""
+        koeffizienten = []
+        for serie in werte:
+            gueltig = ~np.isnan(serie)
+            A = np.column_stack([self.t[gueltig], np.ones(gueltig.sum())])
+            koeffizienten.append(np.linalg.lstsq(A, serie[gueltig], rcond=None)[0])
+        return np.array(koeffizienten)
+
+    def test_batched_fits_match_per_series_lstsq(self) -> None:
+        """Gebündelte Fits wie lstsq je Serie, auch mit NaN-Lücken"""
+        A = np.column_stack([self.t, np.ones(len(self.t))])
+        for werte in (self.werte, self.mit_luecken):
+            erwartet = self._reference(werte)
+            np.testing.assert_allclose(batched_lstsq(A, werte), erwartet, rtol=1e-6)
+            steigung, achse = linear_trends(self.t, werte)
+            np.testing.assert_allclose(steigung, erwartet[:, 0], rtol=1e-9)
+            np.testing.assert_allclose(achse, erwartet[:, 1], rtol=1e-9)
+        # Zu wenige gültige Werte: NaN statt Fehler
+        assert np.isnan(batched_lstsq(A[:2], [[1.0, np.nan]])).all()
+
+    def test_recursive_matches_lstsq(self) -> None:
+        """RLS ohne Vergessen ergibt die Gesamt-Regression"""
+        rls = RecursiveLeastSquares(2, n_series=20, delta=1e8)
+        X = np.column_stack([self.t - 5000, np.ones(len(self.t))])
+        residuen = rls.update_block(X, self.mit_luecken)
+        assert np.isnan(residuen[np.isnan(self.mit_luecken)]).all()
+        np.testing.assert_array_equal(
+            rls.n_updates_, (~np.isnan(self.mit_luecken)).sum(axis=1)
+        )
+        erwartet = self._reference(self.mit_luecken)
+        np.testing.assert_allclose(rls.coef_[:, 0], erwartet[:, 0], rtol=1e-6)
+        with pytest.raises(ValueError):
+            RecursiveLeastSquares(2, forgetting=1.5)
+
+    def test_tracker_follows_trend_change(self) -> None:
+        """Mit Vergessensfaktor folgt die Steigung einem Trendwechsel"""
+        tracker = TrendTracker(20)
+        for i, zeit in enumerate(self.t):
+            tracker.update(zeit, self.werte[:, i])
+        steigung, achse = linear_trends(self.t, self.werte)
+        np.testing.assert_allclose(tracker.slope, steigung, atol=1e-7)
+        np.testing.assert_allclose(tracker.intercept, achse, atol=1e-4)
+
+        # Ab der Hälfte fallen alle Serien mit 2 pro Sekunde
+        rauschen = np.random.default_rng(1).normal(0, 1, (20, 100))
+        knick = self.werte.copy()
+        knick[:, 100:] = knick[:, [100]] - 2.0 * np.arange(100) + rauschen
+        ohne, mit = TrendTracker(20), TrendTracker(20, forgetting=0.9)
+        for i, zeit in enumerate(self.t):
+            ohne.update(zeit, knick[:, i])
+            mit.update(zeit, knick[:, i])
+        np.testing.assert_allclose(mit.slope, -2.0, atol=0.2)
+        assert np.all(np.abs(ohne.slope + 2.0) > 0.5)
+
+
 class TestNumpyPerformanceAndAccuracy:
     """Zusätzliche Tests für NumPy-spezifische Eigenschaften"""
 
@@ -8,6 +8,7 @@ und demonstrieren Test-Patterns für Datenanalyse-Code.
 
 import sys
 import tempfile
+import warnings
 from pathlib import Path
 from unittest.mock import patch
 
@@ -24,6 +25,33 @@ import data_cleaning
 import data_import_export
 import dataframe_basics
 
+# Module importieren
+try:
+    from aggregat_wuerfel import AggregateCube, create_sample_production
+    from datums_parser import parse_dates
+    from duplikat_bereinigung import greedy_window_mask, remove_quasi_duplicates
+    from korrelationen import (
+        CorrelationAccumulator,
+        correlation_matrix,
+        correlation_pairs,
+    )
+    from quantil_sketch import ColumnSketches, QuantileSketch, stream_iqr_outliers
+    from spalten_bereinigung import clean_counts, regex_clean, standardize_ids
+    from stammdaten_lookup import enrich
+    from telemetrie_generator import (
+        MACHINE_PROFILES,
+        generate_machine_telemetry,
+        generate_performance_data,
+        generate_production_log,
+        plant_machines,
+    )
+    from zeit_pyramide import RollupPyramid, create_sample_series
+except ImportError as e:
+    pytest.skip(
+        f"Pandas Beispiele können nicht importiert werden: {e}",
+        allow_module_level=True,
+    )
+
 
 class TestDataFrameBasics:
     """Tests für dataframe_basics.py Beispiel"""
@@ -208,6 +236,609 @@ class TestDataCleaning:
         assert len(df_no_dupes) == 2, "Duplikat-Entfernung fehlerhaft"
 
 
+class TestDatumsParser:
+    """Tests für den vektorisierten Datums-Parser"""
+
+    def test_matches_row_wise_parsing(self):
+        """Ergebnis entspricht dem zeilenweisen Parsen mit try/except"""
+        formats = ["%Y-%m-%d", "%d.%m.%Y", "%Y/%m/%d", "%d.%m.%Y %H:%M"]
+        werte = ["2024-01-05", "05.01.2024", " 2024/01/07 ", "06.01.2024 08:30"]
+        werte += ["31.02.2024", "NULL", None, "2024-01-05", "kaputt"]
+        roh = pd.Series(werte * 50)
+
+        def zeilenweise(date_str):
+            if pd.isna(date_str):
+                return pd.NaT
+            for fmt in formats:
+                try:
+                    return pd.to_datetime(str(date_str).strip(), format=fmt)
+                except (ValueError, TypeError):
+                    continue
+            return pd.NaT
+
+        result, stats = parse_dates(roh, formats=formats, fallback=False)
+        expected = pd.to_datetime(roh.apply(zeilenweise))
+
+        pd.testing.assert_series_equal(result, expected, check_names=False)
+        assert stats["total"] == 450
+        assert stats["unique"] == 7
+        assert stats["null"] == 100
+        assert stats["failed"] == 100
+        assert stats["per_format"]["%Y-%m-%d"] == 100
+
+    def test_fallback_and_datetime_input(self):
+        """Fallback-Parser und bereits konvertierte Spalten"""
+        result, stats = parse_dates(pd.Series(["Jan 5 2024", "2024-01-05"]))
+        assert result.notna().all()
+        assert stats["per_format"] == {"%Y-%m-%d": 1, "fallback": 1}
+
+        datetimes = pd.Series(pd.date_range("2024-01-01", periods=3))
+        result, stats = parse_dates(datetimes)
+        assert result is datetimes
+        assert stats["parsed"] == 3
+
+    def test_mixed_offsets(self):
+        """Gemischte UTC-Offsets und Werte ohne Zeitzone (als UTC)"""
+        werte = pd.Series(
+            [
+                "2024-01-05T10:00:00+01:00",
+                "2024-07-05T10:00:00+02:00",
+                "2024-07-05 12:00:00",
+            ]
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", FutureWarning)
+            result, stats = parse_dates(werte)
+        assert result.tolist() == [
+            pd.Timestamp("2024-01-05 09:00"),
+            pd.Timestamp("2024-07-05 08:00"),
+            pd.Timestamp("2024-07-05 12:00"),
+        ]
+        assert stats["per_format"] == {"%Y-%m-%d %H:%M:%S": 1, "fallback": 2}
+
+
+class TestSpaltenBereinigung:
+    """Tests für die vektorisierte Regex-Bereinigung"""
+
+    def test_standardize_ids_matches_row_wise(self):
+        """Bediener-IDs wie bei der zeilenweisen re.findall-Variante"""
+        import re
+
+        werte = ["BY001", "by7", " Bediener 12 ", "BY-0042", "", None, "unbekannt", 5]
+        roh = pd.Series(werte * 25)
+
+        def zeilenweise(value):
+            if pd.isna(value) or str(value).strip() == "":
+                return np.nan
+            zahlen = re.findall(r"\d+", str(value).strip().upper())
+            return f"BY{int(zahlen[0]):03d}" if zahlen else np.nan
+
+        expected = roh.apply(zeilenweise)
+        pd.testing.assert_series_equal(standardize_ids(roh), expected)
+
+        kategorisch = standardize_ids(roh, as_category=True)
+        assert isinstance(kategorisch.dtype, pd.CategoricalDtype)
+        erwartet = {"BY001", "BY007", "BY012", "BY042", "BY005"}
+        assert set(kategorisch.cat.categories) == erwartet
+        assert kategorisch.isna().sum() == expected.isna().sum()
+
+    def test_clean_counts_and_regex_clean(self):
+        """Stückzahlen und allgemeine Regex-Regeln"""
+        roh = pd.Series(["1.250", "150 Stk", "N/A", 80, None, "abc", " 42 "])
+        result = clean_counts(roh)
+        assert result.tolist()[:2] == [1250, 150]
+        assert result.isna().tolist() == [False, False, True, False, True, True, False]
+        assert result.iloc[-1] == 42
+
+        maschinen = pd.Series(["laser 01", "LASER_1", " Laser-01 "], index=[10, 11, 12])
+        regeln = [(r"[\s\-]+", "_"), (r"_0*(\d+)$", r"_\1")]
+        cleaned = regex_clean(maschinen, upper=True, replace=regeln)
+        assert cleaned.tolist() == ["LASER_1"] * 3
+        assert cleaned.index.tolist() == [10, 11, 12]
+
+
+class TestDuplikatBereinigung:
+    """Tests für die vektorisierte Quasi-Duplikat-Entfernung"""
+
+    @staticmethod
+    def zeilenweise(df, time_window_minutes=1):
+        """Referenz: gierige Zeitfenster-Regel mit iterrows()"""
+        df_sorted = df.sort_values(["Maschine", "Timestamp"]).reset_index(drop=True)
+        keep_rows = []
+        for maschine in df_sorted["Maschine"].dropna().unique():
+            last_kept = None
+            for idx, row in df_sorted[df_sorted["Maschine"] == maschine].iterrows():
+                if pd.isna(row["Timestamp"]):
+                    keep_rows.append(idx)
+                elif last_kept is None or row["Timestamp"] - last_kept >= pd.Timedelta(
+                    minutes=time_window_minutes
+                ):
+                    keep_rows.append(idx)
+                    last_kept = row["Timestamp"]
+        return df_sorted.iloc[keep_rows]
+
+    @pytest.mark.parametrize("window", [0.5, 1, 3])
+    def test_matches_row_wise_semantics(self, window):
+        """Behaltene Zeilen sind identisch zur zeilenweisen Variante"""
+        rng = np.random.default_rng(int(window * 10))
+        n = 400
+        timestamps = pd.Series(
+            pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 900, n), "s")
+        )
+        timestamps[rng.random(n) < 0.05] = pd.NaT
+        df = pd.DataFrame(
+            {
+                "Maschine": rng.choice(["Laser_01", "Laser_02", "Presse_01", None], n),
+                "Timestamp": timestamps,
+                "Wert": np.arange(n),
+            }
+        )
+
+        result, removed = remove_quasi_duplicates(df, time_window_minutes=window)
+        expected = self.zeilenweise(df, time_window_minutes=window)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert removed == n - len(expected)
+
+    def test_multiple_keys_and_long_chains(self):
+        """Mehrere Schlüsselspalten; lange Ketten über Pointer-Doubling"""
+        sekunden = [0, 30, 60, 100, 10, 20]
+        df = pd.DataFrame(
+            {
+                "Maschine": ["L1"] * 6,
+                "Sensor": ["T"] * 4 + ["P"] * 2,
+                "Timestamp": pd.Timestamp("2024-01-01")
+                + pd.to_timedelta(sekunden, unit="s"),
+            }
+        )
+        result, removed = remove_quasi_duplicates(df, keys=["Maschine", "Sensor"])
+        assert removed == 3
+        assert result["Timestamp"].dt.strftime("%M:%S").tolist() == [
+            "00:10",
+            "00:00",
+            "01:00",
+        ]
+
+        # Jede Zeile ist eigenes Kettenglied: 100'000 Glieder in einer Gruppe
+        times = np.arange(100_000, dtype=np.int64)
+        assert greedy_window_mask(times, np.array([0]), window=1).all()
+        assert greedy_window_mask(times, np.array([0]), window=10).sum() == 10_000
+
+
+class TestQuantilSketch:
+    """Tests für zusammenführbare Quantil-Sketches"""
+
+    def test_exact_for_small_streams(self):
+        """Ohne Verdichtung identisch zu pandas' quantile()"""
+        series = pd.Series(np.random.default_rng(1).normal(size=500))
+        series[::50] = np.nan
+        sketch = QuantileSketch().update(series[:200]).update(series[200:])
+
+        assert sketch.is_exact
+        assert sketch.count == series.notna().sum()
+        np.testing.assert_allclose(
+            sketch.quantile([0.25, 0.5, 0.75]), series.quantile([0.25, 0.5, 0.75])
+        )
+
+    def test_bounded_memory_and_merge(self):
+        """Grosse Ströme: feste Grösse, kleiner Rangfehler, merge wie ein Strom"""
+        values = np.random.default_rng(2).gamma(4, 2.5, 400_000)
+        parts = [QuantileSketch(k=200).update(chunk) for chunk in np.split(values, 8)]
+        merged = parts[0]
+        for other in parts[1:]:
+            merged.merge(other)
+
+        assert not merged.is_exact
+        assert merged.count == len(values)
+        assert merged.size <= 3 * 200 + 50
+        for q in (0.25, 0.75):
+            rank = (values <= merged.quantile(q)).mean()
+            assert abs(rank - q) < 0.01
+
+    def test_grouped_bounds_and_two_pass_masks(self):
+        """IQR-Grenzen pro Maschine und Masken im zweiten Durchlauf"""
+        rng = np.random.default_rng(3)
+        df = pd.DataFrame(
+            {
+                "Maschine": np.repeat(["Laser_01", "Presse_01"], 300),
+                "Temperatur": np.concatenate(
+                    [rng.normal(25, 1, 300), rng.normal(40, 5, 300)]
+                ),
+            }
+        )
+        df.loc[[5, 305], "Temperatur"] = [35.0, 100.0]
+        chunks = [df.iloc[i : i + 100] for i in range(0, len(df), 100)]
+
+        sketches = ColumnSketches(["Temperatur"], by="Maschine")
+        for chunk in chunks:
+            sketches.update(chunk)
+        bounds = sketches.bounds()
+
+        for machine, part in df.groupby("Maschine"):
+            q1, q3 = part["Temperatur"].quantile([0.25, 0.75])
+            assert bounds.loc[(machine, "Temperatur"), "Q1"] == pytest.approx(q1)
+            assert bounds.loc[(machine, "Temperatur"), "Q3"] == pytest.approx(q3)
+
+        passes = stream_iqr_outliers(lambda: iter(chunks), "Temperatur", by="Maschine")
+        masks = pd.concat(mask for _, mask in passes)
+
+        limits = bounds.xs("Temperatur", level="Spalte")
+        lower = df["Maschine"].map(limits["Untergrenze"])
+        upper = df["Maschine"].map(limits["Obergrenze"])
+        expected = (df["Temperatur"] < lower) | (df["Temperatur"] > upper)
+        assert masks["Temperatur"].tolist() == expected.tolist()
+        assert masks.loc[[5, 305], "Temperatur"].all()
+
+
+class TestKorrelationen:
+    """Tests für chunkweise Korrelationen und vektorisierte Paarsuche"""
+
+    def setup_method(self):
+        """Korrelierte Kanäle mit Offset und fehlenden Werten"""
+        rng = np.random.default_rng(4)
+        base = rng.normal(size=(3000, 3))
+        self.df = pd.DataFrame(
+            {
+                "Temperatur": 1000 + base[:, 0],
+                "Leistung": 2 * base[:, 0] + 0.5 * base[:, 1],
+                "Druck": base[:, 1],
+                "Vibration": -base[:, 2] + 0.1 * base[:, 0],
+                "Konstant": np.ones(3000),
+            }
+        )
+        self.df = self.df.mask(rng.random(self.df.shape) < 0.05)
+
+    def test_matches_pandas_corr(self):
+        """Chunkweise Matrix entspricht df.corr() (paarweise ohne NaN)"""
+        expected = self.df.corr()
+        result = correlation_matrix(self.df, chunksize=700)
+        pd.testing.assert_frame_equal(result, expected, atol=1e-10)
+
+        result32 = correlation_matrix(self.df, dtype=np.float32, chunksize=700)
+        np.testing.assert_allclose(result32, expected, atol=1e-5)
+
+    def test_merge_equals_single_stream(self):
+        """Getrennt gesammelte Kreuzprodukte lassen sich zusammenführen"""
+        columns = ["Temperatur", "Leistung", "Druck", "Vibration"]
+        first = CorrelationAccumulator(columns).update(self.df.iloc[:1000])
+        second = CorrelationAccumulator(columns)
+        second.shift = np.zeros(len(columns))  # andere Verschiebung als first
+        second.update(self.df.iloc[1000:])
+
+        merged = first.merge(second)
+        pd.testing.assert_frame_equal(
+            merged.corr(), self.df[columns].corr(), atol=1e-10
+        )
+
+    def test_upper_triangle_pairs_and_top_k(self):
+        """Schwellwert in Matrix-Reihenfolge, Top-k nach |r| sortiert"""
+        corr = self.df.corr()
+        pairs = correlation_pairs(corr, threshold=0.3)
+
+        expected = [
+            (a, b)
+            for i, a in enumerate(corr.columns)
+            for b in corr.columns[i + 1 :]
+            if abs(corr.loc[a, b]) > 0.3
+        ]
+        assert (
+            list(zip(pairs["Variable_1"], pairs["Variable_2"], strict=True)) == expected
+        )
+
+        top = correlation_pairs(corr, k=2)
+        assert len(top) == 2
+        assert top.iloc[0][["Variable_1", "Variable_2"]].tolist() == [
+            "Temperatur",
+            "Leistung",
+        ]
+        assert top["Korrelation"].abs().is_monotonic_decreasing
+        assert not correlation_pairs(corr)["Korrelation"].isna().any()
+
+
+class TestStammdatenLookup:
+    """Tests für die Stammdaten-Anreicherung über Schlüssel-Codes"""
+
+    def setup_method(self):
+        """Fakten mit unbekannter Maschine und fehlendem Produkt"""
+        self.facts = pd.DataFrame(
+            {
+                "Maschine": ["Laser_01", "Laser_02", "Laser_01", "Laser_99"],
+                "Produkt": ["P1", "P2", None, "P1"],
+                "Stückzahl": [10, 20, 30, 40],
+            }
+        )
+        self.maschinen = pd.DataFrame(
+            {
+                "Maschine": ["Laser_01", "Laser_02"],
+                "Halle": ["Halle_1", "Halle_2"],
+                "Max_Stueck_pro_h": [100, 120],
+            }
+        )
+        self.produkte = pd.DataFrame(
+            {"Produkt": ["P1", "P2"], "Preis": [1.5, 2.5], "Aktiv": [True, False]}
+        )
+        self.hallen = pd.DataFrame(
+            {"Halle": ["Halle_1", "Halle_2"], "Kostenstelle": ["KST_1", "KST_2"]}
+        )
+
+    def test_matches_chained_merges(self):
+        """Gleiches Ergebnis inkl. Typ-Anpassung wie drei left-merges"""
+        expected = (
+            self.facts.merge(self.maschinen, on="Maschine", how="left")
+            .merge(self.produkte, on="Produkt", how="left")
+            .merge(self.hallen, on="Halle", how="left")
+        )
+        dimensions = {
+            "Maschine": self.maschinen,
+            "Produkt": self.produkte,
+            "Halle": self.hallen,
+        }
+        result = enrich(self.facts, dimensions)
+        pd.testing.assert_frame_equal(result, expected)
+        assert result["Max_Stueck_pro_h"].dtype == np.float64
+        assert list(self.facts.columns) == ["Maschine", "Produkt", "Stückzahl"]
+
+    def test_categorical_options(self):
+        """Categorical-Schlüssel und -Attribute ergeben dieselben Werte"""
+        result = enrich(
+            self.facts,
+            {"Maschine": self.maschinen, "Halle": self.hallen},
+            columns={"Maschine": ["Halle"]},
+            encode_keys=True,
+            categorical_attributes=True,
+        )
+        assert isinstance(result["Maschine"].dtype, pd.CategoricalDtype)
+        assert isinstance(result["Kostenstelle"].dtype, pd.CategoricalDtype)
+        assert result["Kostenstelle"].tolist()[:3] == ["KST_1", "KST_2", "KST_1"]
+        assert pd.isna(result["Kostenstelle"].iloc[3])
+        assert "Max_Stueck_pro_h" not in result.columns
+
+    def test_rejects_ambiguous_dimensions(self):
+        """Doppelte Schlüssel und Spaltenkonflikte werden abgelehnt"""
+        doppelt = pd.concat([self.maschinen, self.maschinen.head(1)])
+        with pytest.raises(ValueError, match="nicht eindeutig"):
+            enrich(self.facts, {"Maschine": doppelt})
+        with pytest.raises(ValueError, match="existieren bereits"):
+            enrich(self.facts, {"Produkt": self.facts[["Produkt", "Stückzahl"]]})
+
+
+class TestAggregatWuerfel:
+    """Tests für den inkrementell gepflegten Aggregat-Würfel"""
+
+    def setup_method(self):
+        """Zehn Tage Produktion mit einzelnen fehlenden Messwerten"""
+        self.df = create_sample_production(days=10, seed=3)
+        self.df.loc[::97, "Ausschuss_Rate"] = np.nan
+        self.dimensions = ["Maschine", "Schicht", "Halle", "Produkt", "Typ", "KW"]
+        self.measures = ["Stückzahl", "Energieverbrauch_kWh", "Ausschuss_Rate"]
+
+    def test_pivots_match_pivot_table(self):
+        """Summe, Anzahl und Mittelwert inkl. Randsummen wie pivot_table()"""
+        cube = AggregateCube.from_frame(self.df, self.dimensions, self.measures)
+        for values, aggfunc in [
+            ("Stückzahl", "sum"),
+            ("Ausschuss_Rate", "count"),
+            ("Ausschuss_Rate", "mean"),
+        ]:
+            expected = self.df.pivot_table(
+                values=values,
+                index="Halle",
+                columns="Schicht",
+                aggfunc=aggfunc,
+                margins=True,
+            )
+            result = cube.pivot(values, "Halle", "Schicht", aggfunc, margins=True)
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+            # Ohne Spalten-Dimension: eine Spalte mit dem Namen der Messgrösse
+            expected = self.df.pivot_table(
+                values=values, index="Typ", aggfunc=aggfunc, margins=True
+            )
+            result = cube.pivot(values, "Typ", aggfunc=aggfunc, margins=True)
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+        ratio = cube.ratio("Energieverbrauch_kWh", "Stückzahl", "Typ", "KW")
+        sums = self.df.groupby(["Typ", "KW"])[["Energieverbrauch_kWh", "Stückzahl"]]
+        sums = sums.sum()
+        expected = (sums["Energieverbrauch_kWh"] / sums["Stückzahl"]).unstack()
+        np.testing.assert_allclose(ratio.to_numpy(), expected.to_numpy())
+
+        ratio = cube.ratio("Energieverbrauch_kWh", "Stückzahl", "Typ")
+        sums = self.df.groupby("Typ")[["Energieverbrauch_kWh", "Stückzahl"]].sum()
+        expected = sums["Energieverbrauch_kWh"] / sums["Stückzahl"]
+        assert list(ratio.columns) == ["Energieverbrauch_kWh/Stückzahl"]
+        np.testing.assert_allclose(ratio.iloc[:, 0], expected.loc[ratio.index])
+
+    def test_incremental_updates_equal_full_build(self):
+        """Tageweise aufgenommene Daten ergeben denselben Würfel"""
+        full = AggregateCube.from_frame(self.df, self.dimensions, self.measures)
+        cube = AggregateCube(self.dimensions, self.measures)
+        for datum, day in self.df.groupby("Datum"):
+            assert cube.update(day, partition=datum)
+        assert not cube.update(day, partition=datum)
+
+        pd.testing.assert_frame_equal(
+            cube.pivot("Stückzahl", "Maschine", "Produkt"),
+            full.pivot("Stückzahl", "Maschine", "Produkt"),
+        )
+        pd.testing.assert_frame_equal(
+            cube.rollup("Typ"), full.rollup("Typ"), check_exact=False
+        )
+
+    def test_select_and_persistence(self, tmp_path):
+        """Teilwürfel und gespeicherte Würfel liefern dieselben Werte"""
+        cube = AggregateCube.from_frame(
+            self.df, self.dimensions, self.measures, partition_column="Datum"
+        )
+        first_week = cube.select(lambda cells: cells["KW"] == cells["KW"].min())
+        week = self.df["KW"] == self.df["KW"].min()
+        expected = self.df[week].groupby("Maschine")["Stückzahl"].sum()
+        assert first_week.rollup("Maschine")["Stückzahl_Summe"].equals(expected)
+
+        cube.save(tmp_path / "wuerfel.pkl")
+        loaded = AggregateCube.load(tmp_path / "wuerfel.pkl")
+        assert loaded.partitions == cube.partitions
+        assert not loaded.update(self.df.head(5), partition=self.df["Datum"].iloc[0])
+        pd.testing.assert_frame_equal(loaded.cells, cube.cells)
+
+        with pytest.raises(KeyError):
+            cube.pivot("Stückzahl", "Datum")
+
+    def test_failed_update_and_empty_cube(self):
+        """Fehlgeschlagene Updates sperren die Partition nicht"""
+        cube = AggregateCube(self.dimensions, self.measures)
+        with pytest.raises(ValueError, match="leer"):
+            cube.select(lambda cells: cells["KW"] > 0)
+
+        day = self.df[self.df["Datum"] == self.df["Datum"].iloc[0]]
+        with pytest.raises(KeyError):
+            cube.update(day.drop(columns="Halle"), partition="Tag 1")
+        assert cube.partitions == set()
+        assert cube.update(day, partition="Tag 1")
+        assert cube.partitions == {"Tag 1"}
+
+
+class TestZeitPyramide:
+    """Tests für die vorberechnete Zeit-Pyramide"""
+
+    def setup_method(self):
+        """Drei Wochen 10-Sekunden-Werte mit Lücken und fehlenden Werten"""
+        self.raw = create_sample_series(days=21, start="2024-03-06", seed=5)
+        self.raw = self.raw[~self.raw.index.day.isin([10, 11])]
+        self.raw.loc[self.raw.index[::50], "Temperatur"] = np.nan
+        self.measures = ["Stückzahl", "Leistung_kW", "Temperatur"]
+        self.agg = {"Stückzahl": "sum", "Leistung_kW": "max", "Temperatur": "mean"}
+
+    def test_queries_match_resample(self):
+        """Abfragen entsprechen resample() auf den Rohdaten"""
+        pyramid = RollupPyramid(self.measures).update(self.raw)
+        for freq, level in [("D", "D"), ("W", "W"), ("ME", "D"), ("2h", "h")]:
+            assert RollupPyramid.level_for(freq) == level
+            expected = self.raw.resample(freq).agg(self.agg)
+            result = pyramid.query(freq, self.agg)
+            pd.testing.assert_frame_equal(
+                result, expected, check_dtype=False, check_freq=False
+            )
+
+        expected = self.raw.groupby(self.raw.index.hour).agg(self.agg)
+        result = pyramid.profile("hour", self.agg)
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+
+    def test_incremental_update_equals_full_build(self):
+        """Nachgelieferte Daten, auch mitten in einer Minute, ergeben dasselbe"""
+        full = RollupPyramid(self.measures).update(self.raw)
+        split = len(self.raw) // 2 + 3  # Schnitt mitten in einer Minute
+        pyramid = RollupPyramid(self.measures)
+        pyramid.update(self.raw.iloc[:split]).update(self.raw.iloc[split:])
+
+        for level, table in full.levels.items():
+            pd.testing.assert_frame_equal(pyramid.levels[level], table)
+
+    def test_persistence_and_errors(self, tmp_path):
+        """Gespeicherte Pyramide liefert dieselben Werte; ungültige Abfragen"""
+        pyramid = RollupPyramid(self.measures).update(self.raw)
+        pyramid.save(tmp_path / "pyramide.pkl")
+        loaded = RollupPyramid.load(tmp_path / "pyramide.pkl")
+        pd.testing.assert_frame_equal(
+            loaded.query("D", start="2024-03-20"),
+            pyramid.query("D", start="2024-03-20"),
+        )
+        with pytest.raises(ValueError):
+            pyramid.query("30s")
+        with pytest.raises(KeyError):
+            pyramid.query("D", {"Druck": "sum"})
+
+
+class TestTelemetrieGenerator:
+    """Tests für den spaltenweisen Telemetrie-Generator"""
+
+    def setup_method(self):
+        """30 Maschinen, zwei Tage im 10-Minuten-Takt"""
+        self.machines = plant_machines(30)
+        self.timestamps = pd.date_range("2024-09-06", periods=288, freq="10min")
+
+    def test_grid_profiles_and_reproducibility(self):
+        """Raster Zeit × Maschine, Mittelwerte je Profil, gleicher Seed"""
+        df = generate_machine_telemetry(self.machines, self.timestamps, seed=3)
+        assert len(df) == 30 * 288
+        assert list(df["machine"].iloc[:30]) == self.machines
+        assert (df["timestamp"].iloc[:30] == self.timestamps[0]).all()
+
+        normal = df[df["status"] == "Normal"]
+        kind = normal["machine"].str.split().str[0].str.replace("maschine", "")
+        means = normal.groupby(kind)["cutting_speed"].mean()
+        for name, profile in MACHINE_PROFILES.items():
+            assert means[name] == pytest.approx(profile["cutting_speed"][0], abs=0.02)
+        assert set(df["shift"]) == {1, 2, 3}
+
+        again = generate_machine_telemetry(
+            self.machines, self.timestamps, seed=3, categorical=True
+        )
+        assert isinstance(again["machine"].dtype, pd.CategoricalDtype)
+        text_columns = {"machine": object, "operator": object, "status": object}
+        pd.testing.assert_frame_equal(again.astype(text_columns), df)
+
+    def test_fault_injection(self):
+        """Störungen mit vorgegebener Rate und Wirkung auf die Kanäle"""
+        df = generate_machine_telemetry(self.machines, self.timestamps, seed=4)
+        rates = df["status"].value_counts(normalize=True)
+        assert rates["Warnung"] == pytest.approx(0.05, abs=0.01)
+        assert rates["Fehler"] == pytest.approx(0.95 * 0.02, abs=0.005)
+        laser = df[df["machine"].str.startswith("Laser")]
+        temperature = laser.groupby("status")["temperature"].mean()
+        assert temperature["Warnung"] - temperature["Normal"] == pytest.approx(
+            10, abs=1
+        )
+        assert df["power_consumption"].min() >= 10
+
+        ruhig = generate_machine_telemetry(
+            self.machines, self.timestamps, seed=4, faults={}
+        )
+        assert (ruhig["status"] == "Normal").all()
+        with pytest.raises(ValueError):
+            generate_machine_telemetry(["Schweissroboter"], self.timestamps)
+
+    def test_uniform_profile_operators_and_shifts(self):
+        """Einheitliches Profil, eigene Bediener und zufällige Schichten"""
+        df = generate_machine_telemetry(
+            self.machines,
+            self.timestamps,
+            seed=6,
+            faults={},
+            profile={"temperature": (65.0, 5.0)},
+            operators=["Schmidt", "Mueller", "Weber"],
+            shifts=[1, 2, 3],
+        )
+        kind = df["machine"].str.split().str[0]
+        temperature = df.groupby(kind)["temperature"].agg(["mean", "std"])
+        np.testing.assert_allclose(temperature["mean"], 65.0, atol=0.3)
+        np.testing.assert_allclose(temperature["std"], 5.0, atol=0.2)
+        assert set(df["operator"]) == {"Schmidt", "Mueller", "Weber"}
+
+        night = df[df["timestamp"].dt.hour < 8]
+        assert set(night["shift"]) == {1, 2, 3}
+
+    def test_dependent_channels_and_production_log(self):
+        """Status und Schicht folgen aus den Werten, Buchungen mit Lücken"""
+        df = generate_performance_data(
+            {"Laser A": 85, "Stanz E": 95}, self.timestamps, seed=5
+        )
+        optimal = df["performance"] >= 90
+        assert (df.loc[optimal, "status"] == "Optimal").all()
+        assert (df.loc[df["performance"] < 60, "status"] == "Kritisch").all()
+        hour = df["timestamp"].dt.hour
+        assert (df.loc[(hour >= 6) & (hour < 14), "shift"] == "Früh").all()
+        assert df["temperature"].between(60, 120).all()
+
+        hours = pd.date_range("2024-01-01", "2024-01-28 23:00", freq="h")
+        log = generate_production_log(hours, seed=6)
+        assert 0.5 * len(hours) * 6 < len(log) < 0.85 * len(hours) * 6
+        weekend = log["Timestamp"].dt.dayofweek >= 5
+        assert weekend.mean() < 0.2
+        assert log["Ausschuss_Rate"].between(0.001, 0.15).all()
+        assert set(log["Schicht"]) == {"Früh", "Spät", "Nacht"}
+
+
 class TestDataAnalysis:
     """Tests für data_analysis.py Beispiel"""
 
@@ -368,6 +999,14 @@ def test_example_files_exist():
         "data_cleaning.py",
         "data_analysis.py",
         "vba_vs_pandas.py",
+        "datums_parser.py",
+        "spalten_bereinigung.py",
+        "duplikat_bereinigung.py",
+        "quantil_sketch.py",
+        "korrelationen.py",
+        "stammdaten_lookup.py",
+        "aggregat_wuerfel.py",
+        "zeit_pyramide.py",
     ]
 
     for filename in files_to_check:
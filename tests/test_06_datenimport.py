@@ -13,6 +13,7 @@ Diese Tests überprüfen alle Funktionalitäten des Datenimport-Moduls:
 Autor: Python Grundkurs Bystronic
 """
 
+import io
 import json
 import sys
 import tempfile
@@ -33,14 +34,51 @@ sys.path.insert(0, str(beispiele_path))
 # Module importieren
 try:
     import csv_import_grundlagen
-    from bystronic_csv_parser import BystronicCSVParser
+    from batch_import import (
+        batch_import,
+        expand_sources,
+        export_import_log,
+        import_log_frame,
+        validate_production_chunk,
+    )
+    from bystronic_csv_parser import BystronicCSVParser, write_scope_csv
     from csv_import_grundlagen import (
         csv_import_beispiele,
         csv_performance_optimierung,
         csv_probleme_loesen,
         visualisiere_csv_daten,
     )
+    from energie_lastprofil import (
+        LoadProfileAccumulator,
+        LoadProfileStore,
+        analyze_power_export,
+        area_share,
+        base_load,
+        daily_profile,
+        energy_per_period,
+        peak_hours,
+        peak_windows,
+        simulate_power,
+        simulate_power_blocks,
+    )
     from excel_verarbeitung import BystronicExcelHandler
+    from import_registry import FormatRegistry, robust_import, source_pattern
+    from json_streaming import JsonRecordStream, iter_json_records, read_json_chunks
+    from parquet_io import (
+        parquet_row_groups,
+        read_parquet,
+        to_parquet_bytes,
+        write_feather,
+        write_parquet,
+    )
+    from speicher_optimierung import optimize_frame
+    from spektralanalyse import (
+        WelchAccumulator,
+        analyze_scope_file,
+        peak_frequency,
+        spectrograms,
+    )
+    from validierungs_regeln import ValidationRuleEngine, rules_from_config
 except ImportError as e:
     pytest.skip(
         f"Datenimport Beispiele können nicht importiert werden: {e}",
@@ -224,6 +262,26 @@ BitMask	0xffffffffffffffff	BitMask	0xffffffffffffffff	BitMask	0xffffffffffffffff
         csv_file.write_text(mock_content, encoding="utf-8")
         return csv_file
 
+    def test_iter_scope_chunks(self):
+        """Scope-Kanäle werden als Spaltenpaare erkannt und blockweise gelesen"""
+        csv_file = self.create_mock_bystronic_csv()
+
+        header = self.parser.read_scope_header(str(csv_file))
+        assert header["channels"] == ["TEMP_001", "VIBR_001", "POWER_001"]
+        assert header["sample_time_ms"] == [1.0, 1.0, 1.0]
+
+        chunks = list(
+            self.parser.iter_scope_chunks(
+                str(csv_file), channels=["POWER_001", "VIBR_001"], chunksize=3
+            )
+        )
+        assert [len(c) for c in chunks] == [3, 1]
+        daten = pd.concat(chunks)
+        assert list(daten.columns) == ["POWER_001", "VIBR_001"]
+        assert daten["VIBR_001"].tolist() == [1.2, 1.4, 2.1, 2.8]
+        with pytest.raises(ValueError):
+            next(self.parser.iter_scope_chunks(str(csv_file), channels=["XYZ"]))
+
     def test_parser_initialization(self):
         """Test der Parser-Initialisierung"""
         assert "\t" in self.parser.common_delimiters
@@ -414,6 +472,838 @@ class TestExcelVerarbeitung:
         assert "Statistiken" in loaded_data
         assert len(loaded_data["Daten"]) == 5
 
+    def test_load_workbooks_parallel(self):
+        """Test des parallelen Ladens mehrerer Arbeitsmappen"""
+        files = []
+        for day in range(3):
+            excel_file = self.temp_dir / f"tag_{day:02d}.xlsx"
+            with pd.ExcelWriter(excel_file, engine="openpyxl") as writer:
+                pd.DataFrame({"Stueck": [day, day + 1]}).to_excel(
+                    writer, sheet_name="Produktion", index=False
+                )
+                pd.DataFrame({"Wert": [day]}).to_excel(
+                    writer, sheet_name="Qualität", index=False
+                )
+            files.append(excel_file)
+
+        merged = self.excel_handler.load_workbooks_parallel(files, max_workers=2)
+
+        assert set(merged) == {"Produktion", "Qualität"}
+        assert len(merged["Produktion"]) == 6
+        assert merged["Produktion"]["Quelldatei"].tolist() == [
+            "tag_00.xlsx",
+            "tag_00.xlsx",
+            "tag_01.xlsx",
+            "tag_01.xlsx",
+            "tag_02.xlsx",
+            "tag_02.xlsx",
+        ]
+        assert len(self.excel_handler.file_timings) == 3
+        assert self.excel_handler.file_timings["Erfolg"].all()
+
+        # Glob-Muster und fehlerhafte Dateien
+        (self.temp_dir / "kaputt.xlsx").write_text("keine Excel-Datei")
+        merged = self.excel_handler.load_workbooks_parallel(
+            str(self.temp_dir / "*.xlsx"), max_workers=1
+        )
+        assert len(merged["Qualität"]) == 3
+        assert (~self.excel_handler.file_timings["Erfolg"]).sum() == 1
+
+    def test_load_workbooks_parallel_sources(self):
+        """Gleichnamige Dateien in Unterordnern, vorhandene Quellspalte"""
+        files = []
+        for folder in ("halle_a", "halle_b"):
+            excel_file = self.temp_dir / folder / "export.xlsx"
+            excel_file.parent.mkdir()
+            pd.DataFrame({"Quelldatei": ["alt.xlsx"], "Stueck": [1]}).to_excel(
+                excel_file, sheet_name="Produktion", index=False
+            )
+            files.append(excel_file)
+
+        merged = self.excel_handler.load_workbooks_parallel(files, max_workers=1)
+
+        produktion = merged["Produktion"]
+        assert list(produktion.columns) == ["Quelldatei", "Stueck"]
+        assert produktion["Quelldatei"].tolist() == [
+            "halle_a/export.xlsx",
+            "halle_b/export.xlsx",
+        ]
+
+
+class TestImportRegistry:
+    """Tests für die Reader-Registry mit Formaterkennung"""
+
+    def setup_method(self):
+        """Setup für jeden Test"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.registry = FormatRegistry()
+        self.df = pd.DataFrame(
+            {
+                "Maschine": ["Laser_01", "Presse_01", "Laser_02"],
+                "Temperatur": [22.5, 23.75, 21.0],
+                "Stückzahl": [120, 80, 95],
+            }
+        )
+
+    def teardown_method(self):
+        """Cleanup nach jedem Test"""
+        import shutil
+
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_sniff_german_csv(self):
+        """Semikolon und Dezimalkomma werden aus dem Inhalt erkannt"""
+        csv_file = self.temp_dir / "daten.txt"
+        self.df.to_csv(csv_file, sep=";", decimal=",", index=False)
+
+        settings = self.registry.sniff(csv_file)
+
+        assert settings["format"] == "csv"
+        assert settings["sep"] == ";"
+        assert settings["decimal"] == ","
+
+    def test_magic_bytes_override_extension(self):
+        """XLSX wird auch mit falscher Endung erkannt"""
+        excel_file = self.temp_dir / "export.xlsx"
+        self.df.to_excel(excel_file, index=False)
+        renamed = excel_file.rename(self.temp_dir / "export.csv")
+
+        df, log = robust_import(renamed)
+
+        assert log["success"]
+        assert log["format"] == "excel"
+        assert len(df) == 3
+
+    def test_gzip_and_json_detection(self):
+        """gzip-komprimierte CSV und JSON werden erkannt"""
+        gz_file = self.temp_dir / "daten.csv.gz"
+        self.df.to_csv(gz_file, sep="\t", index=False, compression="gzip")
+        json_file = self.temp_dir / "daten.dat"
+        self.df.to_json(json_file, orient="records")
+
+        df_gz, settings = self.registry.read(gz_file)
+        df_json, json_settings = self.registry.read(json_file)
+
+        assert settings["compression"] == "gzip"
+        assert settings["sep"] == "\t"
+        assert json_settings["format"] == "json"
+        pd.testing.assert_frame_equal(df_gz, self.df)
+        assert list(df_json.columns) == list(self.df.columns)
+
+    def test_sniff_cache_per_source_pattern(self):
+        """Dateien desselben Feeds teilen die erkannten Einstellungen"""
+        for day in (1, 2):
+            self.df.to_csv(
+                self.temp_dir / f"laser_2024-01-0{day}.csv",
+                sep=";",
+                decimal=",",
+                index=False,
+            )
+
+        first = self.registry.sniff(self.temp_dir / "laser_2024-01-01.csv")
+        second = self.registry.sniff(self.temp_dir / "laser_2024-01-02.csv")
+
+        assert not first["from_cache"]
+        assert second["from_cache"]
+        assert second["sep"] == ";"
+        assert source_pattern("a/laser_2024-01-01.csv") == source_pattern(
+            "a/laser_2025-12-31.csv"
+        )
+
+    def test_usecols_and_dtype_hints(self):
+        """usecols und dtype werden an den Reader durchgereicht"""
+        csv_file = self.temp_dir / "daten.csv"
+        self.df.to_csv(csv_file, index=False)
+
+        df, log = robust_import(
+            csv_file,
+            usecols=["Maschine", "Temperatur"],
+            dtype={"Temperatur": "float32"},
+        )
+
+        assert log["success"]
+        assert list(df.columns) == ["Maschine", "Temperatur"]
+        assert df["Temperatur"].dtype == np.float32
+
+    def test_custom_reader_and_errors(self):
+        """Eigene Reader lassen sich registrieren, Fehler landen im Log"""
+
+        @self.registry.reader("maschinenlog", extensions=(".mlog",))
+        def read_mlog(file_path, settings, **kwargs):
+            return pd.DataFrame({"Zeile": Path(file_path).read_text().splitlines()})
+
+        log_file = self.temp_dir / "anlage.mlog"
+        log_file.write_text("START\nSTOP\n")
+
+        df, settings = self.registry.read(log_file)
+        assert settings["format"] == "maschinenlog"
+        assert len(df) == 2
+
+        df, log = robust_import(self.temp_dir / "fehlt.csv")
+        assert df is None
+        assert not log["success"]
+        assert log["error"]
+
+
+class TestBatchImport:
+    """Tests für den parallelen Batch-Import"""
+
+    def setup_method(self):
+        """Setup für jeden Test"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        df = pd.DataFrame(
+            {
+                "Maschine": ["Laser_01", "Laser_02"] * 5,
+                "Produktion": range(10),
+                "Temperatur": [22.0] * 9 + [55.0],
+            }
+        )
+        df.to_csv(self.temp_dir / "anlage_01.csv", sep=";", decimal=",", index=False)
+        df.to_json(self.temp_dir / "anlage_02.json", orient="records")
+        df.to_excel(self.temp_dir / "anlage_03.xlsx", index=False)
+        (self.temp_dir / "anlage_04.csv").write_bytes(b"")
+
+    def teardown_method(self):
+        """Cleanup nach jedem Test"""
+        import shutil
+
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_expand_sources(self):
+        """Glob-Muster und Listen werden aufgelöst"""
+        files = expand_sources(
+            [self.temp_dir / "*.csv", self.temp_dir / "anlage_01.csv"]
+        )
+        assert [f.name for f in files] == ["anlage_01.csv", "anlage_04.csv"]
+
+    @pytest.mark.parametrize("parse_workers", [1, 2])
+    def test_batch_import_mixed_formats(self, parse_workers):
+        """Gemischte Formate werden importiert, Fehler landen im Log"""
+        data, summary = batch_import(
+            self.temp_dir / "anlage_*",
+            parse_workers=parse_workers,
+            window=2,
+            combine=True,
+        )
+
+        assert summary["total_imports"] == 4
+        assert summary["successful_imports"] == 3
+        assert summary["failed_imports"] == 1
+        assert summary["total_records"] == 30
+        assert len(data) == 30
+        assert set(data["Quelldatei"]) == {
+            "anlage_01.csv",
+            "anlage_02.json",
+            "anlage_03.xlsx",
+        }
+
+        log_df = import_log_frame(summary)
+        assert list(log_df["format"][:3]) == ["csv", "json", "excel"]
+        assert (log_df.loc[log_df["success"], "rows_per_s"] > 0).all()
+        assert log_df.loc[~log_df["success"], "error"].iloc[0]
+
+    def test_chunked_validation_and_log_export(self):
+        """Chunkweise Validierung meldet betroffene Zeilenbereiche"""
+        frames, summary = batch_import(
+            [self.temp_dir / "anlage_01.csv", self.temp_dir / "anlage_02.json"],
+            parse_workers=1,
+            validator=validate_production_chunk,
+            chunksize=4,
+        )
+
+        assert len(frames) == 2
+        for entry in summary["import_log"]:
+            assert entry["validation"] == [
+                "Zeilen 8-9: Temperatur ausserhalb 10-40°C: 1"
+            ]
+
+        log_file = self.temp_dir / "log" / "import_log.json"
+        export_import_log(summary, log_file)
+        with open(log_file, encoding="utf-8") as f:
+            exported = json.load(f)
+        assert exported["validation_issues"] == 2
+
+
+class TestJSONStreaming:
+    """Tests für den inkrementellen JSON/NDJSON-Import"""
+
+    def setup_method(self):
+        """Setup für jeden Test"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.machines = [
+            {
+                "id": f"LC{i:03d}",
+                "status": "running",
+                "sensor": {"temperature": 20.0 + i, "note": 'a"]}'},
+            }
+            for i in range(25)
+        ]
+        self.payload = {
+            "production": {
+                "status": "success",
+                "tags": ["laser"],
+                "data": {"machines": self.machines, "summary": {"count": 25}},
+            }
+        }
+
+    def teardown_method(self):
+        """Cleanup nach jedem Test"""
+        import shutil
+
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_record_path_small_blocks(self):
+        """Datensätze werden auch über Blockgrenzen hinweg korrekt gelesen"""
+        stream = io.StringIO(json.dumps(self.payload))
+        reader = JsonRecordStream(stream, block_size=5)
+        records = list(reader.records("production.data.machines"))
+        assert records == self.machines
+
+        # Ohne Pfad wird das erste Array im Dokument verwendet
+        stream = io.StringIO(json.dumps(self.payload))
+        assert list(JsonRecordStream(stream).records()) == ["laser"]
+
+    def test_chunks_gzip_and_flattening(self):
+        """gzip-Dateien werden chunkweise gelesen und abgeflacht"""
+        import gzip
+
+        file_path = self.temp_dir / "dump.json.gz"
+        with gzip.open(file_path, "wt", encoding="utf-8") as f:
+            json.dump(self.payload, f)
+
+        record_path = "production.data.machines"
+        chunks = list(
+            read_json_chunks(file_path, chunksize=10, record_path=record_path)
+        )
+        assert [len(c) for c in chunks] == [10, 10, 5]
+        assert "sensor_temperature" in chunks[0].columns
+        assert chunks[-1]["sensor_temperature"].iloc[-1] == 44.0
+
+    def test_ndjson_detection_and_registry(self):
+        """NDJSON wird erkannt und über die Registry gelesen"""
+        file_path = self.temp_dir / "feed.txt"
+        file_path.write_text("\n".join(json.dumps(m) for m in self.machines))
+
+        assert len(list(iter_json_records(file_path))) == 25
+
+        registry = FormatRegistry()
+        df, settings = registry.read(file_path)
+        assert settings["format"] == "ndjson"
+        assert len(df) == 25
+        assert "sensor_temperature" in df.columns
+
+        reader, _ = registry.read(file_path, chunksize=10)
+        assert sum(len(chunk) for chunk in reader) == 25
+
+    def test_empty_files_and_shared_separator(self):
+        """Leere Dateien liefern keine Chunks; Registry und Stream gleiche Spalten"""
+        for name, content in [("leer.json", ""), ("leer.ndjson", ""), ("a.json", "[]")]:
+            file_path = self.temp_dir / name
+            file_path.write_text(content)
+            assert list(read_json_chunks(file_path)) == []
+
+        file_path = self.temp_dir / "machines.json"
+        file_path.write_text(json.dumps(self.machines))
+        df, _ = FormatRegistry().read(file_path)
+        chunk = next(read_json_chunks(file_path))
+        assert list(df.columns) == list(chunk.columns)
+
+    def test_missing_record_path(self):
+        """Ein falscher Pfad führt zu einer klaren Fehlermeldung"""
+        file_path = self.temp_dir / "dump.json"
+        file_path.write_text(json.dumps(self.payload))
+        with pytest.raises(ValueError):
+            list(iter_json_records(file_path, record_path="production.data.missing"))
+
+
+class TestParquetIO:
+    """Tests für den spaltenorientierten Parquet/Feather-Pfad"""
+
+    def setup_method(self):
+        """Setup für jeden Test"""
+        pytest.importorskip("pyarrow")
+        self.temp_dir = Path(tempfile.mkdtemp())
+        n_rows = 1000
+        self.df = pd.DataFrame(
+            {
+                "Zeitstempel": pd.date_range("2024-01-01", periods=n_rows, freq="h"),
+                "Maschine": np.tile(
+                    ["Laser_01", "Laser_02", "Presse_01", "Stanze_01"],
+                    250,
+                ),
+                "Temperatur": np.linspace(18, 30, n_rows),
+                "Leistung_kW": np.arange(n_rows, dtype=float),
+            }
+        )
+
+    def teardown_method(self):
+        """Cleanup nach jedem Test"""
+        import shutil
+
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_projection_and_pushdown(self):
+        """Nur ausgewählte Spalten, Maschinen und Zeiträume werden gelesen"""
+        file_path = self.temp_dir / "telemetrie.parquet"
+        write_parquet(self.df, file_path, row_group_size=50)
+
+        result = read_parquet(
+            file_path,
+            columns=["Zeitstempel", "Temperatur"],
+            machines=["Laser_02"],
+            start="2024-01-05",
+            end="2024-01-10",
+        )
+        expected = self.df[
+            (self.df["Maschine"] == "Laser_02")
+            & (self.df["Zeitstempel"] >= "2024-01-05")
+            & (self.df["Zeitstempel"] < "2024-01-10")
+        ]
+        assert list(result.columns) == ["Zeitstempel", "Temperatur"]
+        assert len(result) == len(expected)
+        assert result["Temperatur"].sum() == pytest.approx(expected["Temperatur"].sum())
+
+        # Sortiert nach Maschine: jede Row-Group enthält nur eine Maschine
+        groups = parquet_row_groups(file_path, column="Maschine")
+        assert len(groups) == 20
+        assert (groups["Min"] == groups["Max"]).all()
+
+    def test_partitioned_dataset(self):
+        """Hive-Partitionierung nach Maschine"""
+        dataset = self.temp_dir / "dataset"
+        write_parquet(self.df, dataset, partition_cols=["Maschine"])
+        assert len(list(dataset.iterdir())) == 4
+
+        result = read_parquet(dataset, machines="Presse_01")
+        assert len(result) == 250
+        assert set(result["Maschine"].astype(str)) == {"Presse_01"}
+
+    def test_registry_detects_columnar_formats(self):
+        """Parquet und Feather werden über Magic Bytes erkannt"""
+        parquet_file = self.temp_dir / "export.bin"
+        parquet_file.write_bytes(to_parquet_bytes(self.df))
+        feather_file = self.temp_dir / "export.feather"
+        write_feather(self.df, feather_file)
+
+        registry = FormatRegistry()
+        df, settings = registry.read(parquet_file, usecols=["Maschine", "Temperatur"])
+        assert settings["format"] == "parquet"
+        assert list(df.columns) == ["Maschine", "Temperatur"]
+        assert len(df) == len(self.df)
+
+        df, settings = registry.read(feather_file)
+        assert settings["format"] == "feather"
+        pd.testing.assert_frame_equal(df, self.df)
+
+
+class TestValidierungsRegeln:
+    """Tests für die deklarative Regel-Engine"""
+
+    def setup_method(self):
+        """Setup für jeden Test"""
+        self.df = pd.DataFrame(
+            {
+                "Maschine": ["Laser_01", "Laser_02", "Presse_01", "Laser_01", None],
+                "Temperatur": [25.0, 15.0, 15.0, 45.0, np.nan],
+                "Status": ["OK", "ok", "NOK", None, "OK"],
+                "Bediener": ["BY001", "by9", "BY123", "BY017", "BY1234"],
+            }
+        )
+        self.rules = [
+            {"name": "Temperatur", "column": "Temperatur", "min": 10, "max": 40},
+            {
+                "name": "Status",
+                "column": "Status",
+                "allowed": ["OK", "NOK"],
+                "required": True,
+            },
+            {"name": "Bediener", "column": "Bediener", "pattern": r"^BY\d{3}$"},
+            {
+                "name": "Laser-Temperatur",
+                "column": "Temperatur",
+                "min": 20,
+                "when": {"column": "Maschine", "pattern": "Laser"},
+                "severity": "warning",
+            },
+        ]
+
+    def test_counts_bitmap_and_messages(self):
+        """Bereich, Werteliste, Regex und bedingte Regel"""
+        engine = ValidationRuleEngine(self.rules)
+        report = engine.evaluate(self.df)
+
+        assert report["counts"] == {
+            "Temperatur": 1,
+            "Status": 2,
+            "Bediener": 2,
+            "Laser-Temperatur": 1,
+        }
+        assert report["rows_with_violations"] == 3
+        assert report["errors"][0] == "Temperatur ausserhalb 10-40: 1"
+        assert report["warnings"] == ["Laser-Temperatur unter 20: 1"]
+
+        flags = engine.violation_frame(report, index=self.df.index)
+        assert flags.loc[1].tolist() == [False, True, True, True]
+        assert flags.loc[3].tolist() == [True, True, False, False]
+        assert not flags.loc[0].any()
+
+    def test_chunks_match_full_evaluation(self):
+        """Chunkweise Auswertung ergibt dieselben Zählungen und Bitmap"""
+        engine = ValidationRuleEngine(self.rules)
+        full = engine.evaluate(self.df)
+        chunks = (self.df.iloc[i : i + 2] for i in range(0, len(self.df), 2))
+        streamed = engine.evaluate_chunks(chunks)
+
+        assert streamed["counts"] == full["counts"]
+        assert streamed["rows_with_violations"] == full["rows_with_violations"]
+        np.testing.assert_array_equal(streamed["bitmap"], full["bitmap"])
+
+    def test_config_rules_and_missing_columns(self):
+        """Bereichsregeln aus der Konfiguration, fehlende Spalten übersprungen"""
+        validation_rules = {
+            "temperature_range": (-50, 200),
+            "production_range": (0, 10000),
+            "availability_range": (0, 100),
+            "pressure_range": (0, 1000),
+        }
+        engine = ValidationRuleEngine(rules_from_config(validation_rules))
+        df = pd.DataFrame(
+            {"Temperatur_C": [20, 250], "Stückzahl": [5, -1], "Druck": ["7", "x"]}
+        )
+        report = engine.evaluate(df)
+
+        assert report["counts"]["temperature"] == 1
+        assert report["counts"]["production"] == 1
+        assert report["counts"]["pressure"] == 1  # nicht numerisch
+        assert report["skipped"] == ["availability"]
+
+        with pytest.raises(ValueError):
+            ValidationRuleEngine([{"name": "a"}, {"name": "a"}])
+        with pytest.raises(ValueError):
+            ValidationRuleEngine([{"name": "a", "range": (0, 1)}])
+
+
+class TestSpeicherOptimierung:
+    """Tests für die automatische Datentyp-Optimierung"""
+
+    def setup_method(self):
+        """Setup für jeden Test"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        n_rows = 1000
+        self.df = pd.DataFrame(
+            {
+                "ID": np.arange(n_rows) * 100,
+                "Maschine": np.tile(["Laser_01", "Laser_02", "Presse_01", None], 250),
+                "Schicht": ["Früh"] * n_rows,
+                "Auftrag": [f"A{i:05d}" for i in range(n_rows)],
+                "Temperatur": np.round(np.linspace(18, 30, n_rows), 1),
+                "Zaehler": np.full(n_rows, 2**40),
+                "Genau": np.linspace(0, 1, n_rows) + 1e-12,
+            }
+        )
+
+    def teardown_method(self):
+        """Cleanup nach jedem Test"""
+        import shutil
+
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_smallest_safe_dtypes(self):
+        """Ganzzahlen, Gleitkommazahlen und Kategorien werden verkleinert"""
+        optimized, report = optimize_frame(self.df, float_rtol=1e-6)
+
+        assert optimized["ID"].dtype == np.int32
+        assert optimized["Zaehler"].dtype == np.int64
+        assert optimized["Temperatur"].dtype == np.float32
+        assert optimized["Maschine"].dtype == "category"
+        assert optimized["Schicht"].dtype == "category"
+        assert optimized["Auftrag"].dtype == object  # zu viele verschiedene Werte
+        assert optimized["Maschine"].isna().sum() == 250
+        assert (optimized["ID"] == self.df["ID"]).all()
+
+        assert report["bytes_after"] < report["bytes_before"]
+        assert report["saved_pct"] > 0
+        assert report["columns"]["ID"] == ("int64", "int32")
+        assert self.df["ID"].dtype == np.int64  # Eingabe unverändert
+
+        strict, _ = optimize_frame(self.df, float_rtol=1e-12)
+        assert strict["Genau"].dtype == np.float64
+
+    def test_float32_keeps_integral_values(self):
+        """Grosse ganze Zahlen und Zeitstempel bleiben unverändert float64"""
+        df = pd.DataFrame(
+            {
+                "Zeit": [1704067200.0, 1704067201.0, np.nan],
+                "Zaehler": [16777217.0, 1.0, 2.0],
+                "Klein": [16777216.0, 18.5, np.nan],
+                "Gross": [1e39, 1.0, 2.0],
+            }
+        )
+
+        optimized, report = optimize_frame(df)
+
+        for column in ("Zeit", "Zaehler", "Gross"):
+            assert optimized[column].dtype == np.float64
+            assert column not in report["columns"]
+        assert optimized["Zeit"].nunique() == 2
+        assert optimized["Klein"].dtype == np.float32
+        assert optimized["Klein"].isna().sum() == 1
+
+    def test_loader_option(self):
+        """robust_import liefert optimierte Daten und den Bericht im Log"""
+        csv_file = self.temp_dir / "daten.csv"
+        self.df.to_csv(csv_file, index=False)
+
+        df, log = robust_import(csv_file, optimize=True)
+
+        assert log["success"]
+        assert df["Maschine"].dtype == "category"
+        assert log["memory"]["bytes_after"] < log["memory"]["bytes_before"]
+
+        _, plain_log = robust_import(csv_file)
+        assert plain_log["memory"] is None
+
+
+class TestSpektralanalyse:
+    """Tests für die Spektralanalyse von Scope-Exporten"""
+
+    def setup_method(self):
+        """Setup für jeden Test"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        rng = np.random.default_rng(4)
+        self.fs = 1000.0
+        t = np.arange(20_000) / self.fs
+        self.signale = np.column_stack(
+            [
+                np.sin(2 * np.pi * 40 * t) + rng.normal(0, 0.2, len(t)),
+                np.sin(2 * np.pi * 123.4 * t) + rng.normal(0, 0.2, len(t)),
+            ]
+        )
+
+    def teardown_method(self):
+        """Cleanup nach jedem Test"""
+        import shutil
+
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_chunked_welch_matches_scipy(self):
+        """Blockweise Welch-PSD entspricht scipy.signal.welch am Stück"""
+        from scipy import signal
+
+        accumulator = WelchAccumulator(self.fs, nperseg=512, overlap=0.5)
+        for block in np.array_split(self.signale, 13):
+            accumulator.update(block)
+        freqs, psd = accumulator.psd()
+
+        ref_freqs, ref_psd = signal.welch(self.signale, fs=self.fs, nperseg=512, axis=0)
+        np.testing.assert_allclose(freqs, ref_freqs)
+        np.testing.assert_allclose(psd, ref_psd, rtol=1e-10, atol=1e-15)
+
+        features = accumulator.segment_features(["A", "B"])
+        assert len(features) == accumulator.n_segments
+        tief = features[("A", "10-50 Hz")].mean()
+        assert tief > 10 * features[("A", "50-150 Hz")].mean()
+
+    def test_spectrograms_and_peak_tracking(self):
+        """Spektrogramm aller Kanäle; Peak zwischen den Bins interpoliert"""
+        freqs, zeiten, power = spectrograms(self.signale, self.fs, nperseg=256)
+        assert power.shape == (2, len(freqs), len(zeiten))
+
+        # Mittel über die Zeit = Welch-PSD mit denselben Segmenten
+        welch_psd = WelchAccumulator(self.fs, nperseg=256)
+        welch_psd.update(self.signale)
+        np.testing.assert_allclose(power.mean(axis=2), welch_psd.psd()[1].T)
+
+        peaks, _ = peak_frequency(freqs, np.moveaxis(power, 1, 2))
+        assert np.abs(peaks[0] - 40).max() < 1.0
+        assert np.abs(peaks[1] - 123.4).max() < 1.0
+        # Ohne Interpolation läge der Peak auf dem Raster (3.9 Hz)
+        assert np.abs(np.median(peaks[1]) - 123.4) < 0.5
+
+    def test_analyze_scope_file_with_cache(self):
+        """Scope-Export blockweise analysieren; zweiter Aufruf aus dem Cache"""
+        export = self.temp_dir / "scope.csv"
+        write_scope_csv(
+            export,
+            {"TEMP_001": np.full(len(self.signale), 35.0)}
+            | {f"VIBR_00{i + 1}": self.signale[:, i] for i in range(2)},
+        )
+        cache = self.temp_dir / "cache"
+
+        erster = analyze_scope_file(export, chunksize=3000, cache_dir=cache)
+        assert not erster["from_cache"]
+        assert erster["fs"] == 1000.0
+        assert list(erster["psd"].columns) == ["VIBR_001", "VIBR_002"]
+        assert erster["psd"]["VIBR_001"].idxmax() == pytest.approx(40, abs=1)
+
+        zweiter = analyze_scope_file(export, chunksize=3000, cache_dir=cache)
+        assert zweiter["from_cache"]
+        pd.testing.assert_frame_equal(zweiter["features"], erster["features"])
+
+        anders = analyze_scope_file(export, nperseg=256, cache_dir=cache)
+        assert not anders["from_cache"]
+        assert len(list(cache.glob("*.pkl"))) == 2
+
+
+class TestEnergieLastprofil:
+    """Tests für Lastprofile aus Leistungskanälen"""
+
+    def setup_method(self):
+        """Setup für jeden Test"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        # 20 min mit 100 ms: A konstant 10 kW, B mit 30 s Lastblock à 50 kW
+        self.start = pd.Timestamp("2025-03-03 09:52:30")
+        self.leistung = np.zeros((12_000, 2))
+        self.leistung[:, 0] = 10.0
+        self.leistung[6_000:6_300, 1] = 50.0  # 10:02:30 bis 10:03:00
+
+    def teardown_method(self):
+        """Cleanup nach jedem Test"""
+        import shutil
+
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def accumulate(self, chunksize):
+        accumulator = LoadProfileAccumulator(100, self.start, ["A", "B"])
+        for i in range(0, len(self.leistung), chunksize):
+            accumulator.update(self.leistung[i : i + chunksize])
+        return accumulator.profile()
+
+    def test_streaming_integration_and_peak_windows(self):
+        """Viertelstunden am Uhrzeit-Raster, unabhängig von der Blockgrösse"""
+        profil = self.accumulate(len(self.leistung))
+        for chunksize in (7, 1000, 4_501):
+            pd.testing.assert_frame_equal(self.accumulate(chunksize), profil)
+
+        gesamt = profil[profil["Kanal"] == "Gesamt"].set_index("Zeitstempel")
+        assert list(gesamt.index.strftime("%H:%M")) == ["09:45", "10:00"]
+        assert gesamt["Dauer_s"].tolist() == [450.0, 750.0]
+        energie = self.leistung.sum() * 0.1 / 3600
+        assert gesamt["Energie_kWh"].sum() == pytest.approx(energie)
+        a = profil[profil["Kanal"] == "A"]
+        np.testing.assert_allclose(a["Leistung_kW"], 10.0)
+
+        # 1-min-Mittel: 30 s à 50 kW + 10 kW Grundlast; erstes Fenster mit
+        # dem ganzen Block endet mit dem Block
+        spitze = peak_windows(profil, n=1).iloc[0]
+        assert spitze["Spitze_kW"] == pytest.approx(35.0)
+        assert spitze["Spitze_Ende"] == pd.Timestamp("2025-03-03 10:03:00")
+        assert spitze["Spitze_Beginn"] == pd.Timestamp("2025-03-03 10:02:00")
+
+    def test_analyze_power_export_and_store(self):
+        """Export blockweise auswerten; Ablage ersetzt Quellen, führt zusammen"""
+        signale = {"POWER_001": self.leistung[:, 0], "POWER_002": self.leistung[:, 1]}
+        erster = self.temp_dir / "erster.csv"
+        write_scope_csv(
+            erster, signale, 100.0, {"POWER_001": "Laser"}, start_time=self.start
+        )
+        # Zweiter Export schliesst um 10:12:30 an und teilt die Viertelstunde
+        zweiter = self.temp_dir / "zweiter.csv"
+        start_2 = self.start + pd.Timedelta(minutes=20)
+        write_scope_csv(zweiter, signale, 100.0, start_time=start_2)
+
+        store = LoadProfileStore(self.temp_dir / "ablage")
+        profil = analyze_power_export(erster, chunksize=999, store=store)
+        assert set(profil["Bereich"]) == {"Laser", "Biegen", "Gesamt"}
+        analyze_power_export(erster, store=store)  # erneut: keine Doppelzählung
+        analyze_power_export(zweiter, store=store)
+
+        abfrage = store.query("2025-03-03", "2025-03-04", channels=["Gesamt"])
+        assert list(abfrage["Zeitstempel"].dt.strftime("%H:%M")) == [
+            "09:45",
+            "10:00",
+            "10:15",
+            "10:30",
+        ]
+        zehn_uhr = abfrage.set_index("Zeitstempel").loc["2025-03-03 10:00"]
+        assert zehn_uhr["Dauer_s"] == 900.0
+        energie = 2 * self.leistung.sum() * 0.1 / 3600
+        assert abfrage["Energie_kWh"].sum() == pytest.approx(energie)
+        assert store.query(channels=["POWER_001"])["Leistung_kW"].eq(10.0).all()
+
+    def test_plant_time_zone(self):
+        """Startzeit in Ortszeit: Raster, Sommerzeit und Monatsgrenzen"""
+        export = self.temp_dir / "sommer.csv"
+        write_scope_csv(
+            export,
+            {"POWER_001": np.full(10, 5.0), "POWER_002": np.full(10, 2.0)},
+            1000.0,
+            start_time="2025-07-08 10:58:19.716",
+        )
+        zeile = export.read_text(encoding="utf-8").splitlines()[2]
+        assert zeile.endswith("08.07.2025\t10:58:19.716")
+        parser = BystronicCSVParser()
+        header = parser.read_scope_header(str(export))
+        assert header["start_time"] == pd.Timestamp(
+            "2025-07-08 10:58:19.716", tz="Europe/Zurich"
+        )
+        utc = parser.read_scope_header(str(export), tz=None)["start_time"]
+        assert utc == pd.Timestamp("2025-07-08 08:58:19.716")
+        profil = analyze_power_export(export)
+        assert profil["Zeitstempel"].dt.strftime("%H:%M").unique().tolist() == ["10:45"]
+
+        # Wechsel auf Sommerzeit: 02:00 fehlt, Intervalle bleiben lückenlos
+        start = pd.Timestamp("2025-03-30 01:30", tz="Europe/Zurich")
+        accumulator = LoadProfileAccumulator(60_000, start, ["A"])
+        accumulator.update(np.full(120, 4.0))
+        gesamt = accumulator.profile().query("Kanal == 'Gesamt'")
+        uhrzeit = gesamt["Zeitstempel"].dt.strftime("%H:%M").tolist()
+        assert uhrzeit[:4] == ["01:30", "01:45", "03:00", "03:15"]
+        assert (gesamt["Dauer_s"] == 900.0).all()
+        assert set(daily_profile(gesamt).index) == {1.0, 3.0, 4.0}
+
+        # Monatsgrenze um Mitternacht Ortszeit (22:00 UTC)
+        start = pd.Timestamp("2025-03-31 23:00", tz="Europe/Zurich")
+        accumulator = LoadProfileAccumulator(60_000, start, ["A"])
+        accumulator.update(np.full(120, 4.0))
+        store = LoadProfileStore(self.temp_dir / "monate")
+        store.append(accumulator.profile(), source="grenze")
+        assert [str(m) for m in store.months()] == ["2025-03", "2025-04"]
+        april = store.query("2025-04-01", "2025-04-02", channels=["Gesamt"])
+        assert april["Zeitstempel"].iloc[0] == pd.Timestamp(
+            "2025-04-01", tz="Europe/Zurich"
+        )
+        assert len(april) == 4
+
+        # Tagesblöcke über die Umstellung: 23 h am 30.03., Ende um Mitternacht
+        start = pd.Timestamp("2025-03-29", tz="Europe/Zurich")
+        blocks = list(simulate_power_blocks(start, days=3, sample_time_ms=60_000))
+        assert [len(block) for block in blocks] == [1440, 1380, 1440]
+        accumulator = LoadProfileAccumulator(60_000, start, ["A"])
+        for block in blocks:
+            accumulator.update(block[["POWER_001"]].to_numpy())
+        ende = accumulator.profile()["Zeitstempel"].max() + pd.Timedelta(minutes=15)
+        assert ende == pd.Timestamp("2025-04-01", tz="Europe/Zurich")
+
+    def test_dashboard_queries(self):
+        """Tagesprofil, Spitzenstunden, Grundlast und Anteile je Bereich"""
+        tage = simulate_power("2025-03-03", "2D", sample_time_ms=60_000)
+        accumulator = LoadProfileAccumulator(
+            60_000, "2025-03-03", list(tage.columns), areas={"POWER_001": "Laser"}
+        )
+        accumulator.update(tage.to_numpy())
+        profil = accumulator.profile()
+
+        tagesprofil = daily_profile(profil)
+        assert tagesprofil.shape == (24, 5)
+        assert tagesprofil.columns[0] == "Laser"
+        assert set(peak_hours(profil).index) <= set(range(8, 17))
+        assert base_load(profil) < tagesprofil.sum(axis=1).min() * 1.5
+
+        anteile = area_share(profil)
+        assert anteile["Anteil_%"].sum() == pytest.approx(100.0)
+        assert anteile.index[0] == "Laser"
+        pro_tag = energy_per_period(profil, "1D")
+        assert pro_tag.shape == (2, 5)
+        assert pro_tag.to_numpy().sum() == pytest.approx(anteile["Energie_kWh"].sum())
+
 
 class TestJSONVerarbeitung:
     """Tests für JSON-Datenverarbeitung"""